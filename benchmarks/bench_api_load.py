@@ -0,0 +1,186 @@
+"""HTTP API 负载基准（使用本地替身服务器，离线运行）。
+
+先提交一个长时间执行的任务（execute=True，用 sleep 模拟 GUI 操作），
+在任务执行期间并发发送仅识别请求（execute=False），同时轮询健康检查，比较：
+
+- blocking: 原实现，在事件循环中直接调用阻塞的 recognize / orchestrate
+- async:    当前实现，异步 LLM 调用 + GUI 任务在专用执行器中执行
+
+用法:
+    python -m benchmarks.bench_api_load --requests 100 --concurrency 20 --latency-ms 300 --task-seconds 3
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+import src.api.app as api_app
+from benchmarks.llm_stub_server import start_stub_server
+from src.intent.recognizer import IntentRecognizer
+from src.llm import AsyncLLMService, LLMService
+
+INTENT_CONTENT = json.dumps(
+    {
+        "intent_type": "develop-feature",
+        "confidence": 0.95,
+        "parameters": {"requirement_text": "实现购物车结算功能"},
+        "reasoning": "stub",
+    },
+    ensure_ascii=False,
+)
+
+
+class SleepOrchestrator:
+    """用 sleep 模拟 GUI 任务的编排器。"""
+
+    def __init__(self, task_seconds: float) -> None:
+        self.task_seconds = task_seconds
+
+    def show_execution_plan(self, intent) -> dict:
+        return {"intent": intent.type, "steps": []}
+
+    def orchestrate(self, intent):
+        time.sleep(self.task_seconds)
+        return SimpleNamespace(status="completed", step_results=[], get_execution_summary=lambda: "ok")
+
+
+def build_blocking_app(recognizer: IntentRecognizer, orchestrator: SleepOrchestrator) -> FastAPI:
+    """构建原实现的等价应用：async 端点中直接调用阻塞函数。"""
+    app = FastAPI()
+
+    @app.get("/api/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.post("/api/intent")
+    async def intent(request: api_app.IntentRequest):
+        result = recognizer.recognize(request.message)
+        if request.execute and result.has_match:
+            orchestrator.orchestrate(result.intent)
+        return {"success": result.has_match}
+
+    return app
+
+
+def serve(app: FastAPI) -> tuple[uvicorn.Server, str]:
+    """在后台线程启动 uvicorn，返回 (服务器, base_url)。"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def load(base_url: str, requests: int, concurrency: int) -> dict[str, float]:
+    """在长任务执行期间并发发送仅识别请求和健康检查。"""
+    limits = httpx.Limits(max_connections=concurrency + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=600, limits=limits) as client:
+        long_task = asyncio.create_task(
+            client.post("/api/intent", json={"message": "实现购物车结算功能", "execute": True})
+        )
+        await asyncio.sleep(0.2)
+
+        done = asyncio.Event()
+        health_latencies: list[float] = []
+
+        async def probe_health() -> None:
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/api/health")
+                health_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.1)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def recognize_only() -> float:
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/api/intent", json={"message": "实现购物车结算功能", "execute": False})
+                response.raise_for_status()
+                return time.perf_counter() - start
+
+        prober = asyncio.create_task(probe_health())
+        start = time.perf_counter()
+        latencies = sorted(await asyncio.gather(*(recognize_only() for _ in range(requests))))
+        total = time.perf_counter() - start
+        done.set()
+        await prober
+        await long_task
+
+    health_latencies.sort()
+    return {
+        "total": total,
+        "throughput": requests / total,
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "health_max": health_latencies[-1] if health_latencies else 0.0,
+    }
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="HTTP API 负载基准")
+    parser.add_argument("--requests", type=int, default=100, help="仅识别请求总数")
+    parser.add_argument("--concurrency", type=int, default=20, help="并发请求数")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="替身服务器响应延迟（毫秒）")
+    parser.add_argument("--task-seconds", type=float, default=3.0, help="长任务（模拟 GUI 操作）耗时（秒）")
+    args = parser.parse_args()
+
+    stub, _ = start_stub_server(latency_ms=args.latency_ms, handshake_ms=0, content=INTENT_CONTENT)
+    llm_url = f"http://127.0.0.1:{stub.server_port}"
+    orchestrator = SleepOrchestrator(args.task_seconds)
+    definitions = "config/intent_definitions.yaml"
+
+    pool = {"max_connections": args.concurrency, "max_in_flight": args.concurrency}
+    sync_llm = LLMService(api_key="stub", base_url=llm_url, **pool)
+    async_llm = AsyncLLMService(api_key="stub", base_url=llm_url, **pool)
+
+    # 所有请求使用同一条消息，关闭识别结果缓存以测量 LLM 调用路径
+    blocking_app = build_blocking_app(
+        IntentRecognizer(definitions, llm_client=sync_llm, cache_size=0), orchestrator
+    )
+    api_app.controller = SimpleNamespace(
+        _intent_recognizer=IntentRecognizer(
+            definitions, llm_client=sync_llm, async_llm_client=async_llm, cache_size=0
+        ),
+        _task_orchestrator=orchestrator,
+        async_llm=async_llm,
+    )
+
+    print(
+        f"仅识别请求 {args.requests}，并发 {args.concurrency}，LLM 延迟 {args.latency_ms}ms，"
+        f"长任务 {args.task_seconds}s"
+    )
+    print(
+        f"{'方式':<9} | {'总耗时(s)':>9} | {'吞吐(req/s)':>11} | {'P50(ms)':>8} | {'P95(ms)':>8} | "
+        f"{'健康检查最大延迟(ms)':>20}"
+    )
+    print("-" * 86)
+    for name, app in (("blocking", blocking_app), ("async", api_app.app)):
+        server, base_url = serve(app)
+        result = asyncio.run(load(base_url, args.requests, args.concurrency))
+        server.should_exit = True
+        print(
+            f"{name:<9} | {result['total']:>9.2f} | {result['throughput']:>11.1f} | "
+            f"{result['p50'] * 1000:>8.0f} | {result['p95'] * 1000:>8.0f} | {result['health_max'] * 1000:>20.0f}"
+        )
+
+    sync_llm.close()
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
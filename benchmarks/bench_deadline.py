@@ -0,0 +1,79 @@
+"""限时定位基准：视觉 API 很慢时，不限时定位 vs 给定时间预算的定位（使用本地替身服务器，离线运行）。
+
+替身服务器模拟一次很慢的视觉请求，比较不同时间预算下：
+
+- 定位实际耗时（限时定位在预算到期时取消请求）
+- 是否得到结果、结果是否被标记为不完整（truncated）
+
+之后视觉服务恢复正常（--recovered-ms），同一定位器继续限时定位：此前很慢的一次
+不会使视觉阶段一直被跳过，每次都发送请求并得到结果。
+
+用法:
+    python -m benchmarks.bench_deadline --latency-ms 4000 --budgets 0.5 1 2 8 --recovered-ms 50
+"""
+
+import argparse
+import json
+import time
+
+from PIL import Image
+
+from benchmarks.llm_stub_server import start_stub_server
+from src.llm import LLMResilience, LLMService
+from src.locator.visual_locator import VisualLocator
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="限时定位基准")
+    parser.add_argument("--latency-ms", type=float, default=4000.0, help="替身服务器延迟（毫秒）")
+    parser.add_argument("--budgets", type=float, nargs="+", default=[0.5, 1.0, 2.0, 8.0], help="时间预算（秒）")
+    parser.add_argument("--recovered-ms", type=float, default=50.0, help="视觉服务恢复后的延迟（毫秒）")
+    args = parser.parse_args()
+
+    item = {"element_type": "button", "description": "运行", "bbox": [10, 10, 80, 30], "confidence": 0.9}
+    server, state = start_stub_server(
+        latency_ms=args.latency_ms, handshake_ms=0, content=json.dumps([item], ensure_ascii=False)
+    )
+    # 与控制器一致：由 resilience 统一重试（SDK 内置重试关闭），请求超时即截止时间
+    llm = LLMService(
+        api_key="stub", base_url=f"http://127.0.0.1:{server.server_port}", timeout=60, resilience=LLMResilience()
+    )
+    frame = Image.new("RGB", (1280, 720), (43, 43, 43))
+
+    print(f"视觉请求延迟 {args.latency_ms:.0f}ms")
+    print(f"{'预算(s)':>8} | {'耗时(s)':>8} | {'结果':>4} | {'截断':<4} | {'请求数':>6}")
+    print("-" * 46)
+    locator = VisualLocator(api_key="stub", llm_client=llm)
+    for budget in [None, *args.budgets]:
+        requests = state.requests
+        start = time.perf_counter()
+        result = locator.locate("找到运行按钮", frame, use_cache=False, deadline=budget)
+        elapsed = time.perf_counter() - start
+        label = "不限" if budget is None else f"{budget:.1f}"
+        print(
+            f"{label:>8} | {elapsed:>8.2f} | {len(result):>4} | "
+            f"{'是' if result.truncated else '否':<4} | {state.requests - requests:>6}"
+        )
+
+    # 视觉服务恢复正常：之前记录的很慢的耗时估计不会使视觉阶段被跳过
+    state.latency_ms = args.recovered_ms
+    budget = min(args.budgets)
+    requests, found = state.requests, 0
+    start = time.perf_counter()
+    for _ in range(5):
+        found += bool(locator.locate("找到运行按钮", frame, use_cache=False, deadline=budget))
+    elapsed = (time.perf_counter() - start) / 5
+    print()
+    print(
+        f"恢复到 {args.recovered_ms:.0f}ms 后限时 {budget:.1f}s 定位 5 次: 找到 {found} 次，"
+        f"请求 {state.requests - requests} 次，平均 {elapsed:.2f}s，"
+        f"视觉阶段估计 {locator.get_stage_estimates()['vision']:.2f}s"
+    )
+
+    llm.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""列式元素集合基准：整帧 OCR 结果的内存占用，以及建集合、按目标过滤、去重的耗时（离线运行）。
+
+模拟一帧繁忙 IDE 截图的整帧 OCR 结果（代码、文件树、状态栏文本，大量重复的词），比较：
+
+- 逐个元素的对象列表（带实例字典的 dataclass，即原先的 UIElement）+ Python 循环
+- 列式 ElementSet（NumPy 数组 + 描述词表）+ 向量化计算
+
+用法:
+    python -m benchmarks.bench_element_set --elements 5000 --nms-elements 1000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from src.locator.tiling import box_overlap
+from src.locator.visual_locator import VisualLocator
+from src.models.element_set import ElementSet
+
+WORDS = [
+    "def", "return", "self", "import", "from", "class", "None", "True", "if", "else", "for", "in",
+    "main.py", "utils.py", "config.yaml", "request", "response", "handler", "process", "result",
+    "项目", "运行", "调试", "终端", "版本控制", "UTF-8", "LF", "Python 3.11", "4 spaces",
+]
+
+
+@dataclass
+class DictElement:
+    """原先的 UIElement（每个实例带 __dict__）。"""
+
+    element_type: str
+    description: str
+    bbox: tuple[int, int, int, int]
+    confidence: float
+    metadata: dict[str, Any] | None = None
+
+
+def make_ocr_results(count: int, width: int, height: int, seed: int = 0) -> list:
+    """生成 EasyOCR 格式的整帧识别结果。"""
+    rng = random.Random(seed)
+    results = []
+    for _ in range(count):
+        text = rng.choice(WORDS)
+        w, h = 8 * len(text) + rng.randint(0, 6), rng.randint(12, 18)
+        x, y = rng.randint(0, width - w), rng.randint(0, height - h)
+        results.append(([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], text, rng.uniform(0.3, 1.0)))
+    return results
+
+
+def build_objects(results: list) -> list[DictElement]:
+    """基线：每个文本块一个对象。"""
+    elements = []
+    for bbox, text, confidence in results:
+        x1 = int(min(p[0] for p in bbox))
+        y1 = int(min(p[1] for p in bbox))
+        x2 = int(max(p[0] for p in bbox))
+        y2 = int(max(p[1] for p in bbox))
+        elements.append(DictElement("ocr_text", text, (x1, y1, x2, y2), float(confidence)))
+    return elements
+
+
+def build_set(results: list) -> ElementSet:
+    """列式集合（与 OCRIndex 的构建方式相同）。"""
+    points = np.array([bbox for bbox, _, _ in results], dtype=np.float64).reshape(-1, 4, 2)
+    boxes = np.concatenate([points.min(axis=1), points.max(axis=1)], axis=1).astype(np.int32)
+    return ElementSet.from_columns(
+        boxes, [float(c) for _, _, c in results], "ocr_text", [text for _, text, _ in results]
+    )
+
+
+def filter_objects(locator: VisualLocator, elements: list[DictElement], target: str) -> list[DictElement]:
+    """基线：逐个元素计算匹配度、排序、过滤（原先的 _filter_by_target，不含输出）。"""
+    scored = [(locator._calculate_match_score(e.description, target), e) for e in elements]
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [e for score, e in scored if score > 0.5] or [scored[0][1]]
+
+
+def filter_set(locator: VisualLocator, elements: ElementSet, target: str) -> ElementSet:
+    """列式：按描述词表计算匹配度，向量化排序、过滤。"""
+    scores = elements.description_scores(lambda text: locator._calculate_match_score(text, target))
+    return elements.filter(scores > 0.5).sort(scores[scores > 0.5])
+
+
+def nms_objects(elements: list[DictElement], threshold: float = 0.5) -> list[DictElement]:
+    """基线：原先的 merge_elements。"""
+    kept: list[DictElement] = []
+    for element in sorted(elements, key=lambda item: item.confidence, reverse=True):
+        if not any(box_overlap(element.bbox, other.bbox)[0] >= threshold for other in kept):
+            kept.append(element)
+    return kept
+
+
+def measure(func, *args, repeat: int = 5):
+    """返回 (结果, 平均耗时毫秒, 结果占用内存 KB)。"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    tracemalloc.start()
+    result = func(*args)
+    memory = tracemalloc.get_traced_memory()[0] / 1024
+    tracemalloc.stop()
+    return result, elapsed, memory
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="列式元素集合基准")
+    parser.add_argument("--elements", type=int, default=5000, help="OCR 文本块数量")
+    parser.add_argument("--nms-elements", type=int, default=1000, help="去重测试的元素数量（基线为平方复杂度）")
+    parser.add_argument("--target", default="main.py", help="目标文本")
+    args = parser.parse_args()
+
+    locator = VisualLocator(api_key="stub", vision_enabled=False)
+    results = make_ocr_results(args.elements, 1920, 1080)
+
+    objects, object_build, object_memory = measure(build_objects, results)
+    columns, column_build, column_memory = measure(build_set, results)
+    matched, object_filter, _ = measure(filter_objects, locator, objects, args.target)
+    column_matched, column_filter, _ = measure(filter_set, locator, columns, args.target)
+    assert len(matched) == len(column_matched)
+
+    few = results[: args.nms_elements]
+    kept, object_nms, _ = measure(nms_objects, build_objects(few), repeat=1)
+    column_kept, column_nms, _ = measure(lambda s: s.nms(0.5), build_set(few), repeat=1)
+    assert len(kept) == len(column_kept)
+
+    print(f"{args.elements} 个 OCR 文本块（{len(columns.descriptions)} 种文本），目标 '{args.target}' 匹配 {len(matched)} 个")
+    print(f"{'项目':<16} | {'对象列表':>10} | {'ElementSet':>10} | {'倍数':>6}")
+    print("-" * 54)
+    rows = [
+        ("内存(KB)", object_memory, column_memory),
+        ("建集合(ms)", object_build, column_build),
+        ("按目标过滤(ms)", object_filter, column_filter),
+        (f"去重 {len(few)} 个(ms)", object_nms, column_nms),
+    ]
+    for name, slow, fast in rows:
+        print(f"{name:<16} | {slow:>10.1f} | {fast:>10.1f} | {slow / fast:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
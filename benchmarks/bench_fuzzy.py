@@ -0,0 +1,95 @@
+"""模糊匹配基准：在整帧 OCR 文本上查找目标的耗时与召回（离线运行）。
+
+模拟一帧 IDE 截图的 OCR 文本（文件名、代码片段、菜单），其中部分文件名有一个字符识别错误
+（如 "main.py" → "maln.py"）。比较：
+
+- 子串匹配（原先的 OCR 匹配方式）：识别错误的目标找不到，只能再请求视觉模型
+- 逐个文本用 Python 计算编辑距离（基线）
+- FuzzyMatcher：三元组过滤 + 向量化编辑距离，一次查询所有文本
+
+用法:
+    python -m benchmarks.bench_fuzzy --texts 1000 3000 --queries 200
+"""
+
+import argparse
+import random
+import string
+import time
+
+from src.locator.fuzzy import MATCH_THRESHOLD, FuzzyMatcher, normalize
+
+WORDS = ["def", "return", "self", "request", "response", "handler", "process", "result", "config", "import"]
+MENUS = ["文件", "编辑", "视图", "导航", "代码", "重构", "运行", "工具", "版本控制", "窗口", "帮助", "终端", "调试"]
+
+
+def make_texts(count: int, rng: random.Random) -> tuple[list[str], list[str]]:
+    """生成 OCR 文本和目标文件名（约三分之一的文件名在 OCR 文本中有一个字符识别错误）。"""
+    names = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))) + rng.choice([".py", ".yaml"])
+        for _ in range(count // 4)
+    ]
+    texts = []
+    for name in names:
+        if rng.random() < 0.33:
+            i = rng.randrange(len(name) - 3)
+            name = name[:i] + rng.choice("l1oO0") + name[i + 1 :]
+        texts.append(name)
+    while len(texts) < count:
+        if rng.random() < 0.1:
+            texts.append(rng.choice(MENUS))
+        else:
+            texts.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))))
+    rng.shuffle(texts)
+    return texts, names
+
+
+def substring_distance(text: str, target: str) -> int:
+    """基线：目标与文本中最相近子串的编辑距离（逐字符动态规划）。"""
+    previous = [0] * (len(text) + 1)
+    for i, char in enumerate(target, 1):
+        current = [i]
+        for j, other in enumerate(text, 1):
+            current.append(min(previous[j - 1] + (char != other), previous[j] + 1, current[j - 1] + 1))
+        previous = current
+    return min(previous)
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="模糊匹配基准")
+    parser.add_argument("--texts", type=int, nargs="+", default=[500, 2000, 5000], help="OCR 文本数量")
+    parser.add_argument("--queries", type=int, default=100, help="查询次数")
+    args = parser.parse_args()
+
+    print(f"每种方式 {args.queries} 次查询（目标为文件名），耗时单位毫秒/次")
+    print(f"{'文本数':>6} | {'方式':<10} | {'建索引(ms)':>10} | {'查询(ms)':>9} | {'召回':>6}")
+    print("-" * 56)
+    for count in args.texts:
+        rng = random.Random(count)
+        texts, names = make_texts(count, rng)
+        targets = [rng.choice(names) for _ in range(args.queries)]
+        lowered = [normalize(text) for text in texts]
+
+        start = time.perf_counter()
+        hits = sum(any(target in text for text in lowered) for target in targets)
+        substring = (time.perf_counter() - start) / len(targets) * 1000
+        print(f"{count:>6} | {'子串匹配':<10} | {'-':>10} | {substring:>9.2f} | {hits / len(targets):>6.0%}")
+
+        baseline_targets = targets[: max(1, len(targets) // 10)]
+        start = time.perf_counter()
+        for target in baseline_targets:
+            [substring_distance(text, target) for text in lowered]
+        baseline = (time.perf_counter() - start) / len(baseline_targets) * 1000
+        print(f"{count:>6} | {'Python 编辑距离':<10} | {'-':>10} | {baseline:>9.2f} | {'-':>6}")
+
+        start = time.perf_counter()
+        matcher = FuzzyMatcher(texts)
+        build = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        hits = sum(bool((matcher.scores(target) > MATCH_THRESHOLD).any()) for target in targets)
+        fuzzy = (time.perf_counter() - start) / len(targets) * 1000
+        print(f"{count:>6} | {'FuzzyMatcher':<10} | {build:>10.1f} | {fuzzy:>9.2f} | {hits / len(targets):>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""输入后端分发延迟基准。
+
+对每个输入后端重复执行一组无副作用的操作（单独按下 Shift / Ctrl、移动鼠标），
+输出每种操作类型的分发耗时。pyautogui 和 xtest 会产生真实输入，需要桌面环境；
+virtual 后端可在无界面环境中运行。
+
+用法:
+    python -m benchmarks.bench_input_backends --backends virtual,pyautogui,xtest --rounds 50
+"""
+
+import argparse
+import time
+
+from src.automation.actions import Action, ActionType
+from src.automation.backends import create_input_backend
+from src.automation.executor import AutomationExecutor
+
+ACTIONS = [
+    Action(type=ActionType.SHORTCUT, parameters={"keys": ["shift"]}, retry=0),
+    Action(type=ActionType.SHORTCUT, parameters={"keys": ["ctrl"]}, retry=0),
+]
+
+
+def run_backend(name: str, rounds: int, pause: float) -> dict[str, dict[str, float]] | None:
+    """在指定后端上执行操作组合，返回分发耗时统计。"""
+    try:
+        backend = create_input_backend(name, pause=pause)
+    except Exception as e:
+        print(f"[跳过] {name}: {e}")
+        return None
+
+    executor = AutomationExecutor(action_delay=pause, backend=backend)
+    x, y = backend.position()
+
+    move_latencies = []
+    for i in range(rounds):
+        for action in ACTIONS:
+            executor.execute(action)
+        start = time.perf_counter()
+        executor.move_to(x + (i % 2), y, duration=0)
+        move_latencies.append(time.perf_counter() - start)
+
+    stats = executor.get_dispatch_stats()
+    ordered = sorted(move_latencies)
+    stats["move"] = {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+    return stats
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="输入后端分发延迟基准")
+    parser.add_argument("--backends", default="virtual", help="后端列表（逗号分隔）")
+    parser.add_argument("--rounds", type=int, default=50, help="每个后端的执行轮数")
+    parser.add_argument("--pause", type=float, default=0.2, help="pyautogui 的全局 PAUSE（秒）")
+    args = parser.parse_args()
+
+    print(f"{'后端':<10} | {'操作':<9} | {'次数':>5} | {'平均(ms)':>9} | {'P95(ms)':>9} | {'最大(ms)':>9}")
+    print("-" * 68)
+    for name in [b for b in args.backends.split(",") if b]:
+        stats = run_backend(name, args.rounds, args.pause)
+        if not stats:
+            continue
+        for action_type, s in stats.items():
+            print(
+                f"{name:<10} | {action_type:<9} | {s['count']:>5} | "
+                f"{s['mean_ms']:>9.3f} | {s['p95_ms']:>9.3f} | {s['max_ms']:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
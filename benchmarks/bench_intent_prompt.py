@@ -0,0 +1,147 @@
+"""意图识别提示词规模基准（使用本地替身服务器，离线运行）。
+
+以 config/intent_definitions.yaml 为基础，补充合成意图（动词 × 对象，如"导出日志文件"）
+把意图目录扩充到 10 / 50 / 200 个，比较：
+
+- full:      提示词包含全部意图（原实现）
+- shortlist: 按本地相似度只包含 top-k 候选意图
+
+统计平均提示词长度（字符）、本地构建耗时（含候选筛选）、候选命中率
+（评估集中期望意图出现在候选中的比例），以及替身服务器上的端到端识别延迟
+（替身服务器按请求体大小增加预填充延迟，模拟长提示词的首字延迟）。
+
+用法:
+    python -m benchmarks.bench_intent_prompt --sizes 10 50 200 --top-k 5 --prefill-ms-per-kb 20
+"""
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import yaml
+
+from benchmarks.llm_stub_server import start_stub_server
+from src.intent.recognizer import IntentRecognizer
+from src.llm import LLMService
+
+VERBS = ["创建", "删除", "导出", "导入", "同步", "归档", "备份", "恢复", "统计", "重命名",
+         "迁移", "清理", "校验", "合并", "拆分", "压缩", "加密", "监控", "回滚", "发布"]
+OBJECTS = ["数据库表", "用户账号", "日志文件", "配置项", "代码分支", "容器镜像", "月度报表", "工单",
+           "接口文档", "缓存数据", "定时任务", "权限角色", "消息队列", "静态资源", "依赖版本",
+           "环境变量", "告警规则", "证书", "域名解析", "测试数据"]
+
+
+def build_catalog(base: dict, size: int) -> dict:
+    """在真实意图定义基础上补充合成意图，返回包含 size 个意图的定义。"""
+    intents = dict(list(base["intents"].items())[:size])
+    for verb in VERBS:
+        for obj in OBJECTS:
+            if len(intents) >= size:
+                return {"intents": intents}
+            intents[f"synthetic_{len(intents)}"] = {
+                "type": "single-system",
+                "description": f"{verb}{obj}（合成意图）",
+                "system": "ide",
+                "examples": [f"{verb}{obj}", f"帮我{verb}一下{obj}"],
+                "parameters": {
+                    "target": {
+                        "type": "string",
+                        "description": f"要{verb}的{obj}名称",
+                        "required": True,
+                        "examples": [f"{obj}A", f"{obj}B"],
+                    }
+                },
+            }
+    return {"intents": intents}
+
+
+def measure(recognizer: IntentRecognizer, samples: list[dict], llm_concurrency: int) -> dict[str, float]:
+    """测量提示词长度、构建耗时、候选命中率和端到端识别延迟。"""
+    sizes = []
+    build_times = []
+    hits = labeled = 0
+    for sample in samples:
+        start = time.perf_counter()
+        prompt = recognizer._build_intent_prompt(sample["message"])
+        build_times.append(time.perf_counter() - start)
+        sizes.append(len(prompt))
+
+        expected = sample.get("intent")
+        if expected:
+            labeled += 1
+            hits += expected in recognizer._select_candidates(sample["message"])
+
+    def recognize(sample: dict) -> float:
+        start = time.perf_counter()
+        recognizer.recognize(sample["message"])
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=llm_concurrency) as pool:
+        latencies = sorted(pool.map(recognize, samples))
+
+    return {
+        "chars": sum(sizes) / len(sizes),
+        "build_us": sum(build_times) / len(build_times) * 1e6,
+        "recall": hits / labeled if labeled else 0.0,
+        "latency_ms": sum(latencies) / len(latencies) * 1000,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+    }
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="意图识别提示词规模基准")
+    parser.add_argument("--definitions", default="config/intent_definitions.yaml", help="意图定义文件")
+    parser.add_argument("--dataset", default="benchmarks/data/intent_eval.yaml", help="评估集（提供消息和期望意图）")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200], help="意图目录规模")
+    parser.add_argument("--top-k", type=int, default=5, help="shortlist 模式的候选意图数")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="替身服务器基础延迟（毫秒）")
+    parser.add_argument("--prefill-ms-per-kb", type=float, default=20.0, help="每 KB 请求体增加的延迟（毫秒）")
+    parser.add_argument("--concurrency", type=int, default=8, help="并发识别数")
+    args = parser.parse_args()
+
+    with open(args.definitions, encoding="utf-8") as f:
+        base = yaml.safe_load(f)
+    with open(args.dataset, encoding="utf-8") as f:
+        samples = yaml.safe_load(f)["samples"]
+
+    server, _ = start_stub_server(
+        latency_ms=args.latency_ms, handshake_ms=0, prefill_ms_per_kb=args.prefill_ms_per_kb
+    )
+    llm = LLMService(
+        api_key="stub",
+        base_url=f"http://127.0.0.1:{server.server_port}",
+        max_connections=args.concurrency,
+        max_in_flight=args.concurrency,
+    )
+
+    print(
+        f"评估消息 {len(samples)} 条，top-k {args.top_k}，基础延迟 {args.latency_ms}ms，"
+        f"预填充 {args.prefill_ms_per_kb}ms/KB"
+    )
+    print(
+        f"{'意图数':>6} | {'方式':<9} | {'提示词(字符)':>12} | {'构建(us)':>9} | {'候选命中率':>10} | "
+        f"{'平均延迟(ms)':>12} | {'P95(ms)':>8}"
+    )
+    print("-" * 92)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = Path(tmp) / f"intents_{size}.yaml"
+            path.write_text(yaml.safe_dump(build_catalog(base, size), allow_unicode=True), encoding="utf-8")
+            for name, top_k in (("full", 0), ("shortlist", args.top_k)):
+                # 关闭缓存和本地分类，每条消息都走 LLM
+                recognizer = IntentRecognizer(str(path), llm_client=llm, cache_size=0, shortlist_size=top_k)
+                result = measure(recognizer, samples, args.concurrency)
+                print(
+                    f"{size:>6} | {name:<9} | {result['chars']:>12.0f} | {result['build_us']:>9.0f} | "
+                    f"{result['recall']:>10.1%} | {result['latency_ms']:>12.0f} | {result['p95_ms']:>8.0f}"
+                )
+
+    llm.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""LLM 连接池基准（使用本地替身服务器，离线运行）。
+
+模拟四个模块（命令解析、视觉定位、意图识别、浏览器自动化）并发调用 LLM，比较：
+
+- per_call: 每次调用新建客户端（无连接复用）
+- separate: 每个模块各自的 ZhipuAI 客户端（原实现）
+- shared:   所有模块共用一个 LLMService（共享连接池 + 每模型并发限制）
+
+用法:
+    python -m benchmarks.bench_llm_pool --requests 200 --concurrency 8 --latency-ms 200 --handshake-ms 80
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from zhipuai import ZhipuAI
+
+from benchmarks.llm_stub_server import start_stub_server
+from src.llm.service import LLMService
+
+MODULES = ("parser", "locator", "intent", "browser")
+MESSAGES = [{"role": "user", "content": "ping"}]
+
+
+def run(make_client, requests: int, concurrency: int) -> list[float]:
+    """并发发送请求，返回每个请求的耗时（秒）。"""
+
+    def call(index: int) -> float:
+        client = make_client(MODULES[index % len(MODULES)])
+        start = time.perf_counter()
+        client.chat.completions.create(model="stub-model", messages=MESSAGES)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(call, range(requests)))
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="LLM 连接池基准")
+    parser.add_argument("--requests", type=int, default=200, help="请求总数")
+    parser.add_argument("--concurrency", type=int, default=8, help="并发线程数")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="替身服务器响应延迟（毫秒）")
+    parser.add_argument("--handshake-ms", type=float, default=80.0, help="新连接握手延迟（毫秒）")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="shared 模式每模型最大并发（默认等于并发数）")
+    args = parser.parse_args()
+
+    server, state = start_stub_server(latency_ms=args.latency_ms, handshake_ms=args.handshake_ms)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    def new_client() -> ZhipuAI:
+        return ZhipuAI(api_key="stub", base_url=base_url, max_retries=0)
+
+    separate_clients = {name: new_client() for name in MODULES}
+    max_in_flight = args.max_in_flight or args.concurrency
+    service = LLMService(api_key="stub", base_url=base_url, max_in_flight=max_in_flight)
+
+    scenarios = {
+        "per_call": lambda module: new_client(),
+        "separate": lambda module: separate_clients[module],
+        "shared": lambda module: service,
+    }
+
+    print(f"请求数 {args.requests}，并发 {args.concurrency}，响应延迟 {args.latency_ms}ms，握手 {args.handshake_ms}ms")
+    print(f"{'方式':<9} | {'总耗时(s)':>9} | {'平均(ms)':>9} | {'P95(ms)':>9} | {'新建连接':>8} | {'服务端峰值并发':>14}")
+    print("-" * 76)
+    for name, make_client in scenarios.items():
+        state.reset()
+        start = time.perf_counter()
+        latencies = sorted(run(make_client, args.requests, args.concurrency))
+        total = time.perf_counter() - start
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(
+            f"{name:<9} | {total:>9.2f} | {sum(latencies) / len(latencies) * 1000:>9.1f} | "
+            f"{p95 * 1000:>9.1f} | {state.connections:>8} | {state.peak_in_flight:>14}"
+        )
+
+    service.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
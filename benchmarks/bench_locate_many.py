@@ -0,0 +1,95 @@
+"""批量定位基准：同一屏幕多个目标逐个定位 vs 一次请求定位（使用本地替身服务器，离线运行）。
+
+替身服务器按请求体大小模拟预填充延迟（截图越大越慢），比较：
+
+- single: 每个目标单独调用 locate（每次重新编码并上传截图）
+- batch:  locate_many 一次请求定位全部目标
+
+用法:
+    python -m benchmarks.bench_locate_many --targets 4 --latency-ms 300 --prefill-ms-per-kb 0.5
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from PIL import Image, ImageDraw
+
+from benchmarks.llm_stub_server import start_stub_server
+from src.llm import LLMService
+from src.locator.visual_locator import VisualLocator
+
+
+def make_screenshot(width: int, height: int) -> Image.Image:
+    """生成带文本和色块的截图（PNG 压缩后体积接近真实界面）。"""
+    image = Image.new("RGB", (width, height), (245, 245, 245))
+    draw = ImageDraw.Draw(image)
+    for row in range(0, height, 22):
+        draw.text((12, row + 4), f"line {row // 22}: def handler_{row}(request, context): return {row}", fill="black")
+        draw.rectangle((width - 200, row + 2, width - 200 + (row * 7) % 180, row + 18), fill=(row % 255, 120, 200))
+    return image
+
+
+def responder(body: dict) -> str:
+    """批量请求按目标编号返回，单目标请求返回一个元素。"""
+    text = json.dumps(body.get("messages", []), ensure_ascii=False)
+    item = {"element_type": "text_field", "description": "目标", "bbox": [100, 40, 300, 60], "confidence": 0.9}
+    if "分别找到" in text:
+        count = text.count("找到目标")
+        return json.dumps({str(index): [item] for index in range(1, count + 1)}, ensure_ascii=False)
+    return json.dumps([item], ensure_ascii=False)
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="批量定位基准")
+    parser.add_argument("--targets", type=int, default=4, help="同一屏幕的目标数")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="替身服务器响应延迟（毫秒）")
+    parser.add_argument("--prefill-ms-per-kb", type=float, default=0.5, help="每 KB 请求体增加的延迟（毫秒）")
+    parser.add_argument("--width", type=int, default=1920, help="截图宽度")
+    parser.add_argument("--height", type=int, default=1080, help="截图高度")
+    parser.add_argument("--rounds", type=int, default=3, help="执行次数（取中位数）")
+    args = parser.parse_args()
+
+    server, state = start_stub_server(
+        latency_ms=args.latency_ms,
+        handshake_ms=0,
+        prefill_ms_per_kb=args.prefill_ms_per_kb,
+        responder=responder,
+    )
+    llm = LLMService(api_key="stub", base_url=f"http://127.0.0.1:{server.server_port}")
+    locator = VisualLocator(api_key="stub", llm_client=llm)
+    screenshot = make_screenshot(args.width, args.height)
+    prompts = [f"找到目标 {index}" for index in range(1, args.targets + 1)]
+
+    def single() -> list:
+        return [locator.locate(prompt, screenshot, use_cache=False, use_ocr_fallback=False) for prompt in prompts]
+
+    def batch() -> list:
+        return locator.locate_many(screenshot, prompts, use_cache=False)
+
+    print(
+        f"截图 {args.width}x{args.height}（PNG {len(locator._encode_image(screenshot)) // 1024} KB base64），"
+        f"{args.targets} 个目标，延迟 {args.latency_ms}ms + {args.prefill_ms_per_kb}ms/KB，{args.rounds} 次取中位数"
+    )
+    print(f"{'方式':<8} | {'耗时(ms)':>9} | {'请求数':>6} | {'上传(KB)':>9}")
+    print("-" * 44)
+    for name, run in (("single", single), ("batch", batch)):
+        timings = []
+        for _ in range(args.rounds):
+            state.reset()
+            start = time.perf_counter()
+            results = run()
+            timings.append((time.perf_counter() - start) * 1000)
+            assert all(len(result) == 1 for result in results)
+        requests = state.requests
+        upload_kb = requests * len(locator._encode_image(screenshot)) // 1024
+        print(f"{name:<8} | {statistics.median(timings):>9.0f} | {requests:>6} | {upload_kb:>9}")
+
+    llm.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
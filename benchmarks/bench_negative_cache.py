@@ -0,0 +1,117 @@
+"""快速失败基准：目标不在屏幕上时，失败步骤重试的耗时（使用本地替身服务器，离线运行）。
+
+工作流步骤定位的目标不存在（如按钮还没出现），步骤按 retry_count 重试。比较：
+
+- 关闭失败结果缓存：每次重试都完整定位一次（视觉 API 返回空结果）
+- 开启失败结果缓存：第一次确认未找到后，屏幕没有变化的重试直接返回
+
+任何变化都会使失败记录失效（避免目标出现后仍返回未找到），因此只有文本光标闪烁、
+状态栏内存指示刷新的屏幕也会重新定位；重试期间弹出对话框时同样重新定位。
+
+用法:
+    python -m benchmarks.bench_negative_cache --latency-ms 1500 --retries 3 --retry-interval 0.5
+"""
+
+import argparse
+import contextlib
+import io
+import time
+from types import SimpleNamespace
+
+from PIL import Image, ImageDraw
+
+from benchmarks.llm_stub_server import start_stub_server
+from src.llm import LLMService
+from src.locator.visual_locator import VisualLocator
+from src.workflow.executor import WorkflowExecutor
+from src.workflow.models import WorkflowConfig, WorkflowStep
+
+
+def make_frame(width: int, height: int, tick: int = 0, dialog: bool = False) -> Image.Image:
+    """生成 IDE 风格截图（tick 控制光标闪烁和状态栏指示，可选弹出对话框）。"""
+    image = Image.new("RGB", (width, height), (43, 43, 43))
+    draw = ImageDraw.Draw(image)
+    for row in range(20, height - 20, 18):
+        draw.text((24, row), f"def handler_{row}(request): return process(request, {row})", fill=(169, 183, 198))
+    if tick % 2:
+        draw.rectangle((640, 300, 641, 317), fill=(255, 255, 255))
+    draw.rectangle((width - 60, height - 14, width - 60 + tick % 8 * 4, height - 6), fill=(120, 120, 120))
+    if dialog:
+        draw.rectangle((width // 3, height // 3, width * 2 // 3, height * 2 // 3), fill=(240, 240, 240))
+    return image
+
+
+class FakeIDE:
+    """只执行视觉定位的控制器替身（每次执行截取一帧，未找到目标时返回失败）。"""
+
+    def __init__(self, locator: VisualLocator, frames: list[Image.Image]) -> None:
+        self.locator = locator
+        self._frames = frames
+        self.attempts = 0
+
+    def execute_command(self, command: str, **kwargs):
+        frame = self._frames[min(self.attempts, len(self._frames) - 1)]
+        self.attempts += 1
+        elements = self.locator.locate("找到运行按钮", frame, target_filter="Run")
+        status = "success" if elements else "failed"
+        return SimpleNamespace(status=SimpleNamespace(value=status), error="未找到目标元素", message="")
+
+
+def run_step(url: str, state, ttl: float, frames: list[Image.Image], retries: int, interval: float):
+    """执行一个会失败的工作流步骤，返回 (步骤结果, 视觉请求次数)。"""
+    requests_before = state.requests
+    llm = LLMService(api_key="stub", base_url=url)
+    locator = VisualLocator(api_key="stub", llm_client=llm, negative_cache_ttl=ttl)
+    ide = FakeIDE(locator, frames)
+    config = WorkflowConfig(
+        name="bench",
+        steps=[WorkflowStep(description="点击运行按钮", retry_count=retries, retry_interval=interval)],
+    )
+    # 只输出汇总表，屏蔽执行器和定位器的逐步输出
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = WorkflowExecutor(ide).execute(config)
+    llm.close()
+    return result.step_results[0], state.requests - requests_before
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="快速失败基准")
+    parser.add_argument("--width", type=int, default=1920, help="截图宽度")
+    parser.add_argument("--height", type=int, default=1080, help="截图高度")
+    parser.add_argument("--latency-ms", type=float, default=1500.0, help="替身服务器延迟（毫秒，模拟一次完整定位）")
+    parser.add_argument("--retries", type=int, default=3, help="步骤重试次数")
+    parser.add_argument("--retry-interval", type=float, default=0.5, help="重试间隔（秒）")
+    args = parser.parse_args()
+
+    server, state = start_stub_server(latency_ms=args.latency_ms, handshake_ms=0, content="[]")
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    attempts = args.retries + 1
+    still = [make_frame(args.width, args.height) for _ in range(attempts)]
+    blinking = [make_frame(args.width, args.height, tick) for tick in range(attempts)]
+    changed = [make_frame(args.width, args.height, tick, dialog=tick >= 2) for tick in range(attempts)]
+    scenarios = [
+        ("屏幕未变化", still),
+        ("光标闪烁、状态栏刷新", blinking),
+        ("重试中弹出对话框", changed),
+    ]
+
+    print(
+        f"截图 {args.width}x{args.height}，单次定位 {args.latency_ms:.0f}ms，"
+        f"重试 {args.retries} 次，间隔 {args.retry_interval}s"
+    )
+    print(f"{'场景':<14} | {'失败缓存':<6} | {'视觉请求':>8} | {'步骤耗时(s)':>11} | {'节省(s)':>8}")
+    print("-" * 64)
+    for name, frames in scenarios:
+        for label, ttl in (("关闭", 0.0), ("开启", 30.0)):
+            start = time.perf_counter()
+            step, requests = run_step(url, state, ttl, frames, args.retries, args.retry_interval)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<14} | {label:<6} | {requests:>8} | {elapsed:>11.2f} | {step.saved_seconds:>8.2f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
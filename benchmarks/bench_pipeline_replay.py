@@ -0,0 +1,161 @@
+"""命令流水线录制/回放基准（离线、可复现）。
+
+完整流水线：意图识别 -> 命令解析 -> 视觉定位，三个模块共用一个 LLM 客户端。
+
+1. record: 对本地替身服务器执行一遍流水线，录制全部请求和响应
+2. 关闭替身服务器（之后不再有任何网络访问），用录制文件回放：
+   - replay/none:      不注入延迟（只测本地开销：提示词构建、图像编码、解析）
+   - replay/recorded:  注入录制时的延迟（复现录制时的端到端耗时）
+   - replay/lognormal: 注入对数正态延迟分布（固定随机种子，长尾可复现）
+
+每种回放都校验结果与录制时完全一致。
+
+用法:
+    python -m benchmarks.bench_pipeline_replay --commands 8 --latency-ms 200 --token-ms 5
+    python -m benchmarks.bench_pipeline_replay --cassette cassettes/pipeline.json --replay-only
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, ImageDraw
+
+from benchmarks.llm_stub_server import start_stub_server
+from src.config.config_manager import ConfigManager
+from src.intent.recognizer import IntentRecognizer
+from src.llm import Cassette, LLMService
+from src.llm.cassette import lognormal_latency
+from src.locator.visual_locator import VisualLocator
+from src.parser.command_parser import CommandParser
+
+COMMANDS = [
+    ("帮我运行一下单元测试", "打开 main.py", "main.py"),
+    ("提交当前的代码修改", "打开 utils.py", "utils.py"),
+    ("在浏览器里搜索 pytest 文档", "打开 config.yaml", "config.yaml"),
+    ("重构这个函数", "打开 README.md", "README.md"),
+]
+
+
+def stub_responder(body: dict) -> str:
+    """按请求类型返回替身内容：图像请求 -> 视觉定位，含 intent_type -> 意图识别，否则命令解析。"""
+    messages = body.get("messages", [])
+    text = json.dumps(messages, ensure_ascii=False)
+    if "image_url" in text:
+        target = next((name for _, _, name in COMMANDS if name in text), "main.py")
+        elements = [
+            {"element_type": "tree", "description": name, "bbox": [20, 100 + i * 24, 180, 120 + i * 24]}
+            for i, (_, _, name) in enumerate(COMMANDS)
+        ]
+        elements.sort(key=lambda element: element["description"] != target)
+        return json.dumps(elements, ensure_ascii=False)
+    if "intent_type" in text:
+        return json.dumps(
+            {"intent_type": "test_code", "confidence": 0.92, "parameters": {}, "reasoning": "替身响应"},
+            ensure_ascii=False,
+        )
+    filename = next((name for _, _, name in COMMANDS if name in text), "")
+    return json.dumps(
+        {"intent": "file", "action": "open_file", "parameters": {"filename": filename}, "confidence": 0.9},
+        ensure_ascii=False,
+    )
+
+
+def make_screenshot(index: int) -> Image.Image:
+    """生成确定性的截图（每条命令一张，内容不同）。"""
+    image = Image.new("RGB", (640, 400), "white")
+    draw = ImageDraw.Draw(image)
+    for row, (_, _, name) in enumerate(COMMANDS):
+        draw.text((24, 104 + row * 24), name, fill="black")
+    draw.rectangle((0, 0, 640, 24), fill=(40 * index % 255, 80, 160))
+    return image
+
+
+def run_pipeline(client: Any, config_manager: ConfigManager, commands: int, stream: bool) -> tuple[list, list[float]]:
+    """执行流水线，返回 (每条命令的结果, 每条命令的耗时毫秒)。"""
+    recognizer = IntentRecognizer("config/intent_definitions.yaml", llm_client=client, cache_size=0, stream=stream)
+    command_parser = CommandParser(config_manager, api_key="", llm_client=client, stream=stream)
+    locator = VisualLocator(api_key="", llm_client=client, stream=stream)
+
+    results, timings = [], []
+    for index in range(commands):
+        message, command_text, target = COMMANDS[index % len(COMMANDS)]
+        screenshot = make_screenshot(index)
+        start = time.perf_counter()
+        intent = recognizer.recognize(message)
+        command = command_parser._parse_with_llm(command_text, {})
+        elements = locator.locate(
+            f"找到文件 {target}", screenshot=screenshot, target_filter=target, use_cache=False, use_ocr_fallback=False
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        results.append(
+            (
+                intent.intent.type if intent.intent else None,
+                command.action,
+                command.parameters.get("filename"),
+                [(element.description, element.bbox) for element in elements],
+            )
+        )
+    return results, timings
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="命令流水线录制/回放基准")
+    parser.add_argument("--commands", type=int, default=8, help="执行的命令条数")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="替身服务器首字延迟（毫秒）")
+    parser.add_argument("--token-ms", type=float, default=5.0, help="替身服务器每块输出的生成延迟（毫秒）")
+    parser.add_argument("--stream", action="store_true", help="流式调用（默认非流式）")
+    parser.add_argument("--cassette", default=None, help="录制文件路径（默认使用临时文件）")
+    parser.add_argument("--replay-only", action="store_true", help="只回放已有录制（不启动替身服务器）")
+    parser.add_argument("--lognormal-median-ms", type=float, default=250.0, help="对数正态延迟中位数（毫秒）")
+    args = parser.parse_args()
+
+    config_manager = ConfigManager()
+    config_manager.load_config("config/main.yaml")
+    path = Path(args.cassette or Path(tempfile.mkdtemp()) / "pipeline.json")
+
+    rows = []
+    expected = None
+    if not args.replay_only:
+        path.unlink(missing_ok=True)
+        server, state = start_stub_server(
+            latency_ms=args.latency_ms, handshake_ms=0, token_ms=args.token_ms, responder=stub_responder
+        )
+        llm = LLMService(api_key="stub", base_url=f"http://127.0.0.1:{server.server_port}")
+        recorder = Cassette(path, mode="record", client=llm)
+        expected, timings = run_pipeline(recorder, config_manager, args.commands, args.stream)
+        rows.append(("record（替身服务器）", timings, state.requests, True))
+        llm.close()
+        # 关闭替身服务器，之后的回放不访问网络
+        server.shutdown()
+        server.server_close()
+
+    replays = [
+        ("replay/none", None),
+        ("replay/recorded", "recorded"),
+        ("replay/lognormal", lognormal_latency(args.lognormal_median_ms, sigma=0.6, seed=7)),
+    ]
+    for name, latency in replays:
+        cassette = Cassette(path, mode="replay", latency=latency)
+        results, timings = run_pipeline(cassette, config_manager, args.commands, args.stream)
+        if expected is None:
+            expected = results
+        rows.append((name, timings, cassette.get_stats()["hits"], results == expected))
+
+    print(f"录制文件 {path}，{args.commands} 条命令（意图识别 + 命令解析 + 视觉定位），stream={args.stream}")
+    print(f"{'模式':<22} | {'总耗时(ms)':>10} | {'中位数(ms)':>10} | {'最大(ms)':>9} | {'LLM 调用':>8} | {'结果一致':>6}")
+    print("-" * 82)
+    for name, timings, calls, same in rows:
+        print(
+            f"{name:<22} | {sum(timings):>10.0f} | {statistics.median(timings):>10.1f} | "
+            f"{max(timings):>9.1f} | {calls:>8} | {'是' if same else '否':>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""指针模式基准：每个工作流在 animated / instant 模式下的输入耗时。
+
+解析 workflows/ 下的工作流，对显式指定了 operation 的步骤，
+用编译后的操作程序在虚拟后端上执行（目标元素使用固定坐标），
+统计模拟耗时 = 执行器等待（就绪等待、操作后等待、wait 操作）+ 后端耗时（动画时长、隐式暂停）。
+不产生真实输入，也不实际等待。
+
+用法:
+    python -m benchmarks.bench_pointer_mode --pause 0.2 --workflows workflows
+"""
+
+import argparse
+import dataclasses
+from pathlib import Path
+from unittest.mock import patch
+
+from src.automation.backends import VirtualBackend
+from src.automation.compiler import ActionCompiler
+from src.automation.executor import AutomationExecutor
+from src.automation.text_input import TextInjector
+from src.config.config_manager import ConfigManager
+from src.models.element import UIElement
+from src.workflow.parser import WorkflowParser
+
+ELEMENT = UIElement(element_type="button", description="目标", bbox=(400, 300, 480, 330), confidence=1.0)
+
+
+def run_workflow(steps, operations, mode: str, pause: float) -> float:
+    """以指定指针模式执行工作流的操作步骤，返回模拟耗时（秒）。"""
+    backend = VirtualBackend(pause=pause)
+    # 文本固定逐字键入，避免读写真实剪贴板
+    injector = TextInjector(mode="type", backend=backend)
+    executor = AutomationExecutor(backend=backend, text_injector=injector, pointer_mode=mode)
+    compiler = ActionCompiler()
+
+    slept = []
+    with patch("src.automation.executor.time.sleep", side_effect=slept.append):
+        for step in steps:
+            op = dataclasses.replace(operations[step.operation], pointer_mode=mode)
+            program = compiler.compile(op, step.parameters)
+            executor.run_program(program, step.parameters, {"0": ELEMENT})
+
+    return sum(slept) + backend.simulated_time
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="指针模式基准")
+    parser.add_argument("--workflows", default="workflows", help="工作流目录")
+    parser.add_argument("--operations", default="config/operations/pycharm.yaml", help="操作配置文件")
+    parser.add_argument("--pause", type=float, default=0.2, help="pyautogui 隐式暂停 PAUSE（秒）")
+    args = parser.parse_args()
+
+    ide_config = ConfigManager().load_ide_config(args.operations)
+    operations = {op.name: op for op in ide_config.operations}
+    workflow_parser = WorkflowParser()
+
+    print(f"{'工作流':<32} | {'步骤':>4} | {'animated(s)':>11} | {'instant(s)':>10} | {'节省(s)':>8} | {'节省':>6}")
+    print("-" * 88)
+    for path in sorted(Path(args.workflows).glob("*.md")):
+        try:
+            workflow = workflow_parser.parse_file(str(path))
+        except Exception:
+            continue
+        steps = [s for s in workflow.steps if s.operation in operations]
+        if not steps:
+            continue
+
+        animated = run_workflow(steps, operations, "animated", args.pause)
+        instant = run_workflow(steps, operations, "instant", args.pause)
+        saved = animated - instant
+        print(
+            f"{path.name:<32} | {len(steps):>4} | {animated:>11.2f} | {instant:>10.2f} | "
+            f"{saved:>8.2f} | {saved / animated:>6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
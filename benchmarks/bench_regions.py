@@ -0,0 +1,116 @@
+"""搜索区域基准：整张截图定位 vs 只在操作配置的区域内定位（使用本地替身服务器，离线运行）。
+
+按 PyCharm 常见布局生成截图（顶部工具栏、左侧项目树、底部终端、中间编辑器），
+对每个操作比较整张截图与区域截图的：
+
+- 像素数（OCR、模板匹配的计算量与之成正比）
+- 视觉 API 上传体积和延迟（替身服务器按请求体大小模拟预填充延迟）
+- 模板匹配耗时（使用 TemplateMatcher，OpenCV）
+
+用法:
+    python -m benchmarks.bench_regions --width 2560 --height 1440 --latency-ms 300 --prefill-ms-per-kb 1.0
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from benchmarks.llm_stub_server import start_stub_server
+from src.config.schema import RegionConfig
+from src.llm import LLMService
+from src.locator.regions import fraction_box
+from src.locator.template_matcher import TemplateMatcher
+from src.locator.visual_locator import VisualLocator
+
+# (操作, 定位方式, 区域)
+OPERATIONS = [
+    ("click_run_button", "template", RegionConfig(x=0.5, y=0.0, width=0.5, height=0.12)),
+    ("select_in_project_tree", "vision", RegionConfig(x=0.0, y=0.05, width=0.22, height=0.75)),
+    ("click_terminal_tab", "vision", RegionConfig(x=0.0, y=0.7, width=1.0, height=0.3)),
+]
+
+
+def make_frame(width: int, height: int) -> Image.Image:
+    """按 PyCharm 布局生成截图。"""
+    image = Image.new("RGB", (width, height), (43, 43, 43))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, width, 40), fill=(60, 63, 65))
+    for index in range(12):
+        draw.rectangle((width - 40 - index * 36, 8, width - 16 - index * 36, 32), fill=(90 + index * 10, 140, 90))
+    tree_right = int(width * 0.22)
+    draw.rectangle((0, 40, tree_right, int(height * 0.7)), fill=(60, 63, 65))
+    for row in range(60, int(height * 0.7), 22):
+        draw.text((24 + (row // 22) % 4 * 16, row), f"module_{row}.py", fill=(200, 200, 200))
+    for row in range(60, int(height * 0.7), 18):
+        draw.text((tree_right + 40, row), f"def handler_{row}(request): return process(request, {row})", fill=(169, 183, 198))
+    draw.rectangle((0, int(height * 0.7), width, height), fill=(30, 30, 30))
+    for row in range(int(height * 0.7) + 30, height, 18):
+        draw.text((12, row), f"$ pytest tests/unit -k case_{row} -q  ... {row % 97} passed", fill=(180, 180, 180))
+    return image
+
+
+def median_ms(func, rounds: int) -> float:
+    """执行多次取耗时中位数（毫秒）。"""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="搜索区域基准")
+    parser.add_argument("--width", type=int, default=2560, help="截图宽度")
+    parser.add_argument("--height", type=int, default=1440, help="截图高度")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="替身服务器基础延迟（毫秒）")
+    parser.add_argument("--prefill-ms-per-kb", type=float, default=1.0, help="每 KB 请求体增加的延迟（毫秒）")
+    parser.add_argument("--rounds", type=int, default=3, help="执行次数（取中位数）")
+    args = parser.parse_args()
+
+    frame = make_frame(args.width, args.height)
+    item = {"element_type": "text", "description": "目标", "bbox": [10, 10, 80, 30], "confidence": 0.9}
+    server, _state = start_stub_server(
+        latency_ms=args.latency_ms,
+        handshake_ms=0,
+        prefill_ms_per_kb=args.prefill_ms_per_kb,
+        content=json.dumps([item], ensure_ascii=False),
+    )
+    llm = LLMService(api_key="stub", base_url=f"http://127.0.0.1:{server.server_port}")
+    locator = VisualLocator(api_key="stub", llm_client=llm)
+
+    template_dir = Path(tempfile.mkdtemp())
+    frame.crop((args.width - 40, 8, args.width - 16, 32)).save(template_dir / "run_button.png")
+    matcher = TemplateMatcher(template_dir=str(template_dir))
+
+    print(
+        f"截图 {args.width}x{args.height}，视觉延迟 {args.latency_ms}ms + {args.prefill_ms_per_kb}ms/KB，"
+        f"{args.rounds} 次取中位数"
+    )
+    print(f"{'操作':<24} | {'范围':<6} | {'像素(万)':>8} | {'上传(KB)':>8} | {'耗时(ms)':>8}")
+    print("-" * 68)
+    for name, method, region in OPERATIONS:
+        box = fraction_box(region, frame.size)
+        for scope, image in (("full", frame), ("region", frame.crop(box))):
+            upload = "-"
+            if method == "template":
+                elapsed = median_ms(lambda: matcher.match(image, "run_button.png"), args.rounds)
+            else:
+                upload = len(locator._encode_image(image)) // 1024
+                elapsed = median_ms(
+                    lambda: locator.locate(f"找到 {name}", image, use_cache=False, use_ocr_fallback=False), args.rounds
+                )
+            print(f"{name:<24} | {scope:<6} | {image.width * image.height / 10000:>8.0f} | {upload:>8} | {elapsed:>8.0f}")
+
+    llm.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
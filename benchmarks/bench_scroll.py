@@ -0,0 +1,130 @@
+"""滚动查找基准：到达长页面底部目标所需的时间。
+
+在合成长页面（虚拟后端 + 按滚动事件裁剪的视口截图）上比较两种方式：
+
+- legacy: 外部循环，每步 distance 次 scroll(±300)（每次后 sleep 0.1 秒），然后完整视觉定位一次
+- engine: ScrollEngine.scroll_until_visible，每步一个聚合滚轮事件，帧差异判断页面尽头，OCR 索引查找目标
+
+等待、视觉定位和 OCR 的耗时按参数计入模拟时间（不实际等待），
+帧截取、帧差异和索引查询按实际计算耗时统计。
+
+用法:
+    python -m benchmarks.bench_scroll --page-height 20000 --locate-latency 1.5 --ocr-latency 0.25
+"""
+
+import argparse
+import time
+
+import numpy as np
+from PIL import Image
+
+from src.automation.backends import VirtualBackend
+from src.browser.scroll import SCROLL_CLICKS_PER_UNIT, ScrollEngine
+from src.locator.ocr_index import OCRIndex
+from src.models.element import UIElement
+
+VIEWPORT = (1280, 720)
+LINE_HEIGHT = 40
+# 旧实现每个滚轮事件后的等待（秒）
+LEGACY_SCROLL_SLEEP = 0.1
+
+
+class SyntheticPage:
+    """合成长页面：每 LINE_HEIGHT 像素一行文本，最后一行为目标。"""
+
+    def __init__(self, height: int, target: str) -> None:
+        rng = np.random.default_rng(0)
+        pixels = rng.integers(0, 255, size=(height, VIEWPORT[0] // 4, 3), dtype=np.uint8)
+        self.image = Image.fromarray(pixels).resize((VIEWPORT[0], height), Image.NEAREST)
+        self.lines = [(y, f"第 {y // LINE_HEIGHT} 行") for y in range(0, height - LINE_HEIGHT, LINE_HEIGHT)]
+        self.lines[-1] = (self.lines[-1][0], target)
+        self.backend = VirtualBackend()
+
+    @property
+    def offset(self) -> int:
+        scrolled = -sum(e.args["clicks"] for e in self.backend.events if e.kind == "scroll")
+        return max(0, min(scrolled, self.image.height - VIEWPORT[1]))
+
+    def capture(self) -> Image.Image:
+        return self.image.crop((0, self.offset, VIEWPORT[0], self.offset + VIEWPORT[1]))
+
+    def visible_lines(self) -> list[tuple[int, str]]:
+        top = self.offset
+        return [(y - top, text) for y, text in self.lines if top <= y < top + VIEWPORT[1] - LINE_HEIGHT]
+
+    def ocr_reader(self, image: np.ndarray) -> list:
+        return [
+            ([[20, y], [300, y], [300, y + 30], [20, y + 30]], text, 0.9)
+            for y, text in self.visible_lines()
+        ]
+
+    def locate(self, text: str) -> list[UIElement]:
+        return [
+            UIElement("text", text, (20, y, 300, y + 30), 0.9)
+            for y, line in self.visible_lines()
+            if text in line
+        ]
+
+
+def run_legacy(page: SyntheticPage, target: str, step: int, args) -> dict:
+    """外部循环：逐次滚动 + 完整视觉定位。"""
+    simulated = 0.0
+    locates = 0
+    start = time.perf_counter()
+    for steps in range(args.max_steps + 1):
+        page.capture()
+        locates += 1
+        simulated += args.locate_latency
+        if page.locate(target):
+            break
+        for _ in range(step):
+            page.backend.scroll(-SCROLL_CLICKS_PER_UNIT)
+            simulated += LEGACY_SCROLL_SLEEP
+        simulated += args.settle
+    compute = time.perf_counter() - start
+    return {"steps": steps, "events": len(page.backend.events), "lookups": locates,
+            "compute": compute, "total": compute + simulated}
+
+
+def run_engine(page: SyntheticPage, target: str, step: int, args) -> dict:
+    """ScrollEngine：聚合滚轮事件 + 帧差异 + OCR 索引。"""
+    index = OCRIndex(reader=page.ocr_reader)
+    engine = ScrollEngine(page.backend, page.capture, finder=index.find, settle_delay=0)
+
+    start = time.perf_counter()
+    element = engine.scroll_until_visible(target, step=step, max_steps=args.max_steps)
+    compute = time.perf_counter() - start
+
+    steps = len(page.backend.events)
+    simulated = steps * args.settle + index.ocr_runs * args.ocr_latency
+    if element is None:
+        print("[警告] engine 未找到目标")
+    return {"steps": steps, "events": steps, "lookups": index.ocr_runs,
+            "compute": compute, "total": compute + simulated}
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="滚动查找基准")
+    parser.add_argument("--page-height", type=int, default=20000, help="页面高度（像素）")
+    parser.add_argument("--step", type=int, default=3, help="每步滚动单位数")
+    parser.add_argument("--max-steps", type=int, default=200, help="最大滚动步数")
+    parser.add_argument("--settle", type=float, default=0.3, help="每步滚动后等待渲染的时间（秒）")
+    parser.add_argument("--locate-latency", type=float, default=1.5, help="一次视觉定位耗时（秒）")
+    parser.add_argument("--ocr-latency", type=float, default=0.25, help="一次 OCR 耗时（秒）")
+    args = parser.parse_args()
+
+    target = "页面底部目标"
+    print(f"页面高度 {args.page_height}px，视口 {VIEWPORT[0]}x{VIEWPORT[1]}，每步 {args.step} 单位")
+    print(f"{'方式':<8} | {'步数':>5} | {'滚轮事件':>8} | {'定位/OCR':>8} | {'计算(ms)':>9} | {'总耗时(s)':>9}")
+    print("-" * 64)
+    for name, runner in (("legacy", run_legacy), ("engine", run_engine)):
+        r = runner(SyntheticPage(args.page_height, target), target, args.step, args)
+        print(
+            f"{name:<8} | {r['steps']:>5} | {r['events']:>8} | {r['lookups']:>8} | "
+            f"{r['compute'] * 1000:>9.1f} | {r['total']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
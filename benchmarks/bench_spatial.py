@@ -0,0 +1,100 @@
+"""空间索引基准：按位置关系、包含和重叠查询元素的耗时（离线运行）。
+
+在一帧 IDE 截图大小的范围内生成若干元素（文本块、输入框、按钮），比较：
+
+- 逐个元素用 Python 循环判断（基线）
+- 空间索引查询（网格 + NumPy 边界框数组）
+
+用法:
+    python -m benchmarks.bench_spatial --elements 500 2000 5000 --queries 2000
+"""
+
+import argparse
+import random
+import time
+
+from src.locator.spatial import LATERAL_WEIGHT, SpatialIndex
+from src.models.element import UIElement
+
+
+def make_elements(count: int, width: int, height: int, seed: int = 0) -> list[UIElement]:
+    """生成随机分布的 UI 元素。"""
+    rng = random.Random(seed)
+    kinds = [("ocr_text", 40, 120, 12, 18), ("text_field", 120, 360, 20, 28), ("button", 40, 90, 20, 28)]
+    elements = []
+    for i in range(count):
+        kind, min_w, max_w, min_h, max_h = rng.choice(kinds)
+        w, h = rng.randint(min_w, max_w), rng.randint(min_h, max_h)
+        x, y = rng.randint(0, width - w), rng.randint(0, height - h)
+        elements.append(UIElement(kind, f"{kind}_{i}", (x, y, x + w, y + h), 0.9))
+    return elements
+
+
+def linear_nearest_below(elements: list[UIElement], anchor: tuple[int, int, int, int]) -> UIElement | None:
+    """基线：逐个元素计算“下方”距离。"""
+    best, best_score = None, None
+    for element in elements:
+        x1, y1, x2, _ = element.bbox
+        gap = y1 - anchor[3]
+        if gap < -4:
+            continue
+        lateral = max(0, x1 - anchor[2], anchor[0] - x2)
+        score = max(gap, 0) + LATERAL_WEIGHT * lateral
+        if best_score is None or score < best_score:
+            best, best_score = element, score
+    return best
+
+
+def linear_containing(elements: list[UIElement], point: tuple[int, int]) -> list[UIElement]:
+    """基线：逐个元素判断是否包含点。"""
+    x, y = point
+    return [e for e in elements if e.bbox[0] <= x < e.bbox[2] and e.bbox[1] <= y < e.bbox[3]]
+
+
+def timed(func, args_list: list) -> float:
+    """平均每次调用耗时（微秒）。"""
+    start = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter() - start) / len(args_list) * 1e6
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="空间索引基准")
+    parser.add_argument("--width", type=int, default=1920, help="截图宽度")
+    parser.add_argument("--height", type=int, default=1080, help="截图高度")
+    parser.add_argument("--elements", type=int, nargs="+", default=[100, 1000, 5000], help="元素数量")
+    parser.add_argument("--queries", type=int, default=2000, help="每种查询的次数")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    print(f"截图 {args.width}x{args.height}，每种查询 {args.queries} 次，单位微秒/次")
+    print(f"{'元素数':>6} | {'建索引':>8} | {'查询':<6} | {'Python 循环':>11} | {'空间索引':>8} | {'加速':>6}")
+    print("-" * 62)
+    for count in args.elements:
+        elements = make_elements(count, args.width, args.height)
+        start = time.perf_counter()
+        index = SpatialIndex(elements)
+        build = (time.perf_counter() - start) * 1e6
+
+        anchors = [elements[rng.randrange(count)].bbox for _ in range(args.queries)]
+        points = [(rng.randrange(args.width), rng.randrange(args.height)) for _ in range(args.queries)]
+        cases = [
+            ("下方", linear_nearest_below, lambda a: index.nearest(a, "下方"), anchors),
+            ("包含", linear_containing, index.containing, points),
+        ]
+        for name, baseline, query, inputs in cases:
+            # 两种方式结果一致（包含查询的顺序不同）
+            for x in inputs[:20]:
+                expected, actual = baseline(elements, x), query(x)
+                assert (sorted(map(id, expected)) == sorted(map(id, actual))) if name == "包含" else expected is actual
+            slow = timed(lambda x: baseline(elements, x), [(x,) for x in inputs])
+            fast = timed(query, [(x,) for x in inputs])
+            print(f"{count:>6} | {build:>8.0f} | {name:<6} | {slow:>11.1f} | {fast:>8.1f} | {slow / fast:>5.1f}x")
+        overlap = timed(index.overlapping, [(a,) for a in anchors])
+        print(f"{count:>6} | {build:>8.0f} | {'重叠':<6} | {'-':>11} | {overlap:>8.1f} | {'-':>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""流式增量解码基准：首个可用结果耗时（使用本地替身服务器，离线运行）。
+
+替身服务器按输出长度模拟生成延迟（每 chunk_chars 个字符等待 token_ms），比较：
+
+- full:   等待完整响应后 json.loads（原实现）
+- stream: 流式增量解码，拿到所需字段/目标元素后停止读取
+
+场景：
+
+- 意图识别：拿到 intent_type / confidence / parameters 即可用，不必等待末尾的 reasoning
+- 命令解析：四个字段都需要，只能省掉结尾
+- 视觉定位：返回多个元素，目标元素排在第 --target-index 个
+
+用法:
+    python -m benchmarks.bench_stream_decode --token-ms 20 --rounds 5
+"""
+
+import argparse
+import json
+import statistics
+import time
+from collections.abc import Callable
+
+from PIL import Image
+
+from benchmarks.llm_stub_server import start_stub_server
+from src.config.config_manager import ConfigManager
+from src.intent.recognizer import IntentRecognizer
+from src.llm import LLMService
+from src.locator.visual_locator import VisualLocator
+from src.parser.command_parser import CommandParser
+
+INTENT_CONTENT = json.dumps(
+    {
+        "intent_type": "test_code",
+        "confidence": 0.95,
+        "parameters": {"test_type": "unit"},
+        "reasoning": "用户明确要求运行单元测试，消息中包含“运行”和“单元测试”关键词，"
+        "与 test_code 意图的描述和示例高度一致，测试类型参数为 unit。",
+    },
+    ensure_ascii=False,
+    indent=2,
+)
+
+COMMAND_CONTENT = json.dumps(
+    {"intent": "file", "action": "open_file", "parameters": {"filename": "main.py"}, "confidence": 0.9},
+    ensure_ascii=False,
+)
+
+
+def vision_content(count: int, target_index: int) -> str:
+    """构建视觉定位响应：count 个元素，目标 main.py 排在第 target_index 个（从 1 开始）。"""
+    elements = []
+    for index in range(1, count + 1):
+        name = "main.py" if index == target_index else f"module_{index}.py"
+        elements.append(
+            {
+                "element_type": "tree",
+                "description": name,
+                "bbox": [20, 100 + index * 24, 180, 120 + index * 24],
+                "confidence": 0.9,
+            }
+        )
+    # 模型常见输出：代码块包裹 + 缩进
+    return "```json\n" + json.dumps(elements, ensure_ascii=False, indent=2) + "\n```"
+
+
+def measure(func: Callable[[], object], expected: object, rounds: int) -> float:
+    """多次执行并校验结果，返回耗时中位数（毫秒）。"""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+        if result != expected:
+            raise RuntimeError(f"结果不符合预期: {result!r} != {expected!r}")
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="流式增量解码基准")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="首字延迟（毫秒）")
+    parser.add_argument("--token-ms", type=float, default=20.0, help="每块输出的生成延迟（毫秒）")
+    parser.add_argument("--chunk-chars", type=int, default=4, help="每块输出的字符数")
+    parser.add_argument("--elements", type=int, default=12, help="视觉定位响应中的元素数")
+    parser.add_argument("--target-index", type=int, default=3, help="目标元素在响应中的位置（从 1 开始）")
+    parser.add_argument("--rounds", type=int, default=5, help="每种方式的执行次数（取中位数）")
+    args = parser.parse_args()
+
+    screenshot = Image.new("RGB", (64, 64), "white")
+    config_manager = ConfigManager()
+    config_manager.load_config("config/main.yaml")
+    intent_message = "帮我运行一下单元测试"
+    scenarios = [
+        ("意图识别", INTENT_CONTENT),
+        ("命令解析", COMMAND_CONTENT),
+        ("视觉定位（目标）", vision_content(args.elements, args.target_index)),
+        ("视觉定位（首个）", vision_content(args.elements, args.target_index)),
+    ]
+
+    print(
+        f"首字延迟 {args.latency_ms}ms，每 {args.chunk_chars} 字符 {args.token_ms}ms，"
+        f"视觉响应 {args.elements} 个元素（目标第 {args.target_index} 个），每项 {args.rounds} 次取中位数"
+    )
+    print(f"{'场景':<14} | {'输出(字符)':>10} | {'full(ms)':>9} | {'stream(ms)':>10} | {'节省':>6} | {'服务端中止':>8}")
+    print("-" * 75)
+
+    for name, content in scenarios:
+        server, state = start_stub_server(
+            latency_ms=args.latency_ms,
+            handshake_ms=0,
+            content=content,
+            token_ms=args.token_ms,
+            chunk_chars=args.chunk_chars,
+        )
+        llm = LLMService(api_key="stub", base_url=f"http://127.0.0.1:{server.server_port}")
+
+        timings = {}
+        for stream in (False, True):
+            if name == "意图识别":
+                recognizer = IntentRecognizer(
+                    "config/intent_definitions.yaml", llm_client=llm, cache_size=0, stream=stream
+                )
+
+                expected = "test_code"
+
+                def run() -> object:
+                    return recognizer.recognize(intent_message).intent.type
+
+            elif name == "命令解析":
+                command_parser = CommandParser(config_manager, api_key="stub", llm_client=llm, stream=stream)
+                expected = ("open_file", 0.9)
+
+                def run() -> object:
+                    command = command_parser._parse_with_llm("打开 main.py", {})
+                    return command.action, command.confidence
+
+            else:
+                locator = VisualLocator(api_key="stub", llm_client=llm, stream=stream)
+                if name == "视觉定位（目标）":
+
+                    def stop_when(found: list) -> bool:
+                        return locator._calculate_match_score(found[-1].description, "main.py") >= 1.0
+
+                    expected = "main.py"
+                else:
+
+                    def stop_when(found: list) -> bool:
+                        return True
+
+                    expected = "module_1.py" if args.target_index != 1 else "main.py"
+
+                def run() -> object:
+                    found = locator._locate_with_vision(screenshot, "找到 main.py", stop_when)
+                    return next((element.description for element in found if stop_when([element])), None)
+
+            state.reset()
+            timings[stream] = measure(run, expected, args.rounds)
+            if stream:
+                # 服务端在下一次写入时才发现连接已关闭
+                time.sleep(args.token_ms * 3 / 1000)
+                cancelled = state.cancelled
+
+        saving = 1 - timings[True] / timings[False]
+        print(
+            f"{name:<14} | {len(content):>10} | {timings[False]:>9.0f} | {timings[True]:>10.0f} | "
+            f"{saving:>6.0%} | {cancelled:>8}"
+        )
+        llm.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
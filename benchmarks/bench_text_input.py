@@ -0,0 +1,67 @@
+"""文本输入基准：逐字键入 vs 剪贴板粘贴。
+
+运行前请打开一个空白的编辑器窗口（例如 PyCharm 的 scratch 文件），
+脚本启动后在倒计时内将焦点切换到该窗口。每轮输入结束后会全选并删除。
+
+用法:
+    python -m benchmarks.bench_text_input --lengths 10,50,200,500 --interval 0.1
+    python -m benchmarks.bench_text_input --backend xtest
+"""
+
+import argparse
+import string
+import time
+
+from src.automation.backends import InputBackend, create_input_backend
+from src.automation.text_input import TextInjector
+
+
+def make_text(length: int) -> str:
+    """生成指定长度的 ASCII 测试文本。"""
+    alphabet = string.ascii_letters + string.digits + " "
+    return "".join(alphabet[i % len(alphabet)] for i in range(length))
+
+
+def clear_field(backend: InputBackend) -> None:
+    """清空当前输入区域。"""
+    backend.hotkey("ctrl", "a")
+    backend.press("backspace")
+    time.sleep(0.2)
+
+
+def measure(injector: TextInjector, text: str, interval: float, mode: str) -> float:
+    """测量单次输入耗时（秒）。"""
+    start = time.perf_counter()
+    injector.inject(text, interval=interval, mode=mode)
+    elapsed = time.perf_counter() - start
+    clear_field(injector.backend)
+    return elapsed
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="文本输入基准测试")
+    parser.add_argument("--lengths", default="10,50,200,500", help="文本长度列表（逗号分隔）")
+    parser.add_argument("--interval", type=float, default=0.1, help="键入模式的按键间隔（秒）")
+    parser.add_argument("--countdown", type=int, default=5, help="开始前的倒计时（秒）")
+    parser.add_argument("--backend", default="pyautogui", help="输入后端（pyautogui / xtest）")
+    args = parser.parse_args()
+
+    lengths = [int(x) for x in args.lengths.split(",") if x]
+    injector = TextInjector(backend=create_input_backend(args.backend))
+
+    print(f"请在 {args.countdown} 秒内切换到空白编辑器窗口...")
+    time.sleep(args.countdown)
+
+    print(f"{'长度':>6} | {'键入(s)':>9} | {'粘贴(s)':>9} | {'加速比':>7}")
+    print("-" * 42)
+    for length in lengths:
+        text = make_text(length)
+        typed = measure(injector, text, args.interval, "type")
+        pasted = measure(injector, text, args.interval, "paste")
+        speedup = typed / pasted if pasted > 0 else float("inf")
+        print(f"{length:>6} | {typed:>9.3f} | {pasted:>9.3f} | {speedup:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
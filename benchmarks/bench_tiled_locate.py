@@ -0,0 +1,145 @@
+"""分块定位基准：多显示器虚拟屏幕整图上传 vs 按显示器分块（使用本地替身服务器，离线运行）。
+
+替身服务器模拟视觉模型的内部缩放：图像长边超过 --model-max-side 时先缩小，
+目标标签（截图中的红色文字块）缩小后的高度越小越难辨认：
+缩放后高度 >= --readable-px 时必定识别，低于一半时必定识别失败，中间线性过渡。
+识别成功返回标签的边界框，失败返回一个干扰元素。
+
+比较 2 / 3 显示器下：
+
+- single: 整个虚拟屏幕作为一张图上传
+- tiled:  按显示器分块并发识别，某块找到目标后不再等待其他块
+
+延迟 = --latency-ms + 请求体大小 * --prefill-ms-per-kb。命中：返回的最佳元素中心落在目标标签内。
+
+用法:
+    python -m benchmarks.bench_tiled_locate --rounds 20 --label-px 14 --readable-px 10
+"""
+
+import argparse
+import base64
+import json
+import random
+import statistics
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from benchmarks.llm_stub_server import start_stub_server
+from src.llm import LLMService
+from src.locator.visual_locator import VisualLocator
+
+MONITOR_SIZE = (1920, 1080)
+
+
+def make_monitors(count: int) -> list[dict]:
+    """构建 mss 格式的显示器列表（水平排列）。"""
+    width, height = MONITOR_SIZE
+    monitors = [{"left": 0, "top": 0, "width": width * count, "height": height}]
+    monitors += [{"left": width * i, "top": 0, "width": width, "height": height} for i in range(count)]
+    return monitors
+
+
+def make_frame(count: int, target: tuple[int, int, int, int], seed: int) -> Image.Image:
+    """生成虚拟屏幕截图：灰色代码行 + 红色目标标签。"""
+    rng = random.Random(seed)
+    width, height = MONITOR_SIZE
+    image = Image.new("RGB", (width * count, height), (250, 250, 250))
+    draw = ImageDraw.Draw(image)
+    for y in range(8, height, 18):
+        for x in range(0, width * count, width):
+            draw.rectangle((x + 40, y, x + 40 + rng.randint(200, 900), y + 8), fill=(120, 120, 120))
+    draw.rectangle(target, fill=(255, 0, 0))
+    return image
+
+
+def make_responder(model_max_side: int, readable_px: float, seed: int):
+    """构建模拟视觉模型缩放的响应函数。"""
+    rng = random.Random(seed)
+
+    def respond(body: dict) -> str:
+        url = body["messages"][0]["content"][0]["image_url"]["url"]
+        image = Image.open(BytesIO(base64.b64decode(url.split(",")[-1]))).convert("RGB")
+        scale = min(1.0, model_max_side / max(image.size))
+        pixels = np.asarray(image)
+        red = (pixels[:, :, 0] == 255) & (pixels[:, :, 1] == 0) & (pixels[:, :, 2] == 0)
+        decoy = {"element_type": "text", "description": "code_line", "bbox": [40, 8, 400, 16], "confidence": 0.5}
+        if not red.any():
+            return json.dumps([decoy])
+        ys, xs = np.nonzero(red)
+        bbox = [int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1]
+        visible = (bbox[3] - bbox[1]) * scale
+        probability = min(1.0, max(0.0, (visible - readable_px / 2) / (readable_px / 2)))
+        if rng.random() < probability:
+            return json.dumps([{"element_type": "text", "description": "target.py", "bbox": bbox, "confidence": 0.92}])
+        return json.dumps([decoy])
+
+    return respond
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="分块定位基准")
+    parser.add_argument("--rounds", type=int, default=20, help="每种配置的定位次数")
+    parser.add_argument("--label-px", type=int, default=14, help="目标标签高度（像素）")
+    parser.add_argument("--readable-px", type=float, default=10.0, help="模型缩放后可辨认的标签高度（像素）")
+    parser.add_argument("--model-max-side", type=int, default=1920, help="模型内部缩放后的长边上限")
+    parser.add_argument("--latency-ms", type=float, default=400.0, help="替身服务器基础延迟（毫秒）")
+    parser.add_argument("--prefill-ms-per-kb", type=float, default=1.0, help="每 KB 请求体增加的延迟（毫秒）")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子")
+    args = parser.parse_args()
+
+    print(
+        f"显示器 {MONITOR_SIZE[0]}x{MONITOR_SIZE[1]}，标签高 {args.label_px}px，模型长边上限 {args.model_max_side}px，"
+        f"可辨认 {args.readable_px}px，每项 {args.rounds} 次"
+    )
+    print(f"{'显示器':>6} | {'方式':<7} | {'中位数(ms)':>10} | {'P90(ms)':>8} | {'命中率':>6} | {'请求数':>6}")
+    print("-" * 60)
+
+    for count in (2, 3):
+        monitors = make_monitors(count)
+        capture = type("Capture", (), {"get_monitors": staticmethod(lambda monitors=monitors: monitors)})()
+        for tiling in (False, True):
+            server, state = start_stub_server(
+                latency_ms=args.latency_ms,
+                handshake_ms=0,
+                prefill_ms_per_kb=args.prefill_ms_per_kb,
+                responder=make_responder(args.model_max_side, args.readable_px, args.seed),
+            )
+            llm = LLMService(api_key="stub", base_url=f"http://127.0.0.1:{server.server_port}", max_in_flight=4)
+            locator = VisualLocator(
+                api_key="stub", llm_client=llm, screenshot_capture=capture, tiling=tiling, stream=False
+            )
+
+            rng = random.Random(args.seed)
+            timings, hits = [], 0
+            for round_index in range(args.rounds):
+                x = rng.randint(0, MONITOR_SIZE[0] * count - 200)
+                y = rng.randint(50, MONITOR_SIZE[1] - 50)
+                target = (x, y, x + 120, y + args.label_px)
+                frame = make_frame(count, target, round_index)
+
+                start = time.perf_counter()
+                found = locator.locate(
+                    "找到文件 target.py", screenshot=frame, target_filter="target.py", use_cache=False, use_ocr_fallback=False
+                )
+                timings.append((time.perf_counter() - start) * 1000)
+                if found:
+                    cx, cy = found[0].center
+                    hits += target[0] <= cx <= target[2] and target[1] <= cy <= target[3]
+
+            timings.sort()
+            p90 = timings[min(len(timings) - 1, int(len(timings) * 0.9))]
+            name = "tiled" if tiling else "single"
+            print(
+                f"{count:>6} | {name:<7} | {statistics.median(timings):>10.0f} | {p90:>8.0f} | "
+                f"{hits / args.rounds:>6.0%} | {state.requests:>6}"
+            )
+            llm.close()
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
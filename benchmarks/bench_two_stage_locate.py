@@ -0,0 +1,126 @@
+"""两阶段定位基准：整图单次定位 vs 粗定位 + 原始分辨率裁剪精确定位（使用本地替身服务器，离线运行）。
+
+替身服务器模拟视觉模型的坐标误差：模型以归一化坐标输出，误差与输入图像尺寸成正比，
+返回的边界框每个坐标加上标准差为 --noise * 图像长边的高斯噪声。
+
+比较：
+
+- single:    整张截图单次定位
+- two-stage: 缩小到 --coarse-max-side 的截图粗定位，再裁剪粗定位区域精确定位
+
+延迟 = --latency-ms + 请求体大小 * --prefill-ms-per-kb。误差：返回边界框中心到目标中心的距离。
+
+用法:
+    python -m benchmarks.bench_two_stage_locate --rounds 30 --noise 0.01
+"""
+
+import argparse
+import base64
+import json
+import random
+import statistics
+import threading
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from benchmarks.llm_stub_server import start_stub_server
+from src.llm import LLMService
+from src.locator.tiling import box_overlap
+from src.locator.visual_locator import VisualLocator
+
+
+def make_frame(width: int, height: int, target: tuple[int, int, int, int], seed: int) -> Image.Image:
+    """生成截图：灰色代码行 + 红色目标标签。"""
+    rng = random.Random(seed)
+    image = Image.new("RGB", (width, height), (250, 250, 250))
+    draw = ImageDraw.Draw(image)
+    for y in range(8, height, 18):
+        draw.rectangle((40, y, 40 + rng.randint(200, width // 2), y + 8), fill=(120, 120, 120))
+    draw.rectangle((target[0], target[1], target[2] - 1, target[3] - 1), fill=(255, 0, 0))
+    return image
+
+
+def make_responder(noise: float, seed: int):
+    """构建模拟视觉模型坐标误差的响应函数。"""
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def respond(body: dict) -> str:
+        url = body["messages"][0]["content"][0]["image_url"]["url"]
+        image = Image.open(BytesIO(base64.b64decode(url.split(",")[-1]))).convert("RGB")
+        pixels = np.asarray(image).astype(int)
+        red = (pixels[:, :, 0] > 200) & (pixels[:, :, 1] < 80) & (pixels[:, :, 2] < 80)
+        if not red.any():
+            return "[]"
+        ys, xs = np.nonzero(red)
+        sigma = noise * max(image.size)
+        with lock:
+            jitter = [rng.gauss(0, sigma) for _ in range(4)]
+        bbox = [xs.min(), ys.min(), xs.max() + 1, ys.max() + 1]
+        bbox = [int(round(value + delta)) for value, delta in zip(bbox, jitter)]
+        return json.dumps([{"element_type": "text", "description": "target.py", "bbox": bbox, "confidence": 0.9}])
+
+    return respond
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="两阶段定位基准")
+    parser.add_argument("--rounds", type=int, default=30, help="每种方式的定位次数")
+    parser.add_argument("--width", type=int, default=2560, help="截图宽度")
+    parser.add_argument("--height", type=int, default=1440, help="截图高度")
+    parser.add_argument("--noise", type=float, default=0.01, help="坐标误差标准差（占图像长边的比例）")
+    parser.add_argument("--coarse-max-side", type=int, default=1024, help="粗定位截图长边")
+    parser.add_argument("--latency-ms", type=float, default=400.0, help="替身服务器基础延迟（毫秒）")
+    parser.add_argument("--prefill-ms-per-kb", type=float, default=1.0, help="每 KB 请求体增加的延迟（毫秒）")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子")
+    args = parser.parse_args()
+
+    print(
+        f"截图 {args.width}x{args.height}，坐标误差 σ={args.noise:.1%} 图像长边，粗定位长边 {args.coarse_max_side}px，"
+        f"延迟 {args.latency_ms}ms + {args.prefill_ms_per_kb}ms/KB，每项 {args.rounds} 次"
+    )
+    print(f"{'方式':<10} | {'中位数(ms)':>10} | {'中心误差(px)':>12} | {'P90误差(px)':>11} | {'平均IoU':>7} | {'请求数':>6}")
+    print("-" * 74)
+
+    for name, refine in (("single", False), ("two-stage", True)):
+        server, state = start_stub_server(
+            latency_ms=args.latency_ms,
+            handshake_ms=0,
+            prefill_ms_per_kb=args.prefill_ms_per_kb,
+            responder=make_responder(args.noise, args.seed),
+        )
+        llm = LLMService(api_key="stub", base_url=f"http://127.0.0.1:{server.server_port}")
+        locator = VisualLocator(api_key="stub", llm_client=llm, refine=refine, coarse_max_side=args.coarse_max_side)
+
+        rng = random.Random(args.seed)
+        timings, errors, ious = [], [], []
+        for round_index in range(args.rounds):
+            x = rng.randint(0, args.width - 200)
+            y = rng.randint(0, args.height - 30)
+            target = (x, y, x + 120, y + 16)
+            frame = make_frame(args.width, args.height, target, round_index)
+
+            start = time.perf_counter()
+            found = locator.locate("找到文件 target.py", screenshot=frame, use_cache=False, use_ocr_fallback=False)
+            timings.append((time.perf_counter() - start) * 1000)
+            if found:
+                cx, cy = found[0].center
+                errors.append(((cx - (target[0] + target[2]) / 2) ** 2 + (cy - (target[1] + target[3]) / 2) ** 2) ** 0.5)
+                ious.append(box_overlap(found[0].bbox, target)[0])
+
+        errors.sort()
+        p90 = errors[min(len(errors) - 1, int(len(errors) * 0.9))] if errors else float("nan")
+        print(
+            f"{name:<10} | {statistics.median(timings):>10.0f} | {statistics.mean(errors):>12.1f} | {p90:>11.1f} | "
+            f"{statistics.mean(ious):>7.2f} | {state.requests:>6}"
+        )
+        llm.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
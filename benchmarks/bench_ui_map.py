@@ -0,0 +1,145 @@
+"""界面地图基准：从地图查找目标 + 小范围校验的耗时，以及建图线程的 CPU 占比和让出延迟（离线运行）。
+
+模拟一张 1920x1080 的 IDE 截图（文件树、编辑区中大量文本标签），地图按真实位置建立。比较：
+
+- 整图模板匹配（本地定位中最便宜的完整定位方式；视觉 API 和整图 OCR 要数百毫秒到数秒）
+- 地图查找：模糊匹配标签 + 在目标附近匹配建图时的元素截图
+
+建图线程使用消耗 CPU 的假 OCR（每个条带 --band-ms 毫秒），测量不同 cpu_budget 下
+建图线程的 CPU 时间占比，以及命令到来（pause）到建图放弃之间的延迟。
+
+用法:
+    python -m benchmarks.bench_ui_map --labels 400 --band-ms 40
+"""
+
+import argparse
+import random
+import string
+import threading
+import time
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw
+
+from src.locator.ocr_index import OCRIndex
+from src.locator.ui_map import UIMap, UIMapIndexer
+from src.models.element_set import ElementSet
+
+SIZE = (1920, 1080)
+
+
+def make_frame(count: int, rng: random.Random) -> tuple[Image.Image, list[str], list[tuple[int, int, int, int]]]:
+    """绘制带文本标签的截图，返回 (截图, 标签, 标签位置)。"""
+    image = Image.new("RGB", SIZE, (43, 43, 43))
+    draw = ImageDraw.Draw(image)
+    labels, boxes = [], []
+    columns = max(1, count // 40)
+    for i in range(count):
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12))) + ".py"
+        x, y = 20 + (i // 40) * (SIZE[0] // columns), 30 + (i % 40) * 26
+        draw.text((x, y), name, fill=(200, 200, 200))
+        left, top, right, bottom = draw.textbbox((x, y), name)
+        labels.append(name)
+        boxes.append((left - 2, top - 2, right + 2, bottom + 2))
+    return image, labels, boxes
+
+
+def burn(seconds: float) -> None:
+    """占用 CPU 指定时间（模拟 OCR）。"""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def measure_duty_cycle(frame: Image.Image, budget: float, band_ms: float) -> tuple[float, float]:
+    """运行一轮建图，返回 (建图线程 CPU 时间占比, 墙钟耗时秒)。"""
+    indexer = UIMapIndexer(
+        UIMap(), lambda: frame, ocr_index=OCRIndex(reader=lambda image: (burn(band_ms / 1000), [])[1]),
+        cpu_budget=budget, idle_seconds=0,
+    )
+    start, cpu = time.perf_counter(), time.thread_time()
+    indexer.run_once()
+    wall = time.perf_counter() - start
+    return (time.thread_time() - cpu) / wall, wall
+
+
+def measure_yield(frame: Image.Image, band_ms: float, trials: int) -> list[float]:
+    """命令到来到建图放弃之间的延迟（毫秒）。"""
+    delays = []
+    for trial in range(trials):
+        indexer = UIMapIndexer(
+            UIMap(), lambda: frame, ocr_index=OCRIndex(reader=lambda image: (burn(band_ms / 1000), [])[1]),
+            cpu_budget=0.25, idle_seconds=0,
+        )
+        done = threading.Event()
+        thread = threading.Thread(target=lambda: (indexer.run_once(), done.set()))
+        thread.start()
+        time.sleep(0.05 + trial * 0.013)
+        start = time.perf_counter()
+        indexer.pause()
+        done.wait()
+        delays.append((time.perf_counter() - start) * 1000)
+        thread.join()
+    return delays
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="界面地图基准")
+    parser.add_argument("--labels", type=int, default=400, help="截图中的文本标签数量")
+    parser.add_argument("--queries", type=int, default=200, help="查询次数")
+    parser.add_argument("--band-ms", type=float, default=40.0, help="假 OCR 每个条带的耗时（毫秒）")
+    parser.add_argument("--budgets", type=float, nargs="+", default=[0.1, 0.25, 0.5], help="CPU 占比上限")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    frame, labels, boxes = make_frame(args.labels, rng)
+    ui_map = UIMap()
+    ui_map.update(frame, ElementSet.from_columns(boxes, [0.9] * len(boxes), "ocr_text", labels))
+    targets = [rng.randrange(len(labels)) for _ in range(args.queries)]
+
+    gray = np.asarray(frame.convert("L"))
+    start = time.perf_counter()
+    for i in targets[: max(1, len(targets) // 10)]:
+        x1, y1, x2, y2 = boxes[i]
+        cv2.matchTemplate(gray, gray[y1:y2, x1:x2], cv2.TM_CCOEFF_NORMED)
+    template = (time.perf_counter() - start) / max(1, len(targets) // 10) * 1000
+
+    start = time.perf_counter()
+    found = [ui_map.resolve(frame, text=labels[i], limit=1) for i in targets]
+    resolve = (time.perf_counter() - start) / len(targets) * 1000
+    hits = sum(bool(result) and result[0].bbox == boxes[i] for result, i in zip(found, targets))
+
+    # 标签被换成其他文本（如文件重命名）后，地图中的位置应校验不通过
+    changed = frame.copy()
+    draw = ImageDraw.Draw(changed)
+    for i in targets:
+        draw.rectangle(boxes[i], fill=(43, 43, 43))
+        draw.text((boxes[i][0] + 2, boxes[i][1] + 2), "renamed_" + labels[i][:3], fill=(200, 200, 200))
+    # （模糊匹配可能命中其他未变化的相似标签，那是正确的结果，不计入）
+    stale = sum(boxes[i] in [e.bbox for e in ui_map.resolve(changed, text=labels[i])] for i in targets)
+
+    print(f"{SIZE[0]}x{SIZE[1]} 截图，{args.labels} 个标签，{args.queries} 次查询")
+    print(f"{'方式':<20} | {'耗时(ms/次)':>11} | {'命中':>6}")
+    print("-" * 46)
+    print(f"{'整图模板匹配':<20} | {template:>11.2f} | {'-':>6}")
+    print(f"{'地图查找 + 校验':<20} | {resolve:>11.2f} | {hits / len(targets):>6.0%}")
+    print(f"{'标签变化后仍用旧位置':<20} | {'-':>11} | {stale / len(targets):>6.0%}")
+
+    bands = len(range(0, SIZE[1], 240 - 32))
+    print()
+    print(f"建图：每轮 {bands} 个条带，假 OCR 每条带 {args.band_ms:.0f} ms")
+    print(f"{'cpu_budget':>10} | {'CPU 占比':>8} | {'一轮耗时(s)':>11}")
+    print("-" * 38)
+    for budget in args.budgets:
+        duty, wall = measure_duty_cycle(frame, budget, args.band_ms)
+        print(f"{budget:>10.2f} | {duty:>8.0%} | {wall:>11.2f}")
+
+    delays = measure_yield(frame, args.band_ms, trials=10)
+    print()
+    print(f"命令到来到建图放弃: 平均 {np.mean(delays):.1f} ms，最大 {np.max(delays):.1f} ms（不超过一个步骤的耗时）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""窗口截图基准：整个虚拟屏幕 vs 只截取目标窗口（离线运行）。
+
+在 2 / 3 显示器的虚拟屏幕上放置一个 IDE 窗口，比较两种截图范围下：
+
+- 处理的像素数
+- 模板匹配耗时（TemplateMatcher，OpenCV）
+- 视觉 API 上传体积（PNG base64）
+
+用法:
+    python -m benchmarks.bench_window_capture --window 1920x1040 --rounds 5
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from src.locator.template_matcher import TemplateMatcher
+from src.locator.visual_locator import VisualLocator
+
+MONITOR_SIZE = (2560, 1440)
+
+
+def make_desktop(count: int, window: tuple[int, int]) -> tuple[Image.Image, tuple[int, int, int, int]]:
+    """生成虚拟屏幕截图，IDE 窗口位于第一个显示器。"""
+    width, height = MONITOR_SIZE
+    image = Image.new("RGB", (width * count, height), (20, 60, 100))
+    draw = ImageDraw.Draw(image)
+    for x in range(width, width * count, 400):
+        for y in range(0, height, 300):
+            draw.rectangle((x + 20, y + 20, x + 360, y + 260), fill=(230, 230, 230))
+            draw.text((x + 30, y + 30), f"browser tab {x} {y}", fill="black")
+    box = (40, 40, 40 + window[0], 40 + window[1])
+    draw.rectangle(box, fill=(43, 43, 43))
+    for row in range(box[1] + 40, box[3], 18):
+        draw.text((box[0] + 300, row), f"def handler_{row}(request): return process(request)", fill=(169, 183, 198))
+    draw.rectangle((box[2] - 60, box[1] + 8, box[2] - 36, box[1] + 32), fill=(90, 160, 90))
+    return image, box
+
+
+def median_ms(func, rounds: int) -> float:
+    """执行多次取耗时中位数（毫秒）。"""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """运行基准测试。"""
+    parser = argparse.ArgumentParser(description="窗口截图基准")
+    parser.add_argument("--window", default="1920x1040", help="IDE 窗口尺寸（宽x高）")
+    parser.add_argument("--rounds", type=int, default=5, help="执行次数（取中位数）")
+    args = parser.parse_args()
+    window = tuple(int(value) for value in args.window.split("x"))
+
+    locator = VisualLocator(api_key="stub", llm_client=object())
+    template_dir = Path(tempfile.mkdtemp())
+
+    print(f"显示器 {MONITOR_SIZE[0]}x{MONITOR_SIZE[1]}，IDE 窗口 {window[0]}x{window[1]}，{args.rounds} 次取中位数")
+    print(f"{'显示器':>6} | {'范围':<6} | {'像素(万)':>8} | {'模板匹配(ms)':>12} | {'上传(KB)':>8}")
+    print("-" * 56)
+    for count in (2, 3):
+        desktop, box = make_desktop(count, window)
+        desktop.crop((box[2] - 60, box[1] + 8, box[2] - 36, box[1] + 32)).save(template_dir / "run.png")
+        matcher = TemplateMatcher(template_dir=str(template_dir))
+        for scope, image in (("screen", desktop), ("window", desktop.crop(box))):
+            elapsed = median_ms(lambda: matcher.match(image, "run.png"), args.rounds)
+            upload = len(locator._encode_image(image)) // 1024
+            print(
+                f"{count:>6} | {scope:<6} | {image.width * image.height / 10000:>8.0f} | {elapsed:>12.0f} | {upload:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
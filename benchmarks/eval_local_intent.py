@@ -0,0 +1,96 @@
+"""本地意图快速分类离线评估。
+
+在带标注的评估集上，对不同相似度门限统计：
+
+- 本地作答率：不调用 LLM、直接返回本地结果的消息比例
+- 精确率：本地作答中意图正确的比例（不属于任何意图却被作答算错误）
+- 召回率：属于某个意图的消息中，被本地正确作答的比例
+- 可作答召回率：只统计参数都有 pattern 的意图（其他意图总是交给 LLM）
+- 单条分类耗时 P50 / P95（微秒）
+
+用法:
+    python -m benchmarks.eval_local_intent --margin 0.1
+    python -m benchmarks.eval_local_intent --dataset benchmarks/data/intent_eval.yaml --thresholds 0.5 0.6 0.7
+"""
+
+import argparse
+import time
+
+import yaml
+
+from src.intent.local_classifier import LocalIntentClassifier
+from src.intent.recognizer import IntentRecognizer
+
+
+def locally_answerable(definition) -> bool:
+    """意图的参数是否都能用 pattern 提取。"""
+    return all(param.pattern for param in definition.parameters.values())
+
+
+def evaluate(
+    classifier: LocalIntentClassifier, samples: list[dict], answerable: set[str] | None = None
+) -> dict[str, float]:
+    """评估分类器。"""
+    answered = correct = labeled = answerable_labeled = answerable_correct = 0
+    latencies = []
+    for sample in samples:
+        expected = sample.get("intent")
+        labeled += expected is not None
+        is_answerable = answerable is not None and expected in answerable
+        answerable_labeled += is_answerable
+
+        start = time.perf_counter()
+        match = classifier.classify(sample["message"])
+        latencies.append(time.perf_counter() - start)
+
+        if match.accepted:
+            answered += 1
+            correct += match.intent_type == expected
+            answerable_correct += is_answerable and match.intent_type == expected
+
+    latencies.sort()
+    return {
+        "coverage": answered / len(samples),
+        "precision": correct / answered if answered else 1.0,
+        "recall": correct / labeled if labeled else 0.0,
+        "answerable_recall": answerable_correct / answerable_labeled if answerable_labeled else 0.0,
+        "p50_us": latencies[len(latencies) // 2] * 1e6,
+        "p95_us": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1e6,
+    }
+
+
+def main() -> None:
+    """运行评估。"""
+    parser = argparse.ArgumentParser(description="本地意图快速分类离线评估")
+    parser.add_argument("--definitions", default="config/intent_definitions.yaml", help="意图定义文件")
+    parser.add_argument("--dataset", default="benchmarks/data/intent_eval.yaml", help="标注评估集")
+    parser.add_argument("--margin", type=float, default=0.1, help="领先第二名的最小相似度差")
+    parser.add_argument(
+        "--thresholds", type=float, nargs="+", default=[0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9], help="相似度门限"
+    )
+    args = parser.parse_args()
+
+    with open(args.dataset, encoding="utf-8") as f:
+        samples = yaml.safe_load(f)["samples"]
+    definitions = IntentRecognizer(args.definitions, cache_size=0)._intent_definitions
+    answerable = {name for name, definition in definitions.items() if locally_answerable(definition)}
+
+    print(f"评估集 {len(samples)} 条，意图 {len(definitions)} 个（可本地作答 {len(answerable)} 个），margin {args.margin}")
+    print(
+        f"{'门限':>6} | {'本地作答率':>10} | {'精确率':>8} | {'召回率':>8} | {'可作答召回率':>12} | "
+        f"{'P50(us)':>8} | {'P95(us)':>8}"
+    )
+    print("-" * 83)
+    for threshold in args.thresholds:
+        classifier = LocalIntentClassifier(threshold=threshold, margin=args.margin)
+        classifier.fit(definitions)
+        result = evaluate(classifier, samples, answerable)
+        print(
+            f"{threshold:>6.2f} | {result['coverage']:>10.1%} | {result['precision']:>8.1%} | "
+            f"{result['recall']:>8.1%} | {result['answerable_recall']:>12.1%} | "
+            f"{result['p50_us']:>8.0f} | {result['p95_us']:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""本地 LLM 替身服务器（兼容 chat/completions 接口）。
+
+用于离线基准测试：按固定延迟返回预设内容，并模拟新建连接的握手开销
+（每个新 TCP 连接首次处理前等待 handshake_ms），统计连接数和请求数，
+以便比较连接复用的效果。可选按请求体大小增加预填充延迟（prefill_ms_per_kb），
+模拟提示词越长首字延迟越高；可选按输出长度增加生成延迟（每 chunk_chars 个字符
+等待 token_ms），请求中 "stream": true 时以 SSE 分块返回内容。可选按请求内容
+决定返回内容（responder），模拟多个模块共用一个服务的完整流程。
+
+用法:
+    python -m benchmarks.llm_stub_server --port 8765 --latency-ms 300 --handshake-ms 80
+    # 然后在 config/main.yaml 中设置 api.zhipuai.base_url: "http://127.0.0.1:8765"
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_CONTENT = '{"intent": "unknown", "action": "", "parameters": {}, "confidence": 0.5}'
+
+
+class StubState:
+    """替身服务器的配置和统计。"""
+
+    def __init__(
+        self,
+        latency_ms: float,
+        handshake_ms: float,
+        content: str,
+        prefill_ms_per_kb: float = 0.0,
+        token_ms: float = 0.0,
+        chunk_chars: int = 4,
+        responder: Callable[[dict], str] | None = None,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.handshake_ms = handshake_ms
+        self.content = content
+        self.prefill_ms_per_kb = prefill_ms_per_kb
+        self.token_ms = token_ms
+        self.chunk_chars = chunk_chars
+        self.responder = responder
+        self.connections = 0
+        self.requests = 0
+        # 流式请求中客户端提前断开的次数
+        self.cancelled = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    def reset(self) -> None:
+        """清空统计。"""
+        with self.lock:
+            self.connections = self.requests = self.peak_in_flight = self.cancelled = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """chat/completions 请求处理器（HTTP/1.1，支持 keep-alive）。"""
+
+    protocol_version = "HTTP/1.1"
+    state: StubState
+
+    def setup(self) -> None:
+        super().setup()
+        with self.state.lock:
+            self.state.connections += 1
+        # 模拟 TCP/TLS 握手开销
+        time.sleep(self.state.handshake_ms / 1000)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        # 提示词（请求体）越大，预填充越久
+        delay_ms = self.state.latency_ms + self.state.prefill_ms_per_kb * length / 1024
+
+        state = self.state
+        with state.lock:
+            state.requests += 1
+            state.in_flight += 1
+            state.peak_in_flight = max(state.peak_in_flight, state.in_flight)
+        content = state.responder(body) if state.responder else state.content
+        try:
+            time.sleep(delay_ms / 1000)
+            chunks = [content[i : i + state.chunk_chars] for i in range(0, len(content), state.chunk_chars)]
+            if body.get("stream"):
+                self._send_stream(body, chunks)
+                return
+            # 非流式请求等待全部内容生成完
+            time.sleep(state.token_ms * len(chunks) / 1000)
+        finally:
+            with state.lock:
+                state.in_flight -= 1
+
+        payload = json.dumps(
+            {
+                "id": f"stub-{state.requests}",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": content},
+                    }
+                ],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }
+        ).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_stream(self, body: dict, chunks: list[str]) -> None:
+        """以 SSE 分块返回内容（chunked 编码），客户端断开时停止生成。"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        events = []
+        for index, text in enumerate(chunks):
+            chunk = {
+                "id": f"stub-{self.state.requests}",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop" if index == len(chunks) - 1 else None,
+                        "delta": {"role": "assistant", "content": text},
+                    }
+                ],
+            }
+            events.append(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n")
+        events.append("data: [DONE]\n\n")
+
+        try:
+            for event in events:
+                time.sleep(self.state.token_ms / 1000)
+                data = event.encode()
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            with self.state.lock:
+                self.state.cancelled += 1
+            self.close_connection = True
+
+
+def start_stub_server(
+    port: int = 0,
+    latency_ms: float = 300.0,
+    handshake_ms: float = 80.0,
+    content: str = DEFAULT_CONTENT,
+    prefill_ms_per_kb: float = 0.0,
+    token_ms: float = 0.0,
+    chunk_chars: int = 4,
+    responder: Callable[[dict], str] | None = None,
+) -> tuple[ThreadingHTTPServer, StubState]:
+    """在后台线程启动替身服务器。
+
+    Args:
+        port: 监听端口（0 表示随机端口）
+        latency_ms: 每个请求的响应延迟（毫秒）
+        handshake_ms: 每个新连接的握手延迟（毫秒）
+        content: 返回的消息内容
+        prefill_ms_per_kb: 每 KB 请求体增加的预填充延迟（毫秒）
+        token_ms: 每生成一块内容的延迟（毫秒）
+        chunk_chars: 每块内容的字符数
+        responder: 根据请求体返回消息内容（可选，优先于 content）
+
+    Returns:
+        (服务器, 状态)，base_url 为 f"http://127.0.0.1:{server.server_port}"
+    """
+    state = StubState(latency_ms, handshake_ms, content, prefill_ms_per_kb, token_ms, chunk_chars, responder)
+    handler = type("BoundStubHandler", (StubHandler,), {"state": state})
+    # 默认监听队列只有 5，突发的并发连接会因 SYN 重传多等 1 秒
+    server_class = type("StubHTTPServer", (ThreadingHTTPServer,), {"request_queue_size": 128})
+    server = server_class(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main() -> None:
+    """启动替身服务器。"""
+    parser = argparse.ArgumentParser(description="本地 LLM 替身服务器")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="响应延迟（毫秒）")
+    parser.add_argument("--handshake-ms", type=float, default=80.0, help="新连接握手延迟（毫秒）")
+    parser.add_argument("--content", default=DEFAULT_CONTENT, help="返回的消息内容")
+    parser.add_argument("--prefill-ms-per-kb", type=float, default=0.0, help="每 KB 请求体增加的延迟（毫秒）")
+    parser.add_argument("--token-ms", type=float, default=0.0, help="每块输出内容的生成延迟（毫秒）")
+    parser.add_argument("--chunk-chars", type=int, default=4, help="每块输出内容的字符数")
+    args = parser.parse_args()
+
+    server, state = start_stub_server(
+        args.port,
+        args.latency_ms,
+        args.handshake_ms,
+        args.content,
+        args.prefill_ms_per_kb,
+        args.token_ms,
+        args.chunk_chars,
+    )
+    print(f"LLM 替身服务器已启动: http://127.0.0.1:{server.server_port}（Ctrl+C 退出）")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"连接数={state.connections} 请求数={state.requests} 峰值并发={state.peak_in_flight}")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
 """UI-Agent HTTP API 服务器。"""
 
+import asyncio
+import functools
 import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
@@ -24,6 +27,32 @@ from src.controller.ide_controller import IDEController
 controller: IDEController | None = None
 logger = logging.getLogger(__name__)
 
+# GUI 任务专用执行器：鼠标键盘和截图操作必须串行执行，且不能阻塞事件循环
+_gui_executor: ThreadPoolExecutor | None = None
+
+
+def get_gui_executor() -> ThreadPoolExecutor:
+    """获取（必要时创建）GUI 任务执行器。"""
+    global _gui_executor
+    if _gui_executor is None:
+        _gui_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ui-agent-gui")
+    return _gui_executor
+
+
+async def run_gui_task(func, *args, **kwargs):
+    """在 GUI 任务执行器中运行阻塞函数。
+
+    Args:
+        func: 阻塞函数
+        *args: 位置参数
+        **kwargs: 关键字参数
+
+    Returns:
+        函数返回值
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_gui_executor(), functools.partial(func, *args, **kwargs))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -38,6 +67,12 @@ async def lifespan(app: FastAPI):
         raise
     yield
     # 关闭时清理
+    global _gui_executor
+    if _gui_executor is not None:
+        _gui_executor.shutdown(wait=False, cancel_futures=True)
+        _gui_executor = None
+    if controller and controller.async_llm:
+        await controller.async_llm.aclose()
     logger.info("UI-Agent API 服务器关闭")
 
 
@@ -120,7 +155,19 @@ async def root():
 @app.get("/api/health")
 async def health_check():
     """健康检查。"""
-    return {"status": "healthy", "controller_initialized": controller is not None}
+    result = {"status": "healthy", "controller_initialized": controller is not None}
+    if controller and controller._intent_recognizer:
+        result["intent_cache"] = controller._intent_recognizer.get_cache_stats()
+        # 并发相同请求合并统计
+        result["coalesced"] = {"recognize": controller._intent_recognizer.get_flight_stats()}
+        locator = getattr(controller, "locator", None)
+        if locator is not None:
+            result["coalesced"]["locate"] = locator.get_flight_stats()
+    llm = getattr(controller, "llm", None)
+    if hasattr(llm, "get_resilience_stats"):
+        # 限流、重试和熔断状态（熔断时视觉定位只用 OCR，命令解析只用规则）
+        result["llm"] = llm.get_resilience_stats()
+    return result
 
 
 @app.get("/api/intents")
@@ -173,8 +220,8 @@ async def recognize_intent(request: IntentRequest) -> IntentResponse:
         raise HTTPException(status_code=503, detail="意图识别器未初始化")
 
     try:
-        # 识别意图
-        intent_result = controller._intent_recognizer.recognize(request.message)
+        # 识别意图（异步 LLM 调用，不阻塞事件循环）
+        intent_result = await controller._intent_recognizer.recognize_async(request.message)
 
         if not intent_result.has_match:
             return IntentResponse(
@@ -202,8 +249,10 @@ async def recognize_intent(request: IntentRequest) -> IntentResponse:
                 intent_result.intent
             )
 
-            # 执行任务
-            context = controller._task_orchestrator.orchestrate(intent_result.intent)
+            # 执行任务（在 GUI 执行器中串行执行，期间其他请求照常响应）
+            context = await run_gui_task(
+                controller._task_orchestrator.orchestrate, intent_result.intent
+            )
 
             response.execution_result = {
                 "status": context.status,
@@ -1,6 +1,27 @@
 """自动化执行模块。"""
 
 from .actions import Action, ActionType
+from .backends import (
+    InputBackend,
+    PyAutoGUIBackend,
+    VirtualBackend,
+    XTestBackend,
+    create_input_backend,
+)
+from .compiler import ActionCompiler, CompiledProgram
 from .executor import AutomationExecutor
+from .text_input import TextInjector
 
-__all__ = ["Action", "ActionType", "AutomationExecutor"]
+__all__ = [
+    "Action",
+    "ActionCompiler",
+    "ActionType",
+    "AutomationExecutor",
+    "CompiledProgram",
+    "InputBackend",
+    "PyAutoGUIBackend",
+    "TextInjector",
+    "VirtualBackend",
+    "XTestBackend",
+    "create_input_backend",
+]
@@ -0,0 +1,533 @@
+"""输入后端：将鼠标/键盘事件分发到具体的驱动。
+
+- pyautogui: 默认后端，跨平台，受全局 PAUSE 影响
+- xtest: 直接通过 X11 XTest 扩展注入事件，无隐式暂停（仅 Linux/X11）
+- virtual: 只记录事件不产生真实输入，用于测试和基准测试
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+# 输入后端名称
+INPUT_BACKENDS = ("pyautogui", "xtest", "virtual")
+
+
+class InputBackend(Protocol):
+    """输入后端协议。
+
+    定义统一的鼠标和键盘操作接口。坐标均为屏幕绝对坐标。
+    鼠标操作的 pause 参数表示调用后是否执行后端的隐式暂停（如 pyautogui 的 PAUSE）。
+    """
+
+    name: str
+    # 用户触发安全中断时后端抛出的异常类型
+    failsafe_exceptions: tuple[type[BaseException], ...]
+
+    def move_to(self, x: int, y: int, duration: float = 0.0, pause: bool = True) -> None:
+        """移动鼠标。"""
+        ...
+
+    def click(self, x: int, y: int, button: str = "left", pause: bool = True) -> None:
+        """单击。"""
+        ...
+
+    def double_click(self, x: int, y: int, pause: bool = True) -> None:
+        """双击。"""
+        ...
+
+    def drag_to(self, x: int, y: int, duration: float = 0.0, button: str = "left") -> None:
+        """从当前位置拖拽到指定位置。"""
+        ...
+
+    def drag(
+        self,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        steps: int = 0,
+        duration: float = 0.0,
+        button: str = "left",
+        pause: bool = True,
+    ) -> None:
+        """从 start 拖拽到 end。
+
+        steps 为 0 时按 duration 做补间动画；大于 0 时按下后只发送 steps 个移动事件（最后一个为终点）。
+        """
+        ...
+
+    def scroll(self, clicks: int, horizontal: bool = False) -> None:
+        """滚动（正数向上/向左，负数向下/向右）。"""
+        ...
+
+    def press(self, key: str) -> None:
+        """按下并释放单个按键。"""
+        ...
+
+    def hotkey(self, *keys: str, interval: float = 0.0) -> None:
+        """按下组合键。"""
+        ...
+
+    def write(self, text: str, interval: float = 0.0) -> None:
+        """逐字键入文本。"""
+        ...
+
+    def position(self) -> tuple[int, int]:
+        """获取当前鼠标位置。"""
+        ...
+
+
+def drag_points(start: tuple[int, int], end: tuple[int, int], steps: int) -> list[tuple[int, int]]:
+    """计算拖拽的中间移动点（等距插值，最后一个点为终点）。
+
+    Args:
+        start: 起点
+        end: 终点
+        steps: 移动事件数
+
+    Returns:
+        移动点列表
+    """
+    steps = max(1, steps)
+    (x1, y1), (x2, y2) = start, end
+    return [
+        (round(x1 + (x2 - x1) * i / steps), round(y1 + (y2 - y1) * i / steps))
+        for i in range(1, steps + 1)
+    ]
+
+
+class PyAutoGUIBackend:
+    """基于 pyautogui 的输入后端（快捷键失败时回退到 keyboard 库）。"""
+
+    name = "pyautogui"
+
+    def __init__(self, pause: float | None = None, failsafe: bool = True) -> None:
+        """初始化 pyautogui 后端。
+
+        Args:
+            pause: pyautogui 全局 PAUSE（每次调用后的隐式暂停），None 表示不修改
+            failsafe: 是否启用鼠标移到屏幕角落时的安全中断
+        """
+        import pyautogui
+
+        self._pyautogui = pyautogui
+        self.failsafe_exceptions = (pyautogui.FailSafeException,)
+
+        pyautogui.FAILSAFE = failsafe
+        if pause is not None:
+            pyautogui.PAUSE = pause
+
+    def move_to(self, x: int, y: int, duration: float = 0.0, pause: bool = True) -> None:
+        """移动鼠标。"""
+        if pause:
+            self._pyautogui.moveTo(x, y, duration=duration)
+        else:
+            self._pyautogui.moveTo(x, y, duration=duration, _pause=False)
+
+    def click(self, x: int, y: int, button: str = "left", pause: bool = True) -> None:
+        """单击（移动和点击合并为一次调用）。"""
+        kwargs = {} if pause else {"_pause": False}
+        if button == "right":
+            self._pyautogui.rightClick(x, y, **kwargs)
+        else:
+            self._pyautogui.click(x, y, **kwargs)
+
+    def double_click(self, x: int, y: int, pause: bool = True) -> None:
+        """双击。"""
+        if pause:
+            self._pyautogui.doubleClick(x, y)
+        else:
+            self._pyautogui.doubleClick(x, y, _pause=False)
+
+    def drag_to(self, x: int, y: int, duration: float = 0.0, button: str = "left") -> None:
+        """从当前位置拖拽到指定位置。"""
+        self._pyautogui.dragTo(x, y, duration=duration, button=button)
+
+    def drag(
+        self,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        steps: int = 0,
+        duration: float = 0.0,
+        button: str = "left",
+        pause: bool = True,
+    ) -> None:
+        """从 start 拖拽到 end。"""
+        pyautogui = self._pyautogui
+        pyautogui.moveTo(*start, _pause=False)
+        if steps <= 0:
+            if pause:
+                pyautogui.dragTo(*end, duration=duration, button=button)
+            else:
+                pyautogui.dragTo(*end, duration=duration, button=button, _pause=False)
+            return
+
+        pyautogui.mouseDown(button=button, _pause=False)
+        for x, y in drag_points(start, end, steps):
+            pyautogui.moveTo(x, y, _pause=False)
+        if pause:
+            pyautogui.mouseUp(button=button)
+        else:
+            pyautogui.mouseUp(button=button, _pause=False)
+
+    def scroll(self, clicks: int, horizontal: bool = False) -> None:
+        """滚动。"""
+        if horizontal:
+            self._pyautogui.hscroll(clicks)
+        else:
+            self._pyautogui.scroll(clicks)
+
+    def press(self, key: str) -> None:
+        """按下并释放单个按键。"""
+        self._pyautogui.press(key)
+
+    def hotkey(self, *keys: str, interval: float = 0.0) -> None:
+        """按下组合键，pyautogui 失败时回退到 keyboard 库。"""
+        try:
+            self._pyautogui.hotkey(*keys, interval=interval)
+        except Exception:
+            import keyboard
+
+            keyboard.press_and_release("+".join(keys))
+
+    def write(self, text: str, interval: float = 0.0) -> None:
+        """逐字键入文本。"""
+        if interval:
+            self._pyautogui.typewrite(text, interval=interval)
+        else:
+            self._pyautogui.typewrite(text)
+
+    def position(self) -> tuple[int, int]:
+        """获取当前鼠标位置。"""
+        x, y = self._pyautogui.position()
+        return (int(x), int(y))
+
+
+# pyautogui 风格的按键名到 X11 keysym 名称的映射
+_X11_KEY_NAMES = {
+    "ctrl": "Control_L",
+    "ctrlleft": "Control_L",
+    "ctrlright": "Control_R",
+    "shift": "Shift_L",
+    "shiftleft": "Shift_L",
+    "shiftright": "Shift_R",
+    "alt": "Alt_L",
+    "altleft": "Alt_L",
+    "altright": "Alt_R",
+    "win": "Super_L",
+    "command": "Super_L",
+    "enter": "Return",
+    "return": "Return",
+    "esc": "Escape",
+    "escape": "Escape",
+    "backspace": "BackSpace",
+    "tab": "Tab",
+    "space": "space",
+    "delete": "Delete",
+    "del": "Delete",
+    "insert": "Insert",
+    "home": "Home",
+    "end": "End",
+    "pageup": "Prior",
+    "pagedown": "Next",
+    "up": "Up",
+    "down": "Down",
+    "left": "Left",
+    "right": "Right",
+    "\n": "Return",
+    "\t": "Tab",
+}
+
+# X11 鼠标按钮编号
+_X11_BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+
+class XTestBackend:
+    """基于 X11 XTest 扩展的输入后端。
+
+    事件直接注入 X 服务器，不附加任何隐式暂停和动画，适合 Linux/X11 桌面。
+    """
+
+    name = "xtest"
+    failsafe_exceptions: tuple[type[BaseException], ...] = ()
+
+    def __init__(self, display_name: str | None = None) -> None:
+        """初始化 XTest 后端。
+
+        Args:
+            display_name: X 显示名称（默认读取 DISPLAY 环境变量）
+
+        Raises:
+            ImportError: 未安装 python-xlib
+        """
+        from Xlib import XK, X, display
+        from Xlib.ext import xtest
+
+        self._X = X
+        self._XK = XK
+        self._xtest = xtest
+        self._display = display.Display(display_name)
+        self._root = self._display.screen().root
+
+    def _keycode(self, key: str) -> tuple[int, bool]:
+        """将按键名解析为 (keycode, 是否需要 Shift)。"""
+        name = _X11_KEY_NAMES.get(key.lower() if len(key) > 1 else key)
+        if name is not None:
+            keysym = self._XK.string_to_keysym(name)
+        elif len(key) == 1:
+            # Latin-1 字符的 keysym 与其码位一致
+            keysym = ord(key)
+        else:
+            # F1-F12 等
+            keysym = self._XK.string_to_keysym(key.upper() if key[0] in "fF" else key)
+
+        for keycode, index in self._display.keysym_to_keycodes(keysym):
+            return keycode, index % 2 == 1
+        raise ValueError(f"无法映射按键: {key!r}")
+
+    def _fake(self, event_type: int, detail: int = 0, **kwargs: Any) -> None:
+        self._xtest.fake_input(self._display, event_type, detail, **kwargs)
+
+    def _flush(self) -> None:
+        self._display.sync()
+
+    def move_to(self, x: int, y: int, duration: float = 0.0, pause: bool = True) -> None:
+        """移动鼠标（XTest 不做动画，忽略 duration）。"""
+        self._fake(self._X.MotionNotify, x=int(x), y=int(y))
+        self._flush()
+
+    def _button(self, button: str, press: bool) -> None:
+        event = self._X.ButtonPress if press else self._X.ButtonRelease
+        self._fake(event, _X11_BUTTONS.get(button, 1))
+
+    def click(self, x: int, y: int, button: str = "left", pause: bool = True) -> None:
+        """单击。"""
+        self._fake(self._X.MotionNotify, x=int(x), y=int(y))
+        self._button(button, True)
+        self._button(button, False)
+        self._flush()
+
+    def double_click(self, x: int, y: int, pause: bool = True) -> None:
+        """双击。"""
+        self._fake(self._X.MotionNotify, x=int(x), y=int(y))
+        for _ in range(2):
+            self._button("left", True)
+            self._button("left", False)
+        self._flush()
+
+    def drag_to(self, x: int, y: int, duration: float = 0.0, button: str = "left") -> None:
+        """从当前位置拖拽到指定位置。"""
+        self._button(button, True)
+        self._fake(self._X.MotionNotify, x=int(x), y=int(y))
+        self._button(button, False)
+        self._flush()
+
+    def drag(
+        self,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        steps: int = 0,
+        duration: float = 0.0,
+        button: str = "left",
+        pause: bool = True,
+    ) -> None:
+        """从 start 拖拽到 end（XTest 不做动画，steps 为 0 时只发送终点）。"""
+        self._fake(self._X.MotionNotify, x=int(start[0]), y=int(start[1]))
+        self._button(button, True)
+        for x, y in drag_points(start, end, max(steps, 1)):
+            self._fake(self._X.MotionNotify, x=x, y=y)
+        self._button(button, False)
+        self._flush()
+
+    def scroll(self, clicks: int, horizontal: bool = False) -> None:
+        """滚动（X11 中每个滚轮刻度是一次按钮 4/5/6/7 事件）。"""
+        if horizontal:
+            button = 6 if clicks > 0 else 7
+        else:
+            button = 4 if clicks > 0 else 5
+        for _ in range(abs(int(clicks))):
+            self._fake(self._X.ButtonPress, button)
+            self._fake(self._X.ButtonRelease, button)
+        self._flush()
+
+    def _key(self, key: str, press: bool) -> None:
+        keycode, _ = self._keycode(key)
+        self._fake(self._X.KeyPress if press else self._X.KeyRelease, keycode)
+
+    def press(self, key: str) -> None:
+        """按下并释放单个按键。"""
+        self._tap(key)
+        self._flush()
+
+    def _tap(self, key: str) -> None:
+        keycode, needs_shift = self._keycode(key)
+        shift = self._keycode("shift")[0] if needs_shift else None
+        if shift is not None:
+            self._fake(self._X.KeyPress, shift)
+        self._fake(self._X.KeyPress, keycode)
+        self._fake(self._X.KeyRelease, keycode)
+        if shift is not None:
+            self._fake(self._X.KeyRelease, shift)
+
+    def hotkey(self, *keys: str, interval: float = 0.0) -> None:
+        """按下组合键（依次按下，逆序释放）。"""
+        for key in keys:
+            self._key(key, True)
+            if interval:
+                self._flush()
+                time.sleep(interval)
+        for key in reversed(keys):
+            self._key(key, False)
+        self._flush()
+
+    def write(self, text: str, interval: float = 0.0) -> None:
+        """逐字键入文本（仅支持 Latin-1 字符，其余请使用剪贴板粘贴）。"""
+        for char in text:
+            self._tap(char)
+            if interval:
+                self._flush()
+                time.sleep(interval)
+        self._flush()
+
+    def position(self) -> tuple[int, int]:
+        """获取当前鼠标位置。"""
+        pointer = self._root.query_pointer()
+        return (int(pointer.root_x), int(pointer.root_y))
+
+
+@dataclass
+class InputEvent:
+    """虚拟后端记录的输入事件。
+
+    Attributes:
+        kind: 事件类型（move、click、double_click、drag、scroll、press、hotkey、write）
+        args: 事件参数
+        timestamp: 记录时间（time.perf_counter）
+    """
+
+    kind: str
+    args: dict[str, Any] = field(default_factory=dict)
+    timestamp: float = 0.0
+
+
+class VirtualBackend:
+    """虚拟输入后端：只记录事件，不产生真实输入，零延迟。
+
+    可选地模拟 pyautogui 的耗时（动画时长、按键间隔和隐式暂停），
+    累计到 simulated_time 中而不实际等待，用于比较不同输入策略的耗时。
+    """
+
+    name = "virtual"
+    failsafe_exceptions: tuple[type[BaseException], ...] = ()
+
+    def __init__(self, screen_size: tuple[int, int] = (1920, 1080), pause: float = 0.0) -> None:
+        """初始化虚拟后端。
+
+        Args:
+            screen_size: 虚拟屏幕尺寸 (宽, 高)
+            pause: 模拟的隐式暂停（秒），每次 pause=True 的调用后计入 simulated_time
+        """
+        self.screen_size = screen_size
+        self.pause = pause
+        self.events: list[InputEvent] = []
+        self.simulated_time = 0.0
+        self._position = (0, 0)
+
+    def _record(self, kind: str, **args: Any) -> None:
+        self.events.append(InputEvent(kind=kind, args=args, timestamp=time.perf_counter()))
+
+    def _advance(self, seconds: float, pause: bool = True) -> None:
+        self.simulated_time += seconds + (self.pause if pause else 0.0)
+
+    def move_to(self, x: int, y: int, duration: float = 0.0, pause: bool = True) -> None:
+        """移动鼠标。"""
+        self._position = (int(x), int(y))
+        self._record("move", x=int(x), y=int(y), duration=duration)
+        self._advance(duration, pause)
+
+    def click(self, x: int, y: int, button: str = "left", pause: bool = True) -> None:
+        """单击。"""
+        self._position = (int(x), int(y))
+        self._record("click", x=int(x), y=int(y), button=button)
+        self._advance(0.0, pause)
+
+    def double_click(self, x: int, y: int, pause: bool = True) -> None:
+        """双击。"""
+        self._position = (int(x), int(y))
+        self._record("double_click", x=int(x), y=int(y))
+        self._advance(0.0, pause)
+
+    def drag_to(self, x: int, y: int, duration: float = 0.0, button: str = "left") -> None:
+        """从当前位置拖拽到指定位置。"""
+        self.drag(self._position, (x, y), duration=duration, button=button)
+
+    def drag(
+        self,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        steps: int = 0,
+        duration: float = 0.0,
+        button: str = "left",
+        pause: bool = True,
+    ) -> None:
+        """从 start 拖拽到 end。"""
+        start = (int(start[0]), int(start[1]))
+        self._position = (int(end[0]), int(end[1]))
+        self._record(
+            "drag",
+            start=start,
+            end=self._position,
+            steps=steps,
+            duration=duration,
+            button=button,
+        )
+        self._advance(duration, pause)
+
+    def scroll(self, clicks: int, horizontal: bool = False) -> None:
+        """滚动。"""
+        self._record("scroll", clicks=int(clicks), horizontal=horizontal)
+        self._advance(0.0)
+
+    def press(self, key: str) -> None:
+        """按下并释放单个按键。"""
+        self._record("press", key=key)
+        self._advance(0.0)
+
+    def hotkey(self, *keys: str, interval: float = 0.0) -> None:
+        """按下组合键。"""
+        self._record("hotkey", keys=list(keys))
+        self._advance(interval * len(keys))
+
+    def write(self, text: str, interval: float = 0.0) -> None:
+        """逐字键入文本。"""
+        self._record("write", text=text, interval=interval)
+        self._advance(interval * len(text))
+
+    def position(self) -> tuple[int, int]:
+        """获取当前鼠标位置。"""
+        return self._position
+
+    def clear(self) -> None:
+        """清空已记录的事件。"""
+        self.events.clear()
+
+
+def create_input_backend(name: str = "pyautogui", pause: float | None = None) -> InputBackend:
+    """根据名称创建输入后端。
+
+    Args:
+        name: 后端名称（pyautogui、xtest、virtual）
+        pause: pyautogui 后端的全局 PAUSE（其他后端无隐式暂停，忽略此参数）
+
+    Returns:
+        输入后端实例
+
+    Raises:
+        ValueError: 未知的后端名称
+    """
+    if name == "pyautogui":
+        return PyAutoGUIBackend(pause=pause)
+    if name == "xtest":
+        return XTestBackend()
+    if name == "virtual":
+        return VirtualBackend()
+    raise ValueError(f"未知的输入后端: {name}，可选: {', '.join(INPUT_BACKENDS)}")
@@ -0,0 +1,293 @@
+"""操作序列编译器。
+
+将操作配置（ActionConfig 列表）编译为优化后的操作程序并缓存，避免每次执行时
+重复解析操作类型、判断条件操作和替换占位符：
+
+- 删除在当前参数形态下不会执行的条件操作
+- 合并相邻的等待操作
+- 将相邻的快捷键合并为一个多组合键操作
+- 预编译参数中的 {占位符}，绑定参数时只替换包含占位符的字段
+"""
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.automation.actions import Action, ActionType
+from src.config.schema import ActionConfig, OperationConfig
+
+# 操作前的界面就绪等待（秒），与 AutomationExecutor.execute_sequence 一致
+SETTLE_BEFORE = 0.2
+# 操作后等待时间占 timeout 的比例，与 AutomationExecutor.execute_sequence 一致
+SETTLE_AFTER_RATIO = 0.3
+
+_PLACEHOLDER_PATTERN = re.compile(r"\{(\w+)\}")
+
+# 条件操作的控制字段，编译后不再传给执行器
+_CONDITIONAL_KEYS = ("conditional", "conditional_param")
+
+# 受指针模式影响的操作类型
+_POINTER_ACTIONS = (
+    ActionType.CLICK,
+    ActionType.DOUBLE_CLICK,
+    ActionType.RIGHT_CLICK,
+    ActionType.DRAG,
+)
+
+
+def parameter_shape(parameters: dict[str, Any]) -> tuple[str, ...]:
+    """计算参数形态（有值的参数名集合），作为编译缓存键的一部分。
+
+    Args:
+        parameters: 命令参数
+
+    Returns:
+        排序后的有值参数名元组
+    """
+    return tuple(sorted(name for name, value in parameters.items() if value))
+
+
+@dataclass
+class _Template:
+    """预编译的占位符模板：字面量与参数名交替排列。"""
+
+    parts: list[str]
+
+    @classmethod
+    def parse(cls, text: str) -> "_Template | None":
+        """解析字符串，不包含占位符时返回 None。"""
+        parts = _PLACEHOLDER_PATTERN.split(text)
+        if len(parts) == 1:
+            return None
+        return cls(parts)
+
+    def render(self, values: dict[str, Any]) -> str:
+        """用参数值渲染模板，缺失的参数保留原占位符。"""
+        rendered = []
+        for index, part in enumerate(self.parts):
+            if index % 2 == 0:
+                rendered.append(part)
+            elif part in values:
+                rendered.append(str(values[part]))
+            else:
+                rendered.append(f"{{{part}}}")
+        return "".join(rendered)
+
+
+@dataclass
+class CompiledStep:
+    """编译后的单个步骤。
+
+    Attributes:
+        action: 操作模板（参数中可能仍包含占位符）
+        templates: 包含占位符的参数字段 -> 预编译模板
+        settle_before: 执行前等待时间（秒）
+        settle_after: 执行后等待时间（秒）
+    """
+
+    action: Action
+    templates: dict[str, _Template] = field(default_factory=dict)
+    settle_before: float = SETTLE_BEFORE
+    settle_after: float = 0.0
+
+    def bind(self, values: dict[str, Any]) -> Action:
+        """绑定参数值，生成可执行的操作。
+
+        Args:
+            values: 命令参数
+
+        Returns:
+            操作对象（无占位符时直接复用编译结果）
+        """
+        if not self.templates:
+            return self.action
+
+        parameters = dict(self.action.parameters or {})
+        for key, template in self.templates.items():
+            parameters[key] = template.render(values)
+
+        return Action(
+            type=self.action.type,
+            target=self.action.target,
+            parameters=parameters,
+            timeout=self.action.timeout,
+            retry=self.action.retry,
+        )
+
+
+@dataclass
+class CompiledProgram:
+    """编译后的操作程序。
+
+    Attributes:
+        operation: 操作名称
+        shape: 编译时的参数形态
+        steps: 编译后的步骤列表
+        source_size: 编译前的操作数
+        source: 编译来源的操作配置列表（用于检测配置热更新）
+    """
+
+    operation: str
+    shape: tuple[str, ...]
+    steps: list[CompiledStep]
+    source_size: int = 0
+    source: list[ActionConfig] | None = field(default=None, repr=False)
+
+
+class ActionCompiler:
+    """操作序列编译器（按 (操作名称, 参数形态) 缓存编译结果）。"""
+
+    def __init__(self, max_programs: int = 256) -> None:
+        """初始化编译器。
+
+        Args:
+            max_programs: 最大缓存程序数
+        """
+        self.max_programs = max_programs
+        self._programs: OrderedDict[tuple[str, tuple[str, ...]], CompiledProgram] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, op_config: OperationConfig, parameters: dict[str, Any]) -> CompiledProgram:
+        """获取操作的编译程序（命中缓存时直接返回）。
+
+        Args:
+            op_config: 操作配置
+            parameters: 命令参数（仅参数形态影响编译结果）
+
+        Returns:
+            编译后的操作程序
+        """
+        key = (op_config.name, parameter_shape(parameters))
+        program = self._programs.get(key)
+
+        # 配置热更新后操作列表对象会被替换，需要重新编译
+        if program is not None and program.source is op_config.actions:
+            self._programs.move_to_end(key)
+            self.hits += 1
+            return program
+
+        self.misses += 1
+        program = self._compile(op_config, key[1])
+        self._programs[key] = program
+        self._programs.move_to_end(key)
+        while len(self._programs) > self.max_programs:
+            self._programs.popitem(last=False)
+        return program
+
+    def clear(self) -> None:
+        """清空编译缓存。"""
+        self._programs.clear()
+
+    def _compile(self, op_config: OperationConfig, shape: tuple[str, ...]) -> CompiledProgram:
+        """编译操作配置。"""
+        present = set(shape)
+        steps: list[CompiledStep] = []
+
+        for action_cfg in op_config.actions or []:
+            params = action_cfg.parameters or {}
+
+            # 条件操作：参数形态中缺少条件参数时跳过
+            if params.get("conditional"):
+                if params.get("conditional_param", "submit_action") not in present:
+                    continue
+                params = {k: v for k, v in params.items() if k not in _CONDITIONAL_KEYS}
+
+            step = self._compile_step(action_cfg, params, op_config.pointer_mode)
+            if steps and self._merge(steps[-1], step):
+                continue
+            steps.append(step)
+
+        return CompiledProgram(
+            operation=op_config.name,
+            shape=shape,
+            steps=steps,
+            source_size=len(op_config.actions or []),
+            source=op_config.actions,
+        )
+
+    def _compile_step(
+        self,
+        action_cfg: ActionConfig,
+        params: dict[str, Any],
+        pointer_mode: str | None = None,
+    ) -> CompiledStep:
+        """编译单个操作。"""
+        try:
+            action_type = ActionType(action_cfg.type)
+        except ValueError:
+            # 未知类型按快捷键处理（与原执行逻辑一致）
+            action_type = ActionType.SHORTCUT
+
+        # 操作级指针模式写入鼠标操作参数（操作自身配置的 pointer_mode 优先）
+        if pointer_mode and action_type in _POINTER_ACTIONS and "pointer_mode" not in params:
+            params = {**params, "pointer_mode": pointer_mode}
+
+        templates = {}
+        for key, value in params.items():
+            if isinstance(value, str):
+                template = _Template.parse(value)
+                if template is not None:
+                    templates[key] = template
+
+        action = Action(
+            type=action_type,
+            target=action_cfg.target,
+            parameters=params or None,
+            timeout=action_cfg.timeout,
+            retry=action_cfg.retry,
+        )
+        return CompiledStep(
+            action=action,
+            templates=templates,
+            settle_after=action_cfg.timeout * SETTLE_AFTER_RATIO,
+        )
+
+    def _merge(self, previous: CompiledStep, step: CompiledStep) -> bool:
+        """尝试将步骤合并到上一个步骤中。
+
+        Returns:
+            是否已合并
+        """
+        if previous.templates or step.templates or previous.action.type != step.action.type:
+            return False
+
+        prev_params = previous.action.parameters or {}
+        params = step.action.parameters or {}
+
+        # 相邻等待：时长相加，去掉中间的就绪等待
+        if step.action.type == ActionType.WAIT:
+            duration = prev_params.get("duration", 1.0) + params.get("duration", 1.0)
+            previous.action = Action(
+                type=ActionType.WAIT,
+                parameters={"duration": duration},
+                timeout=step.action.timeout,
+                retry=0,
+            )
+            previous.settle_after = step.settle_after
+            return True
+
+        # 相邻快捷键：合并为多组合键，组合键之间保留原有的操作后等待
+        if step.action.type == ActionType.SHORTCUT:
+            chords = prev_params.get("chords") or [_as_keys(prev_params.get("keys", []))]
+            gaps = list(prev_params.get("chord_gaps", []))
+            gaps.append(previous.settle_after)
+            chords = chords + [_as_keys(params.get("keys", []))]
+            previous.action = Action(
+                type=ActionType.SHORTCUT,
+                parameters={"chords": chords, "chord_gaps": gaps},
+                timeout=step.action.timeout,
+                retry=max(previous.action.retry, step.action.retry),
+            )
+            previous.settle_after = step.settle_after
+            return True
+
+        return False
+
+
+def _as_keys(keys: Any) -> list[str]:
+    """统一快捷键参数为列表。"""
+    if isinstance(keys, str):
+        return [keys]
+    return list(keys)
@@ -3,12 +3,15 @@
 import time
 from typing import Any
 
-import keyboard
-import pyautogui
-
 from src.automation.actions import Action, ActionType
+from src.automation.backends import InputBackend, create_input_backend
+from src.automation.compiler import CompiledProgram
+from src.automation.text_input import TextInjector
 from src.models.element import UIElement
 
+# 指针模式: animated（动画移动，每次调用后隐式暂停）、instant（无动画、无隐式暂停）
+POINTER_MODES = ("animated", "instant")
+
 
 class AutomationExecutor:
     """GUI 自动化执行器。"""
@@ -18,6 +21,10 @@ class AutomationExecutor:
         default_timeout: float = 5.0,
         max_retries: int = 3,
         action_delay: float = 0.2,
+        text_injector: TextInjector | None = None,
+        backend: InputBackend | None = None,
+        pointer_mode: str = "animated",
+        drag_steps: int = 2,
     ) -> None:
         """初始化自动化执行器。
 
@@ -25,14 +32,27 @@ class AutomationExecutor:
             default_timeout: 默认超时时间（秒）
             max_retries: 最大重试次数
             action_delay: 操作间隔延迟（秒）
+            text_injector: 文本注入器（可选，默认按长度/字符自动选择键入或粘贴）
+            backend: 输入后端（可选，默认 pyautogui，PAUSE 为 action_delay）
+            pointer_mode: 默认指针模式（可被操作参数 pointer_mode 覆盖）
+                - animated: 鼠标动画移动，拖拽按时长补间，每次调用后隐式暂停
+                - instant: 移动与点击合并为一次调用，无动画、无隐式暂停，
+                  拖拽只发送 drag_steps 个移动事件
+            drag_steps: instant 模式下拖拽的移动事件数（目标应用识别拖拽所需的最少事件数）
         """
+        if pointer_mode not in POINTER_MODES:
+            raise ValueError(f"不支持的指针模式: {pointer_mode}，可选: {', '.join(POINTER_MODES)}")
+
         self.default_timeout = default_timeout
         self.max_retries = max_retries
         self.action_delay = action_delay
+        self.backend = backend or create_input_backend("pyautogui", pause=action_delay)
+        self.text_injector = text_injector or TextInjector(backend=self.backend)
+        self.pointer_mode = pointer_mode
+        self.drag_steps = drag_steps
 
-        # pyautogui 安全设置
-        pyautogui.FAILSAFE = True
-        pyautogui.PAUSE = action_delay
+        # 每种操作类型的分发耗时（秒）
+        self._dispatch_latency: dict[str, list[float]] = {}
 
     def execute(
         self,
@@ -48,6 +68,15 @@ class AutomationExecutor:
         Returns:
             是否执行成功
         """
+        start = time.perf_counter()
+        try:
+            return self._execute_with_retry(action, element)
+        finally:
+            latencies = self._dispatch_latency.setdefault(action.type.value, [])
+            latencies.append(time.perf_counter() - start)
+
+    def _execute_with_retry(self, action: Action, element: UIElement | None) -> bool:
+        """按操作的重试次数执行单个操作。"""
         max_attempts = action.retry + 1
 
         for attempt in range(max_attempts):
@@ -70,7 +99,7 @@ class AutomationExecutor:
                     return self._execute_wait_for_dialog(action)
                 else:
                     return False
-            except pyautogui.FailSafeException:
+            except self.backend.failsafe_exceptions:
                 # 用户触发了安全中断
                 return False
             except Exception:
@@ -80,6 +109,28 @@ class AutomationExecutor:
 
         return False
 
+    def get_dispatch_stats(self) -> dict[str, dict[str, float]]:
+        """获取各操作类型的分发耗时统计。
+
+        Returns:
+            操作类型 -> {count, mean_ms, p95_ms, max_ms}
+        """
+        stats = {}
+        for action_type, latencies in self._dispatch_latency.items():
+            ordered = sorted(latencies)
+            p95_index = min(len(ordered) - 1, int(len(ordered) * 0.95))
+            stats[action_type] = {
+                "count": len(ordered),
+                "mean_ms": sum(ordered) / len(ordered) * 1000,
+                "p95_ms": ordered[p95_index] * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+        return stats
+
+    def reset_dispatch_stats(self) -> None:
+        """清空分发耗时统计。"""
+        self._dispatch_latency.clear()
+
     def execute_sequence(
         self,
         actions: list[Action],
@@ -110,13 +161,52 @@ class AutomationExecutor:
 
         return True
 
+    def run_program(
+        self,
+        program: CompiledProgram,
+        parameters: dict[str, Any] | None = None,
+        elements: dict[str, UIElement] | None = None,
+    ) -> bool:
+        """执行编译后的操作程序。
+
+        Args:
+            program: 由 ActionCompiler 编译的操作程序
+            parameters: 命令参数（用于替换占位符）
+            elements: UI 元素映射
+
+        Returns:
+            是否全部执行成功
+        """
+        parameters = parameters or {}
+        elements = elements or {}
+
+        for step in program.steps:
+            action = step.bind(parameters)
+            element = elements.get(action.target) if action.target else None
+
+            if step.settle_before:
+                time.sleep(step.settle_before)
+
+            if not self.execute(action, element):
+                return False
+
+            if step.settle_after:
+                time.sleep(step.settle_after)
+
+        return True
+
+    def _is_instant(self, action: Action) -> bool:
+        """判断操作是否使用 instant 指针模式。"""
+        params = action.parameters or {}
+        return (params.get("pointer_mode") or self.pointer_mode) == "instant"
+
     def _execute_click(self, action: Action, element: UIElement | None) -> bool:
         """执行点击操作。"""
         if element is None:
             return False
 
         x, y = element.center
-        pyautogui.click(x, y)
+        self.backend.click(x, y, pause=not self._is_instant(action))
         return True
 
     def _execute_double_click(self, action: Action, element: UIElement | None) -> bool:
@@ -125,7 +215,7 @@ class AutomationExecutor:
             return False
 
         x, y = element.center
-        pyautogui.doubleClick(x, y)
+        self.backend.double_click(x, y, pause=not self._is_instant(action))
         return True
 
     def _execute_right_click(self, action: Action, element: UIElement | None) -> bool:
@@ -134,23 +224,30 @@ class AutomationExecutor:
             return False
 
         x, y = element.center
-        pyautogui.rightClick(x, y)
+        self.backend.click(x, y, button="right", pause=not self._is_instant(action))
         return True
 
     def _execute_drag(self, action: Action, element: UIElement | None) -> bool:
-        """执行拖拽操作。"""
-        params = action.parameters or {}
+        """执行拖拽操作。
 
-        start_x = params.get("start_x", 0)
-        start_y = params.get("start_y", 0)
-        end_x = params.get("end_x", 0)
-        end_y = params.get("end_y", 0)
-        duration = params.get("duration", 0.5)
+        起点优先使用目标元素中心，其次是参数 start_x/start_y，否则为当前鼠标位置。
+        """
+        params = action.parameters or {}
 
         if element:
-            start_x, start_y = element.center
-
-        pyautogui.dragTo(end_x, end_y, duration=duration, button="left")
+            start = element.center
+        elif "start_x" in params or "start_y" in params:
+            start = (params.get("start_x", 0), params.get("start_y", 0))
+        else:
+            start = self.backend.position()
+        end = (params.get("end_x", 0), params.get("end_y", 0))
+
+        if self._is_instant(action):
+            steps = params.get("steps", self.drag_steps)
+            self.backend.drag(start, end, steps=steps, pause=False)
+        else:
+            duration = params.get("duration", 0.5)
+            self.backend.drag(start, end, duration=duration)
         return True
 
     def _execute_type(self, action: Action) -> bool:
@@ -158,37 +255,40 @@ class AutomationExecutor:
         params = action.parameters or {}
         text = params.get("text", "")
         delay = params.get("delay", 0.1)
+        # 可选：按操作覆盖输入模式（auto / type / paste）
+        mode = params.get("input_mode")
 
-        pyautogui.typewrite(text, interval=delay)
+        self.text_injector.inject(text, interval=delay, mode=mode)
         return True
 
     def _execute_shortcut(self, action: Action) -> bool:
-        """执行快捷键操作。"""
-        params = action.parameters or {}
-        keys = params.get("keys", [])
+        """执行快捷键操作。
 
-        if isinstance(keys, str):
-            keys = [keys]
+        参数 keys 为单个组合键；编译器合并相邻快捷键后，
+        参数 chords 为多个组合键，chord_gaps 为组合键之间的等待时间（秒）。
+        """
+        params = action.parameters or {}
+        chords = params.get("chords")
+        if chords is None:
+            chords = [params.get("keys", [])]
+        gaps = params.get("chord_gaps", [])
 
-        # 优先使用 pyautogui（更可靠），失败则回退到 keyboard
-        success = False
+        for index, keys in enumerate(chords):
+            if isinstance(keys, str):
+                keys = [keys]
 
-        # 方法1: 使用 pyautogui
-        try:
-            pyautogui.hotkey(*keys, interval=0.05)
-            success = True
-        except Exception:
-            pass
+            if index > 0 and index - 1 < len(gaps):
+                time.sleep(gaps[index - 1])
 
-        # 方法2: 回退到 keyboard 库
-        if not success:
+            # pyautogui 后端在失败时会回退到 keyboard 库
             try:
-                keyboard.press_and_release("+".join(keys))
-                success = True
+                self.backend.hotkey(*keys, interval=0.05)
+            except self.backend.failsafe_exceptions:
+                raise
             except Exception:
-                pass
+                return False
 
-        return success
+        return True
 
     def _execute_wait(self, action: Action) -> bool:
         """执行等待操作。"""
@@ -231,15 +331,18 @@ class AutomationExecutor:
         # 实际应该根据操作类型进行更精确的验证
         return before_screenshot != after_screenshot
 
-    def move_to(self, x: int, y: int, duration: float = 0.5) -> None:
+    def move_to(self, x: int, y: int, duration: float | None = None) -> None:
         """移动鼠标到指定位置。
 
         Args:
             x: X 坐标
             y: Y 坐标
-            duration: 移动持续时间
+            duration: 移动持续时间（默认 animated 模式 0.5 秒，instant 模式 0）
         """
-        pyautogui.moveTo(x, y, duration=duration)
+        instant = self.pointer_mode == "instant"
+        if duration is None:
+            duration = 0.0 if instant else 0.5
+        self.backend.move_to(x, y, duration=duration, pause=not instant)
 
     def get_mouse_position(self) -> tuple[int, int]:
         """获取当前鼠标位置。
@@ -247,4 +350,4 @@ class AutomationExecutor:
         Returns:
             (x, y) 坐标
         """
-        return pyautogui.position()
+        return self.backend.position()
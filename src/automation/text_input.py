@@ -0,0 +1,146 @@
+"""文本输入策略：逐字键入或通过剪贴板粘贴。"""
+
+import sys
+import time
+
+from src.automation.backends import InputBackend, create_input_backend
+
+# 尝试导入剪贴板库（pyautogui 的依赖，通常已安装）
+try:
+    import pyperclip
+
+    PYPERCLIP_AVAILABLE = True
+except ImportError:
+    PYPERCLIP_AVAILABLE = False
+
+# 文本输入模式
+TEXT_INPUT_MODES = ("auto", "type", "paste")
+
+
+class TextInjector:
+    """文本注入器。
+
+    长文本或包含非 ASCII 字符（如中文）的文本通过剪贴板粘贴输入：
+    保存剪贴板 -> 写入文本 -> 粘贴 -> 恢复剪贴板。
+    其余情况以及剪贴板不可用时，回退到逐字键入。
+    """
+
+    def __init__(
+        self,
+        mode: str = "auto",
+        paste_threshold: int = 32,
+        restore_delay: float = 0.05,
+        paste_keys: list[str] | None = None,
+        backend: InputBackend | None = None,
+    ) -> None:
+        """初始化文本注入器。
+
+        Args:
+            mode: 输入模式
+                - auto: 文本长度 >= paste_threshold 或包含非 ASCII 字符时粘贴，否则键入
+                - type: 始终逐字键入
+                - paste: 始终粘贴（剪贴板不可用时回退到键入）
+            paste_threshold: auto 模式下切换为粘贴的文本长度阈值
+            restore_delay: 粘贴后恢复剪贴板前的等待时间（秒），
+                给目标应用留出读取剪贴板的时间
+            paste_keys: 粘贴快捷键，默认 macOS 为 command+v，其余平台为 ctrl+v
+            backend: 输入后端（可选，默认首次输入时创建 pyautogui 后端）
+        """
+        if mode not in TEXT_INPUT_MODES:
+            raise ValueError(f"不支持的文本输入模式: {mode}，可选: {', '.join(TEXT_INPUT_MODES)}")
+
+        self.mode = mode
+        self.paste_threshold = paste_threshold
+        self.restore_delay = restore_delay
+        if paste_keys is None:
+            paste_keys = ["command", "v"] if sys.platform == "darwin" else ["ctrl", "v"]
+        self.paste_keys = paste_keys
+        self._backend = backend
+
+    @property
+    def backend(self) -> InputBackend:
+        """输入后端（惰性创建）。"""
+        if self._backend is None:
+            self._backend = create_input_backend("pyautogui")
+        return self._backend
+
+    def should_paste(self, text: str, mode: str | None = None) -> bool:
+        """判断文本是否应通过剪贴板粘贴。
+
+        Args:
+            text: 待输入文本
+            mode: 临时覆盖的输入模式（可选）
+
+        Returns:
+            是否使用粘贴方式
+        """
+        mode = mode or self.mode
+        if mode == "type" or not text:
+            return False
+        if mode == "paste":
+            return True
+        # auto: 长文本或 typewrite 无法输入的字符
+        return len(text) >= self.paste_threshold or not text.isascii()
+
+    def inject(self, text: str, interval: float = 0.0, mode: str | None = None) -> str:
+        """输入文本。
+
+        Args:
+            text: 待输入文本
+            interval: 逐字键入时的按键间隔（秒）
+            mode: 临时覆盖的输入模式（可选）
+
+        Returns:
+            实际使用的输入方式（"paste" 或 "type"）
+        """
+        if self.should_paste(text, mode) and self.paste(text):
+            return "paste"
+
+        self.type(text, interval)
+        return "type"
+
+    def type(self, text: str, interval: float = 0.0) -> None:
+        """逐字键入文本。
+
+        Args:
+            text: 待输入文本
+            interval: 按键间隔（秒）
+        """
+        self.backend.write(text, interval=interval)
+
+    def paste(self, text: str) -> bool:
+        """通过剪贴板粘贴文本，完成后恢复原剪贴板内容。
+
+        注意：仅能保存和恢复剪贴板中的文本内容。
+
+        Args:
+            text: 待输入文本
+
+        Returns:
+            是否粘贴成功（剪贴板不可用时返回 False）
+        """
+        if not PYPERCLIP_AVAILABLE:
+            return False
+
+        try:
+            saved = pyperclip.paste()
+        except Exception:
+            saved = None
+
+        try:
+            pyperclip.copy(text)
+        except Exception as e:
+            print(f"[输入] 剪贴板不可用，回退到键入: {e}")
+            return False
+
+        try:
+            self.backend.hotkey(*self.paste_keys)
+            time.sleep(self.restore_delay)
+        finally:
+            if saved is not None:
+                try:
+                    pyperclip.copy(saved)
+                except Exception:
+                    pass
+
+        return True
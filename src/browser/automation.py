@@ -7,14 +7,19 @@ from typing import Any
 
 import pyautogui
 
+from src.automation.backends import InputBackend, create_input_backend
+from src.automation.text_input import TextInjector
 from src.browser.exceptions import (
     ElementNotFoundError,
     OperationTimeoutError,
     ElementNotInteractableError,
 )
+from src.browser.scroll import ScrollEngine
 from src.config.schema import SystemConfig
+from src.locator.ocr_index import OCRIndex
 from src.locator.screenshot import ScreenshotCapture
 from src.locator.visual_locator import VisualLocator
+from src.models.element import UIElement
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +32,10 @@ class BrowserAutomation:
         api_key: str | None = None,
         model: str = "glm-4-flash",
         config: SystemConfig | None = None,
+        text_injector: TextInjector | None = None,
+        input_backend: InputBackend | None = None,
+        ocr_index: OCRIndex | None = None,
+        llm_client: Any | None = None,
     ) -> None:
         """初始化浏览器自动化控制器。
 
@@ -34,9 +43,16 @@ class BrowserAutomation:
             api_key: 智谱 AI API Key
             model: 使用的模型名称
             config: 系统配置（可选）
+            text_injector: 文本注入器（可选，长文本和中文自动走剪贴板粘贴）
+            input_backend: 输入后端（可选，默认 pyautogui，用于滚动）
+            ocr_index: 屏幕文本索引（可选，用于滚动查找）
+            llm_client: 共享 LLM 客户端（可选，如 LLMService）
         """
         self.api_key = api_key
         self.model = model
+        self.input_backend = input_backend or create_input_backend("pyautogui")
+        self.text_injector = text_injector or TextInjector(backend=self.input_backend)
+        self.ocr_index = ocr_index or OCRIndex()
 
         # 如果没有提供配置，创建一个最小配置
         if config is None:
@@ -53,11 +69,19 @@ class BrowserAutomation:
             model=model,
             screenshot_capture=self.screenshot,
             vision_enabled=True,  # 启用视觉识别
+            llm_client=llm_client,
         )
 
         # 设置坐标偏移（如果有需要）
         self.locator.set_coordinate_offset([0, 0])
 
+        # 滚动引擎（聚合滚轮事件，滚动查找时优先使用 OCR 索引）
+        self.scroller = ScrollEngine(
+            self.input_backend,
+            capture=lambda: self.screenshot.capture_fullscreen(),
+            finder=self._find_text,
+        )
+
     def click(self, text: str, timeout: int = 5000) -> None:
         """点击包含指定文本的页面元素。
 
@@ -96,32 +120,51 @@ class BrowserAutomation:
 
         Args:
             direction: 滚动方向（up、down、left、right）
-            distance: 滚动距离（点击次数），默认为 3 次
+            distance: 滚动距离（滚动单位数，每单位相当于滚轮 300），默认为 3，
+                合并为一个滚轮事件发送
         """
         if distance is None:
-            distance = 3  # 默认滚动 3 次
+            distance = 3  # 默认滚动 3 个单位
 
         logger.info(f"滚动页面: direction={direction}, distance={distance}")
+        self.scroller.scroll(direction, distance)
+
+    def scroll_until_visible(
+        self,
+        text: str,
+        direction: str = "down",
+        max_steps: int = 20,
+    ) -> UIElement:
+        """滚动页面直到包含指定文本的元素出现。
+
+        Args:
+            text: 元素文本内容
+            direction: 滚动方向（up、down、left、right）
+            max_steps: 最大滚动步数
+
+        Returns:
+            找到的元素
 
-        match direction:
-            case "down":
-                for _ in range(distance):
-                    pyautogui.scroll(-300)  # 向下滚动
-                    time.sleep(0.1)
-            case "up":
-                for _ in range(distance):
-                    pyautogui.scroll(300)  # 向上滚动
-                    time.sleep(0.1)
-            case "left":
-                for _ in range(distance):
-                    pyautogui.hscroll(300)  # 向左滚动
-                    time.sleep(0.1)
-            case "right":
-                for _ in range(distance):
-                    pyautogui.hscroll(-300)  # 向右滚动
-                    time.sleep(0.1)
-            case _:
-                raise ValueError(f"不支持的滚动方向: {direction}")
+        Raises:
+            ElementNotFoundError: 滚动到页面尽头仍未找到元素
+        """
+        logger.info(f"滚动查找元素: {text}, direction={direction}")
+
+        element = self.scroller.scroll_until_visible(text, direction=direction, max_steps=max_steps)
+        if element is None:
+            raise ElementNotFoundError(text)
+        return element
+
+    def _find_text(self, screenshot: Any, text: str) -> list[UIElement]:
+        """在截图中查找文本（OCR 可用时查询 OCR 索引，否则使用视觉定位）。"""
+        if self.ocr_index.available:
+            return self.ocr_index.find(screenshot, text)
+
+        return self.locator.locate(
+            f"在截图中找到包含文本 '{text}' 的元素",
+            screenshot,
+            target_filter=text,
+        )
 
     def type_text(self, text: str, input_text: str, clear: bool = False) -> None:
         """在输入框中输入文本。
@@ -166,7 +209,7 @@ class BrowserAutomation:
             time.sleep(0.1)
 
         logger.info(f"输入文本: {input_text}")
-        pyautogui.typewrite(input_text)
+        self.text_injector.inject(input_text)
         time.sleep(0.2)
 
     def press_key(self, key: str) -> None:
@@ -0,0 +1,119 @@
+"""页面滚动引擎。"""
+
+import logging
+import time
+from collections.abc import Callable
+
+from PIL import Image
+
+from src.automation.backends import InputBackend
+from src.locator.frames import frame_diff_ratio
+from src.models.element import UIElement
+
+logger = logging.getLogger(__name__)
+
+# 每个滚动单位对应的滚轮量（与原先每次 pyautogui.scroll(±300) 一致）
+SCROLL_CLICKS_PER_UNIT = 300
+
+# 滚动方向 -> (符号, 是否水平)
+_DIRECTIONS = {
+    "down": (-1, False),
+    "up": (1, False),
+    "left": (1, True),
+    "right": (-1, True),
+}
+
+# 文本查找函数：在截图中查找文本，返回匹配元素列表
+TextFinder = Callable[[Image.Image, str], list[UIElement]]
+
+
+class ScrollEngine:
+    """页面滚动引擎。
+
+    一次滚动只发送一个聚合的滚轮事件；滚动查找时每步截图一次，
+    通过帧差异判断是否已滚动到页面尽头，通过文本查找函数（通常是 OCR 索引）判断目标是否出现。
+    """
+
+    def __init__(
+        self,
+        backend: InputBackend,
+        capture: Callable[[], Image.Image],
+        finder: TextFinder | None = None,
+        settle_delay: float = 0.3,
+        end_threshold: float = 0.002,
+    ) -> None:
+        """初始化滚动引擎。
+
+        Args:
+            backend: 输入后端
+            capture: 截图函数
+            finder: 文本查找函数（scroll_until_visible 需要）
+            settle_delay: 滚动后等待页面渲染的时间（秒）
+            end_threshold: 滚动前后帧变化比例低于该值时视为到达页面尽头
+        """
+        self.backend = backend
+        self.capture = capture
+        self.finder = finder
+        self.settle_delay = settle_delay
+        self.end_threshold = end_threshold
+
+    def scroll(self, direction: str = "down", distance: int = 3) -> None:
+        """滚动页面（单个聚合滚轮事件）。
+
+        Args:
+            direction: 滚动方向（up、down、left、right）
+            distance: 滚动距离（滚动单位数）
+
+        Raises:
+            ValueError: 不支持的滚动方向
+        """
+        if direction not in _DIRECTIONS:
+            raise ValueError(f"不支持的滚动方向: {direction}")
+
+        sign, horizontal = _DIRECTIONS[direction]
+        if distance > 0:
+            self.backend.scroll(sign * SCROLL_CLICKS_PER_UNIT * distance, horizontal=horizontal)
+
+    def scroll_until_visible(
+        self,
+        text: str,
+        direction: str = "down",
+        step: int = 3,
+        max_steps: int = 20,
+    ) -> UIElement | None:
+        """滚动直到包含指定文本的元素出现。
+
+        Args:
+            text: 目标文本
+            direction: 滚动方向
+            step: 每步滚动距离（滚动单位数）
+            max_steps: 最大滚动步数
+
+        Returns:
+            找到的元素；到达页面尽头或超过最大步数仍未找到时返回 None
+        """
+        if self.finder is None:
+            raise RuntimeError("未配置文本查找函数")
+
+        frame = self.capture()
+        elements = self.finder(frame, text)
+        if elements:
+            return elements[0]
+
+        for index in range(max_steps):
+            self.scroll(direction, step)
+            if self.settle_delay:
+                time.sleep(self.settle_delay)
+
+            previous, frame = frame, self.capture()
+            if frame_diff_ratio(previous, frame) < self.end_threshold:
+                logger.info(f"已滚动到页面尽头，未找到: {text}（{index + 1} 步）")
+                return None
+
+            elements = self.finder(frame, text)
+            if elements:
+                logger.info(f"滚动 {index + 1} 步后找到: {text}")
+                return elements[0]
+
+        logger.info(f"超过最大滚动步数，未找到: {text}")
+        return None
@@ -7,6 +7,7 @@ from .schema import (
     MainConfig,
     OperationConfig,
     PostCheckConfig,
+    RegionConfig,
 )
 
 __all__ = [
@@ -16,4 +17,5 @@ __all__ = [
     "MainConfig",
     "OperationConfig",
     "PostCheckConfig",
+    "RegionConfig",
 ]
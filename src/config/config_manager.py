@@ -15,6 +15,7 @@ from .schema import (
     MainConfig,
     OperationConfig,
     PostCheckConfig,
+    RegionConfig,
     TemplateMatchingConfig,
 )
 
@@ -75,6 +76,28 @@ class PostCheckConfigModel(BaseModel):
         )
 
 
+class RegionConfigModel(BaseModel):
+    """Region 配置的 Pydantic 模型。"""
+
+    x: float = 0.0
+    y: float = 0.0
+    width: float = Field(default=1.0, gt=0)
+    height: float = Field(default=1.0, gt=0)
+    anchor: str | None = None
+    anchor_confidence: float | None = None
+
+    def to_region_config(self) -> RegionConfig:
+        """转换为 RegionConfig。"""
+        return RegionConfig(
+            x=self.x,
+            y=self.y,
+            width=self.width,
+            height=self.height,
+            anchor=self.anchor,
+            anchor_confidence=self.anchor_confidence,
+        )
+
+
 class OperationConfigModel(BaseModel):
     """Operation 配置的 Pydantic 模型。"""
 
@@ -90,6 +113,9 @@ class OperationConfigModel(BaseModel):
     risk_level: str = "low"
     template: str | None = None
     confidence: float | None = None
+    pointer_mode: str | None = None
+    region: RegionConfigModel | None = None
+    timeout: float | None = Field(default=None, gt=0)
 
     def to_operation_config(self) -> OperationConfig:
         """转换为 OperationConfig。"""
@@ -106,6 +132,9 @@ class OperationConfigModel(BaseModel):
             risk_level=self.risk_level,
             template=self.template,
             confidence=self.confidence,
+            pointer_mode=self.pointer_mode,
+            region=self.region.to_region_config() if self.region else None,
+            timeout=self.timeout,
         )
 
 
@@ -206,6 +235,7 @@ class ConfigManager:
             APIConfig,
             AutomationConfig,
             IDEConfig,
+            IntentConfig,
             SafetyConfig,
             SystemConfig,
             TemplateMatchingConfig,
@@ -219,6 +249,7 @@ class ConfigManager:
         safety_data = data.get("safety", {})
         vision_data = data.get("vision", {})
         template_matching_data = data.get("template_matching", {})
+        intent_data = data.get("intent", {})
 
         # 加载 IDE 操作配置
         ide_config_path = ide_data.get("config_path")
@@ -227,19 +258,35 @@ class ConfigManager:
         else:
             self._ide_config = IDEConfig(name="unknown", version=">=0.0", operations=[])
 
+        zhipuai_data = api_data.get("zhipuai", {})
+
         return MainConfig(
             system=SystemConfig(**system_data),
             ide=self._ide_config,
             api=APIConfig(
-                zhipuai_api_key=api_data.get("zhipuai", {}).get("api_key", ""),
-                model=api_data.get("zhipuai", {}).get("model", "glm-4v-flash"),
-                timeout=api_data.get("zhipuai", {}).get("timeout", 30),
-                base_url=api_data.get("zhipuai", {}).get("base_url"),
+                zhipuai_api_key=zhipuai_data.get("api_key", ""),
+                model=zhipuai_data.get("model", "glm-4v-flash"),
+                timeout=zhipuai_data.get("timeout", 30),
+                base_url=zhipuai_data.get("base_url"),
+                max_connections=zhipuai_data.get("max_connections", 10),
+                keepalive_expiry=zhipuai_data.get("keepalive_expiry", 30.0),
+                max_in_flight=zhipuai_data.get("max_in_flight", 4),
+                stream=zhipuai_data.get("stream", True),
+                rate_limit=zhipuai_data.get("rate_limit", 0.0),
+                rate_burst=zhipuai_data.get("rate_burst", 0),
+                max_retries=zhipuai_data.get("max_retries", 3),
+                retry_base_delay=zhipuai_data.get("retry_base_delay", 0.5),
+                retry_max_delay=zhipuai_data.get("retry_max_delay", 8.0),
+                breaker_failure_threshold=zhipuai_data.get("breaker_failure_threshold", 5),
+                breaker_recovery_timeout=zhipuai_data.get("breaker_recovery_timeout", 30.0),
+                cassette=zhipuai_data.get("cassette"),
+                cassette_mode=zhipuai_data.get("cassette_mode", "replay"),
             ),
             automation=AutomationConfig(**automation_data),
             safety=SafetyConfig(**safety_data),
             vision=VisionConfig(**vision_data),
             template_matching=TemplateMatchingConfig(**template_matching_data),
+            intent=IntentConfig(**intent_data),
         )
 
     def load_ide_config(self, path: str) -> IDEConfig:
@@ -31,6 +31,30 @@ class PostCheckConfig:
     parameters: dict[str, Any] | None = None
 
 
+@dataclass
+class RegionConfig:
+    """操作搜索区域配置。
+
+    未设置 anchor 时 x, y, width, height 为截图（窗口）宽高的比例（0-1）；
+    设置 anchor 时为相对于锚点模板左上角的像素偏移（可为负）和像素尺寸。
+
+    Attributes:
+        x: 区域左边界
+        y: 区域上边界
+        width: 区域宽度
+        height: 区域高度
+        anchor: 锚点模板图片文件名（可选）
+        anchor_confidence: 锚点模板匹配置信度阈值（可选）
+    """
+
+    x: float = 0.0
+    y: float = 0.0
+    width: float = 1.0
+    height: float = 1.0
+    anchor: str | None = None
+    anchor_confidence: float | None = None
+
+
 @dataclass
 class OperationConfig:
     """IDE 操作配置。
@@ -48,6 +72,9 @@ class OperationConfig:
         risk_level: 风险等级
         template: 模板图片文件名（用于 template_match 意图）
         confidence: 模板匹配置信度阈值
+        pointer_mode: 指针模式（animated / instant），None 表示使用 automation.pointer_mode
+        region: 搜索区域（只在该区域内定位），None 表示整张截图
+        timeout: 定位时间预算（秒），超出时跳过来不及完成的定位阶段，None 表示不限时
     """
 
     name: str
@@ -62,6 +89,9 @@ class OperationConfig:
     risk_level: str = "low"
     template: str | None = None
     confidence: float | None = None
+    pointer_mode: str | None = None
+    region: RegionConfig | None = None
+    timeout: float | None = None
 
 
 @dataclass
@@ -80,6 +110,10 @@ class SystemConfig:
     log_level: str = "INFO"
     log_file: str = "logs/ide_controller.log"
     screenshot_dir: str = "screenshots/"
+    # 截图范围: screen（整个屏幕）、window（最近激活的目标窗口，未激活窗口时截取整个屏幕）
+    capture_scope: str = "screen"
+    # 目标窗口位置缓存有效期（秒），过期后重新查询以跟随窗口移动和调整大小
+    window_geometry_ttl: float = 0.5
 
 
 @dataclass
@@ -91,6 +125,28 @@ class APIConfig:
     timeout: int = 30
     # LLM API Base URL（可选，用于自定义代理或兼容接口）
     base_url: str | None = None
+    # 连接池最大连接数（所有模块共享）
+    max_connections: int = 10
+    # 空闲连接保持时间（秒）
+    keepalive_expiry: float = 30.0
+    # 每个模型同时进行的最大请求数
+    max_in_flight: int = 4
+    # 流式调用 LLM（增量解码 JSON，拿到所需字段后停止读取）
+    stream: bool = True
+    # 限流：每秒最多发出的请求数（0 表示不限流）和突发容量（0 表示等于速率）
+    rate_limit: float = 0.0
+    rate_burst: int = 0
+    # 429 / 5xx / 超时时的指数退避重试
+    max_retries: int = 3
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 8.0
+    # 熔断：连续失败多少次后熔断（0 表示不熔断），熔断持续时间（秒）
+    breaker_failure_threshold: int = 5
+    breaker_recovery_timeout: float = 30.0
+    # 录制/回放 LLM 请求的文件路径（可选，用于离线可复现的端到端测试）
+    cassette: str | None = None
+    # 录制模式: replay（只回放）、record（总是录制）、auto（有录制时回放，否则录制）
+    cassette_mode: str = "replay"
 
 
 @dataclass
@@ -103,6 +159,16 @@ class AutomationConfig:
     action_delay: float = 0.2
     # 坐标校准偏移量 [x_offset, y_offset]
     coordinate_offset: list[int] = None
+    # 文本输入模式: auto（按长度/字符自动选择）、type（逐字键入）、paste（剪贴板粘贴）
+    text_input_mode: str = "auto"
+    # auto 模式下改用剪贴板粘贴的文本长度阈值
+    paste_threshold: int = 32
+    # 输入后端: pyautogui（默认）、xtest（Linux X11 直接注入，无隐式暂停）、virtual（仅记录）
+    input_backend: str = "pyautogui"
+    # 默认指针模式: animated（动画移动 + 隐式暂停）、instant（无动画、无隐式暂停，用于可信环境）
+    pointer_mode: str = "animated"
+    # instant 模式下拖拽发送的移动事件数
+    drag_steps: int = 2
 
 
 @dataclass
@@ -119,6 +185,30 @@ class VisionConfig:
     """视觉识别配置。"""
 
     enabled: bool = True
+    # 分块定位大尺寸截图（多显示器虚拟屏幕按显示器分块，超过单块尺寸上限时按网格切分）
+    tiling: bool = False
+    tile_width: int = 1920
+    tile_height: int = 1200
+    # 网格切分时相邻块重叠像素
+    tile_overlap: int = 64
+    # 某块找到置信度不低于该值的目标后不再等待其他块
+    tile_stop_confidence: float = 0.85
+    # 两阶段定位（先在缩小的截图上粗定位，再按原始分辨率裁剪粗定位区域精确定位）
+    refine: bool = False
+    # 粗定位时截图长边缩放到的像素数
+    coarse_max_side: int = 1024
+    # 精确定位时粗定位区域每边扩展的像素
+    refine_margin: int = 96
+    # 每次定位最多精确定位的元素数
+    refine_limit: int = 2
+    # 定位失败结果有效期（秒），屏幕未变化时再次定位同一目标直接返回未找到；0 表示禁用
+    negative_cache_ttl: float = 30.0
+    # 空闲时在后台建立界面地图（OCR 和模板扫描目标窗口），执行命令时先从地图中查找目标
+    ui_map: bool = False
+    # 距离最近一次命令多久（秒）后开始建图
+    ui_map_idle_seconds: float = 3.0
+    # 建图线程的运行时间占比上限 (0-1]
+    ui_map_cpu_budget: float = 0.25
 
 
 @dataclass
@@ -141,6 +231,24 @@ class TemplateMatchingConfig:
             self.scales = [0.8, 0.9, 1.0, 1.1, 1.2]
 
 
+@dataclass
+class IntentConfig:
+    """意图识别配置。"""
+
+    # 识别结果缓存最大条目数（0 表示禁用）
+    cache_size: int = 256
+    # 识别结果缓存过期时间（秒）
+    cache_ttl: float = 600.0
+    # 是否在调用 LLM 前使用本地快速分类
+    local_classifier: bool = True
+    # 本地分类的相似度门限（0-1），越高越保守
+    local_threshold: float = 0.6
+    # 本地分类要求领先第二名意图的最小相似度差
+    local_margin: float = 0.1
+    # 提示词中最多包含的候选意图数（按本地相似度挑选，0 表示包含全部意图）
+    shortlist_size: int = 5
+
+
 @dataclass
 class MainConfig:
     """主配置文件。"""
@@ -152,3 +260,8 @@ class MainConfig:
     safety: SafetyConfig
     vision: VisionConfig = None
     template_matching: TemplateMatchingConfig = None
+    intent: IntentConfig = None
+
+    def __post_init__(self):
+        if self.intent is None:
+            self.intent = IntentConfig()
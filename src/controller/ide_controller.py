@@ -1,11 +1,17 @@
 """IDE 控制主控制器。"""
 
 import re
+import threading
 import time
+from collections.abc import Iterator
 from typing import Any
 
-from src.automation.actions import Action, ActionType
+from PIL import Image
+
+from src.automation.backends import create_input_backend
+from src.automation.compiler import ActionCompiler
 from src.automation.executor import AutomationExecutor
+from src.automation.text_input import TextInjector
 from src.browser.automation import BrowserAutomation
 from src.browser.browser_launcher import BrowserLauncher
 from src.browser.exceptions import (
@@ -15,9 +21,17 @@ from src.browser.exceptions import (
 )
 from src.config.config_manager import ConfigManager
 from src.config.schema import MainConfig, OperationConfig
+from src.infrastructure.deadline import Deadline
+from src.llm import AsyncLLMService, Cassette, LLMResilience, LLMService
+from src.locator.ocr_index import OCRIndex
+from src.locator.regions import RegionResolver, fraction_box, to_frame_elements
 from src.locator.screenshot import ScreenshotCapture
+from src.locator.spatial import DIRECTIONS, SpatialIndex
 from src.locator.template_matcher import TemplateMatcher
+from src.locator.tiling import expand_box, offset_box
+from src.locator.ui_map import UIMap, UIMapIndexer
 from src.locator.visual_locator import VisualLocator
+from src.models.element import UIElement
 from src.models.result import ExecutionResult, ExecutionStatus
 from src.parser.command_parser import CommandParser
 from src.window.exceptions import WindowActivationError, WindowNotFoundError
@@ -31,6 +45,10 @@ from src.workflow.validator import WorkflowValidator
 class IDEController:
     """IDE 控制主控制器。"""
 
+    # 界面地图及其建图线程（vision.ui_map 启用时创建）
+    _ui_map: UIMap | None = None
+    _ui_indexer: UIMapIndexer | None = None
+
     def __init__(self, config_path: str, api_key: str) -> None:
         """初始化控制器。
 
@@ -44,6 +62,21 @@ class IDEController:
 
         # 获取 base_url（如果配置了）
         base_url = self.config.api.base_url
+        if base_url:
+            print(f"[初始化] 使用自定义 LLM API: {base_url}")
+
+        # 限流 / 退避重试 / 熔断（同步和异步客户端共享配额和熔断状态）
+        resilience = LLMResilience.from_config(self.config.api)
+        # 共享 LLM 客户端（连接池 + 并发限制 + 超时），所有模块共用
+        self.llm = LLMService.from_config(self.config.api, api_key, resilience) if api_key else None
+        # 异步 LLM 客户端（供 HTTP API 的事件循环使用，不阻塞其他请求）
+        self.async_llm = AsyncLLMService.from_config(self.config.api, api_key, resilience) if api_key else None
+        # 录制/回放 LLM 请求（replay 模式离线运行，不需要 API Key）
+        if self.config.api.cassette:
+            cassette = Cassette(self.config.api.cassette, mode=self.config.api.cassette_mode, client=self.llm)
+            print(f"[初始化] LLM 请求{cassette.mode}: {cassette.path}")
+            self.llm = cassette
+            self.async_llm = cassette.as_async(self.async_llm)
 
         # 初始化各模块
         self.parser = CommandParser(
@@ -51,6 +84,8 @@ class IDEController:
             api_key=api_key,
             model=self.config.api.model,
             base_url=base_url,
+            llm_client=self.llm,
+            stream=self.config.api.stream,
         )
 
         self.screenshot = ScreenshotCapture(self.config.system)
@@ -60,6 +95,18 @@ class IDEController:
             screenshot_capture=self.screenshot,
             vision_enabled=self.config.vision.enabled,
             base_url=base_url,
+            llm_client=self.llm,
+            async_llm_client=self.async_llm,
+            stream=self.config.api.stream,
+            tiling=self.config.vision.tiling,
+            tile_size=(self.config.vision.tile_width, self.config.vision.tile_height),
+            tile_overlap=self.config.vision.tile_overlap,
+            tile_stop_confidence=self.config.vision.tile_stop_confidence,
+            refine=self.config.vision.refine,
+            coarse_max_side=self.config.vision.coarse_max_side,
+            refine_margin=self.config.vision.refine_margin,
+            refine_limit=self.config.vision.refine_limit,
+            negative_cache_ttl=self.config.vision.negative_cache_ttl,
         )
 
         # 初始化模板匹配器
@@ -74,6 +121,12 @@ class IDEController:
         else:
             self.template_matcher = None
 
+        # 操作搜索区域解析器（锚点区域使用模板匹配器）
+        self._regions = RegionResolver(self.template_matcher)
+
+        # 屏幕文本索引（按位置关系选择目标时查找参考文本，与浏览器自动化共用）
+        self._ocr_index = OCRIndex()
+
         # 设置坐标偏移量（如果有配置）
         if (
             hasattr(self.config.automation, "coordinate_offset")
@@ -82,14 +135,32 @@ class IDEController:
             self.locator.set_coordinate_offset(self.config.automation.coordinate_offset)
             print(f"[初始化] 坐标偏移量: {self.config.automation.coordinate_offset}")
 
+        self.input_backend = create_input_backend(
+            self.config.automation.input_backend,
+            pause=self.config.automation.action_delay,
+        )
+        self.text_injector = TextInjector(
+            mode=self.config.automation.text_input_mode,
+            paste_threshold=self.config.automation.paste_threshold,
+            backend=self.input_backend,
+        )
+
         self.executor = AutomationExecutor(
             default_timeout=self.config.automation.default_timeout,
             max_retries=self.config.automation.max_retries,
             action_delay=self.config.automation.action_delay,
+            text_injector=self.text_injector,
+            backend=self.input_backend,
+            pointer_mode=self.config.automation.pointer_mode,
+            drag_steps=self.config.automation.drag_steps,
         )
 
-        # 初始化窗口管理器
-        self._window_manager = WindowManager()
+        # 操作序列编译器（缓存每个操作编译后的操作程序）
+        self._action_compiler = ActionCompiler()
+
+        # 初始化窗口管理器（记录最近激活的目标窗口，capture_scope 为 window 时截图跟随该窗口）
+        self._window_manager = WindowManager(geometry_ttl=self.config.system.window_geometry_ttl)
+        self._capture_scope = self.config.system.capture_scope
 
         # 初始化浏览器启动器
         self._browser_launcher = BrowserLauncher()
@@ -112,27 +183,26 @@ class IDEController:
 
         # 尝试初始化意图识别模块
         try:
-            from zhipuai import ZhipuAI
-
             from src.intent.recognizer import IntentRecognizer
             from src.orchestration.adapters import BrowserSystemAdapter, IDESystemAdapter
             from src.orchestration.executor import TaskExecutor
             from src.orchestration.orchestrator import TaskOrchestrator
             from src.templates.loader import TemplateLoader
 
-            # 初始化 LLM 客户端（支持自定义 base_url）
-            llm_kwargs = {"api_key": api_key}
-            if self.config.api.base_url:
-                llm_kwargs["base_url"] = self.config.api.base_url
-                print(f"[初始化] 使用自定义 LLM API: {self.config.api.base_url}")
-            llm_client = ZhipuAI(**llm_kwargs)
-
             # 初始化意图识别器
             intent_definitions_path = "config/intent_definitions.yaml"
+            intent_config = self.config.intent
             self._intent_recognizer = IntentRecognizer(
                 intent_definitions_path=intent_definitions_path,
-                llm_client=llm_client,
+                llm_client=self.llm,
+                async_llm_client=self.async_llm,
                 llm_model=self.config.api.model,
+                cache_size=intent_config.cache_size,
+                cache_ttl=intent_config.cache_ttl,
+                local_threshold=intent_config.local_threshold if intent_config.local_classifier else None,
+                local_margin=intent_config.local_margin,
+                shortlist_size=intent_config.shortlist_size,
+                stream=self.config.api.stream,
             )
 
             # 初始化模板加载器
@@ -165,18 +235,32 @@ class IDEController:
         # 运行状态
         self._running = True
 
-    def execute_command(self, command: str, template_name: str | None = None, skip_intent_recognition: bool = False) -> ExecutionResult:
+        # 空闲时建立界面地图
+        if self.config.vision.ui_map:
+            self._start_ui_map()
+
+    def execute_command(
+        self,
+        command: str,
+        template_name: str | None = None,
+        skip_intent_recognition: bool = False,
+        deadline: Deadline | float | None = None,
+    ) -> ExecutionResult:
         """执行自然语言命令。
 
         Args:
             command: 自然语言命令
             template_name: 模板图片文件名（可选）
             skip_intent_recognition: 是否跳过意图识别，直接使用传统解析（用于工作流等场景）
+            deadline: 截止时间或时间预算（秒，可选），限制 UI 元素定位的耗时
 
         Returns:
             执行结果
         """
         start_time = time.time()
+        # 执行命令期间建图线程让出
+        if self._ui_indexer:
+            self._ui_indexer.pause()
 
         try:
             # 判断是否需要跳过意图识别
@@ -350,7 +434,7 @@ class IDEController:
 
             # 5. 执行操作
             result = self._execute_operation(
-                op_config, parsed.parameters, template_name=template_name
+                op_config, parsed.parameters, template_name=template_name, deadline=deadline
             )
 
             duration_ms = int((time.time() - start_time) * 1000)
@@ -371,12 +455,16 @@ class IDEController:
                 error=str(e),
                 duration_ms=duration_ms,
             )
+        finally:
+            if self._ui_indexer:
+                self._ui_indexer.resume()
 
     def _execute_operation(
         self,
         op_config: OperationConfig,
         parameters: dict[str, Any],
         template_name: str | None = None,
+        deadline: Deadline | float | None = None,
     ) -> ExecutionResult:
         """执行操作。
 
@@ -384,65 +472,37 @@ class IDEController:
             op_config: 操作配置
             parameters: 命令参数
             template_name: 命令行指定的模板名称（优先级高于配置）
+            deadline: 截止时间或时间预算（秒，可选），与操作配置的 timeout 取较早者
 
         Returns:
             执行结果
         """
         try:
-            # 1. 捕获屏幕截图
-            screenshot = self.screenshot.capture_fullscreen()
+            budget = Deadline.coerce(deadline).within(op_config.timeout)
+            truncated = False
 
-            # 2. 定位 UI 元素
+            # 1-2. 按从小到大的范围截图并定位 UI 元素（操作区域 → 目标窗口 → 整个屏幕），
+            #      找到后换算为整个屏幕截图的坐标
             elements = []
-
-            # 优先级 1: 模板匹配（如果配置了 template 或命令行指定了模板）
-            template_to_use = template_name or op_config.template
-            if template_to_use and self.template_matcher:
-                print(f"[定位] 使用模板匹配: {template_to_use}")
-                # 使用操作配置中的置信度，或使用默认值
-                threshold = op_config.confidence or self.template_matcher.default_confidence
-                elements = self.template_matcher.match(
-                    screenshot,
-                    template_to_use,
-                    threshold=threshold,
-                )
+            for scope, image, origin in self._capture_scopes(op_config):
+                if budget.expired:
+                    print(f"[截图] 时间预算已用完，不再在{scope}内定位")
+                    truncated = True
+                    break
+                print(f"[截图] 在{scope}内定位（{image.width}x{image.height}，左上角 {origin}）")
+                elements = self._locate_elements(op_config, parameters, image, template_name, budget)
+                truncated = truncated or getattr(elements, "truncated", False)
                 if elements:
-                    print(f"[定位] 模板匹配成功，找到 {len(elements)} 个结果")
-                    for i, elem in enumerate(elements):
-                        center_x, center_y = elem.center
-                        print(f"       元素 {i}: {elem.description}")
-                        print(
-                            f"       bbox={elem.bbox}, 中心=({center_x}, {center_y}), 置信度={elem.confidence}"
-                        )
-                else:
-                    print("[定位] 模板匹配未找到结果")
-
-            # 优先级 2: 视觉识别/OCR（如果没有配置模板或模板匹配失败）
-            if not elements:
-                # 替换提示词中的参数
-                prompt = self._format_prompt(op_config.visual_prompt, parameters)
-
-                # 提取目标过滤参数（根据操作类型选择合适的参数）
-                # - file_operation: 使用 filename
-                # - input: 使用 context_text（用于定位参考元素）
-                # - 其他: 使用 filename 或 context_text
-                if op_config.intent == "input":
-                    target_filter = parameters.get("context_text", None)
-                else:
-                    target_filter = parameters.get("filename", None)
-
-                elements = self.locator.locate(prompt, screenshot, target_filter=target_filter)
-
-                # 显示定位结果（调试用）
-                if elements and target_filter:
-                    for i, elem in enumerate(elements):
-                        center_x, center_y = elem.center
-                        print(f"[定位] 元素 {i}: {elem.description}")
-                        print(
-                            f"       bbox={elem.bbox}, 中心=({center_x}, {center_y}), 置信度={elem.confidence}"
-                        )
-                    print(f"[定位] 选择最匹配 '{target_filter}' 的元素")
+                    elements = to_frame_elements(elements, origin)
+                    break
+                print(f"[截图] {scope}内未找到目标")
 
+            if not elements and truncated:
+                return ExecutionResult(
+                    status=ExecutionStatus.TIMEOUT,
+                    message="UI 元素定位超时",
+                    error="时间预算内未找到目标 UI 元素（部分定位阶段因时间不足被跳过）",
+                )
             if not elements:
                 return ExecutionResult(
                     status=ExecutionStatus.FAILED,
@@ -450,53 +510,12 @@ class IDEController:
                     error="无法找到目标 UI 元素",
                 )
 
-            # 3. 转换操作配置为 Action 对象
-            actions = []
-            for action_cfg in op_config.actions:
-                # 检查条件执行：如果操作标记为 conditional 且相关参数不存在，则跳过
-                if action_cfg.parameters and action_cfg.parameters.get("conditional"):
-                    # 检查是否满足条件（例如 submit_action 存在）
-                    conditional_param = action_cfg.parameters.get(
-                        "conditional_param", "submit_action"
-                    )
-                    if conditional_param not in parameters or not parameters[conditional_param]:
-                        continue  # 跳过此操作
-
-                # 安全地转换操作类型
-                try:
-                    action_type = ActionType(action_cfg.type)
-                except (ValueError, KeyError):
-                    # 如果类型不匹配，尝试按字符串匹配
-                    action_type_map = {
-                        "click": ActionType.CLICK,
-                        "double_click": ActionType.DOUBLE_CLICK,
-                        "right_click": ActionType.RIGHT_CLICK,
-                        "drag": ActionType.DRAG,
-                        "type": ActionType.TYPE,
-                        "shortcut": ActionType.SHORTCUT,
-                        "wait": ActionType.WAIT,
-                        "wait_for_dialog": ActionType.WAIT_FOR_DIALOG,
-                    }
-                    action_type = action_type_map.get(action_cfg.type, ActionType.SHORTCUT)
-
-                actions.append(
-                    Action(
-                        type=action_type,
-                        target=action_cfg.target,
-                        parameters=action_cfg.parameters,
-                        timeout=action_cfg.timeout,
-                        retry=action_cfg.retry,
-                    )
-                )
+            # 3. 获取编译后的操作程序（按操作名称和参数形态缓存）
+            program = self._action_compiler.compile(op_config, parameters)
 
-            # 替换参数中的占位符
-            for action in actions:
-                if action.parameters:
-                    action.parameters = self._format_parameters(action.parameters, parameters)
-
-            # 4. 执行操作序列
+            # 4. 执行操作程序
             elements_map = {str(i): elem for i, elem in enumerate(elements)}
-            success = self.executor.execute_sequence(actions, elements_map)
+            success = self.executor.run_program(program, parameters, elements_map)
 
             if success:
                 return ExecutionResult(
@@ -518,6 +537,286 @@ class IDEController:
                 error=str(e),
             )
 
+    def _capture_scopes(self, op_config: OperationConfig) -> Iterator[tuple[str, Image.Image, tuple[int, int]]]:
+        """按从小到大的范围依次截图：操作区域 → 目标窗口 → 整个屏幕（按需截取）。
+
+        capture_scope 为 window 且有最近激活的目标窗口时只截取该窗口，比例区域相对于窗口；
+        比例区域不依赖截图内容，直接只截取该区域；锚点区域需要先在窗口（屏幕）截图中找到锚点。
+
+        Args:
+            op_config: 操作配置
+
+        Yields:
+            (范围名称, 截图, 截图左上角在整个屏幕截图中的坐标)
+        """
+        base, window_box = self._capture_base_box()
+        region = op_config.region
+
+        if region is not None and not region.anchor:
+            box = offset_box(fraction_box(region, (base[2] - base[0], base[3] - base[1])), base[0], base[1])
+            if box[2] > box[0] and box[3] > box[1]:
+                yield "区域", self._grab(box), (box[0], box[1])
+
+        frame = self._grab(window_box) if window_box else self.screenshot.capture_fullscreen()
+        if region is not None and region.anchor:
+            box = self._regions.resolve(region, frame)
+            if box is not None:
+                yield "区域", frame.crop(box), (base[0] + box[0], base[1] + box[1])
+
+        if window_box is None:
+            yield "屏幕", frame, (0, 0)
+            return
+        yield "窗口", frame, (window_box[0], window_box[1])
+        # 对话框、弹出菜单可能在目标窗口之外
+        yield "屏幕", self.screenshot.capture_fullscreen(), (0, 0)
+
+    def _capture_base_box(
+        self, screenshot: ScreenshotCapture | None = None
+    ) -> tuple[tuple[int, int, int, int], tuple[int, int, int, int] | None]:
+        """获取截图基准范围（整个屏幕截图坐标）。
+
+        Args:
+            screenshot: 截图器（可选，默认使用控制器的截图器；其他线程需要传入自己的截图器）
+
+        Returns:
+            (基准范围, 目标窗口范围)；不跟随窗口或窗口不可用时目标窗口范围为 None，基准范围为整个屏幕
+        """
+        virtual = (screenshot or self.screenshot).get_monitors()[0]
+        screen = (0, 0, virtual["width"], virtual["height"])
+        if self._capture_scope != "window":
+            return screen, None
+        rect = self._window_manager.get_target_rect()
+        if rect is None:
+            return screen, None
+        # 屏幕坐标换算为整个屏幕截图的坐标，并裁剪到屏幕范围内（窗口可能部分在屏幕外）
+        box = expand_box(offset_box(rect, -virtual["left"], -virtual["top"]), 0, (virtual["width"], virtual["height"]))
+        if box[2] <= box[0] or box[3] <= box[1]:
+            return screen, None
+        return box, box
+
+    def _grab(self, box: tuple[int, int, int, int]) -> Image.Image:
+        """截取整个屏幕截图坐标下的一个范围。
+
+        Args:
+            box: 范围 (x1, y1, x2, y2)
+
+        Returns:
+            截图图像
+        """
+        virtual = self.screenshot.get_monitors()[0]
+        return self.screenshot.capture_region(
+            virtual["left"] + box[0], virtual["top"] + box[1], box[2] - box[0], box[3] - box[1]
+        )
+
+    def _locate_elements(
+        self,
+        op_config: OperationConfig,
+        parameters: dict[str, Any],
+        screenshot: Image.Image,
+        template_name: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> list[UIElement]:
+        """在截图（或搜索区域）中定位操作的目标元素。
+
+        Args:
+            op_config: 操作配置
+            parameters: 命令参数
+            screenshot: 截图（或搜索区域的裁剪图）
+            template_name: 命令行指定的模板名称（优先级高于配置）
+            deadline: 截止时间（可选，传给视觉定位器）
+
+        Returns:
+            定位到的元素列表（截图坐标；视觉定位时为 LocateResult，truncated 表示因时间不足结果可能不完整）
+        """
+        # 优先级 0: 界面地图（空闲时建立，校验目标仍在原处后直接使用）
+        elements = self._resolve_from_map(op_config, parameters, screenshot, template_name)
+        if elements:
+            return elements
+
+        # 优先级 1: 模板匹配（如果配置了 template 或命令行指定了模板）
+        template_to_use = template_name or op_config.template
+        if template_to_use and self.template_matcher:
+            print(f"[定位] 使用模板匹配: {template_to_use}")
+            # 使用操作配置中的置信度，或使用默认值
+            threshold = op_config.confidence or self.template_matcher.default_confidence
+            elements = self.template_matcher.match(
+                screenshot,
+                template_to_use,
+                threshold=threshold,
+            )
+            if elements:
+                print(f"[定位] 模板匹配成功，找到 {len(elements)} 个结果")
+                for i, elem in enumerate(elements):
+                    center_x, center_y = elem.center
+                    print(f"       元素 {i}: {elem.description}")
+                    print(
+                        f"       bbox={elem.bbox}, 中心=({center_x}, {center_y}), 置信度={elem.confidence}"
+                    )
+            else:
+                print("[定位] 模板匹配未找到结果")
+
+        # 优先级 2: 视觉识别/OCR（如果没有配置模板或模板匹配失败）
+        if not elements:
+            # 替换提示词中的参数
+            prompt = self._format_prompt(op_config.visual_prompt, parameters)
+
+            # 提取目标过滤参数（根据操作类型选择合适的参数）
+            # - file_operation: 使用 filename
+            # - input: 使用 context_text（用于定位参考元素）
+            # - 其他: 使用 filename 或 context_text
+            if op_config.intent == "input":
+                target_filter = parameters.get("context_text", None)
+            else:
+                target_filter = parameters.get("filename", None)
+
+            elements = self.locator.locate(prompt, screenshot, target_filter=target_filter, deadline=deadline)
+
+            # 显示定位结果（调试用）
+            if elements and target_filter:
+                for i, elem in enumerate(elements):
+                    center_x, center_y = elem.center
+                    print(f"[定位] 元素 {i}: {elem.description}")
+                    print(
+                        f"       bbox={elem.bbox}, 中心=({center_x}, {center_y}), 置信度={elem.confidence}"
+                    )
+                print(f"[定位] 选择最匹配 '{target_filter}' 的元素")
+
+        # 多个候选时按位置关系（如“本地下方的输入框”）在本地选出目标，不再请求视觉模型
+        if len(elements) > 1:
+            resolved = self._resolve_relation(screenshot, elements, parameters)
+            if resolved is not None:
+                elements = [resolved]
+
+        return elements
+
+    def _resolve_from_map(
+        self,
+        op_config: OperationConfig,
+        parameters: dict[str, Any],
+        screenshot: Image.Image,
+        template_name: str | None = None,
+    ) -> list[UIElement]:
+        """在界面地图中查找目标（按模板名称或目标文件名）。
+
+        Args:
+            op_config: 操作配置
+            parameters: 命令参数
+            screenshot: 截图（地图只保存窗口/屏幕截图的布局，区域裁剪图不会命中）
+            template_name: 命令行指定的模板名称
+
+        Returns:
+            校验通过的元素，地图未启用或未命中时返回空列表
+        """
+        if self._ui_map is None:
+            return []
+        template = (template_name or op_config.template) if self.template_matcher else None
+        # input 操作的 context_text 是参考元素而不是目标，不从地图中查找
+        text = None if template or op_config.intent == "input" else parameters.get("filename")
+        if not (template or text):
+            return []
+        elements = self._ui_map.resolve(screenshot, text=text, template=template)
+        if elements:
+            print(f"[定位] 界面地图命中 '{template or text}'，找到 {len(elements)} 个结果")
+        return elements
+
+    def _start_ui_map(self) -> None:
+        """创建界面地图并启动建图线程（扫描操作配置中的所有模板）。"""
+        local = threading.local()
+
+        def capture() -> Image.Image | None:
+            # mss 实例不能跨线程使用，建图线程使用自己的截图器
+            if not hasattr(local, "screenshot"):
+                local.screenshot = ScreenshotCapture(self.config.system)
+            base, _ = self._capture_base_box(local.screenshot)
+            virtual = local.screenshot.get_monitors()[0]
+            return local.screenshot.capture_region(
+                virtual["left"] + base[0], virtual["top"] + base[1], base[2] - base[0], base[3] - base[1]
+            )
+
+        templates = sorted({op.template for op in self.config.ide.operations if op.template})
+        self._ui_map = UIMap()
+        self._ui_indexer = UIMapIndexer(
+            self._ui_map,
+            capture,
+            template_matcher=self.template_matcher,
+            templates=templates,
+            idle_seconds=self.config.vision.ui_map_idle_seconds,
+            cpu_budget=self.config.vision.ui_map_cpu_budget,
+        )
+        self._ui_indexer.start()
+        print(f"[初始化] 界面地图已启用（{len(templates)} 个模板，CPU 占比上限 {self.config.vision.ui_map_cpu_budget:.0%}）")
+
+    def _resolve_relation(
+        self, screenshot: Image.Image, candidates: list[UIElement], parameters: dict[str, Any]
+    ) -> UIElement | None:
+        """按命令中的位置关系从候选元素中选出目标。
+
+        用 OCR 在截图中找到参考文本（context_text），在候选元素的空间索引上
+        查询参考文本指定方向（position_hint）上最近的元素。
+
+        Args:
+            screenshot: 截图
+            candidates: 候选元素（截图坐标）
+            parameters: 命令参数
+
+        Returns:
+            选出的元素；没有位置提示、找不到参考文本或该方向上没有候选元素时返回 None
+        """
+        direction = DIRECTIONS.get(parameters.get("position_hint", ""))
+        anchor_text = parameters.get("context_text")
+        if direction is None or not anchor_text or not self._ocr_index.available:
+            return None
+
+        try:
+            anchors = self._ocr_index.find(screenshot, anchor_text)
+        except Exception as e:
+            print(f"[OCR] 查找参考文本失败: {e}")
+            return None
+
+        index = SpatialIndex(candidates)
+        for anchor in anchors:
+            target = index.nearest(anchor.bbox, direction)
+            if target is not None:
+                print(f"[定位] 按位置关系选择 '{anchor_text}' {parameters['position_hint']}的元素: {target.description}")
+                return target
+        print(f"[定位] 未找到参考文本 '{anchor_text}' {parameters['position_hint']}的候选元素")
+        return None
+
+    def prefetch_targets(self, operations: list[tuple[str, dict[str, Any]]]) -> int:
+        """为接下来的多个操作一次性定位视觉目标（同一屏幕只发送一次视觉请求）。
+
+        之后执行这些操作时，如果屏幕变化不大，直接使用预取的定位结果。
+        使用模板匹配或没有视觉提示词的操作不预取。
+
+        Args:
+            operations: [(操作名称, 参数), ...]
+
+        Returns:
+            预取的目标数
+        """
+        prompts = []
+        for name, parameters in operations:
+            op_config = self.config_manager.get_operation(name)
+            if op_config is None or not op_config.visual_prompt or op_config.intent == "browser_automation":
+                continue
+            if op_config.template and self.template_matcher:
+                continue
+            # 配置了搜索区域的操作只在区域内定位，整屏预取结果用不上
+            if op_config.region is not None:
+                continue
+            prompt = self._format_prompt(op_config.visual_prompt, parameters or {})
+            # 参数要到解析命令时才能确定
+            if "{" in prompt:
+                continue
+            prompts.append(prompt)
+
+        if len(set(prompts)) < 2:
+            return 0
+        # 与执行操作时的截图范围一致（跟随目标窗口时只截取窗口），预取结果才能复用
+        _, window_box = self._capture_base_box()
+        frame = self._grab(window_box) if window_box else self.screenshot.capture_fullscreen()
+        return self.locator.prefetch(frame, prompts)
+
     def _format_prompt(self, template: str, parameters: dict[str, Any]) -> str:
         """格式化提示词模板。
 
@@ -532,24 +831,6 @@ class IDEController:
             template = template.replace(f"{{{key}}}", str(value))
         return template
 
-    def _format_parameters(self, params: dict[str, Any], values: dict[str, Any]) -> dict[str, Any]:
-        """格式化操作参数。
-
-        Args:
-            params: 参数模板
-            values: 参数值
-
-        Returns:
-            格式化后的参数
-        """
-        result = {}
-        for key, value in params.items():
-            if isinstance(value, str):
-                for k, v in values.items():
-                    value = value.replace(f"{{{k}}}", str(v))
-            result[key] = value
-        return result
-
     def _is_dangerous(self, op_config: OperationConfig) -> bool:
         """检查是否为危险操作。
 
@@ -645,6 +926,10 @@ class IDEController:
         """停止控制器。"""
         self._running = False
 
+        # 停止建图线程
+        if self._ui_indexer:
+            self._ui_indexer.stop()
+
         # 停止配置热更新
         if self.config_manager._enable_hot_reload:
             self.config_manager.stop_hot_reload()
@@ -852,6 +1137,7 @@ class IDEController:
             if window.isMinimized:
                 window.restore()
             window.activate()
+            self._window_manager.set_target_window(window)
 
             # 尝试使用 Win32 API 强制激活
             try:
@@ -951,6 +1237,10 @@ class IDEController:
                 api_key=self.config.api.zhipuai_api_key if self.config else None,
                 model=self.config.api.model if self.config else "glm-4-flash",
                 config=self.config.system if self.config else None,
+                text_injector=self.text_injector,
+                input_backend=self.input_backend,
+                llm_client=self.llm,
+                ocr_index=self._ocr_index,
             )
 
         try:
@@ -976,6 +1266,16 @@ class IDEController:
             elif op_config.name == "browser_scroll":
                 # 从参数中获取滚动方向
                 direction = parameters.get("direction", "down")
+                # 指定了目标元素时，滚动直到目标出现
+                text = parameters.get("locator")
+                if text:
+                    print(f"[浏览器自动化] 向{direction}滚动查找: {text}")
+                    self._browser_automation.scroll_until_visible(text, direction=direction)
+                    return ExecutionResult(
+                        status=ExecutionStatus.SUCCESS,
+                        message=f"已滚动到元素: {text}",
+                    )
+
                 print(f"[浏览器自动化] 向{direction}滚动页面")
                 self._browser_automation.scroll(direction)
                 return ExecutionResult(
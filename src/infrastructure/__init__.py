@@ -1,7 +1,9 @@
 """基础设施模块。"""
 
 from .cache import SimpleCache, hash_dict, memoize as cache_memoize
+from .deadline import Deadline, DeadlineExceededError
 from .logger import Logger
+from .singleflight import AsyncSingleFlight, SingleFlight
 from .utils import (
     format_duration,
     retry,
@@ -14,8 +16,12 @@ from .utils import (
 memoize = cache_memoize
 
 __all__ = [
+    "AsyncSingleFlight",
+    "Deadline",
+    "DeadlineExceededError",
     "Logger",
     "SimpleCache",
+    "SingleFlight",
     "hash_dict",
     "memoize",
     "retry",
@@ -61,6 +61,10 @@ class SimpleCache:
         """清空缓存。"""
         self._cache.clear()
 
+    def __len__(self) -> int:
+        """缓存条目数（包含尚未清理的过期条目）。"""
+        return len(self._cache)
+
     def remove(self, key: str) -> bool:
         """移除缓存条目。
 
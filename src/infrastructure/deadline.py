@@ -0,0 +1,137 @@
+"""时间预算（截止时间）。
+
+一次定位可能依次经过模板匹配、视觉 API 和两轮 OCR，最坏情况下耗时数十秒。
+调用方（工作流步骤、操作配置）给出时间预算后，截止时间沿调用链向下传递：
+每个阶段开始前检查剩余时间，预计来不及完成时跳过；视觉 API 请求的超时时间
+取剩余时间，到期即取消。被跳过或取消的阶段记录在截止时间上，调用方据此得知
+结果是否因时间不足而不完整。
+"""
+
+import time
+
+
+class DeadlineExceededError(TimeoutError):
+    """时间预算已用完。"""
+
+    def __init__(self, stage: str) -> None:
+        super().__init__(f"时间预算已用完: {stage}")
+        self.stage = stage
+
+
+class Deadline:
+    """截止时间。
+
+    不设预算（seconds 为 None）时永不到期，所有检查都放行，可以直接作为默认值传递。
+    """
+
+    def __init__(self, seconds: float | None = None, expires_at: float | None = None) -> None:
+        """初始化截止时间。
+
+        Args:
+            seconds: 时间预算（秒），None 表示不限时
+            expires_at: 到期时刻（time.monotonic），与 seconds 同时给出时取较早者
+        """
+        if seconds is not None:
+            until = time.monotonic() + max(0.0, seconds)
+            expires_at = until if expires_at is None else min(expires_at, until)
+        self.expires_at = expires_at
+        # 因时间不足被跳过或取消的阶段
+        self.truncated_stages: list[str] = []
+
+    @classmethod
+    def coerce(cls, value: "Deadline | float | None") -> "Deadline":
+        """将时间预算（秒）或截止时间统一为新的截止时间对象（到期时刻相同，阶段记录独立）。
+
+        Args:
+            value: 截止时间、时间预算（秒）或 None
+
+        Returns:
+            截止时间
+        """
+        if isinstance(value, Deadline):
+            return cls(expires_at=value.expires_at)
+        return cls(seconds=value)
+
+    def within(self, seconds: float | None) -> "Deadline":
+        """派生一个不晚于当前截止时间的子截止时间。
+
+        Args:
+            seconds: 子预算（秒），None 表示沿用当前截止时间
+
+        Returns:
+            子截止时间
+        """
+        return Deadline(seconds=seconds, expires_at=self.expires_at)
+
+    @property
+    def bounded(self) -> bool:
+        """是否设置了截止时间。"""
+        return self.expires_at is not None
+
+    def remaining(self) -> float | None:
+        """剩余时间（秒）。
+
+        Returns:
+            剩余秒数（不小于 0），不限时返回 None
+        """
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """是否已到期。"""
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def allows(self, estimate: float) -> bool:
+        """剩余时间是否足够完成预计耗时 estimate 秒的阶段。
+
+        Args:
+            estimate: 阶段预计耗时（秒），未知时传 0
+
+        Returns:
+            不限时或剩余时间不少于预计耗时（且未到期）时返回 True
+        """
+        remaining = self.remaining()
+        return remaining is None or (remaining > 0 and remaining >= estimate)
+
+    def timeout(self, cap: float | None = None) -> float | None:
+        """计算请求超时时间（剩余时间与 cap 取较小值）。
+
+        Args:
+            cap: 超时上限（秒，可选）
+
+        Returns:
+            超时秒数，不限时且没有上限时返回 None
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return cap
+        return remaining if cap is None else min(remaining, cap)
+
+    def check(self, stage: str) -> None:
+        """到期时抛出 DeadlineExceededError。
+
+        Args:
+            stage: 当前阶段名称
+
+        Raises:
+            DeadlineExceededError: 已到期
+        """
+        if self.expired:
+            raise DeadlineExceededError(stage)
+
+    def truncate(self, stage: str) -> None:
+        """记录因时间不足被跳过或取消的阶段。
+
+        Args:
+            stage: 阶段名称
+        """
+        if stage not in self.truncated_stages:
+            self.truncated_stages.append(stage)
+
+    @property
+    def truncated(self) -> bool:
+        """是否有阶段因时间不足被跳过或取消。"""
+        return bool(self.truncated_stages)
@@ -0,0 +1,147 @@
+"""相同请求合并（single-flight）。
+
+多个调用方同时发起相同键的请求时，只执行一次，其余调用方等待并共享结果；
+执行出错时，异常同样传给所有等待者。请求结束后立即移除，不缓存结果。
+
+- SingleFlight: 线程调用方（同步函数）
+- AsyncSingleFlight: asyncio 调用方（协程函数）
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class _FlightStats:
+    """合并统计。"""
+
+    def __init__(self) -> None:
+        self.executed = 0
+        self.deduplicated = 0
+
+    def snapshot(self, in_flight: int) -> dict[str, Any]:
+        """生成统计快照。"""
+        total = self.executed + self.deduplicated
+        return {
+            "executed": self.executed,
+            "deduplicated": self.deduplicated,
+            "dedup_rate": self.deduplicated / total if total else 0.0,
+            "in_flight": in_flight,
+        }
+
+
+class SingleFlight:
+    """线程调用方的相同请求合并。"""
+
+    def __init__(self) -> None:
+        """初始化。"""
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self._stats = _FlightStats()
+
+    def do(self, key: Hashable, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """执行请求，相同键的并发请求只执行一次。
+
+        Args:
+            key: 请求键
+            func: 执行函数
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            执行结果（等待者与执行者共享同一个结果对象）
+
+        Raises:
+            Exception: 执行函数抛出的异常（所有等待者都会收到）
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self._stats.executed += 1
+            else:
+                self._stats.deduplicated += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取统计。
+
+        Returns:
+            {executed, deduplicated, dedup_rate, in_flight}
+        """
+        with self._lock:
+            return self._stats.snapshot(len(self._calls))
+
+
+class AsyncSingleFlight:
+    """asyncio 调用方的相同请求合并。"""
+
+    def __init__(self) -> None:
+        """初始化。"""
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self._stats = _FlightStats()
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """执行请求，相同键的并发请求只执行一次。
+
+        共享的请求在单独的任务中执行，某个等待者被取消不会影响其他等待者。
+
+        Args:
+            key: 请求键
+            func: 协程函数
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            执行结果（所有等待者共享同一个结果对象）
+
+        Raises:
+            Exception: 协程抛出的异常（所有等待者都会收到）
+        """
+        loop = asyncio.get_running_loop()
+        task = self._calls.get(key)
+        # 其他事件循环遗留的任务不能在当前循环中等待
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(func(*args, **kwargs))
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self._stats.executed += 1
+        else:
+            self._stats.deduplicated += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """请求结束后移除。"""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # 标记异常已被获取（等待者都已取消时避免 "exception was never retrieved" 警告）
+            task.exception()
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取统计。
+
+        Returns:
+            {executed, deduplicated, dedup_rate, in_flight}
+        """
+        return self._stats.snapshot(len(self._calls))
@@ -0,0 +1,230 @@
+"""意图识别结果缓存。
+
+以归一化后的消息为键缓存识别结果，命中时完全跳过 LLM 调用：
+
+- 归一化：全角转半角、忽略大小写、去掉空白和标点
+- 参数模板化：URL、需求编号以及意图定义中带 ``pattern`` 的参数片段替换为占位符，
+  因此 "查看 https://a/1" 和 "查看https://a/2。" 命中同一条缓存
+- 命中后用意图定义的 ``pattern`` 从新消息中重新提取这些参数
+  （仅当 pattern 在原消息中提取出的值与 LLM 结果一致时）
+
+自由文本参数（没有 pattern）直接复用缓存值；如果其值包含被模板化的片段，
+该结果不会写入缓存，避免把上一条消息的 URL / 编号带到新消息中。
+归一化会忽略大小写和符号，"打开 README.md" 与 "打开 Readme.md" 的键相同，
+因此原消息中原样出现的自由文本参数值，命中时必须也原样出现在新消息中。
+"""
+
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.infrastructure.cache import SimpleCache
+from src.intent.models import Intent, IntentDefinition
+
+logger = logging.getLogger(__name__)
+
+# 通用的参数类片段（意图定义中没有 pattern 时也模板化）
+_GENERIC_PATTERNS = (
+    ("url", re.compile(r"https?://\S+")),
+    ("id", re.compile(r"(?<![A-Za-z0-9])[A-Za-z]+-\d+(?![0-9])")),
+)
+
+
+@dataclass
+class _CachedIntent:
+    """缓存的识别结果。"""
+
+    intent_type: str
+    confidence: float
+    reasoning: str
+    parameters: dict[str, Any] = field(default_factory=dict)
+    pattern_parameters: tuple[str, ...] = ()
+    echoed_parameters: tuple[str, ...] = ()  # 值原样出现在原消息中的自由文本参数
+
+
+class IntentCache:
+    """意图识别结果缓存（有界、带过期时间）。"""
+
+    def __init__(self, max_size: int = 256, ttl: float = 600.0) -> None:
+        """初始化意图缓存。
+
+        Args:
+            max_size: 最大缓存条目数
+            ttl: 缓存过期时间（秒）
+        """
+        self._cache = SimpleCache(max_size=max_size, ttl=ttl)
+        self._definitions: dict[str, IntentDefinition] = {}
+        self._patterns: list[tuple[str, re.Pattern[str]]] = list(_GENERIC_PATTERNS)
+        self.hits = 0
+        self.misses = 0
+
+    def set_definitions(self, definitions: dict[str, IntentDefinition]) -> None:
+        """设置意图定义并清空缓存（意图定义变化后旧结果不再可靠）。
+
+        Args:
+            definitions: 意图名称 -> 意图定义
+        """
+        self._definitions = definitions
+        patterns: dict[tuple[str, str], re.Pattern[str]] = {}
+        for definition in definitions.values():
+            for name, param in definition.parameters.items():
+                if param.pattern and (name, param.pattern) not in patterns:
+                    try:
+                        patterns[(name, param.pattern)] = re.compile(param.pattern)
+                    except re.error as e:
+                        logger.warning(f"参数 {name} 的 pattern 无效: {e}")
+        # 意图定义中的 pattern 优先于通用模式
+        self._patterns = [(name, regex) for (name, _), regex in patterns.items()]
+        self._patterns.extend(_GENERIC_PATTERNS)
+        self.clear()
+
+    def normalize(self, message: str) -> str:
+        """归一化消息，作为缓存键。
+
+        Args:
+            message: 用户消息
+
+        Returns:
+            归一化后的消息
+        """
+        return self._template(message)[0]
+
+    def get(self, message: str) -> Intent | None:
+        """查询缓存。
+
+        Args:
+            message: 用户消息
+
+        Returns:
+            命中时返回意图（参数已从新消息中重新提取），否则返回 None
+        """
+        entry: _CachedIntent | None = self._cache.get(self.normalize(message))
+        definition = self._definitions.get(entry.intent_type) if entry else None
+        if entry is None or definition is None:
+            self.misses += 1
+            return None
+
+        parameters = dict(entry.parameters)
+        for name in entry.pattern_parameters:
+            match = re.search(definition.parameters[name].pattern, message)
+            if match is None:
+                self.misses += 1
+                return None
+            parameters[name] = match.group(0)
+        if any(str(entry.parameters[name]) not in message for name in entry.echoed_parameters):
+            # 键相同但参数值不同（如大小写、下划线不同的文件名）
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return Intent(
+            type=entry.intent_type,
+            parameters=parameters,
+            confidence=entry.confidence,
+            raw_message=message,
+            reasoning=entry.reasoning,
+        )
+
+    def put(self, intent: Intent) -> bool:
+        """缓存识别结果。
+
+        Args:
+            intent: 识别到的意图（raw_message 为原始消息）
+
+        Returns:
+            是否写入缓存
+        """
+        definition = self._definitions.get(intent.type)
+        if definition is None:
+            return False
+
+        message = intent.raw_message
+        key, spans = self._template(message)
+
+        parameters: dict[str, Any] = {}
+        pattern_parameters = []
+        for name, value in intent.parameters.items():
+            param = definition.parameters.get(name)
+            text = str(value)
+            if param and param.pattern:
+                # 只有 pattern 能从原消息中提取出与 LLM 相同的值时，命中后才能重新提取
+                match = re.search(param.pattern, message)
+                if match and match.group(0) == text:
+                    pattern_parameters.append(name)
+                    continue
+            if any(span in text or (text and text in span) for span in spans):
+                # 自由文本参数依赖被模板化的片段，换一条消息就不成立
+                return False
+            parameters[name] = value
+
+        echoed = tuple(name for name, value in parameters.items() if str(value) and str(value) in message)
+        self._cache.set(
+            key,
+            _CachedIntent(
+                intent_type=intent.type,
+                confidence=intent.confidence,
+                reasoning=intent.reasoning,
+                parameters=parameters,
+                pattern_parameters=tuple(pattern_parameters),
+                echoed_parameters=echoed,
+            ),
+        )
+        return True
+
+    def clear(self) -> None:
+        """清空缓存和统计。"""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取缓存统计。
+
+        Returns:
+            {hits, misses, hit_rate, size}
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._cache),
+        }
+
+    def _template(self, message: str) -> tuple[str, list[str]]:
+        """模板化参数片段并归一化其余文本。
+
+        Args:
+            message: 用户消息
+
+        Returns:
+            (归一化后的消息, 被模板化的片段列表)
+        """
+        # 收集参数片段，重叠时保留先出现的片段（同位置按模式优先级，再取更长的）
+        matches = []
+        for priority, (name, regex) in enumerate(self._patterns):
+            for match in regex.finditer(message):
+                if match.end() > match.start():
+                    matches.append((match.start(), priority, match.end(), name))
+        matches.sort()
+
+        parts = []
+        spans = []
+        position = 0
+        for start, _, end, name in matches:
+            if start < position:
+                continue
+            parts.append(fold_text(message[position:start]))
+            parts.append(f"<{name}>")
+            spans.append(message[start:end])
+            position = end
+        parts.append(fold_text(message[position:]))
+        return "".join(parts), spans
+
+
+def fold_text(text: str) -> str:
+    """全角转半角、忽略大小写，并去掉空白、标点和符号。"""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return "".join(ch for ch in text if unicodedata.category(ch)[0] not in "PSZC")
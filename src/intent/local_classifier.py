@@ -0,0 +1,249 @@
+"""本地意图快速分类器。
+
+在调用 LLM 之前，用字符 n-gram TF-IDF 相似度把用户消息与意图定义中的
+描述、示例语句和参数示例做比对，并用参数的 ``pattern`` 提取参数：
+
+- 最高分 >= threshold，且领先第二名 >= margin，且意图的每个参数都有 pattern、
+  必需参数都能提取时，直接返回本地结果（微秒级）
+- 否则交给 LLM 识别（本地相似度仍用于筛选提示词中的候选意图）
+
+没有 pattern 的参数（如需求文本、测试类型、审查范围）无法在本地可靠提取，即使是
+可选参数，本地作答也会把它丢掉，因此声明了这类参数的意图总是交给 LLM。
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+from src.intent.cache import fold_text
+from src.intent.models import Intent, IntentDefinition
+
+# 有效 LLM 结果的置信度下限（与 Intent.is_valid 一致），本地通过门限的结果映射到 [下限, 1.0]
+_VALID_CONFIDENCE = 0.85
+
+
+@dataclass
+class LocalMatch:
+    """本地分类结果。
+
+    Attributes:
+        intent_type: 得分最高的意图（没有任何相似意图时为 None）
+        score: 最高相似度（0-1）
+        margin: 领先第二名的相似度差
+        parameters: 用 pattern 提取到的参数
+        missing: 无法在本地提取的参数（没有 pattern 的参数，或未匹配到的必需参数）
+        accepted: 是否通过置信度门限（可直接作为识别结果）
+    """
+
+    intent_type: str | None
+    score: float
+    margin: float
+    parameters: dict[str, str] = field(default_factory=dict)
+    missing: list[str] = field(default_factory=list)
+    accepted: bool = False
+
+
+class LocalIntentClassifier:
+    """基于字符 n-gram TF-IDF 的本地意图分类器。"""
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        margin: float = 0.1,
+        ngram_range: tuple[int, int] = (1, 2),
+    ) -> None:
+        """初始化本地分类器。
+
+        Args:
+            threshold: 最高相似度门限（0-1）
+            margin: 领先第二名的最小相似度差
+            ngram_range: 字符 n-gram 长度范围
+        """
+        self.threshold = threshold
+        self.margin = margin
+        self.ngram_range = ngram_range
+
+        self._definitions: dict[str, IntentDefinition] = {}
+        self._idf: dict[str, float] = {}
+        self._default_idf = 1.0
+        # 倒排索引：n-gram -> [(文档序号, 权重)]，每个意图有多篇文档（意图画像 + 每条示例语句）
+        self._postings: dict[str, list[tuple[int, float]]] = {}
+        self._document_intents: list[str] = []
+        self._patterns: list[re.Pattern[str]] = []
+
+        # 统计
+        self.answered = 0
+        self.escalated = 0
+
+    def fit(self, definitions: dict[str, IntentDefinition]) -> None:
+        """根据意图定义构建索引。
+
+        Args:
+            definitions: 意图名称 -> 意图定义
+        """
+        self._definitions = definitions
+        self._patterns = []
+        for definition in definitions.values():
+            for param in definition.parameters.values():
+                if param.pattern:
+                    try:
+                        self._patterns.append(re.compile(param.pattern))
+                    except re.error:
+                        pass
+
+        documents: list[tuple[str, Counter[str]]] = []
+        for name, definition in definitions.items():
+            # 意图画像：描述 + 参数描述 + 参数示例
+            profile = [definition.description]
+            for param in definition.parameters.values():
+                profile.append(param.description)
+                profile.extend(str(example) for example in param.examples)
+            documents.append((name, self._ngrams(self._strip_parameters(" ".join(profile)))))
+            for example in definition.examples:
+                documents.append((name, self._ngrams(self._strip_parameters(example))))
+
+        document_frequency: Counter[str] = Counter()
+        for _, grams in documents:
+            document_frequency.update(grams.keys())
+        total = len(documents)
+        self._idf = {
+            gram: math.log((1 + total) / (1 + count)) + 1.0 for gram, count in document_frequency.items()
+        }
+        self._default_idf = math.log(1 + total) + 1.0
+
+        self._postings = {}
+        self._document_intents = []
+        for index, (name, grams) in enumerate(documents):
+            self._document_intents.append(name)
+            for gram, weight in self._weigh(grams).items():
+                self._postings.setdefault(gram, []).append((index, weight))
+
+    def score(self, message: str) -> list[tuple[str, float]]:
+        """计算消息与每个意图的相似度。
+
+        Args:
+            message: 用户消息
+
+        Returns:
+            [(意图名称, 相似度)]，按相似度从高到低排序
+        """
+        query = self._weigh(self._ngrams(self._strip_parameters(message)))
+
+        # 只遍历查询中出现的 n-gram 的倒排列表
+        similarities: dict[int, float] = {}
+        for gram, query_weight in query.items():
+            for index, weight in self._postings.get(gram, ()):
+                similarities[index] = similarities.get(index, 0.0) + query_weight * weight
+
+        best = dict.fromkeys(self._definitions, 0.0)
+        for index, similarity in similarities.items():
+            name = self._document_intents[index]
+            if similarity > best[name]:
+                best[name] = similarity
+        return sorted(best.items(), key=lambda item: item[1], reverse=True)
+
+    def classify(self, message: str) -> LocalMatch:
+        """分类用户消息。
+
+        Args:
+            message: 用户消息
+
+        Returns:
+            本地分类结果
+        """
+        scores = self.score(message)
+        if not scores or scores[0][1] <= 0.0:
+            self.escalated += 1
+            return LocalMatch(intent_type=None, score=0.0, margin=0.0)
+
+        intent_type, best = scores[0]
+        margin = best - (scores[1][1] if len(scores) > 1 else 0.0)
+
+        parameters: dict[str, str] = {}
+        missing = []
+        for name, param in self._definitions[intent_type].parameters.items():
+            if not param.pattern:
+                missing.append(name)
+                continue
+            match = re.search(param.pattern, message)
+            if match:
+                parameters[name] = match.group(0)
+            elif param.required:
+                missing.append(name)
+
+        accepted = best >= self.threshold and margin >= self.margin and not missing
+        if accepted:
+            self.answered += 1
+        else:
+            self.escalated += 1
+
+        return LocalMatch(
+            intent_type=intent_type,
+            score=best,
+            margin=margin,
+            parameters=parameters,
+            missing=missing,
+            accepted=accepted,
+        )
+
+    def to_intent(self, match: LocalMatch, message: str) -> Intent:
+        """将通过门限的本地结果转换为意图。
+
+        Args:
+            match: 本地分类结果
+            message: 用户消息
+
+        Returns:
+            意图（置信度映射到 [0.85, 1.0]）
+        """
+        span = 1.0 - self.threshold
+        ratio = (match.score - self.threshold) / span if span > 0 else 1.0
+        confidence = _VALID_CONFIDENCE + (1.0 - _VALID_CONFIDENCE) * min(1.0, max(0.0, ratio))
+        return Intent(
+            type=match.intent_type or "unknown",
+            parameters=dict(match.parameters),
+            confidence=round(confidence, 4),
+            raw_message=message,
+            reasoning=f"本地分类（相似度 {match.score:.2f}，领先 {match.margin:.2f}）",
+        )
+
+    def get_stats(self) -> dict[str, float]:
+        """获取统计。
+
+        Returns:
+            {answered, escalated, local_rate}
+        """
+        total = self.answered + self.escalated
+        return {
+            "answered": self.answered,
+            "escalated": self.escalated,
+            "local_rate": self.answered / total if total else 0.0,
+        }
+
+    def _strip_parameters(self, message: str) -> str:
+        """去掉参数片段（URL、编号等），避免参数值干扰相似度。"""
+        for regex in self._patterns:
+            message = regex.sub(" ", message)
+        return message
+
+    def _ngrams(self, text: str) -> Counter[str]:
+        """提取字符 n-gram。"""
+        text = fold_text(text)
+        low, high = self.ngram_range
+        grams: Counter[str] = Counter()
+        for n in range(low, high + 1):
+            for i in range(len(text) - n + 1):
+                grams[text[i : i + n]] += 1
+        return grams
+
+    def _weigh(self, grams: Counter[str]) -> dict[str, float]:
+        """计算 L2 归一化的 TF-IDF 向量。"""
+        vector = {
+            gram: (1.0 + math.log(count)) * self._idf.get(gram, self._default_idf)
+            for gram, count in grams.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if norm == 0:
+            return {}
+        return {gram: weight / norm for gram, weight in vector.items()}
@@ -36,6 +36,7 @@ class IntentDefinition:
         system: 目标系统（单系统意图）
         systems: 目标系统列表（组合意图）
         parameters: 参数定义映射
+        examples: 示例语句列表（用于本地快速分类）
     """
 
     name: str
@@ -44,6 +45,7 @@ class IntentDefinition:
     system: str | None = None
     systems: list[str] = field(default_factory=list)
     parameters: dict[str, IntentParameter] = field(default_factory=dict)
+    examples: list[str] = field(default_factory=list)
 
 
 @dataclass
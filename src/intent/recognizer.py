@@ -1,16 +1,41 @@
 """基于 LLM 的意图识别器。"""
 
+import asyncio
 import json
 import logging
 from pathlib import Path
+from typing import Any
 
 import yaml
-from zhipuai import ZhipuAI
 
+from src.infrastructure.singleflight import AsyncSingleFlight, SingleFlight
+from src.intent.cache import IntentCache
+from src.intent.local_classifier import LocalIntentClassifier
 from src.intent.models import Intent, IntentDefinition, IntentMatchResult, IntentParameter
+from src.llm.streaming import decode_stream
 
 logger = logging.getLogger(__name__)
 
+# 提示词末尾的输出格式说明
+_PROMPT_FORMAT = "".join(
+    [
+        "\n请以 JSON 格式返回（不要包含其他文字）：\n",
+        "```json\n",
+        "{\n",
+        '  "intent_type": "意图类型",\n',
+        '  "confidence": 0.95,\n',
+        '  "parameters": {\n',
+        '    "参数名": "参数值"\n',
+        "  },\n",
+        '  "reasoning": "识别理由"\n',
+        "}\n",
+        "```\n",
+    ]
+)
+
+# 流式识别时拿到这些字段即停止读取（reasoning 在最后，不必等待）
+_REQUIRED_FIELDS = frozenset({"intent_type", "confidence", "parameters"})
+
 
 class IntentRecognizer:
     """基于 LLM 的意图识别器。
@@ -21,19 +46,33 @@ class IntentRecognizer:
     def __init__(
         self,
         intent_definitions_path: str | None = None,
-        llm_client: ZhipuAI | None = None,
+        llm_client: Any | None = None,
+        async_llm_client: Any | None = None,
         llm_model: str = "glm-4-flash",
         confidence_threshold: float = 0.85,
         base_url: str | None = None,
+        cache_size: int = 256,
+        cache_ttl: float = 600.0,
+        local_threshold: float | None = None,
+        local_margin: float = 0.1,
+        shortlist_size: int = 5,
+        stream: bool = False,
     ):
         """初始化意图识别器。
 
         Args:
             intent_definitions_path: 意图定义文件路径（YAML）
-            llm_client: LLM 客户端（可选，默认创建新的 ZhipuAI 客户端）
+            llm_client: LLM 客户端（ZhipuAI 或共享的 LLMService，需提供 chat.completions.create）
+            async_llm_client: 异步 LLM 客户端（AsyncLLMService，可选，供 recognize_async 使用）
             llm_model: 使用的 LLM 模型名称
             confidence_threshold: 置信度阈值
             base_url: LLM API Base URL（可选，用于自定义代理）
+            cache_size: 识别结果缓存的最大条目数（0 表示禁用缓存）
+            cache_ttl: 识别结果缓存的过期时间（秒）
+            local_threshold: 本地快速分类的相似度门限（None 表示禁用本地分类）
+            local_margin: 本地快速分类要求领先第二名的最小相似度差
+            shortlist_size: 提示词中最多包含的候选意图数（0 表示包含全部意图）
+            stream: 是否流式调用 LLM（增量解码，拿到必需字段后停止读取）
         """
         # 如果提供了 base_url 且没有提供客户端，则创建带 base_url 的客户端
         if base_url and llm_client is None:
@@ -42,13 +81,35 @@ class IntentRecognizer:
             logger.warning(f"base_url 已设置但未传入 llm_client，请使用已配置 base_url 的客户端")
 
         self.llm_client = llm_client
+        self.async_llm_client = async_llm_client
         self.llm_model = llm_model
         self.confidence_threshold = confidence_threshold
+        self.stream = stream
 
         # 意图定义存储
         self._intent_definitions: dict[str, IntentDefinition] = {}
         self._definitions_path = intent_definitions_path
 
+        # 识别结果缓存（加载意图定义时自动清空）
+        self._cache = IntentCache(max_size=cache_size, ttl=cache_ttl) if cache_size > 0 else None
+
+        # 本地快速分类器（高置信度的消息不调用 LLM）
+        self.local_classifier = (
+            LocalIntentClassifier(threshold=local_threshold, margin=local_margin)
+            if local_threshold is not None
+            else None
+        )
+
+        # 合并相同消息的并发识别请求
+        self._flight = SingleFlight()
+        self._async_flight = AsyncSingleFlight()
+
+        # 候选意图筛选（与本地分类共用相似度索引）
+        self.shortlist_size = shortlist_size
+        self._scorer = self.local_classifier or LocalIntentClassifier()
+        # 每个意图预先渲染的提示词片段
+        self._intent_fragments: dict[str, str] = {}
+
         # 加载意图定义
         if intent_definitions_path:
             self.load_definitions(intent_definitions_path)
@@ -89,10 +150,19 @@ class IntentRecognizer:
                 system=intent_data.get("system"),
                 systems=intent_data.get("systems", []),
                 parameters=parameters,
+                examples=intent_data.get("examples", []),
             )
 
         logger.info(f"已加载 {len(self._intent_definitions)} 个意图定义")
 
+        if self._cache is not None:
+            self._cache.set_definitions(self._intent_definitions)
+        self._scorer.fit(self._intent_definitions)
+        self._intent_fragments = {
+            name: self._render_intent_fragment(name, definition)
+            for name, definition in self._intent_definitions.items()
+        }
+
     def reload_definitions(self) -> bool:
         """重新加载意图定义。
 
@@ -111,72 +181,229 @@ class IntentRecognizer:
     def recognize(self, message: str) -> IntentMatchResult:
         """识别用户消息的意图。
 
+        相同消息的并发调用只识别一次，共享结果。
+
         Args:
             message: 用户消息
 
         Returns:
             意图匹配结果
         """
-        if not self.llm_client:
-            logger.error("LLM 客户端未配置")
-            return IntentMatchResult(intent=None, confidence=0.0)
+        return self._flight.do(message, self._recognize, message)
 
+    def _recognize(self, message: str) -> IntentMatchResult:
+        """识别用户消息的意图（见 recognize）。"""
         if not self._intent_definitions:
             logger.warning("没有可用的意图定义")
             return IntentMatchResult(intent=None, confidence=0.0)
 
+        local = self._recognize_locally(message)
+        if local is not None:
+            return local
+
+        if not self.llm_client:
+            logger.error("LLM 客户端未配置")
+            return IntentMatchResult(intent=None, confidence=0.0)
+
         try:
-            # 构建提示词
-            prompt = self._build_intent_prompt(message)
+            if self.stream:
+                return self._remember(self._recognize_streaming(message))
 
             # 调用 LLM
             response = self.llm_client.chat.completions.create(
                 model=self.llm_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "你是一个意图识别助手，负责分析用户消息并匹配到预定义的意图类型。"
-                        "请严格按照 JSON 格式返回结果。",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
+                messages=self._build_messages(message),
                 temperature=0.1,  # 降低温度以获得更确定的结果
             )
+            return self._remember(self._parse_response(message, response.choices[0].message.content))
+        except Exception as e:
+            logger.error(f"意图识别失败: {e}")
+            return IntentMatchResult(intent=None, confidence=0.0)
 
-            # 解析响应
-            response_text = response.choices[0].message.content.strip()
-            logger.debug(f"LLM 响应: {response_text}")
+    async def recognize_async(self, message: str) -> IntentMatchResult:
+        """异步识别用户消息的意图。
 
-            # 提取 JSON（处理可能的 markdown 代码块）
-            json_text = self._extract_json(response_text)
-            result_data = json.loads(json_text)
+        配置了异步客户端时直接 await LLM 调用，不占用事件循环；
+        否则在线程池中执行同步的 recognize。
 
-            # 创建意图对象
-            intent = Intent(
-                type=result_data.get("intent_type", "unknown"),
-                parameters=result_data.get("parameters", {}),
-                confidence=result_data.get("confidence", 0.0),
-                raw_message=message,
-                reasoning=result_data.get("reasoning", ""),
+        Args:
+            message: 用户消息
+
+        Returns:
+            意图匹配结果
+        """
+        if not self.async_llm_client:
+            # 在线程池中执行的 recognize 已合并相同请求
+            return await asyncio.to_thread(self.recognize, message)
+        return await self._async_flight.do(message, self._recognize_async, message)
+
+    async def _recognize_async(self, message: str) -> IntentMatchResult:
+        """使用异步客户端识别用户消息的意图（见 recognize_async）。"""
+        if not self._intent_definitions:
+            logger.warning("没有可用的意图定义")
+            return IntentMatchResult(intent=None, confidence=0.0)
+
+        local = self._recognize_locally(message)
+        if local is not None:
+            return local
+
+        try:
+            response = await self.async_llm_client.chat.completions.create(
+                model=self.llm_model,
+                messages=self._build_messages(message),
+                temperature=0.1,
             )
+            return self._remember(self._parse_response(message, response.choices[0].message.content))
+        except Exception as e:
+            logger.error(f"意图识别失败: {e}")
+            return IntentMatchResult(intent=None, confidence=0.0)
+
+    def _recognize_streaming(self, message: str) -> IntentMatchResult:
+        """流式调用 LLM 识别意图，拿到必需字段后立即停止读取。
+
+        Args:
+            message: 用户消息
+
+        Returns:
+            意图匹配结果
+        """
+        response = self.llm_client.chat.completions.create(
+            model=self.llm_model,
+            messages=self._build_messages(message),
+            temperature=0.1,
+            stream=True,
+        )
+        result_data = decode_stream(response, until=lambda decoder: _REQUIRED_FIELDS <= decoder.fields.keys())
+        if not isinstance(result_data, dict) or "intent_type" not in result_data:
+            logger.error(f"解析 LLM 流式响应失败: {result_data}")
+            return IntentMatchResult(intent=None, confidence=0.0)
+        return self._build_result(message, result_data)
+
+    def _recognize_locally(self, message: str) -> IntentMatchResult | None:
+        """不调用 LLM 的识别：先查识别结果缓存，再尝试本地快速分类。
 
-            # 检查意图是否有效
-            if intent.type == "unknown" or intent.type not in self._intent_definitions:
-                logger.warning(f"未知的意图类型: {intent.type}")
-                return IntentMatchResult(intent=None, confidence=0.0)
+        Args:
+            message: 用户消息
 
-            return IntentMatchResult(intent=intent, confidence=intent.confidence)
+        Returns:
+            缓存命中或本地分类通过门限时返回意图匹配结果，否则返回 None
+        """
+        if self._cache is not None:
+            intent = self._cache.get(message)
+            if intent is not None:
+                logger.debug(f"意图缓存命中: {intent.type}")
+                return IntentMatchResult(intent=intent, confidence=intent.confidence)
 
+        if self.local_classifier is not None:
+            match = self.local_classifier.classify(message)
+            if match.accepted:
+                intent = self.local_classifier.to_intent(match, message)
+                logger.debug(f"本地分类命中: {intent.type}（相似度 {match.score:.2f}）")
+                return IntentMatchResult(intent=intent, confidence=intent.confidence)
+
+        return None
+
+    def _remember(self, result: IntentMatchResult) -> IntentMatchResult:
+        """缓存有效的识别结果。
+
+        Args:
+            result: 意图匹配结果
+
+        Returns:
+            原意图匹配结果
+        """
+        if self._cache is not None and result.has_match:
+            self._cache.put(result.intent)
+        return result
+
+    def get_cache_stats(self) -> dict[str, Any] | None:
+        """获取识别结果缓存统计。
+
+        Returns:
+            {hits, misses, hit_rate, size}，未启用缓存时返回 None
+        """
+        return self._cache.get_stats() if self._cache is not None else None
+
+    def get_flight_stats(self) -> dict[str, dict[str, Any]]:
+        """获取并发识别请求合并统计。
+
+        Returns:
+            {"sync": {...}, "async": {...}}，每项为 {executed, deduplicated, dedup_rate, in_flight}
+        """
+        return {"sync": self._flight.get_stats(), "async": self._async_flight.get_stats()}
+
+    def _build_messages(self, message: str) -> list[dict[str, str]]:
+        """构建意图识别的对话消息。
+
+        Args:
+            message: 用户消息
+
+        Returns:
+            对话消息列表
+        """
+        return [
+            {
+                "role": "system",
+                "content": "你是一个意图识别助手，负责分析用户消息并匹配到预定义的意图类型。"
+                "请严格按照 JSON 格式返回结果。",
+            },
+            {"role": "user", "content": self._build_intent_prompt(message)},
+        ]
+
+    def _parse_response(self, message: str, response_text: str) -> IntentMatchResult:
+        """解析 LLM 响应为意图匹配结果。
+
+        Args:
+            message: 用户消息
+            response_text: LLM 响应内容
+
+        Returns:
+            意图匹配结果
+        """
+        response_text = response_text.strip()
+        logger.debug(f"LLM 响应: {response_text}")
+
+        try:
+            # 提取 JSON（处理可能的 markdown 代码块）
+            json_text = self._extract_json(response_text)
+            result_data = json.loads(json_text)
         except json.JSONDecodeError as e:
             logger.error(f"解析 LLM 响应失败: {e}")
             return IntentMatchResult(intent=None, confidence=0.0)
-        except Exception as e:
-            logger.error(f"意图识别失败: {e}")
+
+        return self._build_result(message, result_data)
+
+    def _build_result(self, message: str, result_data: dict[str, Any]) -> IntentMatchResult:
+        """根据 LLM 返回的字段构建意图匹配结果。
+
+        Args:
+            message: 用户消息
+            result_data: LLM 返回的 JSON 对象
+
+        Returns:
+            意图匹配结果
+        """
+        # 创建意图对象
+        intent = Intent(
+            type=result_data.get("intent_type", "unknown"),
+            parameters=result_data.get("parameters", {}),
+            confidence=result_data.get("confidence", 0.0),
+            raw_message=message,
+            reasoning=result_data.get("reasoning", ""),
+        )
+
+        # 检查意图是否有效
+        if intent.type == "unknown" or intent.type not in self._intent_definitions:
+            logger.warning(f"未知的意图类型: {intent.type}")
             return IntentMatchResult(intent=None, confidence=0.0)
 
+        return IntentMatchResult(intent=intent, confidence=intent.confidence)
+
     def _build_intent_prompt(self, message: str) -> str:
         """构建意图识别提示词。
 
+        只包含候选意图（见 _select_candidates），每个意图的说明在加载时预先渲染。
+
         Args:
             message: 用户消息
 
@@ -189,38 +416,53 @@ class IntentRecognizer:
             "可用的意图类型：\n",
         ]
 
-        for intent_idx, (intent_name, intent_def) in enumerate(self._intent_definitions.items()):
-            prompt_parts.append(f"{intent_idx + 1}. {intent_name} - {intent_def.description}\n")
-
-            # 添加参数说明
-            if intent_def.parameters:
-                prompt_parts.append("   参数：\n")
-                for param_name, param in intent_def.parameters.items():
-                    required_str = "必需" if param.required else "可选"
-                    prompt_parts.append(
-                        f"   - {param_name}（{param.type}, {required_str}）: {param.description}\n"
-                    )
-                    if param.examples:
-                        prompt_parts.append(f"     示例: {', '.join(param.examples)}\n")
-
-        prompt_parts.extend(
-            [
-                "\n请以 JSON 格式返回（不要包含其他文字）：\n",
-                "```json\n",
-                "{\n",
-                '  "intent_type": "意图类型",\n',
-                '  "confidence": 0.95,\n',
-                '  "parameters": {\n',
-                '    "参数名": "参数值"\n',
-                "  },\n",
-                '  "reasoning": "识别理由"\n',
-                "}\n",
-                "```\n",
-            ]
-        )
+        for intent_idx, intent_name in enumerate(self._select_candidates(message)):
+            prompt_parts.append(f"{intent_idx + 1}. {self._intent_fragments[intent_name]}")
+
+        prompt_parts.append(_PROMPT_FORMAT)
 
         return "".join(prompt_parts)
 
+    def _select_candidates(self, message: str) -> list[str]:
+        """用本地相似度挑选放入提示词的候选意图。
+
+        Args:
+            message: 用户消息
+
+        Returns:
+            候选意图名称列表（意图数不超过 shortlist_size 或没有任何相似意图时返回全部）
+        """
+        if self.shortlist_size <= 0 or len(self._intent_definitions) <= self.shortlist_size:
+            return list(self._intent_definitions)
+
+        scores = self._scorer.score(message)
+        if not scores or scores[0][1] <= 0.0:
+            return list(self._intent_definitions)
+        return [name for name, _ in scores[: self.shortlist_size]]
+
+    def _render_intent_fragment(self, intent_name: str, intent_def: IntentDefinition) -> str:
+        """渲染单个意图在提示词中的说明（不含序号）。
+
+        Args:
+            intent_name: 意图名称
+            intent_def: 意图定义
+
+        Returns:
+            意图说明文本
+        """
+        parts = [f"{intent_name} - {intent_def.description}\n"]
+
+        # 添加参数说明
+        if intent_def.parameters:
+            parts.append("   参数：\n")
+            for param_name, param in intent_def.parameters.items():
+                required_str = "必需" if param.required else "可选"
+                parts.append(f"   - {param_name}（{param.type}, {required_str}）: {param.description}\n")
+                if param.examples:
+                    parts.append(f"     示例: {', '.join(param.examples)}\n")
+
+        return "".join(parts)
+
     def _extract_json(self, text: str) -> str:
         """从文本中提取 JSON 内容。
 
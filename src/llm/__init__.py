@@ -0,0 +1,18 @@
+"""LLM 客户端模块。"""
+
+from .async_service import AsyncLLMService
+from .cassette import Cassette, CassetteMissError
+from .resilience import CircuitOpenError, LLMResilience
+from .service import LLMService
+from .streaming import IncrementalJSONDecoder, decode_stream
+
+__all__ = [
+    "AsyncLLMService",
+    "Cassette",
+    "CassetteMissError",
+    "CircuitOpenError",
+    "IncrementalJSONDecoder",
+    "LLMResilience",
+    "LLMService",
+    "decode_stream",
+]
@@ -0,0 +1,309 @@
+"""异步 LLM 客户端服务。
+
+zhipuai SDK 只提供同步客户端（其 async_completions 是服务端异步任务接口，
+并非 asyncio 客户端），在事件循环中调用会阻塞整个循环。这里基于
+httpx.AsyncClient 直接调用 ``{base_url}/chat/completions``：
+
+- 同一个异步连接池（keep-alive 复用连接）
+- 每个模型的最大并发请求数限制（asyncio.Semaphore）
+- 每次调用的超时时间（排队等待计入超时）
+- 限流、429/5xx 退避重试和熔断（见 src/llm/resilience.py）
+
+对外提供与 LLMService 相同的 ``await chat.completions.create(...)`` 调用方式，
+返回对象同样可通过 ``response.choices[0].message.content`` 读取内容。
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from src.config.schema import APIConfig
+from src.llm.resilience import LLMResilience
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://open.bigmodel.cn/api/paas/v4"
+
+
+@dataclass
+class ChatMessage:
+    """对话消息。"""
+
+    role: str
+    content: str
+
+
+@dataclass
+class ChatChoice:
+    """对话补全候选。"""
+
+    index: int
+    message: ChatMessage
+    finish_reason: str | None = None
+
+
+@dataclass
+class ChatCompletion:
+    """对话补全响应。"""
+
+    id: str
+    model: str
+    choices: list[ChatChoice]
+    usage: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ChatCompletion":
+        """从接口返回的 JSON 创建响应对象。
+
+        Args:
+            data: 接口返回的 JSON 数据
+
+        Returns:
+            对话补全响应
+        """
+        choices = []
+        for item in data.get("choices", []):
+            message = item.get("message") or {}
+            choices.append(
+                ChatChoice(
+                    index=item.get("index", 0),
+                    message=ChatMessage(
+                        role=message.get("role", "assistant"),
+                        content=message.get("content") or "",
+                    ),
+                    finish_reason=item.get("finish_reason"),
+                )
+            )
+        return cls(
+            id=data.get("id", ""),
+            model=data.get("model", ""),
+            choices=choices,
+            usage=data.get("usage") or {},
+        )
+
+
+class _AsyncCompletions:
+    """chat.completions 异步接口门面。"""
+
+    def __init__(self, service: "AsyncLLMService") -> None:
+        self._service = service
+
+    async def create(self, **kwargs: Any) -> ChatCompletion:
+        """创建对话补全（参数与 ZhipuAI chat.completions.create 相同）。"""
+        return await self._service.create_chat_completion(**kwargs)
+
+
+class _AsyncChat:
+    """chat 异步接口门面。"""
+
+    def __init__(self, service: "AsyncLLMService") -> None:
+        self.completions = _AsyncCompletions(service)
+
+
+class AsyncLLMService:
+    """异步 LLM 客户端服务。"""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str | None = None,
+        timeout: float = 30.0,
+        max_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        max_in_flight: int = 4,
+        http_client: httpx.AsyncClient | None = None,
+        resilience: LLMResilience | None = None,
+    ) -> None:
+        """初始化异步 LLM 服务。
+
+        Args:
+            api_key: 智谱 AI API Key
+            base_url: LLM API Base URL（可选，默认使用官方地址）
+            timeout: 每次调用的默认超时时间（秒）
+            max_connections: 连接池最大连接数
+            keepalive_expiry: 空闲连接保持时间（秒）
+            max_in_flight: 每个模型同时进行的最大请求数
+            http_client: 底层 httpx.AsyncClient（可选，默认在首次调用时创建）
+            resilience: 限流/重试/熔断保护（可选，与同步服务共用同一实例以共享配额和熔断状态）
+        """
+        self.api_key = api_key
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.max_in_flight = max_in_flight
+        self.resilience = resilience or LLMResilience()
+
+        self._http_client = http_client
+        self._owns_client = http_client is None
+        # 信号量和连接池都绑定到创建时的事件循环
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._in_flight: dict[str, int] = {}
+        self._stats: dict[str, dict[str, float]] = {}
+
+        self.chat = _AsyncChat(self)
+
+    @classmethod
+    def from_config(
+        cls, api_config: APIConfig, api_key: str | None = None, resilience: LLMResilience | None = None
+    ) -> "AsyncLLMService":
+        """根据 API 配置创建服务。
+
+        Args:
+            api_config: API 配置
+            api_key: API Key（可选，默认使用配置中的 Key）
+            resilience: 限流/重试/熔断保护（可选，默认按配置创建）
+
+        Returns:
+            异步 LLM 服务实例
+        """
+        return cls(
+            api_key=api_key or api_config.zhipuai_api_key,
+            base_url=api_config.base_url,
+            timeout=float(api_config.timeout),
+            max_connections=api_config.max_connections,
+            keepalive_expiry=api_config.keepalive_expiry,
+            max_in_flight=api_config.max_in_flight,
+            resilience=resilience or LLMResilience.from_config(api_config),
+        )
+
+    def _bind_loop(self) -> None:
+        """绑定当前事件循环，循环变化时重建信号量和自有连接池。"""
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        self._loop = loop
+        self._semaphores.clear()
+        if self._owns_client:
+            # 旧连接池属于已结束的事件循环，不能再复用
+            self._http_client = None
+
+    def _client(self) -> httpx.AsyncClient:
+        """获取（必要时创建）连接池。"""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                timeout=self.timeout,
+            )
+        return self._http_client
+
+    def _semaphore(self, model: str) -> asyncio.Semaphore:
+        """获取模型的并发信号量。"""
+        semaphore = self._semaphores.get(model)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._semaphores[model] = semaphore
+            self._in_flight.setdefault(model, 0)
+            self._stats.setdefault(
+                model,
+                {
+                    "requests": 0,
+                    "errors": 0,
+                    "peak_in_flight": 0,
+                    "queue_wait_ms": 0.0,
+                    "latency_ms": 0.0,
+                },
+            )
+        return semaphore
+
+    async def create_chat_completion(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> ChatCompletion:
+        """创建对话补全。
+
+        排队等待并发槽的时间计入超时时间，剩余时间作为请求超时。
+
+        Args:
+            model: 模型名称
+            messages: 对话消息列表
+            timeout: 本次调用的超时时间（秒，默认使用服务超时）
+            **kwargs: 其他请求参数（temperature 等）
+
+        Returns:
+            对话补全响应
+
+        Raises:
+            TimeoutError: 等待并发槽或限流令牌超时
+            CircuitOpenError: 熔断中（立即失败，不等待超时）
+            httpx.HTTPError: 请求失败或超时（可重试的错误已按退避策略重试）
+        """
+        self._bind_loop()
+        deadline = time.monotonic() + (timeout if timeout is not None else self.timeout)
+        semaphore = self._semaphore(model)
+
+        wait_start = time.monotonic()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=max(0.0, deadline - wait_start))
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"等待 LLM 并发槽超时: {model}") from None
+
+        start = time.monotonic()
+        stats = self._stats[model]
+        self._in_flight[model] += 1
+        stats["requests"] += 1
+        stats["queue_wait_ms"] += (start - wait_start) * 1000
+        stats["peak_in_flight"] = max(stats["peak_in_flight"], self._in_flight[model])
+
+        async def post(remaining: float) -> httpx.Response:
+            response = await self._client().post(
+                f"{self.base_url}/chat/completions",
+                json={"model": model, "messages": messages, **kwargs},
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=remaining,
+            )
+            response.raise_for_status()
+            return response
+
+        try:
+            response = await self.resilience.call_async(post, deadline)
+            return ChatCompletion.from_dict(response.json())
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            self._in_flight[model] -= 1
+            stats["latency_ms"] += (time.monotonic() - start) * 1000
+            semaphore.release()
+
+    @property
+    def circuit_open(self) -> bool:
+        """熔断器是否打开（调用方可直接走不依赖模型的降级路径）。"""
+        return self.resilience.circuit_open
+
+    def get_stats(self) -> dict[str, dict[str, float]]:
+        """获取每个模型的调用统计。
+
+        Returns:
+            模型名称 -> {requests, errors, peak_in_flight, avg_queue_wait_ms, avg_latency_ms}
+        """
+        result = {}
+        for model, stats in self._stats.items():
+            count = stats["requests"] or 1
+            result[model] = {
+                "requests": stats["requests"],
+                "errors": stats["errors"],
+                "peak_in_flight": stats["peak_in_flight"],
+                "avg_queue_wait_ms": stats["queue_wait_ms"] / count,
+                "avg_latency_ms": stats["latency_ms"] / count,
+            }
+        return result
+
+    async def aclose(self) -> None:
+        """关闭连接池。"""
+        if self._http_client is not None and self._owns_client:
+            await self._http_client.aclose()
+            self._http_client = None
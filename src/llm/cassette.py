@@ -0,0 +1,393 @@
+"""LLM / VLM 请求录制与回放（cassette）。
+
+录制模式下把请求和响应写入 JSON 文件，回放模式下按请求指纹返回录制的响应，
+不访问网络，用于离线、可复现的端到端基准测试：
+
+- 请求指纹：规范化后的请求参数（去掉 timeout / stream 等不影响结果的参数，
+  图像数据替换为哈希）的 SHA-256
+- 相同指纹的多次请求按录制顺序依次回放，回放完后循环
+- 可注入录制时的延迟（流式响应按首字延迟 + 逐块延迟回放）或指定的延迟分布
+
+用法::
+
+    cassette = Cassette("cassettes/pipeline.json", mode="record", client=llm_service)
+    locator = VisualLocator(api_key="", llm_client=cassette)
+    ...
+    replay = Cassette("cassettes/pipeline.json", latency="recorded")
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from src.llm.async_service import ChatCompletion
+from src.llm.streaming import close_stream, iter_stream_text
+
+MODES = ("record", "replay", "auto")
+
+# 不影响模型输出的参数，不计入指纹
+_VOLATILE_PARAMS = frozenset({"timeout", "stream", "request_id", "user_id", "extra_headers"})
+
+# 延迟模型：None（不延迟）、"recorded"（录制时的延迟）、固定毫秒数、或 (录制条目) -> 毫秒数
+Latency = None | str | float | Callable[[dict[str, Any]], float]
+
+
+class CassetteMissError(LookupError):
+    """回放模式下请求没有对应的录制。"""
+
+    def __init__(self, fingerprint: str, model: str | None) -> None:
+        super().__init__(f"cassette 中没有匹配的录制: model={model}, fingerprint={fingerprint}")
+        self.fingerprint = fingerprint
+
+
+def normalize_request(params: dict[str, Any]) -> dict[str, Any]:
+    """规范化请求参数（去掉不影响结果的参数，图像数据替换为哈希）。
+
+    Args:
+        params: chat.completions.create 的关键字参数
+
+    Returns:
+        规范化后的参数
+    """
+    return {key: _normalize_value(value) for key, value in params.items() if key not in _VOLATILE_PARAMS}
+
+
+def fingerprint(params: dict[str, Any]) -> str:
+    """计算请求指纹。
+
+    Args:
+        params: chat.completions.create 的关键字参数
+
+    Returns:
+        规范化请求的 SHA-256（前 16 位）
+    """
+    text = json.dumps(normalize_request(params), ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def lognormal_latency(median_ms: float, sigma: float = 0.5, seed: int = 0) -> Callable[[dict[str, Any]], float]:
+    """对数正态延迟分布（固定随机种子，结果可复现）。
+
+    Args:
+        median_ms: 延迟中位数（毫秒）
+        sigma: 对数标准差（越大长尾越重）
+        seed: 随机种子
+
+    Returns:
+        延迟模型，可作为 Cassette 的 latency 参数
+    """
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def sample(_entry: dict[str, Any]) -> float:
+        with lock:
+            return median_ms * rng.lognormvariate(0.0, sigma)
+
+    return sample
+
+
+def _normalize_value(value: Any) -> Any:
+    """递归规范化参数值。"""
+    if isinstance(value, dict):
+        if value.get("type") == "image_url" and isinstance(value.get("image_url"), dict):
+            url = value["image_url"].get("url", "")
+            digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+            return {"type": "image_url", "image_url": {"url": f"sha256:{digest}"}}
+        return {key: _normalize_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(item) for item in value]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+class Cassette:
+    """录制/回放 LLM 客户端。
+
+    提供与 LLMService 相同的 ``chat.completions.create(...)`` 调用方式，
+    可直接作为 llm_client 传给 VisualLocator、IntentRecognizer 和 CommandParser。
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        mode: str = "replay",
+        client: Any | None = None,
+        latency: Latency = None,
+        chunk_chars: int = 8,
+    ) -> None:
+        """初始化。
+
+        Args:
+            path: 录制文件路径（JSON）
+            mode: record（总是请求并录制）、replay（只回放，不访问网络）、
+                auto（有录制时回放，否则请求并录制）
+            client: 实际的 LLM 客户端（record / auto 模式需要）
+            latency: 回放时注入的延迟：None 不延迟，"recorded" 使用录制时的延迟，
+                数值为固定毫秒数，函数为 (录制条目) -> 毫秒数
+            chunk_chars: 流式回放时每块的字符数
+
+        Raises:
+            ValueError: 模式无效，或录制模式没有提供客户端
+        """
+        if mode not in MODES:
+            raise ValueError(f"无效的 cassette 模式: {mode}（可选: {', '.join(MODES)}）")
+        if mode != "replay" and client is None:
+            raise ValueError(f"{mode} 模式需要提供实际的 LLM 客户端")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.client = client
+        self.latency = latency
+        self.chunk_chars = max(1, chunk_chars)
+        self._lock = threading.Lock()
+        self._entries: dict[str, list[dict[str, Any]]] = {}
+        self._cursors: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            for entry in data.get("interactions", []):
+                self._entries.setdefault(entry["fingerprint"], []).append(entry)
+
+    def create(self, **kwargs: Any) -> Any:
+        """创建对话补全（回放或请求并录制）。
+
+        Args:
+            **kwargs: 与 chat.completions.create 相同的参数
+
+        Returns:
+            对话补全响应；stream=True 时返回分块迭代器
+
+        Raises:
+            CassetteMissError: 回放模式下没有匹配的录制
+        """
+        key = fingerprint(kwargs)
+        entry = self._lookup(key, kwargs.get("model"))
+        if entry is not None:
+            if kwargs.get("stream"):
+                return _ReplayStream(self._chunks(entry["content"]), *self._stream_delays(entry))
+            time.sleep(self._delay(entry))
+            return self._completion(entry)
+
+        start = time.perf_counter()
+        response = self.client.chat.completions.create(**kwargs)
+        if kwargs.get("stream"):
+            return _RecordingStream(response, lambda content, first: self._record(key, kwargs, content, start, first))
+        self._record(key, kwargs, response.choices[0].message.content, start)
+        return response
+
+    def as_async(self, client: Any | None = None) -> "AsyncCassetteClient":
+        """创建共用同一录制文件的异步客户端。
+
+        Args:
+            client: 实际的异步 LLM 客户端（record / auto 模式需要）
+
+        Returns:
+            异步录制/回放客户端
+        """
+        return AsyncCassetteClient(self, client)
+
+    def save(self) -> None:
+        """写入录制文件。"""
+        with self._lock:
+            interactions = [entry for entries in self._entries.values() for entry in entries]
+        interactions.sort(key=lambda entry: entry["seq"])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps({"version": 1, "interactions": interactions}, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取统计。
+
+        Returns:
+            {mode, hits, misses, recorded, entries}
+        """
+        with self._lock:
+            entries = sum(len(items) for items in self._entries.values())
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "recorded": self.recorded,
+            "entries": entries,
+        }
+
+    def _lookup(self, key: str, model: str | None) -> dict[str, Any] | None:
+        """查找回放条目（相同指纹按录制顺序循环）。"""
+        if self.mode == "record":
+            return None
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                if self.mode == "replay":
+                    raise CassetteMissError(key, model)
+                return None
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            self.hits += 1
+            return entries[cursor % len(entries)]
+
+    def _record(
+        self,
+        key: str,
+        params: dict[str, Any],
+        content: str,
+        start: float,
+        first_token: float | None = None,
+    ) -> None:
+        """记录一次请求并写入文件。"""
+        end = time.perf_counter()
+        with self._lock:
+            entry = {
+                "seq": sum(len(items) for items in self._entries.values()),
+                "fingerprint": key,
+                "request": normalize_request(params),
+                "content": content or "",
+                "latency_ms": round((end - start) * 1000, 1),
+                "first_token_ms": round(((first_token or end) - start) * 1000, 1),
+            }
+            self._entries.setdefault(key, []).append(entry)
+            self.recorded += 1
+        self.save()
+
+    def _delay(self, entry: dict[str, Any]) -> float:
+        """回放延迟（秒）。"""
+        if self.latency is None:
+            return 0.0
+        if self.latency == "recorded":
+            return entry.get("latency_ms", 0.0) / 1000
+        if callable(self.latency):
+            return max(0.0, self.latency(entry)) / 1000
+        return float(self.latency) / 1000
+
+    def _stream_delays(self, entry: dict[str, Any]) -> tuple[float, float]:
+        """流式回放的首块延迟和后续每块延迟（秒）。"""
+        total = self._delay(entry)
+        if total <= 0:
+            return 0.0, 0.0
+        chunks = max(1, -(-len(entry["content"]) // self.chunk_chars))
+        recorded_total = entry.get("latency_ms") or 0.0
+        ratio = entry.get("first_token_ms", recorded_total) / recorded_total if recorded_total else 1.0
+        first = total * ratio
+        return first, (total - first) / max(1, chunks - 1)
+
+    def _chunks(self, content: str) -> list[str]:
+        """按固定字符数切分回放内容。"""
+        return [content[i : i + self.chunk_chars] for i in range(0, len(content), self.chunk_chars)]
+
+    @staticmethod
+    def _completion(entry: dict[str, Any]) -> ChatCompletion:
+        """构建回放的对话补全响应。"""
+        return ChatCompletion.from_dict(
+            {
+                "id": f"cassette-{entry['fingerprint']}",
+                "model": entry["request"].get("model", ""),
+                "choices": [{"message": {"role": "assistant", "content": entry["content"]}, "finish_reason": "stop"}],
+            }
+        )
+
+
+class AsyncCassetteClient:
+    """录制/回放异步 LLM 客户端（与同步 Cassette 共用录制）。"""
+
+    def __init__(self, cassette: Cassette, client: Any | None = None) -> None:
+        """初始化。
+
+        Args:
+            cassette: 同步录制/回放客户端
+            client: 实际的异步 LLM 客户端（record / auto 模式需要）
+        """
+        self.cassette = cassette
+        self.client = client
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs: Any) -> Any:
+        """创建对话补全（回放或请求并录制，参数见 Cassette.create）。"""
+        key = fingerprint(kwargs)
+        entry = self.cassette._lookup(key, kwargs.get("model"))
+        if entry is not None:
+            await asyncio.sleep(self.cassette._delay(entry))
+            return self.cassette._completion(entry)
+        if self.client is None:
+            raise CassetteMissError(key, kwargs.get("model"))
+
+        start = time.perf_counter()
+        response = await self.client.chat.completions.create(**kwargs)
+        await asyncio.to_thread(self.cassette._record, key, kwargs, response.choices[0].message.content, start)
+        return response
+
+    async def aclose(self) -> None:
+        """关闭实际的异步客户端。"""
+        if self.client is not None:
+            await self.client.aclose()
+
+
+class _ReplayStream:
+    """回放的流式响应（按块产出，可提前关闭）。"""
+
+    def __init__(self, pieces: list[str], first_delay: float, chunk_delay: float) -> None:
+        self._pieces = pieces
+        self._first_delay = first_delay
+        self._chunk_delay = chunk_delay
+        self._closed = False
+
+    def __iter__(self) -> Iterator[Any]:
+        for index, piece in enumerate(self._pieces):
+            if self._closed:
+                return
+            delay = self._first_delay if index == 0 else self._chunk_delay
+            if delay > 0:
+                time.sleep(delay)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+    def close(self) -> None:
+        self._closed = True
+
+
+class _RecordingStream:
+    """录制中的流式响应：原样转发分块，结束后录制完整内容。
+
+    调用方提前关闭时读完剩余内容再录制，保证回放时其他停止条件也能拿到完整响应。
+    """
+
+    def __init__(self, response: Any, on_done: Callable[[str, float | None], None]) -> None:
+        self._response = response
+        self._on_done = on_done
+        self._texts: list[str] = []
+        self._first_token: float | None = None
+        self._iterator = iter_stream_text(response)
+        self._done = False
+
+    def __iter__(self) -> Iterator[Any]:
+        for text in self._iterator:
+            if self._first_token is None:
+                self._first_token = time.perf_counter()
+            self._texts.append(text)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+        self._finish()
+
+    def close(self) -> None:
+        if not self._done:
+            self._texts.extend(self._iterator)
+            self._finish()
+
+    def _finish(self) -> None:
+        if self._done:
+            return
+        self._done = True
+        close_stream(self._response)
+        self._on_done("".join(self._texts), self._first_token)
@@ -0,0 +1,462 @@
+"""模型调用的限流、退避重试和熔断。
+
+- TokenBucket: 令牌桶限流，按配额（每秒请求数 + 突发容量）平滑发出请求
+- RetryPolicy: 429 / 5xx / 超时 / 连接错误时按指数退避（全抖动）重试，优先遵循 Retry-After
+- CircuitBreaker: 连续失败达到阈值后熔断，熔断期间调用立即失败（CircuitOpenError），
+  冷却后放行一个探测请求，成功则恢复
+
+LLMResilience 把三者组合在一起，由同步和异步 LLM 服务共用（配额和熔断状态按 API Key 共享）。
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+import httpx
+
+from src.config.schema import APIConfig
+
+T = TypeVar("T")
+
+# 可重试的 HTTP 状态码（限流和服务端错误）
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """熔断器打开时调用被立即拒绝。"""
+
+    def __init__(self, retry_in: float) -> None:
+        super().__init__(f"LLM 服务熔断中，{retry_in:.1f} 秒后重试")
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """令牌桶限流器（线程安全，同步和异步调用方共用）。"""
+
+    def __init__(self, rate: float, capacity: int | None = None) -> None:
+        """初始化令牌桶。
+
+        Args:
+            rate: 每秒补充的令牌数（即允许的平均请求速率）
+            capacity: 桶容量（允许的突发请求数，默认等于 max(1, rate)）
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited = 0
+        self.wait_seconds = 0.0
+
+    def reserve(self, max_wait: float | None = None) -> float | None:
+        """预订一个令牌。
+
+        令牌不足时预订未来的令牌（排队），调用方等待返回的时间后再发出请求。
+
+        Args:
+            max_wait: 最长等待时间（秒），需要等待更久时不预订
+
+        Returns:
+            需要等待的时间（秒），超过 max_wait 时返回 None
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            wait = max(0.0, (1.0 - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= 1.0
+            if wait > 0:
+                self.waited += 1
+                self.wait_seconds += wait
+            return wait
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """获取一个令牌（阻塞等待）。
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            是否获取成功
+        """
+        wait = self.reserve(timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, timeout: float | None = None) -> bool:
+        """获取一个令牌（异步等待）。
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            是否获取成功
+        """
+        wait = self.reserve(timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取统计。
+
+        Returns:
+            {rate, capacity, tokens, waited, wait_seconds}
+        """
+        with self._lock:
+            tokens = min(self.capacity, self._tokens + (time.monotonic() - self._updated) * self.rate)
+            return {
+                "rate": self.rate,
+                "capacity": self.capacity,
+                "tokens": round(tokens, 2),
+                "waited": self.waited,
+                "wait_seconds": round(self.wait_seconds, 3),
+            }
+
+
+class RetryPolicy:
+    """指数退避重试策略（全抖动）。"""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 8.0) -> None:
+        """初始化重试策略。
+
+        Args:
+            max_retries: 最大重试次数（0 表示不重试）
+            base_delay: 第一次重试的退避上限（秒），之后每次翻倍
+            max_delay: 退避上限（秒）
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, error: BaseException | None = None) -> float:
+        """计算第 attempt 次重试前的等待时间。
+
+        Args:
+            attempt: 重试序号（从 0 开始）
+            error: 触发重试的异常（有 Retry-After 响应头时优先遵循）
+
+        Returns:
+            等待时间（秒）
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return max(backoff, min(self.max_delay, retry_after))
+        return backoff
+
+    @staticmethod
+    def is_retryable(error: BaseException) -> bool:
+        """判断异常是否可重试（限流、服务端错误、超时、连接错误）。
+
+        Args:
+            error: 调用抛出的异常
+
+        Returns:
+            是否可重试
+        """
+        status = _status_code(error)
+        if status is not None:
+            return status in RETRYABLE_STATUS
+        if isinstance(error, (TimeoutError, httpx.TimeoutException, httpx.TransportError)):
+            return True
+        # ZhipuAI 的 APIConnectionError / APITimeoutError（不依赖具体 SDK 类型）
+        return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+class CircuitBreaker:
+    """熔断器。
+
+    状态：
+    - closed: 正常放行
+    - open: 连续失败达到阈值，recovery_timeout 内拒绝所有调用
+    - half_open: 冷却结束，放行一个探测请求；成功则关闭，失败则重新打开
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0) -> None:
+        """初始化熔断器。
+
+        Args:
+            failure_threshold: 连续失败多少次后熔断
+            recovery_timeout: 熔断持续时间（秒），之后放行探测请求
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        """当前状态（closed / open / half_open）。"""
+        with self._lock:
+            return self._current_state()
+
+    @property
+    def is_open(self) -> bool:
+        """是否处于熔断状态（调用会被立即拒绝）。"""
+        return self.state == self.OPEN
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def before_call(self) -> None:
+        """调用前检查。
+
+        Raises:
+            CircuitOpenError: 熔断中，或半开状态下已有探测请求在进行
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+            raise CircuitOpenError(max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at)))
+
+    def record_success(self) -> None:
+        """记录调用成功。"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """记录调用失败（服务不可用类的错误）。"""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.trips += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def release_probe(self) -> None:
+        """探测请求以非服务错误结束（如参数错误）时释放探测名额。"""
+        with self._lock:
+            self._probing = False
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取状态和统计。
+
+        Returns:
+            {state, consecutive_failures, retry_in, trips, rejected}
+        """
+        with self._lock:
+            state = self._current_state()
+            retry_in = 0.0
+            if state == self.OPEN:
+                retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "retry_in": round(retry_in, 1),
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
+
+
+class LLMResilience:
+    """模型调用保护：熔断检查 -> 限流 -> 调用（失败时退避重试）。"""
+
+    def __init__(
+        self,
+        rate_limiter: TokenBucket | None = None,
+        retry_policy: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        """初始化。
+
+        Args:
+            rate_limiter: 令牌桶限流器（None 表示不限流）
+            retry_policy: 重试策略（None 表示不重试）
+            breaker: 熔断器（None 表示不熔断）
+        """
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=0)
+        self.breaker = breaker
+        self.retries = 0
+
+    @classmethod
+    def from_config(cls, api_config: APIConfig) -> "LLMResilience":
+        """根据 API 配置创建。
+
+        Args:
+            api_config: API 配置
+
+        Returns:
+            模型调用保护实例
+        """
+        return cls(
+            rate_limiter=(
+                TokenBucket(api_config.rate_limit, api_config.rate_burst or None)
+                if api_config.rate_limit > 0
+                else None
+            ),
+            retry_policy=RetryPolicy(
+                max_retries=api_config.max_retries,
+                base_delay=api_config.retry_base_delay,
+                max_delay=api_config.retry_max_delay,
+            ),
+            breaker=(
+                CircuitBreaker(api_config.breaker_failure_threshold, api_config.breaker_recovery_timeout)
+                if api_config.breaker_failure_threshold > 0
+                else None
+            ),
+        )
+
+    @property
+    def circuit_open(self) -> bool:
+        """熔断器是否打开（调用方可据此直接走不依赖模型的降级路径）。"""
+        return self.breaker is not None and self.breaker.is_open
+
+    def call(self, func: Callable[[float], T], deadline: float) -> T:
+        """执行同步模型调用。
+
+        Args:
+            func: 调用函数，参数为本次尝试的剩余超时时间（秒）
+            deadline: 截止时间（time.monotonic()），限流等待和退避都计入
+
+        Returns:
+            调用结果
+
+        Raises:
+            CircuitOpenError: 熔断中
+            TimeoutError: 截止时间前拿不到限流令牌
+        """
+        attempt = 0
+        while True:
+            self._before_attempt()
+            wait = self._reserve(deadline)
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                result = func(max(0.001, deadline - time.monotonic()))
+            except Exception as e:
+                delay = self._after_failure(e, attempt, deadline)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._after_success()
+            return result
+
+    async def call_async(self, func: Callable[[float], Awaitable[T]], deadline: float) -> T:
+        """执行异步模型调用（参数见 call）。"""
+        attempt = 0
+        while True:
+            self._before_attempt()
+            wait = self._reserve(deadline)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                result = await func(max(0.001, deadline - time.monotonic()))
+            except Exception as e:
+                delay = self._after_failure(e, attempt, deadline)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self._after_success()
+            return result
+
+    def _before_attempt(self) -> None:
+        if self.breaker is not None:
+            self.breaker.before_call()
+
+    def _reserve(self, deadline: float) -> float:
+        if self.rate_limiter is None:
+            return 0.0
+        wait = self.rate_limiter.reserve(max_wait=max(0.0, deadline - time.monotonic()))
+        if wait is None:
+            if self.breaker is not None:
+                self.breaker.release_probe()
+            raise TimeoutError("等待 LLM 限流令牌超时")
+        return wait
+
+    def _after_success(self) -> None:
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+    def _after_failure(self, error: Exception, attempt: int, deadline: float) -> float | None:
+        """记录失败，返回重试前的等待时间（不重试时返回 None）。"""
+        retryable = self.retry_policy.is_retryable(error)
+        if self.breaker is not None:
+            if retryable:
+                self.breaker.record_failure()
+            else:
+                # 参数错误等不代表服务不可用
+                self.breaker.release_probe()
+        if not retryable or attempt >= self.retry_policy.max_retries:
+            return None
+        if self.breaker is not None and self.breaker.is_open:
+            return None
+        delay = self.retry_policy.delay(attempt, error)
+        if time.monotonic() + delay >= deadline:
+            return None
+        self.retries += 1
+        return delay
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取状态和统计。
+
+        Returns:
+            {breaker, rate_limiter, retries}
+        """
+        return {
+            "breaker": self.breaker.get_stats() if self.breaker is not None else None,
+            "rate_limiter": self.rate_limiter.get_stats() if self.rate_limiter is not None else None,
+            "retries": self.retries,
+        }
+
+
+def _status_code(error: BaseException | None) -> int | None:
+    """提取异常对应的 HTTP 状态码（httpx.HTTPStatusError 或 ZhipuAI APIStatusError）。"""
+    if error is None:
+        return None
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(error: BaseException | None) -> float | None:
+    """读取 Retry-After 响应头（秒）。"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        value = float(headers.get("retry-after", ""))
+    except (TypeError, ValueError):
+        return None
+    return value if value >= 0 else None
@@ -0,0 +1,278 @@
+"""共享 LLM 客户端服务。
+
+所有模块（命令解析、视觉定位、意图识别、浏览器自动化）共用同一个客户端：
+
+- 同一个 httpx 连接池（keep-alive 复用 TCP/TLS 连接）
+- 每个模型的最大并发请求数限制
+- 每次调用的超时时间（默认取 APIConfig.timeout）
+- 限流、429/5xx 退避重试和熔断（见 src/llm/resilience.py）
+
+对外提供与 ZhipuAI 相同的 ``chat.completions.create(...)`` 调用方式，
+可直接作为各模块的 llm_client 传入。
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+from zhipuai import ZhipuAI
+
+from src.config.schema import APIConfig
+from src.llm.resilience import LLMResilience
+from src.llm.streaming import close_stream
+
+logger = logging.getLogger(__name__)
+
+
+class _Completions:
+    """chat.completions 接口门面。"""
+
+    def __init__(self, service: "LLMService") -> None:
+        self._service = service
+
+    def create(self, **kwargs: Any) -> Any:
+        """创建对话补全（参数与 ZhipuAI chat.completions.create 相同）。"""
+        return self._service.create_chat_completion(**kwargs)
+
+
+class _Chat:
+    """chat 接口门面。"""
+
+    def __init__(self, service: "LLMService") -> None:
+        self.completions = _Completions(service)
+
+
+class _SlotStream:
+    """流式响应包装：读取结束、出错或被关闭时释放并发槽并关闭底层响应。"""
+
+    def __init__(self, response: Any, release: Callable[[bool], None]) -> None:
+        self._response = response
+        self._iterator = iter(response)
+        self._release: Callable[[bool], None] | None = release
+
+    def __iter__(self) -> "_SlotStream":
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            self._done(failed=False)
+            raise
+        except Exception:
+            self._done(failed=True)
+            raise
+
+    def close(self) -> None:
+        """关闭流（提前停止读取时调用）。"""
+        self._done(failed=False)
+
+    def _done(self, failed: bool) -> None:
+        if self._release is None:
+            return
+        release, self._release = self._release, None
+        try:
+            close_stream(self._response)
+        finally:
+            release(failed)
+
+
+class LLMService:
+    """共享 LLM 客户端服务。"""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str | None = None,
+        timeout: float = 30.0,
+        max_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        max_in_flight: int = 4,
+        client: Any | None = None,
+        resilience: LLMResilience | None = None,
+    ) -> None:
+        """初始化 LLM 服务。
+
+        Args:
+            api_key: 智谱 AI API Key
+            base_url: LLM API Base URL（可选，用于自定义代理）
+            timeout: 每次调用的默认超时时间（秒）
+            max_connections: 连接池最大连接数
+            keepalive_expiry: 空闲连接保持时间（秒）
+            max_in_flight: 每个模型同时进行的最大请求数
+            client: 底层客户端（可选，需提供 chat.completions.create，默认创建 ZhipuAI 客户端）
+            resilience: 限流/重试/熔断保护（可选，与异步服务共用同一实例以共享配额和熔断状态）
+        """
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.resilience = resilience or LLMResilience()
+
+        self._http_client: httpx.Client | None = None
+        if client is None:
+            self._http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+                timeout=timeout,
+            )
+            client_kwargs: dict[str, Any] = {
+                "api_key": api_key,
+                "timeout": timeout,
+                "http_client": self._http_client,
+            }
+            if resilience is not None:
+                # 由 resilience 统一重试，避免与 SDK 内置重试叠加
+                client_kwargs["max_retries"] = 0
+            if base_url:
+                client_kwargs["base_url"] = base_url
+            client = ZhipuAI(**client_kwargs)
+        self._client = client
+
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._in_flight: dict[str, int] = {}
+        self._stats: dict[str, dict[str, float]] = {}
+
+        self.chat = _Chat(self)
+
+    @classmethod
+    def from_config(
+        cls, api_config: APIConfig, api_key: str | None = None, resilience: LLMResilience | None = None
+    ) -> "LLMService":
+        """根据 API 配置创建服务。
+
+        Args:
+            api_config: API 配置
+            api_key: API Key（可选，默认使用配置中的 Key）
+            resilience: 限流/重试/熔断保护（可选，默认按配置创建）
+
+        Returns:
+            LLM 服务实例
+        """
+        return cls(
+            api_key=api_key or api_config.zhipuai_api_key,
+            base_url=api_config.base_url,
+            timeout=float(api_config.timeout),
+            max_connections=api_config.max_connections,
+            keepalive_expiry=api_config.keepalive_expiry,
+            max_in_flight=api_config.max_in_flight,
+            resilience=resilience or LLMResilience.from_config(api_config),
+        )
+
+    def _semaphore(self, model: str) -> threading.BoundedSemaphore:
+        """获取模型的并发信号量。"""
+        with self._lock:
+            semaphore = self._semaphores.get(model)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_in_flight)
+                self._semaphores[model] = semaphore
+                self._in_flight[model] = 0
+                self._stats[model] = {
+                    "requests": 0,
+                    "errors": 0,
+                    "peak_in_flight": 0,
+                    "queue_wait_ms": 0.0,
+                    "latency_ms": 0.0,
+                }
+            return semaphore
+
+    def create_chat_completion(self, *, model: str, timeout: float | None = None, **kwargs: Any) -> Any:
+        """创建对话补全。
+
+        排队等待并发槽的时间计入超时时间，剩余时间作为请求超时。
+
+        Args:
+            model: 模型名称
+            timeout: 本次调用的超时时间（秒，默认使用服务超时）
+            **kwargs: 传给底层客户端的其他参数
+
+        Returns:
+            对话补全响应（stream=True 时为分块迭代器，读取结束或关闭后才释放并发槽）
+
+        Raises:
+            TimeoutError: 等待并发槽或限流令牌超时
+            CircuitOpenError: 熔断中（立即失败，不等待超时）
+        """
+        deadline = time.monotonic() + (timeout if timeout is not None else self.timeout)
+        semaphore = self._semaphore(model)
+
+        wait_start = time.monotonic()
+        if not semaphore.acquire(timeout=max(0.0, deadline - wait_start)):
+            raise TimeoutError(f"等待 LLM 并发槽超时: {model}")
+
+        start = time.monotonic()
+        stats = self._stats[model]
+        with self._lock:
+            self._in_flight[model] += 1
+            stats["requests"] += 1
+            stats["queue_wait_ms"] += (start - wait_start) * 1000
+            stats["peak_in_flight"] = max(stats["peak_in_flight"], self._in_flight[model])
+
+        try:
+            response = self.resilience.call(
+                lambda remaining: self._client.chat.completions.create(model=model, timeout=remaining, **kwargs),
+                deadline,
+            )
+        except Exception:
+            self._finish(model, semaphore, start, failed=True)
+            raise
+
+        if kwargs.get("stream"):
+            # 流式响应在读取结束（或提前关闭）后才释放并发槽
+            return _SlotStream(response, lambda failed: self._finish(model, semaphore, start, failed=failed))
+        self._finish(model, semaphore, start)
+        return response
+
+    def _finish(
+        self, model: str, semaphore: threading.BoundedSemaphore, start: float, failed: bool = False
+    ) -> None:
+        """记录调用结束并释放并发槽。"""
+        stats = self._stats[model]
+        with self._lock:
+            if failed:
+                stats["errors"] += 1
+            self._in_flight[model] -= 1
+            stats["latency_ms"] += (time.monotonic() - start) * 1000
+        semaphore.release()
+
+    @property
+    def circuit_open(self) -> bool:
+        """熔断器是否打开（调用方可直接走不依赖模型的降级路径）。"""
+        return self.resilience.circuit_open
+
+    def get_resilience_stats(self) -> dict[str, Any]:
+        """获取限流、重试和熔断状态。
+
+        Returns:
+            {breaker, rate_limiter, retries}
+        """
+        return self.resilience.get_stats()
+
+    def get_stats(self) -> dict[str, dict[str, float]]:
+        """获取每个模型的调用统计。
+
+        Returns:
+            模型名称 -> {requests, errors, peak_in_flight, avg_queue_wait_ms, avg_latency_ms}
+        """
+        with self._lock:
+            result = {}
+            for model, stats in self._stats.items():
+                count = stats["requests"] or 1
+                result[model] = {
+                    "requests": stats["requests"],
+                    "errors": stats["errors"],
+                    "peak_in_flight": stats["peak_in_flight"],
+                    "avg_queue_wait_ms": stats["queue_wait_ms"] / count,
+                    "avg_latency_ms": stats["latency_ms"] / count,
+                }
+            return result
+
+    def close(self) -> None:
+        """关闭连接池。"""
+        if self._http_client is not None:
+            self._http_client.close()
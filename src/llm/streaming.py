@@ -0,0 +1,250 @@
+"""流式 LLM 响应的增量 JSON 解码。
+
+LLM 以流式返回时，不必等完整响应再 ``json.loads``：
+
+- 根节点是数组时，每个元素一完整就立即产出（视觉定位的元素列表）
+- 根节点是对象时，每个顶层字段一完整就立即产出（意图识别、命令解析结果）
+- 调用方拿到所需字段后即可停止读取流（关闭连接，不再等待剩余输出）
+
+同时容忍现有修复逻辑处理的格式问题：
+
+- 根节点之前的说明文字和 markdown 代码块标记（```json），根节点结束后的内容被忽略
+- 字符串值中未转义的双引号（如 ``"文件 "main.py""``）：引号后的第一个非空白字符
+  不是 ``, : } ]`` 时视为字符串内容
+- 尾随逗号，以及字符串中的原始换行等控制字符
+"""
+
+import json
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+# 字符串结束引号之后可能出现的结构字符
+_STRING_TERMINATORS = ",:}]"
+_WHITESPACE = " \t\r\n"
+
+
+class IncrementalJSONDecoder:
+    """增量 JSON 解码器。
+
+    用法::
+
+        decoder = IncrementalJSONDecoder()
+        for text in stream:
+            for key, value in decoder.feed(text):
+                ...  # 数组根节点时 key 为元素序号，对象根节点时 key 为字段名
+        value = decoder.close()
+    """
+
+    def __init__(self) -> None:
+        """初始化解码器。"""
+        self._raw = ""
+        self._pos = 0
+        # 修复后的 JSON 文本（从根节点开始）
+        self._clean: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._root: str | None = None
+        # 当前顶层元素/字段在 _clean 中的起始位置
+        self._item_start = 0
+        self._item_done = False
+
+        self.items: list[Any] = []
+        self.fields: dict[str, Any] = {}
+        self.done = False
+        self.closed = False
+
+    @property
+    def value(self) -> Any:
+        """当前已解码的根节点（数组为已完整的元素，对象为已完整的字段，尚未开始时为 None）。"""
+        if self._root == "[":
+            return list(self.items)
+        if self._root == "{":
+            return dict(self.fields)
+        return None
+
+    def feed(self, text: str) -> list[tuple[Any, Any]]:
+        """输入一段响应文本。
+
+        Args:
+            text: 新到达的响应文本
+
+        Returns:
+            本次新完整的 [(元素序号或字段名, 值)]
+        """
+        self._raw += text
+        return self._scan(final=False)
+
+    def close(self) -> Any:
+        """结束输入并返回解码结果。
+
+        响应被截断（根节点未结束）时返回已完整的部分。
+
+        Returns:
+            根节点的值（没有找到 JSON 时为 None）
+        """
+        if not self.closed:
+            self._scan(final=True)
+            if not self.done and self._depth == 1 and not self._in_string:
+                # 截断在最后一个元素/字段之后（缺少逗号或右括号）
+                self._emit([])
+            self.closed = True
+        return self.value
+
+    def _scan(self, final: bool) -> list[tuple[Any, Any]]:
+        """扫描未处理的文本。
+
+        Args:
+            final: 是否已到输入末尾（末尾的引号直接视为字符串结束）
+
+        Returns:
+            新完整的 [(键, 值)]
+        """
+        events: list[tuple[Any, Any]] = []
+        raw = self._raw
+        clean = self._clean
+
+        while self._pos < len(raw) and not self.done:
+            char = raw[self._pos]
+
+            if self._root is None:
+                # 跳过根节点之前的说明文字和代码块标记
+                if char in "[{":
+                    self._root = char
+                    self._depth = 1
+                    clean.append(char)
+                    self._item_start = 1
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if char == "\\":
+                    if self._pos + 1 >= len(raw):
+                        break  # 等待被转义的字符
+                    clean.append(raw[self._pos : self._pos + 2])
+                    self._pos += 2
+                    continue
+                if char == '"':
+                    lookahead = self._pos + 1
+                    while lookahead < len(raw) and raw[lookahead] in _WHITESPACE:
+                        lookahead += 1
+                    if lookahead >= len(raw) and not final:
+                        break  # 等待下一个字符以判断引号是否结束字符串
+                    if lookahead >= len(raw) or raw[lookahead] in _STRING_TERMINATORS:
+                        self._in_string = False
+                        clean.append('"')
+                    else:
+                        clean.append('\\"')
+                    self._pos += 1
+                    continue
+                clean.append(char)
+                self._pos += 1
+                continue
+
+            self._pos += 1
+            if char == '"':
+                self._in_string = True
+                clean.append(char)
+            elif char in "[{":
+                self._depth += 1
+                clean.append(char)
+            elif char in "]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(events)
+                    clean.append(char)
+                    self.done = True
+                else:
+                    clean.append(char)
+                    if self._depth == 1:
+                        # 容器类型的元素/字段值一结束就产出，不等后面的逗号
+                        self._emit(events)
+                        self._item_done = True
+            elif char == "," and self._depth == 1:
+                self._emit(events)
+                clean.append(char)
+                self._item_start = len(clean)
+                self._item_done = False
+            else:
+                clean.append(char)
+
+        return events
+
+    def _emit(self, events: list[tuple[Any, Any]]) -> None:
+        """解码当前顶层元素/字段并记录。"""
+        if self._item_done:
+            return
+        text = "".join(self._clean[self._item_start :]).strip()
+        if not text:
+            return  # 尾随逗号或空容器
+        try:
+            if self._root == "[":
+                value = json.loads(text, strict=False)
+                events.append((len(self.items), value))
+                self.items.append(value)
+            else:
+                for key, value in json.loads("{" + text + "}", strict=False).items():
+                    events.append((key, value))
+                    self.fields[key] = value
+        except json.JSONDecodeError:
+            pass  # 跳过无法解析的元素，不影响后续元素
+
+
+def iter_stream_text(response: Iterable[Any]) -> Iterator[str]:
+    """从流式对话补全响应中提取增量文本。
+
+    Args:
+        response: ``chat.completions.create(stream=True)`` 返回的分块迭代器
+
+    Yields:
+        每个分块的 delta 文本
+    """
+    for chunk in response:
+        choices = getattr(chunk, "choices", None)
+        if not choices:
+            continue
+        content = getattr(choices[0].delta, "content", None)
+        if content:
+            yield content
+
+
+def decode_stream(
+    response: Iterable[Any],
+    until: Callable[[IncrementalJSONDecoder], bool] | None = None,
+    on_item: Callable[[Any, Any], None] | None = None,
+) -> Any:
+    """增量解码流式响应，满足条件时提前停止读取。
+
+    提前停止时关闭响应（释放连接，服务端不再继续生成）。
+
+    Args:
+        response: ``chat.completions.create(stream=True)`` 返回的分块迭代器
+        until: 每产出新元素/字段后调用，返回 True 时停止读取
+        on_item: 每个新完整的元素/字段的回调 (键, 值)
+
+    Returns:
+        根节点的值（见 IncrementalJSONDecoder.close）
+    """
+    decoder = IncrementalJSONDecoder()
+    try:
+        for text in iter_stream_text(response):
+            events = decoder.feed(text)
+            if on_item is not None:
+                for key, value in events:
+                    on_item(key, value)
+            if decoder.done or (events and until is not None and until(decoder)):
+                break
+    finally:
+        close_stream(response)
+    return decoder.close()
+
+
+def close_stream(response: Any) -> None:
+    """关闭流式响应（支持生成器、ZhipuAI StreamResponse 和 httpx.Response）。
+
+    Args:
+        response: 流式响应
+    """
+    for target in (response, getattr(response, "response", None)):
+        close = getattr(target, "close", None)
+        if callable(close):
+            close()
@@ -0,0 +1,196 @@
+"""屏幕帧比较工具（帧指纹与帧差异）。"""
+
+import hashlib
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# 计算帧差异时的缩略图尺寸（宽, 高）
+DIFF_SIZE = (160, 90)
+# 灰度差超过该值的像素视为变化
+DIFF_PIXEL_THRESHOLD = 12
+# 脏区域至少包含的变化像素数（缩略图像素），更小的变化（如光标闪烁）忽略
+DIRTY_MIN_PIXELS = 4
+
+Box = tuple[int, int, int, int]
+
+
+def frame_fingerprint(image: Image.Image) -> str:
+    """计算帧指纹（完整像素数据的哈希）。
+
+    相同指纹表示两帧像素完全相同，可作为截图相关缓存的键。
+
+    Args:
+        image: 截图图像
+
+    Returns:
+        十六进制指纹字符串
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode}:{image.size}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def _thumbnail(image: Image.Image, size: tuple[int, int]) -> np.ndarray:
+    """缩放为灰度缩略图。"""
+    return np.asarray(image.convert("L").resize(size, Image.BILINEAR), dtype=np.int16)
+
+
+def frame_diff_ratio(
+    previous: Image.Image,
+    current: Image.Image,
+    size: tuple[int, int] = DIFF_SIZE,
+    pixel_threshold: int = DIFF_PIXEL_THRESHOLD,
+) -> float:
+    """计算两帧之间发生变化的像素比例。
+
+    在缩略图上比较，忽略抗锯齿和压缩带来的细微差异。
+
+    Args:
+        previous: 上一帧
+        current: 当前帧
+        size: 比较用的缩略图尺寸
+        pixel_threshold: 像素灰度差阈值
+
+    Returns:
+        变化像素比例（0-1），尺寸不同时返回 1.0
+    """
+    mask = frame_diff_mask(previous, current, size, pixel_threshold)
+    if mask is None:
+        return 1.0
+    return float(np.count_nonzero(mask)) / mask.size
+
+
+def frame_diff_mask(
+    previous: Image.Image,
+    current: Image.Image,
+    size: tuple[int, int] = DIFF_SIZE,
+    pixel_threshold: int = DIFF_PIXEL_THRESHOLD,
+) -> np.ndarray | None:
+    """计算两帧之间的变化掩码（缩略图坐标）。
+
+    Args:
+        previous: 上一帧
+        current: 当前帧
+        size: 比较用的缩略图尺寸
+        pixel_threshold: 像素灰度差阈值
+
+    Returns:
+        布尔数组（高, 宽），True 表示该位置发生变化；尺寸不同时返回 None
+    """
+    if previous.size != current.size:
+        return None
+    return np.abs(_thumbnail(previous, size) - _thumbnail(current, size)) > pixel_threshold
+
+
+def region_changed(mask: np.ndarray, bbox: tuple[int, int, int, int], frame_size: tuple[int, int]) -> bool:
+    """判断帧中的某个区域是否发生变化。
+
+    Args:
+        mask: frame_diff_mask 返回的变化掩码
+        bbox: 区域 (x1, y1, x2, y2)（原帧像素坐标）
+        frame_size: 原帧尺寸 (宽, 高)
+
+    Returns:
+        区域内是否有变化
+    """
+    height, width = mask.shape
+    scale_x, scale_y = width / frame_size[0], height / frame_size[1]
+    x1, y1, x2, y2 = bbox
+    left = min(width - 1, max(0, int(x1 * scale_x)))
+    top = min(height - 1, max(0, int(y1 * scale_y)))
+    right = max(left + 1, min(width, int(np.ceil(x2 * scale_x))))
+    bottom = max(top + 1, min(height, int(np.ceil(y2 * scale_y))))
+    return bool(mask[top:bottom, left:right].any())
+
+
+def dirty_regions(
+    mask: np.ndarray,
+    frame_size: tuple[int, int],
+    min_pixels: int = DIRTY_MIN_PIXELS,
+) -> list[Box]:
+    """将变化掩码分组为脏区域（相连的变化像素合并为一个矩形）。
+
+    Args:
+        mask: frame_diff_mask 返回的变化掩码
+        frame_size: 原帧尺寸 (宽, 高)
+        min_pixels: 脏区域至少包含的变化像素数，更小的区域忽略
+
+    Returns:
+        脏区域列表 [(x1, y1, x2, y2), ...]（原帧像素坐标）
+    """
+    count, _labels, stats, _centroids = cv2.connectedComponentsWithStats(mask.astype(np.uint8), connectivity=8)
+    height, width = mask.shape
+    scale_x, scale_y = frame_size[0] / width, frame_size[1] / height
+    regions = []
+    # 第 0 个连通区域是未变化的背景
+    for left, top, w, h, area in stats[1:count]:
+        if area < min_pixels:
+            continue
+        regions.append(
+            (
+                int(left * scale_x),
+                int(top * scale_y),
+                min(frame_size[0], int(np.ceil((left + w) * scale_x))),
+                min(frame_size[1], int(np.ceil((top + h) * scale_y))),
+            )
+        )
+    return regions
+
+
+class DirtyRegionDetector:
+    """脏区域检测器（记录参考帧，检测之后的帧相对参考帧变化的区域）。
+
+    只保存参考帧的指纹和缩略图，不持有完整截图。
+    """
+
+    def __init__(
+        self,
+        reference: Image.Image,
+        size: tuple[int, int] = DIFF_SIZE,
+        pixel_threshold: int = DIFF_PIXEL_THRESHOLD,
+        min_pixels: int = DIRTY_MIN_PIXELS,
+    ) -> None:
+        """初始化脏区域检测器。
+
+        Args:
+            reference: 参考帧
+            size: 比较用的缩略图尺寸
+            pixel_threshold: 像素灰度差阈值
+            min_pixels: 脏区域至少包含的变化像素数（缩略图像素）
+        """
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.min_pixels = min_pixels
+        self.frame_size = reference.size
+        self.fingerprint = frame_fingerprint(reference)
+        self._thumbnail = _thumbnail(reference, size)
+
+    def detect(self, frame: Image.Image) -> list[Box]:
+        """检测帧相对参考帧的脏区域。
+
+        Args:
+            frame: 当前帧
+
+        Returns:
+            脏区域列表（原帧像素坐标）；帧尺寸与参考帧不同时整帧视为脏区域
+        """
+        if frame.size != self.frame_size:
+            return [(0, 0, frame.width, frame.height)]
+        if frame_fingerprint(frame) == self.fingerprint:
+            return []
+        mask = np.abs(self._thumbnail - _thumbnail(frame, self.size)) > self.pixel_threshold
+        return dirty_regions(mask, self.frame_size, self.min_pixels)
+
+    def changed(self, frame: Image.Image) -> bool:
+        """判断帧相对参考帧是否有（足够大的）变化。
+
+        Args:
+            frame: 当前帧
+
+        Returns:
+            是否存在脏区域
+        """
+        return bool(self.detect(frame))
@@ -0,0 +1,202 @@
+"""目标文本模糊匹配。
+
+OCR 常把字符认错（"main.py" 识别为 "maln.py"），只做子串匹配时定位失败，
+只能再请求一次视觉模型。FuzzyMatcher 对一组文本（一帧 OCR 结果的文本词表）建立
+三元组倒排索引，一次查询对所有文本批量打分：
+
+1. 完全相同 1.0，包含目标 0.9
+2. 分词部分匹配：按分词命中比例 × 0.7（英文按单词，中文按相邻两字切分）
+3. 编辑距离：目标与文本中最相近子串的编辑距离不超过目标长度的 1/4 时，
+   得分为 0.85 × 相似度。先用三元组计数排除不可能在该距离内的文本（不会漏掉），
+   剩下的文本一起做向量化的动态规划
+
+各项取最大值。
+"""
+
+import re
+import unicodedata
+
+import numpy as np
+
+# 视为匹配的最低分数
+MATCH_THRESHOLD = 0.5
+
+# 包含目标文本的得分（完全相同为 1.0）
+CONTAIN_SCORE = 0.9
+
+# 分词部分匹配的权重
+PART_WEIGHT = 0.7
+
+# 编辑距离匹配的权重（低于包含匹配：精确匹配优先）
+FUZZY_WEIGHT = 0.85
+
+# 编辑距离匹配的最低相似度（1 - 编辑距离 / 目标长度）
+MIN_SIMILARITY = 0.75
+
+# 中日韩统一表意文字（含扩展 A）
+_CJK = "㐀-䶿一-鿿"
+_TOKEN_PATTERN = re.compile(rf"[{_CJK}]+|[^\W_{_CJK}]+")
+
+
+def normalize(text: str) -> str:
+    """规范化文本（全角转半角、小写、去除首尾空白）。"""
+    return unicodedata.normalize("NFKC", text).lower().strip()
+
+
+def tokenize(text: str) -> list[str]:
+    """分词：英文、数字按单词切分（"." "_" 等符号为分隔符），中文按相邻两字切分。
+
+    Args:
+        text: 文本
+
+    Returns:
+        分词列表（已规范化）
+    """
+    tokens = []
+    for run in _TOKEN_PATTERN.findall(normalize(text)):
+        if "㐀" <= run[0] <= "鿿" and len(run) > 1:
+            tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def trigrams(text: str) -> set[str]:
+    """文本中的三元组（连续三个字符）集合。"""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class FuzzyMatcher:
+    """一组文本上的模糊匹配器（建立一次，多次查询）。"""
+
+    def __init__(self, texts: list[str]) -> None:
+        """初始化匹配器。
+
+        Args:
+            texts: 候选文本（如一帧 OCR 结果的文本词表）
+        """
+        self.texts = list(texts)
+        normalized = [normalize(text) for text in self.texts]
+        self._array = np.array(normalized, dtype=str)
+        self._lengths = np.array([len(text) for text in normalized], dtype=np.int32)
+
+        postings: dict[str, list[int]] = {}
+        for i, text in enumerate(normalized):
+            for gram in trigrams(text):
+                postings.setdefault(gram, []).append(i)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+        # 字符编码矩阵（按最长文本补齐，补位为 -1，不与任何字符相等）
+        width = int(self._lengths.max()) if len(normalized) else 0
+        self._codes = np.full((len(normalized), width), -1, dtype=np.int32)
+        for i, text in enumerate(normalized):
+            self._codes[i, : len(text)] = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def scores(self, target: str) -> np.ndarray:
+        """计算所有文本与目标的匹配分数。
+
+        Args:
+            target: 目标文本
+
+        Returns:
+            分数数组 (N,)，取值 0-1，与 texts 顺序一致
+        """
+        scores = np.zeros(len(self.texts), dtype=np.float64)
+        target = normalize(target)
+        if not target or not len(self.texts):
+            return scores
+
+        contains = np.char.find(self._array, target) >= 0
+        scores[contains] = CONTAIN_SCORE
+        scores[self._array == target] = 1.0
+
+        parts = tokenize(target)
+        if parts:
+            hits = sum((np.char.find(self._array, part) >= 0).astype(np.int32) for part in parts)
+            scores = np.maximum(scores, hits / len(parts) * PART_WEIGHT)
+
+        max_edits = int(len(target) * (1 - MIN_SIMILARITY))
+        if max_edits:
+            candidates = ~contains & (self._lengths >= len(target) - max_edits) & self._prefilter(target, max_edits)
+            indices = np.flatnonzero(candidates)
+            if len(indices):
+                distances = self._substring_distances(target, indices)
+                close = distances <= max_edits
+                fuzzy = FUZZY_WEIGHT * (1 - distances[close] / len(target))
+                scores[indices[close]] = np.maximum(scores[indices[close]], fuzzy)
+        return scores
+
+    def rank(self, target: str, confidences=None) -> np.ndarray:
+        """挑出与目标匹配的文本，按匹配度排序。
+
+        有完全相同或包含目标的文本时，只是相近（编辑距离、分词部分匹配）的文本不返回：
+        否则阅读顺序在前的相似文本（查找 test_a.py 时的 test_b.py）会排在真正的目标前面。
+        空目标匹配所有文本（与子串匹配相同），保持原顺序，用于不按目标过滤、获取所有文本的场景。
+
+        Args:
+            target: 目标文本
+            confidences: 各文本的识别置信度（匹配度相同时按置信度降序），None 表示不参与排序
+
+        Returns:
+            匹配文本的下标数组（按匹配度降序，匹配度相同时按置信度降序，再按原顺序）
+        """
+        if not normalize(target):
+            return np.arange(len(self.texts))
+        scores = self.scores(target)
+        if (scores >= CONTAIN_SCORE).any():
+            rows = np.flatnonzero(scores >= CONTAIN_SCORE)
+        else:
+            rows = np.flatnonzero(scores > MATCH_THRESHOLD)
+        if confidences is None:
+            return rows[np.argsort(-scores[rows], kind="stable")]
+        confidences = np.asarray(confidences, dtype=np.float64)
+        return rows[np.lexsort((-confidences[rows], -scores[rows]))]
+
+    def _prefilter(self, target: str, max_edits: int) -> np.ndarray:
+        """三元组过滤：编辑距离不超过 max_edits 的文本至少包含目标中 (三元组数 - 3 × max_edits) 个三元组。"""
+        grams = trigrams(target)
+        need = len(grams) - 3 * max_edits
+        if need <= 0:
+            return np.ones(len(self.texts), dtype=bool)
+        found = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not found:
+            return np.zeros(len(self.texts), dtype=bool)
+        counts = np.bincount(np.concatenate(found), minlength=len(self.texts))
+        return counts >= need
+
+    def _substring_distances(self, target: str, indices: np.ndarray) -> np.ndarray:
+        """计算目标与各文本中最相近子串的编辑距离（所有文本一起按目标字符逐行计算）。
+
+        D[i][j] 为目标前 i 个字符与“在文本第 j 个字符处结束的子串”的最小编辑距离，
+        D[0][j] = 0（子串可以从任意位置开始），结果取 D[m][j] 在文本长度内的最小值。
+        同一行中插入操作的依赖（D[i][j-1] + 1）用 j + 前缀最小值(A[k] - k) 一次算出。
+        """
+        lengths = self._lengths[indices]
+        width = int(lengths.max())
+        codes = self._codes[indices, :width]
+        columns = np.arange(width + 1, dtype=np.int32)
+
+        previous = np.zeros((len(indices), width + 1), dtype=np.int32)
+        current = np.empty_like(previous)
+        for i, code in enumerate(np.frombuffer(target.encode("utf-32-le"), dtype=np.uint32).tolist(), 1):
+            current[:, 0] = i
+            np.minimum(previous[:, :-1] + (codes != code), previous[:, 1:] + 1, out=current[:, 1:])
+            previous, current = np.minimum.accumulate(current - columns, axis=1) + columns, previous
+        previous[columns > lengths[:, None]] = np.iinfo(np.int32).max
+        return previous.min(axis=1)
+
+
+def match_score(text: str, target: str) -> float:
+    """计算单个文本与目标的匹配分数（规则与 FuzzyMatcher 相同）。
+
+    Args:
+        text: 文本（如元素描述）
+        target: 目标文本
+
+    Returns:
+        匹配分数 (0-1)
+    """
+    return float(FuzzyMatcher([text]).scores(target)[0])
@@ -0,0 +1,136 @@
+"""定位失败结果缓存（目标不在屏幕上时快速失败）。
+
+目标不在屏幕上时，一次定位要依次尝试视觉 API、区域 OCR 和全图 OCR，耗时数秒；
+工作流步骤失败重试时屏幕往往没有变化，重复定位只会得到同样的结果。
+
+确认某个目标未找到后，记录当时截图的指纹和缩略图。之后在同样尺寸的截图上定位
+同一目标时，如果截图指纹相同或脏区域检测没有发现变化，直接返回未找到；
+屏幕发生变化（或记录过期）后才重新定位。
+
+返回过时的“未找到”代价很高（重试直到记录过期），因此缩略图按截图尺寸的 1/4 缩放、
+任何变化像素都算屏幕变化：大屏幕上新出现的一个小文件名也能检测到，代价是光标闪烁
+也会使记录失效。
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+
+from PIL import Image
+
+from src.locator.frames import DirtyRegionDetector
+
+# 比较用的缩略图相对截图的缩小倍数
+DIFF_SCALE = 4
+
+
+@dataclass
+class _Miss:
+    """一次确认的定位失败。"""
+
+    detector: DirtyRegionDetector  # 失败时截图的指纹与缩略图
+    cost: float  # 那次定位的耗时（秒）
+    recorded_at: float  # 记录时间（time.monotonic）
+
+
+class NegativeCache:
+    """定位失败结果缓存。
+
+    以 (目标, 截图尺寸) 为键，每个键只保留最近一次失败时的截图指纹；
+    命中时累计节省的时间（按那次失败定位的耗时计算）。
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 64, diff_scale: int = DIFF_SCALE) -> None:
+        """初始化失败结果缓存。
+
+        Args:
+            ttl: 记录有效期（秒），0 表示禁用
+            max_entries: 最多记录的目标数
+            diff_scale: 比较用的缩略图相对截图的缩小倍数
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.diff_scale = diff_scale
+        self._entries: dict[tuple[str, tuple[int, int]], _Miss] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "recorded": 0, "invalidated": 0, "saved_seconds": 0.0}
+
+    @property
+    def enabled(self) -> bool:
+        """是否启用。"""
+        return self.ttl > 0
+
+    def check(self, target: str, frame: Image.Image) -> bool:
+        """检查目标在当前截图上是否已确认未找到。
+
+        Args:
+            target: 目标键（提示词和目标过滤文本）
+            frame: 当前截图
+
+        Returns:
+            True 表示屏幕自上次失败以来没有变化，可以直接返回未找到
+        """
+        key = (target, frame.size)
+        with self._lock:
+            miss = self._entries.get(key)
+        if miss is None:
+            return False
+
+        if time.monotonic() - miss.recorded_at > self.ttl:
+            self.discard(target, frame.size)
+            return False
+
+        dirty = miss.detector.detect(frame)
+        with self._lock:
+            if dirty:
+                self._entries.pop(key, None)
+                self._stats["invalidated"] += 1
+                return False
+            self._stats["hits"] += 1
+            self._stats["saved_seconds"] += miss.cost
+        return True
+
+    def record(self, target: str, frame: Image.Image, cost: float) -> None:
+        """记录一次确认的定位失败。
+
+        Args:
+            target: 目标键（提示词和目标过滤文本）
+            frame: 定位失败时的截图
+            cost: 那次定位的耗时（秒）
+        """
+        if not self.enabled:
+            return
+        size = (max(1, frame.width // self.diff_scale), max(1, frame.height // self.diff_scale))
+        miss = _Miss(DirtyRegionDetector(frame, size=size, min_pixels=1), cost, time.monotonic())
+        with self._lock:
+            self._entries.pop((target, frame.size), None)
+            self._entries[(target, frame.size)] = miss
+            while len(self._entries) > self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._stats["recorded"] += 1
+
+    def discard(self, target: str, frame_size: tuple[int, int]) -> None:
+        """删除目标的失败记录。
+
+        Args:
+            target: 目标键
+            frame_size: 截图尺寸
+        """
+        with self._lock:
+            self._entries.pop((target, frame_size), None)
+
+    def get_stats(self) -> dict[str, float]:
+        """获取缓存统计。
+
+        Returns:
+            {"hits": 直接返回未找到的次数, "recorded": 记录的失败次数,
+             "invalidated": 屏幕变化后重新定位的次数, "saved_seconds": 节省的定位时间（秒）,
+             "size": 当前记录数}
+        """
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        """清空失败记录。"""
+        with self._lock:
+            self._entries.clear()
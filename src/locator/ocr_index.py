@@ -0,0 +1,157 @@
+"""屏幕文本索引（按帧缓存 OCR 结果）。"""
+
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from PIL import Image
+
+from src.locator.frames import frame_fingerprint
+from src.locator.fuzzy import MATCH_THRESHOLD, FuzzyMatcher
+from src.models.element import UIElement
+from src.models.element_set import ElementSet
+
+# 尝试导入 OCR 库
+try:
+    import easyocr
+
+    EASYOCR_AVAILABLE = True
+except ImportError:
+    EASYOCR_AVAILABLE = False
+
+# OCR 识别函数：输入图像数组，返回 [(四点 bbox, 文本, 置信度), ...]（EasyOCR readtext 格式）
+OCRReader = Callable[[np.ndarray], list[tuple[Any, str, float]]]
+
+
+@dataclass
+class OCRWord:
+    """OCR 识别到的文本块。
+
+    Attributes:
+        text: 文本内容
+        bbox: 边界框 (x1, y1, x2, y2)
+        confidence: 识别置信度 (0-1)
+    """
+
+    text: str
+    bbox: tuple[int, int, int, int]
+    confidence: float
+
+
+class OCRIndex:
+    """屏幕文本索引。
+
+    对每一帧只执行一次 OCR，结果按帧指纹缓存为列式元素集合（描述为识别文本）
+    和文本词表上的模糊匹配器；同一帧上的多次文本查找直接查询索引。
+    """
+
+    def __init__(
+        self,
+        reader: OCRReader | None = None,
+        min_confidence: float = 0.1,
+        max_frames: int = 8,
+    ) -> None:
+        """初始化文本索引。
+
+        Args:
+            reader: OCR 识别函数（可选，默认首次使用时加载 EasyOCR）
+            min_confidence: 最低识别置信度
+            max_frames: 最多缓存的帧数
+        """
+        self._reader = reader
+        self.min_confidence = min_confidence
+        self.max_frames = max_frames
+        self._frames: OrderedDict[str, tuple[ElementSet, FuzzyMatcher]] = OrderedDict()
+        self.ocr_runs = 0
+
+    @property
+    def available(self) -> bool:
+        """OCR 是否可用。"""
+        return self._reader is not None or EASYOCR_AVAILABLE
+
+    def _get_reader(self) -> OCRReader:
+        """获取 OCR 识别函数（惰性加载 EasyOCR）。"""
+        if self._reader is None:
+            if not EASYOCR_AVAILABLE:
+                raise RuntimeError("OCR 不可用，请安装 easyocr")
+            print("[OCR] 初始化 EasyOCR Reader...")
+            self._reader = easyocr.Reader(["en", "ch_sim"], gpu=False).readtext
+        return self._reader
+
+    def elements(self, image: Image.Image) -> ElementSet:
+        """获取帧的文本块集合（未缓存时执行 OCR）。
+
+        Args:
+            image: 截图图像
+
+        Returns:
+            文本块集合（element_type 为 ocr_text，description 为识别文本）
+        """
+        return self._lookup(image)[0]
+
+    def _lookup(self, image: Image.Image) -> tuple[ElementSet, FuzzyMatcher]:
+        """获取帧的文本块集合与模糊匹配器（未缓存时执行 OCR）。"""
+        key = frame_fingerprint(image)
+        cached = self._frames.get(key)
+        if cached is not None:
+            self._frames.move_to_end(key)
+            return cached
+
+        results = [item for item in self._get_reader()(np.array(image)) if item[2] >= self.min_confidence]
+        self.ocr_runs += 1
+
+        # bbox 格式: [[x1,y1], [x2,y1], [x2,y2], [x1,y2]]
+        points = np.array([bbox for bbox, _, _ in results], dtype=np.float64).reshape(-1, 4, 2)
+        boxes = np.concatenate([points.min(axis=1), points.max(axis=1)], axis=1).astype(np.int32)
+        words = ElementSet.from_columns(
+            boxes,
+            [float(confidence) for _, _, confidence in results],
+            "ocr_text",
+            [text for _, text, _ in results],
+        )
+
+        self._frames[key] = (words, FuzzyMatcher(words.descriptions))
+        while len(self._frames) > self.max_frames:
+            self._frames.popitem(last=False)
+        return self._frames[key]
+
+    def index(self, image: Image.Image) -> list[OCRWord]:
+        """获取帧的文本块（未缓存时执行 OCR）。
+
+        Args:
+            image: 截图图像
+
+        Returns:
+            文本块列表
+        """
+        return [OCRWord(text=w.description, bbox=w.bbox, confidence=w.confidence) for w in self.elements(image)]
+
+    def find(self, image: Image.Image, text: str) -> list[UIElement]:
+        """在帧中查找包含指定文本的元素。
+
+        Args:
+            image: 截图图像
+            text: 目标文本（不区分大小写，容忍少量识别错误，见 src.locator.fuzzy）
+
+        Returns:
+            匹配的 UI 元素列表（按匹配度降序，匹配度相同时按置信度降序）
+        """
+        words, matcher = self._lookup(image)
+        scores = matcher.scores(text)[words.description_codes]
+        rows = np.flatnonzero(scores > MATCH_THRESHOLD)
+        matched = words.take(rows[np.lexsort((-words.confidences[rows], -scores[rows]))])
+        return [
+            UIElement(
+                element_type="ocr_text",
+                description=f"OCR识别文本: {word.description}",
+                bbox=word.bbox,
+                confidence=word.confidence,
+            )
+            for word in matched
+        ]
+
+    def clear(self) -> None:
+        """清空索引缓存。"""
+        self._frames.clear()
@@ -0,0 +1,166 @@
+"""操作搜索区域（只在截图的已知区域内定位）。
+
+许多操作的目标位置是固定的（左侧项目树、底部终端、顶部工具栏），
+只截取并分析该区域可以减少模板匹配、OCR 的计算量和视觉 API 的上传体积。
+
+区域有两种写法（见 RegionConfig）：
+
+- 比例区域：相对于截图（窗口）宽高的比例
+- 锚点区域：相对于锚点模板匹配位置的像素偏移和尺寸，适合位置随布局变化的面板
+"""
+
+from dataclasses import replace
+from typing import Any
+
+from PIL import Image
+
+from src.config.schema import RegionConfig
+from src.locator.tiling import expand_box, offset_box
+from src.models.element import UIElement
+
+Box = tuple[int, int, int, int]
+
+# 复核缓存的锚点位置时，在原位置周围扩展的像素
+ANCHOR_SEARCH_MARGIN = 32
+
+
+def fraction_box(region: RegionConfig, frame_size: tuple[int, int]) -> Box:
+    """将比例区域换算为截图坐标。
+
+    Args:
+        region: 区域配置（x, y, width, height 为 0-1 的比例）
+        frame_size: 截图尺寸 (宽, 高)
+
+    Returns:
+        区域 (x1, y1, x2, y2)，裁剪到截图范围内
+    """
+    width, height = frame_size
+    x1 = round(region.x * width)
+    y1 = round(region.y * height)
+    x2 = round((region.x + region.width) * width)
+    y2 = round((region.y + region.height) * height)
+    return _clip((x1, y1, x2, y2), frame_size)
+
+
+def anchored_box(region: RegionConfig, anchor_bbox: Box, frame_size: tuple[int, int]) -> Box:
+    """将锚点区域换算为截图坐标。
+
+    Args:
+        region: 区域配置（x, y 为相对于锚点左上角的像素偏移，width, height 为像素尺寸）
+        anchor_bbox: 锚点在截图中的边界框
+        frame_size: 截图尺寸 (宽, 高)
+
+    Returns:
+        区域 (x1, y1, x2, y2)，裁剪到截图范围内
+    """
+    x1 = anchor_bbox[0] + round(region.x)
+    y1 = anchor_bbox[1] + round(region.y)
+    return _clip((x1, y1, x1 + round(region.width), y1 + round(region.height)), frame_size)
+
+
+def _clip(box: Box, frame_size: tuple[int, int]) -> Box:
+    """将区域裁剪到截图范围内。"""
+    return expand_box(box, 0, frame_size)
+
+
+def to_frame_elements(elements: list[UIElement], origin: tuple[int, int]) -> list[UIElement]:
+    """将区域（窗口）内定位到的元素换算为截图坐标。
+
+    Args:
+        elements: 区域坐标下的元素列表
+        origin: 区域左上角在截图中的坐标 (x, y)
+
+    Returns:
+        截图坐标下的元素列表
+    """
+    return [replace(element, bbox=offset_box(element.bbox, origin[0], origin[1])) for element in elements]
+
+
+class RegionResolver:
+    """操作搜索区域解析器（缓存锚点位置）。
+
+    锚点模板在整张截图上匹配一次后记录位置，之后只在原位置附近复核，
+    锚点移动（如面板被拖动）时才重新全图匹配。
+    """
+
+    def __init__(self, template_matcher: Any | None = None) -> None:
+        """初始化区域解析器。
+
+        Args:
+            template_matcher: 模板匹配器（可选，没有时锚点区域不可用）
+        """
+        self.template_matcher = template_matcher
+        # 锚点模板 -> 最近一次匹配到的边界框
+        self._anchors: dict[str, Box] = {}
+        self._stats = {"anchor_hits": 0, "anchor_searches": 0, "anchor_missing": 0}
+
+    def resolve(self, region: RegionConfig | None, screenshot: Image.Image) -> Box | None:
+        """解析操作的搜索区域。
+
+        Args:
+            region: 区域配置（None 表示整张截图）
+            screenshot: 截图
+
+        Returns:
+            区域 (x1, y1, x2, y2)；未配置区域、锚点未找到或区域为空时返回 None（搜索整张截图）
+        """
+        if region is None:
+            return None
+        if region.anchor:
+            anchor_bbox = self._find_anchor(region, screenshot)
+            if anchor_bbox is None:
+                print(f"[区域] 未找到锚点 {region.anchor}，搜索整张截图")
+                return None
+            box = anchored_box(region, anchor_bbox, screenshot.size)
+        else:
+            box = fraction_box(region, screenshot.size)
+        if box[2] <= box[0] or box[3] <= box[1]:
+            return None
+        return box
+
+    def _find_anchor(self, region: RegionConfig, screenshot: Image.Image) -> Box | None:
+        """查找锚点模板（先复核缓存位置，再全图匹配）。
+
+        Args:
+            region: 区域配置
+            screenshot: 截图
+
+        Returns:
+            锚点边界框，未找到时返回 None
+        """
+        if self.template_matcher is None:
+            return None
+        name = region.anchor
+        threshold = region.anchor_confidence or self.template_matcher.default_confidence
+
+        cached = self._anchors.get(name)
+        if cached is not None:
+            near = expand_box(cached, ANCHOR_SEARCH_MARGIN, screenshot.size)
+            matches = self.template_matcher.match(screenshot.crop(near), name, threshold=threshold)
+            if matches:
+                self._stats["anchor_hits"] += 1
+                bbox = offset_box(matches[0].bbox, near[0], near[1])
+                self._anchors[name] = bbox
+                return bbox
+
+        self._stats["anchor_searches"] += 1
+        matches = self.template_matcher.match(screenshot, name, threshold=threshold)
+        if not matches:
+            self._stats["anchor_missing"] += 1
+            self._anchors.pop(name, None)
+            return None
+        bbox = max(matches, key=lambda element: element.confidence).bbox
+        self._anchors[name] = bbox
+        return bbox
+
+    def get_stats(self) -> dict[str, int]:
+        """获取锚点缓存统计。
+
+        Returns:
+            {"anchor_hits": 复核命中次数, "anchor_searches": 全图匹配次数, "anchor_missing": 未找到次数}
+        """
+        return dict(self._stats)
+
+    def clear(self) -> None:
+        """清空锚点位置缓存。"""
+        self._anchors.clear()
@@ -0,0 +1,202 @@
+"""UI 元素空间索引（方向、包含与重叠查询）。
+
+一帧截图上的模板匹配结果、OCR 文本块等元素放入均匀网格索引，边界框存为 NumPy 数组。
+“本地下方的输入框”这类按位置关系描述的目标，找到参考元素后直接在索引上查询，
+不需要再调用视觉模型。
+"""
+
+import numpy as np
+
+from src.models.element import UIElement
+
+Box = tuple[int, int, int, int]
+
+# 命令中的位置提示 → 查询方向
+DIRECTIONS = {
+    "上方": "up",
+    "下方": "down",
+    "左侧": "left",
+    "左边": "left",
+    "右侧": "right",
+    "右边": "right",
+}
+
+# 网格单元边长（像素）
+DEFAULT_CELL_SIZE = 128
+
+# 方向查询时偏离参考元素所在行（列）的距离权重：偏离越远越不像“正下方”的元素
+LATERAL_WEIGHT = 2.0
+
+# 方向判断的容差（像素）：相邻元素的边框常有几个像素重叠
+EDGE_TOLERANCE = 4
+
+
+class SpatialIndex:
+    """UI 元素空间索引。
+
+    边界框存为 (N, 4) 的整数数组，按均匀网格记录每个单元覆盖的元素：
+    包含与重叠查询只检查与查询范围相交的单元中的元素，方向查询对全部元素做向量化计算。
+    """
+
+    def __init__(self, elements: list[UIElement], cell_size: int = DEFAULT_CELL_SIZE) -> None:
+        """初始化空间索引。
+
+        Args:
+            elements: UI 元素列表
+            cell_size: 网格单元边长（像素）
+        """
+        self.elements = list(elements)
+        self.cell_size = cell_size
+        self.boxes = np.array([element.bbox for element in self.elements], dtype=np.int64).reshape(-1, 4)
+        self._types = np.array([element.element_type for element in self.elements], dtype=object)
+
+        cells: dict[tuple[int, int], list[int]] = {}
+        for i, (x1, y1, x2, y2) in enumerate(self.boxes.tolist()):
+            for cx, cy in self._cells_of((x1, y1, x2, y2)):
+                cells.setdefault((cx, cy), []).append(i)
+        self._cells = {cell: np.array(indices, dtype=np.int64) for cell, indices in cells.items()}
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def _cells_of(self, box: Box) -> list[tuple[int, int]]:
+        """计算范围覆盖的网格单元。"""
+        x1, y1, x2, y2 = box
+        size = self.cell_size
+        return [
+            (cx, cy)
+            for cx in range(x1 // size, max(x1, x2 - 1) // size + 1)
+            for cy in range(y1 // size, max(y1, y2 - 1) // size + 1)
+        ]
+
+    def _candidates(self, box: Box) -> np.ndarray:
+        """与范围相交的网格单元中的元素下标（去重）。"""
+        found = [self._cells[cell] for cell in self._cells_of(box) if cell in self._cells]
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def _select(self, indices: np.ndarray) -> list[UIElement]:
+        return [self.elements[i] for i in indices.tolist()]
+
+    def containing(self, target: tuple[int, int] | Box) -> list[UIElement]:
+        """查找包含指定点或范围的元素。
+
+        Args:
+            target: 点 (x, y) 或范围 (x1, y1, x2, y2)
+
+        Returns:
+            包含目标的元素列表（按面积升序，最内层的元素在前）
+        """
+        box = (target[0], target[1], target[0] + 1, target[1] + 1) if len(target) == 2 else tuple(target)
+        indices = self._candidates(box)
+        b = self.boxes[indices]
+        mask = (b[:, 0] <= box[0]) & (b[:, 1] <= box[1]) & (b[:, 2] >= box[2]) & (b[:, 3] >= box[3])
+        indices = indices[mask]
+        b = b[mask]
+        order = np.argsort((b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1]), kind="stable")
+        return self._select(indices[order])
+
+    def within(self, box: Box) -> list[UIElement]:
+        """查找完全位于范围内的元素。
+
+        Args:
+            box: 范围 (x1, y1, x2, y2)
+
+        Returns:
+            范围内的元素列表
+        """
+        indices = self._candidates(box)
+        b = self.boxes[indices]
+        mask = (b[:, 0] >= box[0]) & (b[:, 1] >= box[1]) & (b[:, 2] <= box[2]) & (b[:, 3] <= box[3])
+        return self._select(indices[mask])
+
+    def iou(self, box: Box) -> np.ndarray:
+        """计算范围与所有元素的交并比。
+
+        Args:
+            box: 范围 (x1, y1, x2, y2)
+
+        Returns:
+            交并比数组（与 elements 顺序一致）
+        """
+        b = self.boxes
+        width = np.clip(np.minimum(b[:, 2], box[2]) - np.maximum(b[:, 0], box[0]), 0, None)
+        height = np.clip(np.minimum(b[:, 3], box[3]) - np.maximum(b[:, 1], box[1]), 0, None)
+        inter = width * height
+        areas = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+        union = areas + (box[2] - box[0]) * (box[3] - box[1]) - inter
+        return np.where(union > 0, inter / np.maximum(union, 1), 0.0)
+
+    def overlapping(self, box: Box, min_iou: float = 0.0) -> list[tuple[UIElement, float]]:
+        """查找与范围重叠的元素。
+
+        Args:
+            box: 范围 (x1, y1, x2, y2)
+            min_iou: 最低交并比（只返回大于该值的元素）
+
+        Returns:
+            [(元素, 交并比), ...]（按交并比降序）
+        """
+        indices = self._candidates(box)
+        if not len(indices):
+            return []
+        b = self.boxes[indices]
+        width = np.clip(np.minimum(b[:, 2], box[2]) - np.maximum(b[:, 0], box[0]), 0, None)
+        height = np.clip(np.minimum(b[:, 3], box[3]) - np.maximum(b[:, 1], box[1]), 0, None)
+        inter = width * height
+        union = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1]) + (box[2] - box[0]) * (box[3] - box[1]) - inter
+        scores = np.where(union > 0, inter / np.maximum(union, 1), 0.0)
+        order = np.argsort(-scores, kind="stable")
+        return [(self.elements[indices[i]], float(scores[i])) for i in order.tolist() if scores[i] > min_iou]
+
+    def nearest(
+        self,
+        anchor: Box,
+        direction: str,
+        element_types: list[str] | None = None,
+        max_distance: int | None = None,
+    ) -> UIElement | None:
+        """查找参考范围指定方向上最近的元素。
+
+        距离为沿查询方向的间隔加上偏离参考范围所在行（列）的距离（乘以 LATERAL_WEIGHT）：
+        正下方稍远的元素优先于斜下方较近的元素。与参考范围重叠的元素（包括参考元素本身）不参与比较。
+
+        Args:
+            anchor: 参考范围 (x1, y1, x2, y2)
+            direction: 方向（up/down/left/right 或命令中的位置提示，如“下方”）
+            element_types: 只查找这些类型的元素（可选）
+            max_distance: 沿查询方向的最大间隔（像素，可选）
+
+        Returns:
+            最近的元素，没有时返回 None
+
+        Raises:
+            ValueError: 未知的方向
+        """
+        axis = DIRECTIONS.get(direction, direction)
+        if axis not in ("up", "down", "left", "right"):
+            raise ValueError(f"未知的方向: {direction}")
+        if not self.elements:
+            return None
+
+        b = self.boxes
+        ax1, ay1, ax2, ay2 = anchor
+        if axis in ("up", "down"):
+            gap = b[:, 1] - ay2 if axis == "down" else ay1 - b[:, 3]
+            lateral = np.maximum(0, np.maximum(b[:, 0] - ax2, ax1 - b[:, 2]))
+        else:
+            gap = b[:, 0] - ax2 if axis == "right" else ax1 - b[:, 2]
+            lateral = np.maximum(0, np.maximum(b[:, 1] - ay2, ay1 - b[:, 3]))
+
+        mask = gap >= -EDGE_TOLERANCE
+        if element_types is not None:
+            mask &= np.isin(self._types, element_types)
+        if max_distance is not None:
+            mask &= gap <= max_distance
+        indices = np.flatnonzero(mask)
+        if not len(indices):
+            return None
+
+        scores = np.maximum(gap[indices], 0) + LATERAL_WEIGHT * lateral[indices]
+        return self.elements[int(indices[np.argmin(scores)])]
@@ -0,0 +1,191 @@
+"""大尺寸截图分块与区域坐标换算（多显示器虚拟屏幕的视觉定位、两阶段定位）。
+
+视觉模型会把大图缩小后再识别，整个虚拟屏幕（monitor_index=0）作为一张图上传时，
+IDE 中的小字无法辨认。分块后每块以接近原始分辨率识别：
+
+- 多显示器时按显示器分块（显示器之间没有跨越的元素，不需要重叠）
+- 单块仍超过尺寸上限时按网格切分，相邻块重叠，避免切断边界上的元素
+- 各块结果换算为全局坐标后去重（非极大值抑制）
+
+两阶段定位先在缩小的整图上粗定位，再按原始分辨率裁剪粗定位区域精确定位，
+同样需要在缩放图、裁剪图与截图坐标之间换算。
+"""
+
+from src.models.element import UIElement
+from src.models.element_set import ElementSet
+
+# 单块默认尺寸上限（宽, 高）
+DEFAULT_TILE_SIZE = (1920, 1200)
+# 网格切分时相邻块的默认重叠（像素）
+DEFAULT_TILE_OVERLAP = 64
+
+Box = tuple[int, int, int, int]
+
+
+def grid_tiles(region: Box, tile_size: tuple[int, int], overlap: int) -> list[Box]:
+    """将区域按网格切分为相互重叠的块。
+
+    Args:
+        region: 区域 (x1, y1, x2, y2)
+        tile_size: 单块尺寸上限 (宽, 高)
+        overlap: 相邻块重叠像素
+
+    Returns:
+        块列表 (x1, y1, x2, y2)，区域不超过上限时只有一块
+    """
+    x1, y1, x2, y2 = region
+    xs = _spans(x1, x2, tile_size[0], overlap)
+    ys = _spans(y1, y2, tile_size[1], overlap)
+    return [(left, top, right, bottom) for top, bottom in ys for left, right in xs]
+
+
+def _spans(start: int, end: int, size: int, overlap: int) -> list[tuple[int, int]]:
+    """一维切分：块数最少、块长相等，相邻块至少重叠 overlap。"""
+    length = end - start
+    if length <= size:
+        return [(start, end)]
+    step = max(1, size - overlap)
+    count = -(-(length - overlap) // step)
+    # 平均分布各块起点，首尾对齐区域边界
+    stride = (length - size) / (count - 1)
+    return [(start + round(i * stride), start + round(i * stride) + size) for i in range(count)]
+
+
+def monitor_tiles(monitors: list[dict], frame_size: tuple[int, int]) -> list[Box] | None:
+    """按显示器划分虚拟屏幕截图。
+
+    Args:
+        monitors: mss 显示器列表（第 0 项为虚拟屏幕，其余为各显示器）
+        frame_size: 截图尺寸 (宽, 高)
+
+    Returns:
+        各显示器在截图中的区域；截图不是多显示器虚拟屏幕时返回 None
+    """
+    if len(monitors) < 3:
+        return None
+    virtual = monitors[0]
+    if (virtual.get("width"), virtual.get("height")) != tuple(frame_size):
+        return None
+    return [
+        (
+            monitor["left"] - virtual["left"],
+            monitor["top"] - virtual["top"],
+            monitor["left"] - virtual["left"] + monitor["width"],
+            monitor["top"] - virtual["top"] + monitor["height"],
+        )
+        for monitor in monitors[1:]
+    ]
+
+
+def plan_tiles(
+    frame_size: tuple[int, int],
+    monitors: list[dict] | None = None,
+    tile_size: tuple[int, int] = DEFAULT_TILE_SIZE,
+    overlap: int = DEFAULT_TILE_OVERLAP,
+) -> list[Box]:
+    """规划截图的分块。
+
+    Args:
+        frame_size: 截图尺寸 (宽, 高)
+        monitors: mss 显示器列表（可选，多显示器时按显示器分块）
+        tile_size: 单块尺寸上限 (宽, 高)
+        overlap: 网格切分时相邻块重叠像素
+
+    Returns:
+        块列表 (x1, y1, x2, y2)；不需要分块时只有整张截图一块
+    """
+    width, height = frame_size
+    regions = (monitors and monitor_tiles(monitors, frame_size)) or [(0, 0, width, height)]
+    tiles = []
+    for region in regions:
+        tiles.extend(grid_tiles(region, tile_size, overlap))
+    return tiles
+
+
+def offset_box(box: Box, dx: int, dy: int) -> Box:
+    """平移边界框（局部坐标换算为全局坐标）。
+
+    Args:
+        box: 边界框 (x1, y1, x2, y2)
+        dx: X 轴平移量
+        dy: Y 轴平移量
+
+    Returns:
+        平移后的边界框
+    """
+    return (box[0] + dx, box[1] + dy, box[2] + dx, box[3] + dy)
+
+
+def scale_box(box: Box, factor: float) -> Box:
+    """缩放边界框（缩放图坐标换算为原图坐标时 factor 为缩放比例的倒数）。
+
+    Args:
+        box: 边界框 (x1, y1, x2, y2)
+        factor: 缩放倍数
+
+    Returns:
+        缩放后的边界框
+    """
+    return tuple(round(value * factor) for value in box)
+
+
+def expand_box(box: Box, margin: int, frame_size: tuple[int, int]) -> Box:
+    """向四周扩展边界框并裁剪到截图范围内。
+
+    Args:
+        box: 边界框 (x1, y1, x2, y2)
+        margin: 每边扩展像素
+        frame_size: 截图尺寸 (宽, 高)
+
+    Returns:
+        扩展后的边界框
+    """
+    width, height = frame_size
+    return (
+        max(0, box[0] - margin),
+        max(0, box[1] - margin),
+        min(width, box[2] + margin),
+        min(height, box[3] + margin),
+    )
+
+
+def box_overlap(a: Box, b: Box) -> tuple[float, float]:
+    """计算两个边界框的重叠程度。
+
+    Args:
+        a: 边界框 (x1, y1, x2, y2)
+        b: 边界框 (x1, y1, x2, y2)
+
+    Returns:
+        (IoU, 交集占较小框面积的比例)
+    """
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0, 0.0
+    inter = width * height
+    area_a = max(1, (a[2] - a[0]) * (a[3] - a[1]))
+    area_b = max(1, (b[2] - b[0]) * (b[3] - b[1]))
+    return inter / (area_a + area_b - inter), inter / min(area_a, area_b)
+
+
+def merge_elements(
+    elements: list[UIElement],
+    iou_threshold: float = 0.5,
+    containment_threshold: float = 0.8,
+) -> list[UIElement]:
+    """合并重复元素（非极大值抑制）。
+
+    重叠块会重复识别边界附近的元素，其中一块可能只看到元素的一部分，
+    因此除 IoU 外，较小框大部分落在较大框内且描述相同时也视为重复。
+    保留置信度最高的一个。
+
+    Args:
+        elements: 全局坐标下的元素列表
+        iou_threshold: IoU 超过该值视为重复
+        containment_threshold: 描述相同且交集占较小框比例超过该值视为重复
+
+    Returns:
+        去重后的元素列表（按置信度降序）
+    """
+    return ElementSet.from_elements(elements).nms(iou_threshold, containment_threshold).to_list()
@@ -0,0 +1,451 @@
+"""界面地图（空闲时建立的目标窗口 UI 元素位置索引）。
+
+两条命令之间程序大部分时间处于空闲状态。UIMapIndexer 在空闲时截取目标窗口，
+分条带执行 OCR、逐个扫描操作模板，得到带标签（识别文本或模板名称）的元素位置，
+按窗口布局存入 UIMap。执行命令时先在地图中按标签查找目标，在目标位置附近用建图时
+保存的元素截图做一次小范围模板匹配，确认元素还在（允许移动几个像素）后直接使用，
+不再完整定位一次。
+
+建图以步骤（一次截图、一个条带的 OCR、一个模板）为单位进行：每步之间检查是否有命令
+到来，有则立即放弃本轮建图；每步之后按步骤耗时休眠，使后台线程的运行时间占比
+不超过 cpu_budget。
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from src.locator.fuzzy import MATCH_THRESHOLD, FuzzyMatcher
+from src.locator.ocr_index import OCRIndex
+from src.models.element import UIElement
+from src.models.element_set import ElementSet
+
+Box = tuple[int, int, int, int]
+
+# 布局缩略图尺寸（判断两帧是否为同一窗口布局）
+LAYOUT_SIZE = (32, 18)
+# 同一布局允许的缩略图平均灰度差（编辑区文字变化、光标闪烁不改变布局）
+LAYOUT_TOLERANCE = 12.0
+# 最多保存的布局数
+MAX_LAYOUTS = 8
+
+# 校验时在元素位置每边扩展的搜索范围（像素）
+VERIFY_MARGIN = 4
+# 校验通过的最低相关系数（标签不同的文本通常低于 0.8）
+VERIFY_MIN_SCORE = 0.9
+# 元素截图的最大尺寸（超过时只保存左上部分）
+MAX_PATCH_SIZE = (240, 64)
+# 低于该灰度标准差的元素截图视为纯色，用平均灰度差校验
+FLAT_STD = 2.0
+FLAT_MAX_DIFF = 8.0
+
+# OCR 条带高度与相邻条带重叠（像素），条带之间可以让出 CPU
+BAND_HEIGHT = 240
+BAND_OVERLAP = 32
+
+# 模板元素的类型（description 为模板名称）
+TEMPLATE_TYPE = "template"
+
+
+def _thumbnail(image: Image.Image) -> np.ndarray:
+    """布局缩略图（灰度）。"""
+    return cv2.resize(np.asarray(image.convert("L")), LAYOUT_SIZE, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+@dataclass
+class _Layout:
+    """一个窗口布局的地图。"""
+
+    size: tuple[int, int]  # 截图尺寸
+    thumbnail: np.ndarray  # 布局缩略图
+    elements: ElementSet  # 带标签的元素（截图坐标）
+    patches: list[np.ndarray]  # 每个元素的灰度截图（原始分辨率）
+    matcher: FuzzyMatcher  # 元素标签上的模糊匹配器
+    built_at: float  # 建立时间（time.monotonic）
+
+
+class UIMap:
+    """界面地图。
+
+    按截图尺寸和布局缩略图区分窗口布局，每个布局保存最近一次建图的结果。
+    """
+
+    def __init__(
+        self,
+        max_layouts: int = MAX_LAYOUTS,
+        layout_tolerance: float = LAYOUT_TOLERANCE,
+        verify_min_score: float = VERIFY_MIN_SCORE,
+    ) -> None:
+        """初始化界面地图。
+
+        Args:
+            max_layouts: 最多保存的布局数
+            layout_tolerance: 同一布局允许的缩略图平均灰度差
+            verify_min_score: 校验通过的最低相关系数
+        """
+        self.max_layouts = max_layouts
+        self.layout_tolerance = layout_tolerance
+        self.verify_min_score = verify_min_score
+        self._layouts: list[_Layout] = []
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._rejected = 0
+
+    def _find(self, frame: Image.Image, thumbnail: np.ndarray | None = None) -> _Layout | None:
+        """查找帧所属的布局（调用方持有锁）。"""
+        candidates = [layout for layout in self._layouts if layout.size == frame.size]
+        if not candidates:
+            return None
+        if thumbnail is None:
+            thumbnail = _thumbnail(frame)
+        diffs = [float(np.abs(layout.thumbnail - thumbnail).mean()) for layout in candidates]
+        best = int(np.argmin(diffs))
+        return candidates[best] if diffs[best] <= self.layout_tolerance else None
+
+    def update(self, frame: Image.Image, elements: ElementSet) -> None:
+        """保存一帧的建图结果（替换同一布局之前的结果）。
+
+        Args:
+            frame: 建图时的截图
+            elements: 带标签的元素（截图坐标）
+        """
+        gray = np.asarray(frame.convert("L"))
+        patches = []
+        for x1, y1, x2, y2 in elements.boxes.tolist():
+            x1, y1 = max(0, x1), max(0, y1)
+            x2, y2 = min(x2, x1 + MAX_PATCH_SIZE[0]), min(y2, y1 + MAX_PATCH_SIZE[1])
+            patches.append(gray[y1:y2, x1:x2].copy())
+
+        thumbnail = _thumbnail(frame)
+        layout = _Layout(
+            frame.size, thumbnail, elements, patches, FuzzyMatcher(elements.descriptions), time.monotonic()
+        )
+        with self._lock:
+            previous = self._find(frame, thumbnail)
+            if previous is not None:
+                self._layouts.remove(previous)
+            self._layouts.append(layout)
+            while len(self._layouts) > self.max_layouts:
+                self._layouts.pop(0)
+
+    def age(self, frame: Image.Image) -> float | None:
+        """帧所属布局的地图建立至今的时间（秒）。
+
+        Args:
+            frame: 截图
+
+        Returns:
+            秒数，没有该布局的地图时返回 None
+        """
+        with self._lock:
+            layout = self._find(frame)
+        return None if layout is None else time.monotonic() - layout.built_at
+
+    def resolve(
+        self,
+        frame: Image.Image,
+        text: str | None = None,
+        template: str | None = None,
+        limit: int = 3,
+    ) -> list[UIElement]:
+        """在地图中查找目标，并用小块截图校验元素仍在原处。
+
+        Args:
+            frame: 当前截图（与建图时相同的截图范围）
+            text: 目标文本（在 OCR 文本中模糊匹配）
+            template: 模板名称（与 text 二选一）
+            limit: 最多返回的元素数
+
+        Returns:
+            校验通过的元素（按匹配度降序）；没有该布局的地图或校验都未通过时返回空列表
+        """
+        with self._lock:
+            layout = self._find(frame)
+        if layout is None or not (text or template):
+            self._count("_misses")
+            return []
+
+        elements = layout.elements
+        template_code = elements.types.index(TEMPLATE_TYPE) if TEMPLATE_TYPE in elements.types else -1
+        if template:
+            scores = np.array([float(description == template) for description in elements.descriptions])
+            wanted = elements.type_codes == template_code
+        else:
+            scores = layout.matcher.scores(text)
+            wanted = elements.type_codes != template_code
+        row_scores = scores[elements.description_codes] if len(elements) else np.zeros(0)
+        rows = np.flatnonzero((row_scores > MATCH_THRESHOLD) & wanted)
+        rows = rows[np.lexsort((-elements.confidences[rows], -row_scores[rows]))]
+
+        found = []
+        gray = np.asarray(frame.convert("L")) if len(rows) else None
+        for row in rows.tolist():
+            box = self._verify(gray, tuple(elements.boxes[row].tolist()), layout.patches[row])
+            if box is None:
+                self._count("_rejected")
+                continue
+            element = elements[row]
+            description = element.description if template else f"OCR识别文本: {element.description}"
+            found.append(
+                UIElement(
+                    element_type=element.element_type,
+                    description=description,
+                    bbox=box,
+                    confidence=element.confidence,
+                    metadata={"source": "ui_map"},
+                )
+            )
+            if len(found) >= limit:
+                break
+
+        self._count("_hits" if found else "_misses")
+        return found
+
+    def _count(self, name: str) -> None:
+        """统计计数加一。"""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _verify(self, gray: np.ndarray, box: Box, patch: np.ndarray) -> Box | None:
+        """在元素位置附近匹配建图时的元素截图。
+
+        Args:
+            gray: 当前截图（灰度）
+            box: 建图时的元素位置
+            patch: 建图时的元素截图
+
+        Returns:
+            元素当前位置（按匹配位置平移），未找到时返回 None
+        """
+        h, w = patch.shape
+        if not h or not w:
+            return None
+        x0, y0 = max(0, box[0] - VERIFY_MARGIN), max(0, box[1] - VERIFY_MARGIN)
+        region = gray[y0 : max(0, box[1]) + h + VERIFY_MARGIN, x0 : max(0, box[0]) + w + VERIFY_MARGIN]
+        if region.shape[0] < h or region.shape[1] < w:
+            return None
+
+        if patch.std() < FLAT_STD:
+            # 纯色截图的相关系数没有意义，只比较原位置的平均灰度
+            dx, dy = max(0, box[0]) - x0, max(0, box[1]) - y0
+            current = region[dy : dy + h, dx : dx + w].astype(np.int16)
+            return box if float(np.abs(current - patch).mean()) <= FLAT_MAX_DIFF else None
+
+        result = cv2.matchTemplate(region, patch, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (x, y) = cv2.minMaxLoc(result)
+        if not np.isfinite(score) or score < self.verify_min_score:
+            return None
+        dx, dy = x0 + x - max(0, box[0]), y0 + y - max(0, box[1])
+        return (box[0] + dx, box[1] + dy, box[2] + dx, box[3] + dy)
+
+    def get_stats(self) -> dict:
+        """获取统计信息。
+
+        Returns:
+            布局数、元素数、命中次数、未命中次数、校验未通过的元素数
+        """
+        with self._lock:
+            return {
+                "layouts": len(self._layouts),
+                "elements": sum(len(layout.elements) for layout in self._layouts),
+                "hits": self._hits,
+                "misses": self._misses,
+                "rejected": self._rejected,
+            }
+
+    def clear(self) -> None:
+        """清空地图。"""
+        with self._lock:
+            self._layouts.clear()
+
+
+class _YieldError(Exception):
+    """有命令到来（或停止），放弃本轮建图。"""
+
+
+class UIMapIndexer:
+    """空闲时建立界面地图的后台线程。
+
+    执行命令期间调用 pause()/resume()（可以嵌套）；距离最近一次命令超过 idle_seconds
+    后开始建图。同一布局的地图在 refresh_seconds 内不重建；未变化的条带由 OCR 索引
+    按条带截图指纹直接返回上次的结果。
+    """
+
+    def __init__(
+        self,
+        ui_map: UIMap,
+        capture: Callable[[], Image.Image | None],
+        ocr_index: OCRIndex | None = None,
+        template_matcher=None,
+        templates: list[str] | None = None,
+        idle_seconds: float = 3.0,
+        cpu_budget: float = 0.25,
+        refresh_seconds: float = 30.0,
+        band_height: int = BAND_HEIGHT,
+    ) -> None:
+        """初始化建图线程。
+
+        Args:
+            ui_map: 界面地图
+            capture: 截图函数（在建图线程中调用，返回与执行命令时相同范围的截图，不可用时返回 None）
+            ocr_index: 文本索引（可选，默认使用独立的 EasyOCR 实例，不与执行命令时的 OCR 争用）
+            template_matcher: 模板匹配器（可选）
+            templates: 要扫描的模板名称
+            idle_seconds: 距离最近一次命令多久（秒）后开始建图
+            cpu_budget: 建图线程的运行时间占比上限（0-1，每步之后按步骤耗时休眠）
+            refresh_seconds: 同一布局的地图多久（秒）后重建
+            band_height: OCR 条带高度（像素）
+
+        Raises:
+            ValueError: cpu_budget 不在 (0, 1] 范围内
+        """
+        if not 0 < cpu_budget <= 1:
+            raise ValueError(f"cpu_budget 必须在 (0, 1] 范围内: {cpu_budget}")
+        self.ui_map = ui_map
+        self._capture = capture
+        self._ocr = ocr_index or OCRIndex(max_frames=16)
+        self._template_matcher = template_matcher
+        self.templates = list(templates or [])
+        self.idle_seconds = idle_seconds
+        self.cpu_budget = cpu_budget
+        self.refresh_seconds = refresh_seconds
+        self.band_height = band_height
+
+        self._lock = threading.Lock()
+        self._busy = 0
+        self._activity = 0  # 每次 pause/resume 递增，建图期间变化即放弃本轮
+        self._last_active = time.monotonic()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self.passes = 0
+        self.yielded = 0
+        self.busy_seconds = 0.0
+        self.throttled_seconds = 0.0
+
+    def start(self) -> None:
+        """启动建图线程。"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._worker, name="ui-map-indexer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止建图线程。"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+
+    def pause(self) -> None:
+        """命令开始：正在进行的建图在当前步骤结束后放弃。"""
+        with self._lock:
+            self._busy += 1
+            self._activity += 1
+            self._last_active = time.monotonic()
+        self._wake.set()
+
+    def resume(self) -> None:
+        """命令结束：重新开始计算空闲时间。"""
+        with self._lock:
+            self._busy = max(0, self._busy - 1)
+            self._activity += 1
+            self._last_active = time.monotonic()
+
+    @property
+    def idle(self) -> bool:
+        """是否空闲（没有命令在执行，且距离最近一次命令超过 idle_seconds）。"""
+        with self._lock:
+            return self._busy == 0 and time.monotonic() - self._last_active >= self.idle_seconds
+
+    def _worker(self) -> None:
+        """建图工作线程。"""
+        while not self._stop.is_set():
+            self._wake.clear()
+            if not self.idle:
+                self._wake.wait(0.2)
+                continue
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"[界面地图] 建图失败: {e}")
+            self._wake.wait(max(1.0, self.idle_seconds))
+
+    def run_once(self) -> bool:
+        """执行一轮建图。
+
+        Returns:
+            是否更新了地图（有命令到来而放弃、截图不可用或地图仍然新鲜时返回 False）
+        """
+        # 先清除唤醒标记再记录活动计数：之后到来的命令一定会打断休眠
+        self._wake.clear()
+        with self._lock:
+            activity = self._activity
+        try:
+            frame = self._step(activity, self._capture)
+            if frame is None:
+                return False
+            age = self.ui_map.age(frame)
+            if age is not None and age < self.refresh_seconds:
+                return False
+
+            boxes, confidences, types, descriptions = [], [], [], []
+            for top in range(0, frame.height, self.band_height - BAND_OVERLAP):
+                bottom = min(frame.height, top + self.band_height)
+                band = frame.crop((0, top, frame.width, bottom))
+                words = self._step(activity, lambda: self._ocr.elements(band))
+                boxes.extend((x1, y1 + top, x2, y2 + top) for x1, y1, x2, y2 in words.boxes.tolist())
+                confidences.extend(words.confidences.tolist())
+                types.extend(words.types[code] for code in words.type_codes.tolist())
+                descriptions.extend(words.descriptions[code] for code in words.description_codes.tolist())
+                if bottom >= frame.height:
+                    break
+
+            if self._template_matcher is not None:
+                for name in self.templates:
+                    matches = self._step(activity, lambda: self._template_matcher.match(frame, name))
+                    for match in matches:
+                        boxes.append(match.bbox)
+                        confidences.append(match.confidence)
+                        types.append(TEMPLATE_TYPE)
+                        descriptions.append(name)
+
+            # 相邻条带重叠处的文本会识别两次
+            elements = ElementSet.from_columns(boxes, confidences, types, descriptions).nms(0.5, 0.8)
+            self._step(activity, lambda: self.ui_map.update(frame, elements))
+            self.passes += 1
+            print(f"[界面地图] 已更新 {frame.width}x{frame.height} 布局，{len(elements)} 个元素")
+            return True
+        except _YieldError:
+            self.yielded += 1
+            return False
+
+    def _step(self, activity: int, func: Callable):
+        """执行建图的一步：之前检查是否需要让出，之后按 CPU 预算休眠。"""
+        self._check(activity)
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        self.busy_seconds += elapsed
+        # 运行 elapsed 秒后休眠 elapsed × (1 - budget) / budget 秒，占比即为 budget
+        pause = elapsed * (1 - self.cpu_budget) / self.cpu_budget
+        if pause > 0:
+            self.throttled_seconds += pause
+            self._wake.wait(pause)
+        self._check(activity)
+        return result
+
+    def _check(self, activity: int) -> None:
+        """有命令到来（或已停止）时抛出 _YieldError。"""
+        with self._lock:
+            changed = self._busy > 0 or self._activity != activity
+        if changed or self._stop.is_set():
+            raise _YieldError()
@@ -1,14 +1,39 @@
 """视觉 UI 定位器。"""
 
+import asyncio
 import json
 import re
-from typing import Optional
-
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import replace
+from typing import Any, Optional
+
+import numpy as np
 from PIL import Image
 from zhipuai import ZhipuAI
 
+from src.infrastructure.deadline import Deadline
+from src.infrastructure.singleflight import AsyncSingleFlight, SingleFlight
+from src.llm.resilience import CircuitOpenError
+from src.llm.streaming import IncrementalJSONDecoder, decode_stream
+from src.locator.frames import frame_diff_mask, region_changed
+from src.locator.fuzzy import MATCH_THRESHOLD, FuzzyMatcher, match_score
+from src.locator.negative_cache import NegativeCache
 from src.locator.screenshot import ScreenshotCapture
-from src.models.element import UIElement
+from src.locator.tiling import (
+    DEFAULT_TILE_OVERLAP,
+    DEFAULT_TILE_SIZE,
+    expand_box,
+    merge_elements,
+    offset_box,
+    plan_tiles,
+    scale_box,
+)
+from src.models.element import LocateResult, UIElement
+from src.models.element_set import ElementSet
 
 
 class CoordinateCalibrator:
@@ -64,6 +89,39 @@ except ImportError:
     TESSERACT_AVAILABLE = False
 
 
+# 视觉定位结果中每个元素的字段说明（单目标和批量定位共用）
+ELEMENT_FIELDS = """1. element_type: 元素类型（button, menu, text_field, tree, dialog 等）
+2. description: 元素描述（注意：禁止在描述中使用双引号，文件名用单引号包裹）
+3. bbox: 边界框坐标 [x1, y1, x2, y2]（基于截图像素坐标）
+4. confidence: 置信度 (0-1)"""
+
+# 预取结果可用的最大画面变化比例（超过时视为已切换到其他界面）
+PREFETCH_MAX_CHANGE = 0.25
+
+# 图像编码缓存的最大条目数（同一截图的粗定位、批量定位、重试共用编码结果）
+ENCODE_CACHE_SIZE = 8
+
+
+# 定位阶段（时间预算检查与耗时估计的单位）
+STAGE_NAMES = {"vision": "视觉定位", "ocr_region": "区域 OCR", "ocr_full": "全图 OCR"}
+# 阶段耗时估计的平滑系数（指数移动平均）
+STAGE_TIME_ALPHA = 0.3
+# 到期可以取消的阶段（视觉 API 请求的超时取剩余时间），有剩余时间就执行，不按估计跳过
+CANCELLABLE_STAGES = {"vision"}
+# 阶段因估计耗时不足被跳过时，估计乘以该系数（偶尔一次很慢不会使该阶段一直被跳过）
+STAGE_SKIP_DECAY = 0.5
+
+# 目标匹配时输出匹配分数的元素数（整帧 OCR 结果可能有上千个）
+MATCH_LOG_LIMIT = 10
+
+
+def _downscale_ratio(size: tuple[int, int], max_side: int | None) -> float:
+    """计算将图像长边缩放到 max_side 的比例（不放大，max_side 为空时为 1）。"""
+    if not max_side or max(size) <= max_side:
+        return 1.0
+    return max_side / max(size)
+
+
 class VisualLocator:
     """视觉 UI 定位器。"""
 
@@ -75,6 +133,18 @@ class VisualLocator:
         vision_enabled: bool = True,
         base_url: str | None = None,
         monitor_index: int = 0,
+        llm_client: Any | None = None,
+        async_llm_client: Any | None = None,
+        stream: bool = False,
+        tiling: bool = False,
+        tile_size: tuple[int, int] = DEFAULT_TILE_SIZE,
+        tile_overlap: int = DEFAULT_TILE_OVERLAP,
+        tile_stop_confidence: float = 0.85,
+        refine: bool = False,
+        coarse_max_side: int = 1024,
+        refine_margin: int = 96,
+        refine_limit: int = 2,
+        negative_cache_ttl: float = 30.0,
     ) -> None:
         """初始化视觉定位器。
 
@@ -89,19 +159,59 @@ class VisualLocator:
                 - 1: 第一个显示器
                 - 2: 第二个显示器
                 - 以此类推...
+            llm_client: 共享 LLM 客户端（可选，如 LLMService，传入时忽略 api_key 和 base_url）
+            async_llm_client: 异步 LLM 客户端（可选，如 AsyncLLMService，供 locate_async 使用）
+            stream: 是否流式调用视觉 API（元素一完整就解析，找到目标后停止读取）
+            tiling: 是否分块定位大尺寸截图（多显示器按显示器分块，超过 tile_size 时按网格切分）
+            tile_size: 单块尺寸上限 (宽, 高)
+            tile_overlap: 网格切分时相邻块重叠像素
+            tile_stop_confidence: 分块定位时，某块找到置信度不低于该值的目标后不再等待其他块
+            refine: 是否两阶段定位（先在缩小的截图上粗定位，再按原始分辨率裁剪粗定位区域精确定位）
+            coarse_max_side: 粗定位时截图长边缩放到的像素数（截图不超过该尺寸时直接单次定位）
+            refine_margin: 精确定位时粗定位区域每边扩展的像素（容纳粗定位误差）
+            refine_limit: 每次定位最多精确定位的元素数
+            negative_cache_ttl: 定位失败结果的有效期（秒）。屏幕未变化时再次定位同一目标直接返回未找到，
+                0 表示禁用
         """
-        # 初始化 LLM 客户端（支持自定义 base_url）
-        client_kwargs = {"api_key": api_key}
-        if base_url:
-            client_kwargs["base_url"] = base_url
-        self.client = ZhipuAI(**client_kwargs)
+        # 初始化 LLM 客户端（优先使用共享客户端，支持自定义 base_url）
+        if llm_client is not None:
+            self.client = llm_client
+        else:
+            client_kwargs = {"api_key": api_key}
+            if base_url:
+                client_kwargs["base_url"] = base_url
+            self.client = ZhipuAI(**client_kwargs)
+        self.async_client = async_llm_client
         self.model = model
+        self.stream = stream
+        self.tiling = tiling
+        self.tile_size = tile_size
+        self.tile_overlap = tile_overlap
+        self.tile_stop_confidence = tile_stop_confidence
+        self.refine = refine
+        self.coarse_max_side = coarse_max_side
+        self.refine_margin = refine_margin
+        self.refine_limit = refine_limit
         self.screenshot_capture = screenshot_capture
         self._vision_enabled = vision_enabled
         self._monitor_index = monitor_index
 
         # 定位结果缓存
         self._cache: dict[str, list[UIElement]] = {}
+        # 合并相同的并发定位请求（多个 API 客户端或并行工作流步骤）
+        self._flight = SingleFlight()
+        self._async_flight = AsyncSingleFlight()
+        # 预取的定位结果：提示词 -> (预取时的截图, 元素列表)
+        self._prefetched: dict[str, tuple[Image.Image, list[UIElement]]] = {}
+        self._prefetch_stats = {"prefetched": 0, "hits": 0, "stale": 0}
+        # 图像编码缓存：(截图哈希, 尺寸, 模式, 长边上限) -> base64 PNG
+        self._encode_cache: OrderedDict[tuple, str] = OrderedDict()
+        self._encode_lock = threading.Lock()
+        self._encode_stats = {"hits": 0, "misses": 0}
+        # 定位失败结果缓存：屏幕未变化时不重复定位不存在的目标（如工作流步骤失败重试）
+        self._negative = NegativeCache(ttl=negative_cache_ttl)
+        # 各定位阶段的耗时估计（秒），时间预算不足以完成某阶段时跳过该阶段
+        self._stage_seconds: dict[str, float] = {}
 
         # 坐标校准器
         self.calibrator = CoordinateCalibrator.from_config(None)  # 默认无偏移
@@ -142,9 +252,14 @@ class VisualLocator:
         target_filter: str | None = None,
         use_ocr_fallback: bool = True,
         monitor_index: int | None = None,
-    ) -> list[UIElement]:
+        deadline: Deadline | float | None = None,
+    ) -> LocateResult:
         """在截图中定位 UI 元素。
 
+        参数相同（同一帧截图，或都未提供截图）的并发调用只执行一次定位，共享结果。
+        给出时间预算时，预计来不及完成的阶段（视觉定位、区域 OCR、全图 OCR）被跳过，
+        视觉 API 请求到期取消，返回已得到的最好结果并标记 truncated。
+
         Args:
             prompt: 定位提示词
             screenshot: 截图图像，如果不提供则自动捕获
@@ -156,10 +271,134 @@ class VisualLocator:
                 - 1: 第一个显示器
                 - 2: 第二个显示器
                 - 以此类推...
+            deadline: 截止时间或时间预算（秒，可选），None 表示不限时
 
         Returns:
-            定位到的 UI 元素列表
+            定位到的 UI 元素列表（LocateResult，truncated 表示因时间不足结果可能不完整）
+        """
+        budget = Deadline.coerce(deadline)
+        # 截止时间不同的调用不合并（不让限时的调用等待不限时的定位）
+        key = self._flight_key(prompt, screenshot, use_cache, target_filter, use_ocr_fallback, monitor_index)
+        key += (budget.expires_at,)
+
+        def run() -> LocateResult:
+            found = self._locate(prompt, screenshot, use_cache, target_filter, use_ocr_fallback, monitor_index, budget)
+            return LocateResult(found, truncated=budget.truncated, stages=budget.truncated_stages)
+
+        elements = self._flight.do(key, run)
+        # 每个调用方拿到独立的列表
+        return LocateResult(elements, truncated=elements.truncated, stages=elements.stages)
+
+    def locate_many(
+        self,
+        screenshot: Image.Image | None,
+        targets: list[str | tuple[str, str | None]],
+        use_cache: bool = True,
+        monitor_index: int | None = None,
+    ) -> list[list[UIElement]]:
+        """在同一帧截图中定位多个目标，只发送一次视觉请求（截图只上传一次）。
+
+        模型按目标编号分别返回元素；某个目标的结果缺失或无法解析时，单独定位该目标。
+        视觉识别被禁用或 LLM 熔断中时逐个定位（OCR）。
+
+        Args:
+            screenshot: 截图图像，如果为 None 则自动捕获
+            targets: 目标列表，每项为定位提示词，或 (定位提示词, 目标过滤文本)
+            use_cache: 是否使用缓存（与 locate 共用缓存）
+            monitor_index: 显示器索引（可选，覆盖默认值）
+
+        Returns:
+            与 targets 一一对应的元素列表
+        """
+        pairs = [(target, None) if isinstance(target, str) else tuple(target) for target in targets]
+        if screenshot is None and self.screenshot_capture:
+            idx = monitor_index if monitor_index is not None else self._monitor_index
+            screenshot = self.screenshot_capture.capture_fullscreen(monitor_index=idx)
+
+        if screenshot is None:
+            return [[] for _ in pairs]
+
+        if not self._vision_enabled or self._circuit_open():
+            return [self.locate(prompt, screenshot, use_cache, target_filter) for prompt, target_filter in pairs]
+
+        # 缓存未命中的目标合并为一次请求（相同提示词只问一次）
+        frame = hash(screenshot.tobytes())
+        raw: dict[str, list[UIElement]] = {}
+        pending = []
+        for prompt, target_filter in pairs:
+            cache_key = f"{prompt}:{target_filter}:{frame}"
+            if use_cache and cache_key in self._cache:
+                raw[cache_key] = self._cache[cache_key]
+            elif prompt not in pending:
+                pending.append(prompt)
+
+        if pending:
+            try:
+                batched = dict(zip(pending, self._locate_batch(screenshot, pending)))
+            except CircuitOpenError as e:
+                print(f"[批量定位] {e}，逐个使用 OCR 定位")
+                return [self._locate_with_ocr(screenshot, target_filter or "") for _, target_filter in pairs]
+            for prompt, target_filter in pairs:
+                cache_key = f"{prompt}:{target_filter}:{frame}"
+                if cache_key not in raw:
+                    raw[cache_key] = batched[prompt]
+                    if use_cache:
+                        self._cache[cache_key] = batched[prompt]
+
+        results = []
+        for prompt, target_filter in pairs:
+            elements = raw[f"{prompt}:{target_filter}:{frame}"]
+            if target_filter and elements:
+                elements = self._filter_by_target(elements, target_filter)
+            results.append(list(elements))
+        return results
+
+    def prefetch(self, screenshot: Image.Image, prompts: list[str]) -> int:
+        """批量预取多个目标的定位结果。
+
+        后续 locate 使用相同提示词时，如果截图变化不大（整体变化比例不超过
+        PREFETCH_MAX_CHANGE，且预取到的元素所在区域没有变化），直接使用预取结果。
+        每个预取结果只使用一次。
+
+        Args:
+            screenshot: 截图图像
+            prompts: 定位提示词列表
+
+        Returns:
+            预取的目标数
         """
+        prompts = list(dict.fromkeys(prompts))
+        if not prompts or not self._vision_enabled or self._circuit_open():
+            return 0
+        try:
+            batched = self._locate_batch(screenshot, prompts)
+        except CircuitOpenError:
+            return 0
+        for prompt, elements in zip(prompts, batched):
+            self._prefetched[prompt] = (screenshot, elements)
+        self._prefetch_stats["prefetched"] += len(prompts)
+        return len(prompts)
+
+    def get_prefetch_stats(self) -> dict[str, int]:
+        """获取预取统计。
+
+        Returns:
+            {prefetched, hits, stale, pending}
+        """
+        return {**self._prefetch_stats, "pending": len(self._prefetched)}
+
+    def _locate(
+        self,
+        prompt: str,
+        screenshot: Image.Image | None,
+        use_cache: bool,
+        target_filter: str | None,
+        use_ocr_fallback: bool,
+        monitor_index: int | None,
+        deadline: Deadline | None = None,
+    ) -> list[UIElement]:
+        """在截图中定位 UI 元素（参数见 locate，跳过或取消的阶段记录在 deadline 上）。"""
+        deadline = deadline or Deadline()
         # 如果没有提供截图，尝试捕获
         if screenshot is None and self.screenshot_capture:
             idx = monitor_index if monitor_index is not None else self._monitor_index
@@ -168,36 +407,336 @@ class VisualLocator:
         if screenshot is None:
             return []
 
+        # 屏幕自上次确认未找到以来没有变化，直接返回
+        negative_key = f"{prompt}:{target_filter}"
+        if use_cache and self._negative.enabled and self._negative.check(negative_key, screenshot):
+            print(f"[定位] 屏幕未变化，上次未找到目标，直接返回,关键字为{target_filter}")
+            return []
+        started = time.perf_counter()
+
         # 如果视觉识别被禁用，直接使用 OCR
         if not self._vision_enabled:
             print(f"[定位] 视觉识别已禁用，使用 OCR 定位,关键字为{target_filter}")
-            if target_filter:
-                return self._locate_with_ocr(screenshot, target_filter)
             # 如果没有目标过滤，尝试全图 OCR 获取所有文本
-            return self._locate_with_ocr(screenshot, "")
+            elements = self._run_stage(
+                "ocr_full", deadline, lambda: self._locate_with_ocr(screenshot, target_filter or "")
+            ) or []
+            if use_cache and not elements and not deadline.truncated:
+                self._negative.record(negative_key, screenshot, time.perf_counter() - started)
+            return elements
 
-        # 如果有目标过滤且支持 OCR，使用混合定位方法
-        if use_ocr_fallback and target_filter and EASYOCR_AVAILABLE:
-            print(f"[定位] 使用混合定位方法 (GLM + OCR),关键字为{target_filter}")
-            elements = self._locate_hybrid(screenshot, prompt, target_filter)
-        else:
-            # 检查缓存
-            cache_key = f"{prompt}:{hash(screenshot.tobytes())}"
-            if use_cache and cache_key in self._cache:
-                elements = self._cache[cache_key]
+        # LLM 熔断中，直接使用 OCR（不等待视觉 API 超时）
+        if self._circuit_open():
+            print(f"[定位] LLM 熔断中，使用 OCR 定位,关键字为{target_filter}")
+            return self._run_stage("ocr_full", deadline, lambda: self._locate_with_ocr(screenshot, target_filter or "")) or []
+
+        try:
+            # 如果有目标过滤且支持 OCR，使用混合定位方法
+            if use_ocr_fallback and target_filter and EASYOCR_AVAILABLE:
+                print(f"[定位] 使用混合定位方法 (GLM + OCR),关键字为{target_filter}")
+                elements = self._locate_hybrid(screenshot, prompt, target_filter, deadline)
             else:
-                # 调用视觉 API
-                elements = self._locate_with_vision(screenshot, prompt)
-                # 缓存结果
-                if use_cache:
-                    self._cache[cache_key] = elements
+                # 检查缓存（流式定位找到目标即停止，结果与目标相关）
+                cache_key = f"{prompt}:{target_filter}:{hash(screenshot.tobytes())}"
+                if use_cache and cache_key in self._cache:
+                    elements = self._cache[cache_key]
+                else:
+                    # 调用视觉 API（流式时找到与目标完全匹配的元素即停止）
+                    def exact_match(found: list[UIElement]) -> bool:
+                        return self._calculate_match_score(found[-1].description, target_filter) >= 1.0
+
+                    stop_when = exact_match if target_filter else None
+                    elements = self._run_stage(
+                        "vision", deadline, lambda: self._locate_with_vision(screenshot, prompt, stop_when, deadline)
+                    ) or []
+                    # 缓存结果（时间不足被截断的结果不缓存）
+                    if use_cache and not deadline.truncated:
+                        self._cache[cache_key] = elements
+
+                # 如果指定了目标过滤，选择最匹配的元素
+                if target_filter and elements:
+                    elements = self._filter_by_target(elements, target_filter)
+        except CircuitOpenError as e:
+            print(f"[定位] {e}，使用 OCR 定位,关键字为{target_filter}")
+            return self._run_stage("ocr_full", deadline, lambda: self._locate_with_ocr(screenshot, target_filter or "")) or []
+
+        # 视觉 API 和 OCR 都确认未找到（请求出错时异常已抛出，时间不足跳过阶段时结果不确定，都不记录）
+        if use_cache and not elements and not deadline.truncated:
+            self._negative.record(negative_key, screenshot, time.perf_counter() - started)
+        return elements
 
-            # 如果指定了目标过滤，选择最匹配的元素
-            if target_filter and elements:
-                elements = self._filter_by_target(elements, target_filter)
+    def _run_stage(
+        self, stage: str, deadline: Deadline, func: Callable[[], list[UIElement]]
+    ) -> list[UIElement] | None:
+        """在时间预算内执行一个定位阶段。
+
+        可以取消的阶段（视觉 API）只要还有剩余时间就执行，到期时由请求超时取消；
+        不能取消的阶段（OCR）在剩余时间不足以完成（按最近的耗时估计）时跳过，
+        每次跳过将估计减半，之后重新执行时按实际耗时更新。执行中到期导致的失败
+        视为该阶段被取消。跳过和取消都记录在 deadline 上。
+
+        Args:
+            stage: 阶段名称（见 STAGE_NAMES）
+            deadline: 截止时间
+            func: 阶段执行函数
+
+        Returns:
+            阶段定位结果；被跳过或取消时返回 None
+        """
+        estimate = 0.0 if stage in CANCELLABLE_STAGES else self._stage_seconds.get(stage, 0.0)
+        if not deadline.allows(estimate):
+            print(
+                f"[定位] 剩余时间 {deadline.remaining():.1f}s 不足以完成{STAGE_NAMES[stage]}"
+                f"（预计 {estimate:.1f}s），跳过"
+            )
+            if estimate:
+                self._stage_seconds[stage] = estimate * STAGE_SKIP_DECAY
+            deadline.truncate(stage)
+            return None
+
+        start = time.perf_counter()
+        try:
+            elements = func()
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            if not deadline.expired:
+                raise
+            print(f"[定位] 时间预算已用完，取消{STAGE_NAMES[stage]}: {e}")
+            deadline.truncate(stage)
+            return None
+        if stage not in deadline.truncated_stages:
+            # 被提前截断的阶段耗时不代表完整耗时，不更新估计
+            elapsed = time.perf_counter() - start
+            previous = self._stage_seconds.get(stage)
+            self._stage_seconds[stage] = (
+                elapsed if previous is None else previous + STAGE_TIME_ALPHA * (elapsed - previous)
+            )
+        return elements
+
+    def get_stage_estimates(self) -> dict[str, float]:
+        """获取各定位阶段的耗时估计。
+
+        Returns:
+            阶段名称 -> 预计耗时（秒）
+        """
+        return dict(self._stage_seconds)
+
+    async def locate_async(
+        self,
+        prompt: str,
+        screenshot: Image.Image | None = None,
+        use_cache: bool = True,
+        target_filter: str | None = None,
+        monitor_index: int | None = None,
+    ) -> list[UIElement]:
+        """异步定位 UI 元素。
+
+        纯视觉定位且配置了异步客户端时直接 await 视觉 API；
+        截图、OCR 混合定位等 CPU/GUI 工作仍在线程池中执行同步的 locate。
+
+        Args:
+            prompt: 定位提示词
+            screenshot: 截图图像，如果不提供则自动捕获
+            use_cache: 是否使用缓存
+            target_filter: 目标文件名/文本，用于过滤最匹配的元素
+            monitor_index: 显示器索引（可选，覆盖默认值）
+
+        Returns:
+            定位到的 UI 元素列表
+        """
+        hybrid = target_filter and EASYOCR_AVAILABLE
+        if self.async_client is None or not self._vision_enabled or hybrid or self._circuit_open():
+            # 在线程池中执行的 locate 已合并相同请求
+            return await asyncio.to_thread(
+                self.locate,
+                prompt,
+                screenshot,
+                use_cache,
+                target_filter,
+                True,
+                monitor_index,
+            )
+
+        key = self._flight_key(prompt, screenshot, use_cache, target_filter, False, monitor_index)
+        elements = await self._async_flight.do(
+            key, self._locate_async, prompt, screenshot, use_cache, target_filter, monitor_index
+        )
+        return list(elements)
+
+    async def _locate_async(
+        self,
+        prompt: str,
+        screenshot: Image.Image | None,
+        use_cache: bool,
+        target_filter: str | None,
+        monitor_index: int | None,
+    ) -> list[UIElement]:
+        """使用异步客户端进行纯视觉定位（参数见 locate_async）。"""
+        if screenshot is None and self.screenshot_capture:
+            idx = monitor_index if monitor_index is not None else self._monitor_index
+            screenshot = await asyncio.to_thread(self.screenshot_capture.capture_fullscreen, monitor_index=idx)
+
+        if screenshot is None:
+            return []
+
+        cache_key = f"{prompt}:{target_filter}:{hash(screenshot.tobytes())}"
+        if use_cache and cache_key in self._cache:
+            elements = self._cache[cache_key]
+        else:
+            try:
+                elements = await self._locate_with_vision_async(screenshot, prompt)
+            except CircuitOpenError as e:
+                print(f"[定位] {e}，使用 OCR 定位,关键字为{target_filter}")
+                return await asyncio.to_thread(self._locate_with_ocr, screenshot, target_filter or "")
+            if use_cache:
+                self._cache[cache_key] = elements
+
+        if target_filter and elements:
+            elements = self._filter_by_target(elements, target_filter)
 
         return elements
 
+    def _circuit_open(self) -> bool:
+        """LLM 客户端是否处于熔断状态（此时视觉定位直接走 OCR）。"""
+        return any(
+            getattr(client, "circuit_open", False) is True for client in (self.client, self.async_client)
+        )
+
+    def _locate_batch(self, screenshot: Image.Image, prompts: list[str]) -> list[list[UIElement]]:
+        """在一次视觉请求中定位多个目标。
+
+        Args:
+            screenshot: 截图图像
+            prompts: 定位提示词列表（不重复）
+
+        Returns:
+            与 prompts 一一对应的元素列表（未经目标过滤）
+        """
+        if len(prompts) == 1:
+            return [self._locate_with_vision(screenshot, prompts[0])]
+
+        numbered = "\n".join(f"{index}. {prompt}" for index, prompt in enumerate(prompts, 1))
+        batch_prompt = f"""请分析截图，分别找到以下每个目标对应的 UI 元素：
+
+{numbered}
+
+请返回 JSON 对象，键为目标编号（"1"、"2" ...），值为该目标的元素数组（未找到时为空数组），每个元素包含：
+{ELEMENT_FIELDS}
+
+只返回 JSON 对象，不要其他内容。"""
+
+        start = time.perf_counter()
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._vision_messages(screenshot, batch_prompt),
+            temperature=0.1,
+        )
+        parsed = self._parse_batch_response(response.choices[0].message.content, len(prompts))
+        print(
+            f"[批量定位] {len(prompts)} 个目标一次请求完成（{(time.perf_counter() - start) * 1000:.0f}ms），"
+            f"解析成功 {len(parsed)} 个"
+        )
+
+        results = []
+        for index, prompt in enumerate(prompts):
+            elements = parsed.get(index)
+            if elements is None:
+                print(f"[批量定位] 目标 {index + 1} 的结果缺失或无法解析，单独定位: {prompt}")
+                elements = self._locate_with_vision(screenshot, prompt)
+            results.append(elements)
+        return results
+
+    def _parse_batch_response(self, result_text: str, count: int) -> dict[int, list[UIElement]]:
+        """解析批量定位响应。
+
+        支持 {"1": [...], "2": [...]}，以及 [{"target": 1, "elements": [...]}, ...]。
+
+        Args:
+            result_text: 视觉 API 响应内容
+            count: 目标数
+
+        Returns:
+            目标索引（从 0 开始）-> 元素列表，只包含成功解析的目标
+        """
+        decoder = IncrementalJSONDecoder()
+        decoder.feed(result_text or "")
+        data = decoder.close()
+
+        if isinstance(data, dict):
+            entries = list(data.items())
+        elif isinstance(data, list):
+            entries = [(item.get("target"), item.get("elements")) for item in data if isinstance(item, dict)]
+        else:
+            return {}
+
+        parsed: dict[int, list[UIElement]] = {}
+        for key, items in entries:
+            try:
+                index = int(key) - 1
+            except (TypeError, ValueError):
+                continue
+            if 0 <= index < count and isinstance(items, list):
+                elements = [self._element_from_item(item) for item in items]
+                parsed[index] = [element for element in elements if element is not None]
+        return parsed
+
+    def _take_prefetched(self, screenshot: Image.Image, prompt: str) -> list[UIElement] | None:
+        """取出预取的定位结果（截图变化过大或元素区域有变化时丢弃）。
+
+        Args:
+            screenshot: 当前截图
+            prompt: 定位提示词
+
+        Returns:
+            预取的元素列表，没有可用的预取结果时返回 None
+        """
+        entry = self._prefetched.pop(prompt, None)
+        if entry is None:
+            return None
+        frame, elements = entry
+        if frame is not screenshot:
+            mask = frame_diff_mask(frame, screenshot)
+            stale = (
+                mask is None
+                or mask.mean() > PREFETCH_MAX_CHANGE
+                # 未找到目标时，画面有任何变化都可能让目标出现
+                or (not elements and mask.any())
+                or any(region_changed(mask, element.bbox, screenshot.size) for element in elements)
+            )
+            if stale:
+                self._prefetch_stats["stale"] += 1
+                print(f"[预取] 截图已变化，丢弃预取结果: {prompt}")
+                return None
+        self._prefetch_stats["hits"] += 1
+        print(f"[预取] 使用预取的定位结果（{len(elements)} 个元素）: {prompt}")
+        return list(elements)
+
+    def _flight_key(
+        self,
+        prompt: str,
+        screenshot: Image.Image | None,
+        use_cache: bool,
+        target_filter: str | None,
+        use_ocr_fallback: bool,
+        monitor_index: int | None,
+    ) -> tuple:
+        """生成合并并发定位请求的键。
+
+        未提供截图的调用都定位"当前屏幕"，同一显示器的并发调用可以共享一次截图和定位。
+        """
+        frame = hash(screenshot.tobytes()) if screenshot is not None else None
+        idx = monitor_index if monitor_index is not None else self._monitor_index
+        return (prompt, frame, use_cache, target_filter, use_ocr_fallback, idx)
+
+    def get_flight_stats(self) -> dict[str, dict[str, Any]]:
+        """获取并发定位请求合并统计。
+
+        Returns:
+            {"sync": {...}, "async": {...}}，每项为 {executed, deduplicated, dedup_rate, in_flight}
+        """
+        return {"sync": self._flight.get_stats(), "async": self._async_flight.get_stats()}
+
     def _filter_by_target(self, elements: list[UIElement], target: str) -> list[UIElement]:
         """根据目标名称过滤和排序元素。
 
@@ -208,30 +747,33 @@ class VisualLocator:
         Returns:
             过滤后的元素列表
         """
-        # 计算每个元素与目标名称的匹配度
-        scored_elements = []
-        for elem in elements:
-            score = self._calculate_match_score(elem.description, target)
-            scored_elements.append((score, elem))
-            print(f"[匹配] '{elem.description}' -> {target}: 分数={score:.2f}")
+        if not elements:
+            return []
 
-        # 按匹配度降序排序
-        scored_elements.sort(key=lambda x: x[0], reverse=True)
+        # 对所有不同的描述批量计算与目标名称的匹配度（含模糊匹配），按匹配度降序排序
+        candidates = ElementSet.from_elements(elements)
+        scores = FuzzyMatcher(candidates.descriptions).scores(target)[candidates.description_codes]
+        order = np.argsort(-scores, kind="stable")
+        ranked, scores = candidates.take(order), scores[order]
+        for i in range(min(len(ranked), MATCH_LOG_LIMIT)):
+            print(f"[匹配] '{ranked[i].description}' -> {target}: 分数={scores[i]:.2f}")
 
-        # 只返回匹配度 > 0.5 的元素
-        result = [elem for score, elem in scored_elements if score > 0.5]
+        # 只返回匹配度 > MATCH_THRESHOLD 的元素
+        result = ranked.filter(scores > MATCH_THRESHOLD).to_list()
 
-        if not result and scored_elements:
+        if not result:
             # 如果没有高匹配度的，返回最高分的
-            best_score, best_elem = scored_elements[0]
-            print(f"[匹配] 最佳匹配分数较低 ({best_score:.2f})，使用: {best_elem.description}")
-            return [best_elem]
+            print(f"[匹配] 最佳匹配分数较低 ({scores[0]:.2f})，使用: {ranked[0].description}")
+            return [ranked[0]]
 
-        return result if result else []
+        return result
 
     def _calculate_match_score(self, description: str, target: str) -> float:
         """计算描述与目标的匹配度。
 
+        完全相同 1.0，包含目标 0.9，分词部分匹配按命中比例 × 0.7，
+        与目标相差很少几个字符（如 OCR 识别错误）时按编辑距离计算相似度。
+
         Args:
             description: 元素描述
             target: 目标名称
@@ -239,24 +781,7 @@ class VisualLocator:
         Returns:
             匹配度分数 (0-1)
         """
-        desc_lower = description.lower()
-        target_lower = target.lower()
-
-        # 完全匹配
-        if target_lower in desc_lower:
-            # 精确匹配得分更高
-            if desc_lower == target_lower:
-                return 1.0
-            # 包含目标名称
-            return 0.9
-
-        # 部分匹配（检查分词）
-        target_parts = target_lower.replace(".", " ").replace("_", " ").split()
-        match_count = sum(1 for part in target_parts if part in desc_lower)
-        if match_count > 0:
-            return match_count / len(target_parts) * 0.7
-
-        return 0.0
+        return match_score(description, target)
 
     def _fix_json_format(self, json_str: str) -> str:
         """修复 JSON 字符串中的常见格式问题。
@@ -323,53 +848,420 @@ class VisualLocator:
 
         return '\n'.join(fixed_lines)
 
-    def _locate_with_vision(self, screenshot: Image, prompt: str) -> list[UIElement]:
+    def _locate_with_vision(
+        self,
+        screenshot: Image,
+        prompt: str,
+        stop_when: Callable[[list[UIElement]], bool] | None = None,
+        deadline: Deadline | None = None,
+    ) -> list[UIElement]:
         """使用视觉 API 定位元素。
 
         Args:
             screenshot: 截图图像
             prompt: 定位提示词
+            stop_when: 流式定位时每解析出一个元素调用，返回 True 时停止读取（可选）
+            deadline: 截止时间（可选，请求超时取剩余时间）
 
         Returns:
             定位到的 UI 元素列表
         """
-        # 将图像转换为 base64
-        import base64
-        from io import BytesIO
+        prefetched = self._take_prefetched(screenshot, prompt) if self._prefetched else None
+        if prefetched is not None:
+            return prefetched
 
-        buffer = BytesIO()
-        screenshot.save(buffer, format="PNG")
-        img_base64 = base64.b64encode(buffer.getvalue()).decode()
+        if self.tiling:
+            tiles = self._plan_tiles(screenshot)
+            if len(tiles) > 1:
+                return self._locate_tiled(screenshot, prompt, tiles, stop_when, deadline)
+        return self._locate_region(screenshot, prompt, stop_when, deadline)
 
+    def _locate_region(
+        self,
+        screenshot: Image,
+        prompt: str,
+        stop_when: Callable[[list[UIElement]], bool] | None = None,
+        deadline: Deadline | None = None,
+    ) -> list[UIElement]:
+        """定位整张图像（或分块中的一块），开启两阶段定位时先粗后精（参数见 _locate_with_vision）。"""
+        if self.refine and max(screenshot.size) > self.coarse_max_side:
+            return self._locate_two_stage(screenshot, prompt, stop_when, deadline)
+        return self._request_vision(screenshot, prompt, stop_when, deadline=deadline)
+
+    def _request_vision(
+        self,
+        screenshot: Image,
+        prompt: str,
+        stop_when: Callable[[list[UIElement]], bool] | None = None,
+        max_side: int | None = None,
+        deadline: Deadline | None = None,
+    ) -> list[UIElement]:
+        """对整张图像调用一次视觉 API（参数见 _locate_with_vision）。
+
+        max_side 不为空时上传缩小后的图像，返回的坐标换算回原图坐标。
+        有截止时间时请求超时取剩余时间（已到期时不发送请求，抛出 DeadlineExceededError）。
+        """
+        request_kwargs: dict[str, Any] = {}
+        if deadline is not None and deadline.bounded:
+            deadline.check("vision")
+            request_kwargs["timeout"] = deadline.timeout()
+        messages = self._build_vision_messages(screenshot, prompt, max_side)
+        if self.stream:
+            elements = self._locate_with_vision_streaming(messages, stop_when, deadline, request_kwargs)
+        else:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.1,
+                **request_kwargs,
+            )
+            elements = self._parse_vision_response(response.choices[0].message.content)
+
+        scale = _downscale_ratio(screenshot.size, max_side)
+        if scale < 1:
+            elements = [replace(element, bbox=scale_box(element.bbox, 1 / scale)) for element in elements]
+        return elements
+
+    def _locate_two_stage(
+        self,
+        screenshot: Image,
+        prompt: str,
+        stop_when: Callable[[list[UIElement]], bool] | None = None,
+        deadline: Deadline | None = None,
+    ) -> list[UIElement]:
+        """两阶段定位：缩小的截图上粗定位，再按原始分辨率裁剪粗定位区域精确定位。
+
+        模型输出的坐标误差与输入图像尺寸成正比，整图定位的边界框常有几十像素偏差；
+        粗定位只需找到大致区域（上传体积小），精确定位的裁剪图很小，坐标误差随之缩小。
+        精确定位失败或未找到元素时保留粗定位结果。
+
+        Args:
+            screenshot: 截图图像
+            prompt: 定位提示词
+            stop_when: 目标条件（可选，满足条件的元素优先精确定位）
+            deadline: 截止时间（可选，粗定位后已到期时不再精确定位）
+
+        Returns:
+            定位到的 UI 元素列表（精确定位的元素替换为精确坐标）
+        """
+        start = time.perf_counter()
+        coarse = self._request_vision(screenshot, prompt, stop_when, max_side=self.coarse_max_side, deadline=deadline)
+        if not coarse:
+            return coarse
+        if deadline is not None and deadline.expired:
+            print("[两阶段定位] 时间预算已用完，使用粗定位结果")
+            deadline.truncate("vision")
+            return coarse
+
+        ranked = sorted(coarse, key=lambda element: element.confidence, reverse=True)
+        matched = [element for element in ranked if stop_when is not None and stop_when([element])]
+        candidates = (matched or ranked)[: self.refine_limit]
+
+        if len(candidates) == 1:
+            refined = [self._refine_element(screenshot, prompt, candidates[0], deadline)]
+        else:
+            with ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="locate-refine") as pool:
+                refined = list(
+                    pool.map(lambda element: self._refine_element(screenshot, prompt, element, deadline), candidates)
+                )
+
+        replacements = {id(element): result for element, result in zip(candidates, refined)}
+        print(
+            f"[两阶段定位] 粗定位 {len(coarse)} 个元素，精确定位 {len(candidates)} 个"
+            f"（{(time.perf_counter() - start) * 1000:.0f}ms）"
+        )
+        return [replacements.get(id(element), element) for element in coarse]
+
+    def _refine_element(
+        self, screenshot: Image, prompt: str, element: UIElement, deadline: Deadline | None = None
+    ) -> UIElement:
+        """按原始分辨率裁剪粗定位区域，重新定位元素。
+
+        Args:
+            screenshot: 截图图像
+            prompt: 定位提示词
+            element: 粗定位的元素（截图坐标）
+            deadline: 截止时间（可选）
+
+        Returns:
+            精确坐标的元素（失败时返回粗定位元素）
+        """
+        box = expand_box(element.bbox, self.refine_margin, screenshot.size)
+        if box[2] <= box[0] or box[3] <= box[1]:
+            return element
+        refine_prompt = f"{prompt}\n（截图是屏幕的局部区域，目标元素：{element.description}）"
+        try:
+            found = self._request_vision(screenshot.crop(box), refine_prompt, deadline=deadline)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            print(f"[两阶段定位] 精确定位失败，使用粗定位结果: {e}")
+            if deadline is not None and deadline.expired:
+                deadline.truncate("vision")
+            return element
+        if not found:
+            return element
+
+        best = max(
+            found,
+            key=lambda item: (self._calculate_match_score(item.description, element.description), item.confidence),
+        )
+        return replace(element, bbox=offset_box(best.bbox, box[0], box[1]), confidence=best.confidence)
+
+    def _plan_tiles(self, screenshot: Image) -> list[tuple[int, int, int, int]]:
+        """规划截图的分块（多显示器虚拟屏幕按显示器分块）。"""
+        monitors = None
+        if self.screenshot_capture is not None:
+            try:
+                monitors = self.screenshot_capture.get_monitors()
+            except Exception:
+                monitors = None
+        return plan_tiles(screenshot.size, monitors, self.tile_size, self.tile_overlap)
+
+    def _locate_tiled(
+        self,
+        screenshot: Image,
+        prompt: str,
+        tiles: list[tuple[int, int, int, int]],
+        stop_when: Callable[[list[UIElement]], bool] | None = None,
+        deadline: Deadline | None = None,
+    ) -> list[UIElement]:
+        """分块并发定位，结果换算为全局坐标并去重。
+
+        有目标条件（stop_when）时，某块找到置信度足够高的目标后立即返回，
+        不再等待其他块（流式调用的块随即停止读取）。
+
+        Args:
+            screenshot: 截图图像
+            prompt: 定位提示词
+            tiles: 块列表 (x1, y1, x2, y2)
+            stop_when: 目标条件（可选，参数为元素列表，判断最后一个元素）
+            deadline: 截止时间（可选，到期时返回已完成块的结果）
+
+        Returns:
+            去重后的元素列表（按置信度降序）
+        """
+        start = time.perf_counter()
+        hit = threading.Event()
+
+        def tile_stop(found: list[UIElement]) -> bool:
+            return hit.is_set() or (stop_when is not None and stop_when(found))
+
+        def locate_tile(box: tuple[int, int, int, int]) -> list[UIElement]:
+            elements = self._locate_region(screenshot.crop(box), prompt, tile_stop, deadline)
+            return [replace(element, bbox=offset_box(element.bbox, box[0], box[1])) for element in elements]
+
+        found: list[UIElement] = []
+        errors: list[Exception] = []
+        pool = ThreadPoolExecutor(max_workers=len(tiles), thread_name_prefix="locate-tile")
+        try:
+            futures = [pool.submit(locate_tile, box) for box in tiles]
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    elements = future.result()
+                except CircuitOpenError:
+                    raise
+                except Exception as e:
+                    print(f"[分块定位] 块识别失败: {e}")
+                    errors.append(e)
+                    continue
+                found.extend(elements)
+                if stop_when is not None and any(
+                    element.confidence >= self.tile_stop_confidence and stop_when([element]) for element in elements
+                ):
+                    hit.set()
+                    print(
+                        f"[分块定位] 第 {done}/{len(tiles)} 块找到目标，提前结束"
+                        f"（{(time.perf_counter() - start) * 1000:.0f}ms）"
+                    )
+                    break
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if errors and len(errors) == len(tiles):
+            raise errors[0]
+        if errors and deadline is not None and deadline.expired:
+            deadline.truncate("vision")
+        merged = merge_elements(found)
+        print(f"[分块定位] {len(tiles)} 块，识别 {len(found)} 个元素，去重后 {len(merged)} 个")
+        return merged
+
+    def _locate_with_vision_streaming(
+        self,
+        messages: list[dict[str, Any]],
+        stop_when: Callable[[list[UIElement]], bool] | None = None,
+        deadline: Deadline | None = None,
+        request_kwargs: dict[str, Any] | None = None,
+    ) -> list[UIElement]:
+        """流式调用视觉 API，元素一完整就解析。
+
+        Args:
+            messages: 对话消息
+            stop_when: 每解析出一个元素调用，返回 True 时停止读取（可选）
+            deadline: 截止时间（可选，到期时停止读取，返回已解析的元素）
+            request_kwargs: 传给 create 的其他参数（如 timeout）
+
+        Returns:
+            定位到的 UI 元素列表
+        """
+        elements: list[UIElement] = []
+        stopped = False
+
+        def collect(_index: Any, item: Any) -> None:
+            element = self._element_from_item(item)
+            if element is not None:
+                elements.append(element)
+
+        def until(_decoder: Any) -> bool:
+            nonlocal stopped
+            if deadline is not None and deadline.expired:
+                deadline.truncate("vision")
+                return True
+            stopped = bool(elements) and stop_when is not None and stop_when(elements)
+            return stopped
+
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.1,
+            stream=True,
+            **(request_kwargs or {}),
+        )
+        start = time.perf_counter()
+        data = decode_stream(response, until=until, on_item=collect)
+
+        # 模型只返回单个对象（不是数组）时，对象结束后才能解析
+        if isinstance(data, dict):
+            element = self._element_from_item(data)
+            elements = [element] if element is not None else []
+
+        if stopped:
+            print(f"[定位] 流式解析到目标元素，提前结束（{(time.perf_counter() - start) * 1000:.0f}ms）")
+        return elements
+
+    async def _locate_with_vision_async(self, screenshot: Image, prompt: str) -> list[UIElement]:
+        """使用异步视觉 API 定位元素。
+
+        Args:
+            screenshot: 截图图像
+            prompt: 定位提示词
+
+        Returns:
+            定位到的 UI 元素列表
+        """
+        # PNG 编码是 CPU 密集操作，放到线程池避免阻塞事件循环
+        messages = await asyncio.to_thread(self._build_vision_messages, screenshot, prompt)
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.1,
+        )
+        return self._parse_vision_response(response.choices[0].message.content)
+
+    def _build_vision_messages(
+        self, screenshot: Image, prompt: str, max_side: int | None = None
+    ) -> list[dict[str, Any]]:
+        """构建视觉定位的对话消息。
+
+        Args:
+            screenshot: 截图图像
+            prompt: 定位提示词
+            max_side: 上传前将截图长边缩放到该像素数（可选）
+
+        Returns:
+            对话消息列表
+        """
         # 构建提示词
         vision_prompt = f"""请分析截图，找到以下 UI 元素：
 
 {prompt}
 
 请返回 JSON 格式的结果，包含每个元素的：
-1. element_type: 元素类型（button, menu, text_field, tree, dialog 等）
-2. description: 元素描述（注意：禁止在描述中使用双引号，文件名用单引号包裹）
-3. bbox: 边界框坐标 [x1, y1, x2, y2]（基于截图像素坐标）
-4. confidence: 置信度 (0-1)
+{ELEMENT_FIELDS}
 
 只返回 JSON 数组，不要其他内容。"""
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{img_base64}"}},
-                            {"type": "text", "text": vision_prompt},
-                        ],
-                    }
+        return self._vision_messages(screenshot, vision_prompt, max_side)
+
+    def _vision_messages(self, screenshot: Image, text: str, max_side: int | None = None) -> list[dict[str, Any]]:
+        """构建包含截图和文本的对话消息。
+
+        Args:
+            screenshot: 截图图像
+            text: 提示词文本
+            max_side: 上传前将截图长边缩放到该像素数（可选）
+
+        Returns:
+            对话消息列表
+        """
+        img_base64 = self._encode_image(screenshot, max_side)
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{img_base64}"}},
+                    {"type": "text", "text": text},
                 ],
-                temperature=0.1,
-            )
+            }
+        ]
 
-            result_text = response.choices[0].message.content.strip()
+    def _encode_image(self, screenshot: Image, max_side: int | None = None) -> str:
+        """将截图编码为 base64 PNG（按截图内容缓存，PNG 编码是定位中最耗 CPU 的步骤）。
+
+        Args:
+            screenshot: 截图图像
+            max_side: 编码前将截图长边缩放到该像素数（可选，截图不超过该尺寸时不缩放）
+
+        Returns:
+            base64 字符串
+        """
+        import base64
+        from io import BytesIO
+
+        key = (hash(screenshot.tobytes()), screenshot.size, screenshot.mode, max_side)
+        with self._encode_lock:
+            cached = self._encode_cache.get(key)
+            if cached is not None:
+                self._encode_cache.move_to_end(key)
+                self._encode_stats["hits"] += 1
+                return cached
+            self._encode_stats["misses"] += 1
+
+        scale = _downscale_ratio(screenshot.size, max_side)
+        image = screenshot
+        if scale < 1:
+            width, height = screenshot.size
+            image = screenshot.resize((max(1, round(width * scale)), max(1, round(height * scale))), Image.BILINEAR)
+        buffer = BytesIO()
+        image.save(buffer, format="PNG")
+        encoded = base64.b64encode(buffer.getvalue()).decode()
+
+        with self._encode_lock:
+            self._encode_cache[key] = encoded
+            while len(self._encode_cache) > ENCODE_CACHE_SIZE:
+                self._encode_cache.popitem(last=False)
+        return encoded
+
+    def get_encode_stats(self) -> dict[str, int]:
+        """获取图像编码缓存统计。
+
+        Returns:
+            {"hits": 命中次数, "misses": 编码次数, "size": 缓存条目数}
+        """
+        with self._encode_lock:
+            return {**self._encode_stats, "size": len(self._encode_cache)}
+
+    def _parse_vision_response(self, result_text: str) -> list[UIElement]:
+        """解析视觉 API 返回的元素列表。
+
+        Args:
+            result_text: 视觉 API 响应内容
+
+        Returns:
+            定位到的 UI 元素列表
+        """
+        try:
+            result_text = result_text.strip()
 
             # 清理 markdown 代码块标记
             if result_text.startswith("```json"):
@@ -390,24 +1282,41 @@ class VisualLocator:
 
             elements = []
             for item in data if isinstance(data, list) else [data]:
-                bbox = item.get("bbox", [])
-                if len(bbox) >= 4:
-                    elements.append(
-                        UIElement(
-                            element_type=item.get("element_type", "unknown"),
-                            description=item.get("description", ""),
-                            bbox=(int(bbox[0]), int(bbox[1]), int(bbox[2]), int(bbox[3])),
-                            confidence=float(item.get("confidence", 0.8)),
-                        )
-                    )
+                element = self._element_from_item(item)
+                if element is not None:
+                    elements.append(element)
 
             return elements
-        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError, AttributeError) as e:
             # 解析失败，返回空列表
             print(f"JSON 解析错误: {e}")
-            print(f"原始内容: {result_text[:200] if 'result_text' in locals() else 'N/A'}")
+            print(f"原始内容: {result_text[:200] if isinstance(result_text, str) else 'N/A'}")
             return []
 
+    def _element_from_item(self, item: Any) -> UIElement | None:
+        """将视觉 API 返回的单个元素转换为 UIElement。
+
+        Args:
+            item: 元素字典（element_type, description, bbox, confidence）
+
+        Returns:
+            UI 元素（缺少有效 bbox 时返回 None）
+        """
+        if not isinstance(item, dict):
+            return None
+        bbox = item.get("bbox", [])
+        if len(bbox) < 4:
+            return None
+        try:
+            return UIElement(
+                element_type=item.get("element_type", "unknown"),
+                description=item.get("description", ""),
+                bbox=(int(bbox[0]), int(bbox[1]), int(bbox[2]), int(bbox[3])),
+                confidence=float(item.get("confidence", 0.8)),
+            )
+        except (TypeError, ValueError):
+            return None
+
     def verify(
         self,
         element: UIElement,
@@ -487,7 +1396,6 @@ class VisualLocator:
             return []
 
         elements = []
-        target_lower = target_text.lower()
 
         # 优先使用 EasyOCR（更准确）
         if EASYOCR_AVAILABLE:
@@ -496,31 +1404,31 @@ class VisualLocator:
                 if not hasattr(self, '_ocr_reader'):
                     self._ocr_reader = easyocr.Reader(['en', 'ch_sim'], gpu=False)
 
-                import numpy as np
                 # 转换 PIL 图像为 numpy 数组
                 img_array = np.array(screenshot)
 
                 # 执行 OCR
                 results = self._ocr_reader.readtext(img_array)
 
-                for (bbox, text, confidence) in results:
+                # 批量计算所有文本块与目标文本的匹配度（容忍少量识别错误），按匹配度、置信度排序
+                matcher = FuzzyMatcher([text for _, text, _ in results])
+                for index in matcher.rank(target_text, [confidence for _, _, confidence in results]):
+                    bbox, text, confidence = results[index]
                     # bbox 格式: [[x1,y1], [x2,y1], [x2,y2], [x1,y2]]
                     x1 = int(min(p[0] for p in bbox))
                     y1 = int(min(p[1] for p in bbox))
                     x2 = int(max(p[0] for p in bbox))
                     y2 = int(max(p[1] for p in bbox))
 
-                    # 检查文本是否包含目标文本
-                    if target_lower in text.lower():
-                        elements.append(
-                            UIElement(
-                                element_type="ocr_text",
-                                description=f"OCR识别文本: {text}",
-                                bbox=(x1, y1, x2, y2),
-                                confidence=float(confidence),
-                            )
+                    elements.append(
+                        UIElement(
+                            element_type="ocr_text",
+                            description=f"OCR识别文本: {text}",
+                            bbox=(x1, y1, x2, y2),
+                            confidence=float(confidence),
                         )
-                        print(f"[OCR] 找到匹配文本 '{text}' at bbox=({x1}, {y1}, {x2}, {y2})")
+                    )
+                    print(f"[OCR] 找到匹配文本 '{text}' at bbox=({x1}, {y1}, {x2}, {y2})")
 
                 return elements
 
@@ -530,8 +1438,6 @@ class VisualLocator:
         # 回退到 Tesseract
         if TESSERACT_AVAILABLE:
             try:
-                import numpy as np
-
                 # 使用 pytesseract 获取文本和坐标
                 data = pytesseract.image_to_data(
                     screenshot,
@@ -539,22 +1445,26 @@ class VisualLocator:
                     lang='eng+chi_sim'
                 )
 
-                n_boxes = len(data['text'])
-                for i in range(n_boxes):
+                # 只保留非空、置信度为正的文本块，按匹配度、置信度排序
+                boxes = [
+                    i for i in range(len(data['text']))
+                    if data['text'][i].strip() and int(data['conf'][i]) > 0
+                ]
+                matcher = FuzzyMatcher([data['text'][i].strip() for i in boxes])
+                for index in matcher.rank(target_text, [int(data['conf'][i]) for i in boxes]):
+                    i = boxes[index]
                     text = data['text'][i].strip()
                     conf = int(data['conf'][i])
-
-                    if text and target_lower in text.lower() and conf > 0:
-                        x, y, w, h = data['left'][i], data['top'][i], data['width'][i], data['height'][i]
-                        elements.append(
-                            UIElement(
-                                element_type="ocr_text",
-                                description=f"OCR识别文本: {text}",
-                                bbox=(x, y, x + w, y + h),
-                                confidence=min(conf / 100.0, 1.0),
-                            )
+                    x, y, w, h = data['left'][i], data['top'][i], data['width'][i], data['height'][i]
+                    elements.append(
+                        UIElement(
+                            element_type="ocr_text",
+                            description=f"OCR识别文本: {text}",
+                            bbox=(x, y, x + w, y + h),
+                            confidence=min(conf / 100.0, 1.0),
                         )
-                        print(f"[OCR] 找到匹配文本 '{text}' at bbox=({x}, {y}, {x+w}, {y+h})")
+                    )
+                    print(f"[OCR] 找到匹配文本 '{text}' at bbox=({x}, {y}, {x+w}, {y+h})")
 
             except Exception as e:
                 print(f"[OCR] Tesseract 定位失败: {e}")
@@ -597,7 +1507,6 @@ class VisualLocator:
                 print(f"[OCR] 初始化 EasyOCR Reader...")
                 self._ocr_reader = easyocr.Reader(['en', 'ch_sim'], gpu=False)
 
-            import numpy as np
             img_array = np.array(crop_img)
             print(f"[OCR] 开始 OCR 识别，图像数组形状: {img_array.shape}")
 
@@ -605,7 +1514,6 @@ class VisualLocator:
             print(f"[OCR] OCR 识别完成，返回 {len(results)} 个结果")
 
             elements = []
-            target_lower = target_text.lower()
 
             # 调试：显示所有识别到的文本
             if results:
@@ -615,33 +1523,37 @@ class VisualLocator:
             else:
                 print(f"[OCR] 未识别到任何文本")
 
-            for (bbox, text, confidence) in results:
-                # 降低置信度阈值以捕获更多可能的匹配
-                if confidence > 0.1 and target_lower in text.lower():
-                    # bbox 格式: [[x1,y1], [x2,y1], [x2,y2], [x1,y2]]
-                    x_coords = [p[0] for p in bbox]
-                    y_coords = [p[1] for p in bbox]
-
-                    x1_local = int(min(x_coords))
-                    y1_local = int(min(y_coords))
-                    x2_local = int(max(x_coords))
-                    y2_local = int(max(y_coords))
-
-                    # 加上偏移量
-                    x1_final = x1_local + offset_x
-                    y1_final = y1_local + offset_y
-                    x2_final = x2_local + offset_x
-                    y2_final = y2_local + offset_y
-
-                    elements.append(
-                        UIElement(
-                            element_type="ocr_text",
-                            description=f"OCR识别文本: {text}",
-                            bbox=(x1_final, y1_final, x2_final, y2_final),
-                            confidence=float(confidence),
-                        )
+            # 降低置信度阈值以捕获更多可能的匹配
+            results = [result for result in results if result[2] > 0.1]
+
+            # 批量计算所有文本块与目标文本的匹配度（容忍少量识别错误），按匹配度、置信度排序
+            matcher = FuzzyMatcher([text for _, text, _ in results])
+            for index in matcher.rank(target_text, [confidence for _, _, confidence in results]):
+                bbox, text, confidence = results[index]
+                # bbox 格式: [[x1,y1], [x2,y1], [x2,y2], [x1,y2]]
+                x_coords = [p[0] for p in bbox]
+                y_coords = [p[1] for p in bbox]
+
+                x1_local = int(min(x_coords))
+                y1_local = int(min(y_coords))
+                x2_local = int(max(x_coords))
+                y2_local = int(max(y_coords))
+
+                # 加上偏移量
+                x1_final = x1_local + offset_x
+                y1_final = y1_local + offset_y
+                x2_final = x2_local + offset_x
+                y2_final = y2_local + offset_y
+
+                elements.append(
+                    UIElement(
+                        element_type="ocr_text",
+                        description=f"OCR识别文本: {text}",
+                        bbox=(x1_final, y1_final, x2_final, y2_final),
+                        confidence=float(confidence),
                     )
-                    print(f"[OCR] 找到 '{text}' at bbox=({x1_final}, {y1_final}, {x2_final}, {y2_final}), 置信度={confidence:.2f}")
+                )
+                print(f"[OCR] 找到 '{text}' at bbox=({x1_final}, {y1_final}, {x2_final}, {y2_final}), 置信度={confidence:.2f}")
 
             return elements
 
@@ -654,6 +1566,7 @@ class VisualLocator:
         screenshot: Image,
         prompt: str,
         target_text: str,
+        deadline: Deadline | None = None,
     ) -> list[UIElement]:
         """混合方法：先用 GLM 获取大致区域，再用 OCR 精确定位。
 
@@ -661,16 +1574,20 @@ class VisualLocator:
             screenshot: 截图图像
             prompt: GLM 定位提示词
             target_text: 目标文本
+            deadline: 截止时间（可选，时间不足的阶段跳过，返回已得到的最好结果）
 
         Returns:
             定位到的 UI 元素列表
         """
-        # 第一步：用 GLM 获取大致区域
-        glm_elements = self._locate_with_vision(screenshot, prompt)
+        deadline = deadline or Deadline()
+        # 第一步：用 GLM 获取大致区域（只用第一个元素，流式时拿到即停止）
+        glm_elements = self._run_stage(
+            "vision", deadline, lambda: self._locate_with_vision(screenshot, prompt, lambda found: True, deadline)
+        ) or []
 
         if not glm_elements:
             print(f"[混合定位] GLM 未找到任何元素，尝试全图 OCR...")
-            return self._locate_with_ocr(screenshot, target_text)
+            return self._run_stage("ocr_full", deadline, lambda: self._locate_with_ocr(screenshot, target_text)) or []
 
         # 选择最匹配的 GLM 结果
         best_glm = glm_elements[0]
@@ -714,7 +1631,9 @@ class VisualLocator:
 
         print(f"[混合定位] 在扩大区域 {search_region} 内使用 OCR 精确定位...")
 
-        ocr_elements = self._locate_with_ocr_in_region(screenshot, target_text, search_region)
+        ocr_elements = self._run_stage(
+            "ocr_region", deadline, lambda: self._locate_with_ocr_in_region(screenshot, target_text, search_region)
+        ) or []
 
         if ocr_elements:
             print(f"[混合定位] OCR 精确定位成功，找到 {len(ocr_elements)} 个结果")
@@ -722,7 +1641,9 @@ class VisualLocator:
 
         # 如果区域内未找到，尝试全图 OCR
         print(f"[混合定位] 区域内未找到，尝试全图 OCR...")
-        ocr_elements_full = self._locate_with_ocr_in_region(screenshot, target_text, None)
+        ocr_elements_full = self._run_stage(
+            "ocr_full", deadline, lambda: self._locate_with_ocr_in_region(screenshot, target_text, None)
+        ) or []
 
         if ocr_elements_full:
             print(f"[混合定位] 全图 OCR 找到 {len(ocr_elements_full)} 个结果")
@@ -731,6 +1652,18 @@ class VisualLocator:
         print(f"[混合定位] OCR 未找到，使用 GLM 结果")
         return glm_elements
 
+    def get_negative_stats(self) -> dict[str, float]:
+        """获取定位失败结果缓存统计。
+
+        Returns:
+            {"hits", "recorded", "invalidated", "saved_seconds", "size"}（见 NegativeCache.get_stats）
+        """
+        return self._negative.get_stats()
+
     def clear_cache(self) -> None:
         """清空定位缓存。"""
         self._cache.clear()
+        self._prefetched.clear()
+        self._negative.clear()
+        with self._encode_lock:
+            self._encode_cache.clear()
@@ -1,7 +1,8 @@
 """数据模型模块。"""
 
 from .command import ParsedCommand
-from .element import UIElement
+from .element import LocateResult, UIElement
+from .element_set import ElementSet
 from .result import ExecutionResult, ExecutionStatus
 
-__all__ = ["ParsedCommand", "UIElement", "ExecutionResult", "ExecutionStatus"]
+__all__ = ["ParsedCommand", "UIElement", "ElementSet", "LocateResult", "ExecutionResult", "ExecutionStatus"]
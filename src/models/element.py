@@ -4,9 +4,9 @@ from dataclasses import dataclass
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class UIElement:
-    """UI 元素信息。
+    """UI 元素信息（使用 __slots__，不带实例字典；大量元素请使用 ElementSet）。
 
     Attributes:
         element_type: 元素类型（button, menu, text_field, tree 等）
@@ -37,3 +37,17 @@ class UIElement:
     def height(self) -> int:
         """元素高度。"""
         return self.bbox[3] - self.bbox[1]
+
+
+class LocateResult(list):
+    """定位结果（元素列表）。
+
+    Attributes:
+        truncated: 是否因时间预算不足跳过或取消了部分定位阶段（结果可能不完整）
+        stages: 被跳过或取消的阶段
+    """
+
+    def __init__(self, elements=(), truncated: bool = False, stages: list[str] | None = None) -> None:
+        super().__init__(elements)
+        self.truncated = truncated
+        self.stages = list(stages or [])
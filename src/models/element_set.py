@@ -0,0 +1,281 @@
+"""列式 UI 元素集合。
+
+整帧 OCR 会产生上千个文本块。ElementSet 把边界框、置信度、类型和描述分别存为
+NumPy 数组（类型和描述存为词表下标，相同文本只存一份），过滤、排序、去重（NMS）
+和中心点计算都按列向量化完成；需要单个元素时再按下标生成 UIElement。
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+import numpy as np
+
+from src.models.element import UIElement
+
+
+class ElementSet:
+    """列式 UI 元素集合。
+
+    Attributes:
+        boxes: 边界框数组 (N, 4)，int32，(x1, y1, x2, y2)
+        confidences: 置信度数组 (N,)，float64
+        type_codes: 类型下标数组 (N,)，指向 types
+        description_codes: 描述下标数组 (N,)，指向 descriptions
+        types: 类型词表
+        descriptions: 描述词表
+    """
+
+    def __init__(
+        self,
+        boxes: np.ndarray,
+        confidences: np.ndarray,
+        type_codes: np.ndarray,
+        description_codes: np.ndarray,
+        types: list[str],
+        descriptions: list[str],
+        metadata: dict[int, dict[str, Any]] | None = None,
+        source: list[UIElement] | None = None,
+    ) -> None:
+        """初始化元素集合（一般通过 from_elements / from_columns 构建）。
+
+        Args:
+            boxes: 边界框数组 (N, 4)
+            confidences: 置信度数组 (N,)
+            type_codes: 类型下标数组 (N,)
+            description_codes: 描述下标数组 (N,)
+            types: 类型词表
+            descriptions: 描述词表
+            metadata: 行号 → 元数据（只记录有元数据的行）
+            source: 构建集合的原始元素（可选，取单个元素时直接返回原对象）
+        """
+        self.boxes = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+        self.confidences = np.asarray(confidences, dtype=np.float64)
+        self.type_codes = np.asarray(type_codes, dtype=np.int32)
+        self.description_codes = np.asarray(description_codes, dtype=np.int32)
+        self.types = types
+        self.descriptions = descriptions
+        self._metadata = metadata or {}
+        self._source = source
+
+    @classmethod
+    def from_elements(cls, elements: Iterable[UIElement]) -> "ElementSet":
+        """从 UIElement 列表构建集合。
+
+        Args:
+            elements: UI 元素
+
+        Returns:
+            元素集合（取单个元素时返回原对象）
+        """
+        elements = list(elements)
+        return cls.from_columns(
+            [element.bbox for element in elements],
+            [element.confidence for element in elements],
+            [element.element_type for element in elements],
+            [element.description for element in elements],
+            metadata={i: element.metadata for i, element in enumerate(elements) if element.metadata is not None},
+            source=elements,
+        )
+
+    @classmethod
+    def from_columns(
+        cls,
+        boxes: Iterable[tuple[int, int, int, int]],
+        confidences: Iterable[float],
+        element_types: str | Iterable[str],
+        descriptions: Iterable[str],
+        metadata: dict[int, dict[str, Any]] | None = None,
+        source: list[UIElement] | None = None,
+    ) -> "ElementSet":
+        """从按列给出的数据构建集合（类型和描述编码为词表下标）。
+
+        Args:
+            boxes: 边界框
+            confidences: 置信度
+            element_types: 元素类型（所有元素类型相同时可以只给一个字符串）
+            descriptions: 描述
+            metadata: 行号 → 元数据（可选）
+            source: 原始元素（可选）
+
+        Returns:
+            元素集合
+        """
+        descriptions = list(descriptions)
+        description_vocab: dict[str, int] = {}
+        description_codes = [description_vocab.setdefault(text, len(description_vocab)) for text in descriptions]
+        if isinstance(element_types, str):
+            types, type_codes = [element_types], np.zeros(len(descriptions), dtype=np.int32)
+        else:
+            type_vocab: dict[str, int] = {}
+            type_codes = [type_vocab.setdefault(kind, len(type_vocab)) for kind in element_types]
+            types = list(type_vocab)
+        return cls(
+            np.array(list(boxes), dtype=np.int32),
+            np.array(list(confidences), dtype=np.float64),
+            type_codes,
+            description_codes,
+            types,
+            list(description_vocab),
+            metadata,
+            source,
+        )
+
+    def __len__(self) -> int:
+        return len(self.confidences)
+
+    def __getitem__(self, index: int) -> UIElement:
+        """取第 index 个元素（UIElement 视图）。"""
+        if self._source is not None:
+            return self._source[index]
+        if index < 0:
+            index += len(self)
+        x1, y1, x2, y2 = self.boxes[index].tolist()
+        return UIElement(
+            element_type=self.types[self.type_codes[index]],
+            description=self.descriptions[self.description_codes[index]],
+            bbox=(x1, y1, x2, y2),
+            confidence=float(self.confidences[index]),
+            metadata=self._metadata.get(index),
+        )
+
+    def __iter__(self) -> Iterator[UIElement]:
+        return (self[i] for i in range(len(self)))
+
+    def to_list(self) -> list[UIElement]:
+        """转换为 UIElement 列表。"""
+        return list(self)
+
+    @property
+    def centers(self) -> np.ndarray:
+        """中心点数组 (N, 2)，与 UIElement.center 一致（整数除法）。"""
+        b = self.boxes
+        return np.stack([(b[:, 0] + b[:, 2]) // 2, (b[:, 1] + b[:, 3]) // 2], axis=1)
+
+    @property
+    def areas(self) -> np.ndarray:
+        """面积数组 (N,)。"""
+        b = self.boxes.astype(np.int64)
+        return (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+
+    def take(self, indices: np.ndarray) -> "ElementSet":
+        """按下标取子集（共用词表）。
+
+        Args:
+            indices: 行下标数组
+
+        Returns:
+            子集（顺序与 indices 一致）
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        rows = indices.tolist()
+        metadata = {new: self._metadata[old] for new, old in enumerate(rows) if old in self._metadata}
+        source = [self._source[i] for i in rows] if self._source is not None else None
+        return ElementSet(
+            self.boxes[indices],
+            self.confidences[indices],
+            self.type_codes[indices],
+            self.description_codes[indices],
+            self.types,
+            self.descriptions,
+            metadata,
+            source,
+        )
+
+    def filter(self, mask: np.ndarray) -> "ElementSet":
+        """按布尔掩码取子集。"""
+        return self.take(np.flatnonzero(mask))
+
+    def select(
+        self,
+        element_types: list[str] | None = None,
+        min_confidence: float | None = None,
+        region: tuple[int, int, int, int] | None = None,
+    ) -> "ElementSet":
+        """按类型、置信度和区域过滤。
+
+        Args:
+            element_types: 只保留这些类型（可选）
+            min_confidence: 最低置信度（可选）
+            region: 只保留中心点在该范围内的元素（可选）
+
+        Returns:
+            过滤后的子集
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if element_types is not None:
+            wanted = [i for i, kind in enumerate(self.types) if kind in element_types]
+            mask &= np.isin(self.type_codes, wanted)
+        if min_confidence is not None:
+            mask &= self.confidences >= min_confidence
+        if region is not None:
+            centers = self.centers
+            mask &= (
+                (centers[:, 0] >= region[0]) & (centers[:, 0] < region[2])
+                & (centers[:, 1] >= region[1]) & (centers[:, 1] < region[3])
+            )
+        return self.filter(mask)
+
+    def description_scores(self, score: Callable[[str], float]) -> np.ndarray:
+        """按描述计算每个元素的分数（相同描述只计算一次）。
+
+        Args:
+            score: 描述 → 分数的函数
+
+        Returns:
+            分数数组 (N,)
+        """
+        used = np.unique(self.description_codes)
+        table = np.zeros(len(self.descriptions), dtype=np.float64)
+        for code in used.tolist():
+            table[code] = score(self.descriptions[code])
+        return table[self.description_codes]
+
+    def sort(self, keys: np.ndarray | None = None, descending: bool = True) -> "ElementSet":
+        """按分数排序（稳定排序，分数相同时保持原顺序）。
+
+        Args:
+            keys: 分数数组（默认按置信度）
+            descending: 是否降序
+
+        Returns:
+            排序后的集合
+        """
+        keys = self.confidences if keys is None else np.asarray(keys)
+        order = np.argsort(-keys if descending else keys, kind="stable")
+        return self.take(order)
+
+    def nms(self, iou_threshold: float = 0.5, containment_threshold: float | None = None) -> "ElementSet":
+        """非极大值抑制：按置信度从高到低保留元素，去掉与已保留元素重复的元素。
+
+        Args:
+            iou_threshold: IoU 达到该值视为重复
+            containment_threshold: 描述相同且交集占较小框比例达到该值也视为重复（可选）
+
+        Returns:
+            去重后的集合（按置信度降序）
+        """
+        ordered = self.sort()
+        b = ordered.boxes.astype(np.int64)
+        areas = ordered.areas
+        codes = ordered.description_codes
+        suppressed = np.zeros(len(ordered), dtype=bool)
+        kept = []
+        for i in range(len(ordered)):
+            if suppressed[i]:
+                continue
+            kept.append(i)
+            rest = np.arange(i + 1, len(ordered))
+            rest = rest[~suppressed[rest]]
+            if not len(rest):
+                break
+            width = np.clip(np.minimum(b[rest, 2], b[i, 2]) - np.maximum(b[rest, 0], b[i, 0]), 0, None)
+            height = np.clip(np.minimum(b[rest, 3], b[i, 3]) - np.maximum(b[rest, 1], b[i, 1]), 0, None)
+            inter = width * height
+            overlap = inter > 0
+            duplicate = overlap & (inter >= iou_threshold * (areas[rest] + areas[i] - inter))
+            if containment_threshold is not None:
+                smaller = np.maximum(np.minimum(areas[rest], areas[i]), 1)
+                contained = overlap & (inter >= containment_threshold * smaller)
+                duplicate |= contained & (codes[rest] == codes[i])
+            suppressed[rest[duplicate]] = True
+        return ordered.take(np.array(kept, dtype=np.int64))
@@ -7,9 +7,13 @@ from zhipuai import ZhipuAI
 
 from src.config.config_manager import ConfigManager
 from src.config.schema import OperationConfig
+from src.llm.streaming import decode_stream
 from src.models.command import ParsedCommand
 from src.parser.intents import INTENT_KEYWORDS, IntentType
 
+# 流式解析时拿到这些字段即停止读取
+_RESULT_FIELDS = frozenset({"intent", "action", "parameters", "confidence"})
+
 
 class CommandParser:
     """自然语言命令解析器。"""
@@ -20,6 +24,8 @@ class CommandParser:
         api_key: str,
         model: str = "glm-4-flash",
         base_url: str | None = None,
+        llm_client: Any | None = None,
+        stream: bool = False,
     ) -> None:
         """初始化命令解析器。
 
@@ -28,9 +34,13 @@ class CommandParser:
             api_key: 智谱 AI API Key
             model: 使用的模型名称
             base_url: LLM API Base URL（可选，用于自定义代理）
+            llm_client: 共享 LLM 客户端（可选，如 LLMService，传入时忽略 api_key 和 base_url）
+            stream: 是否流式调用 LLM（增量解码，拿到全部字段后停止读取）
         """
         self.config = config_manager
-        if api_key:
+        if llm_client is not None:
+            self.client = llm_client
+        elif api_key:
             client_kwargs = {"api_key": api_key}
             if base_url:
                 client_kwargs["base_url"] = base_url
@@ -38,6 +48,7 @@ class CommandParser:
         else:
             self.client = None
         self.model = model
+        self.stream = stream
 
     def parse(self, text: str, context: dict[str, Any] | None = None) -> ParsedCommand:
         """解析自然语言命令。
@@ -65,8 +76,8 @@ class CommandParser:
                 context=context,
             )
 
-        # 如果没有匹配到配置的操作，使用 NLP 解析
-        if self.client:
+        # 如果没有匹配到配置的操作，使用 NLP 解析（LLM 熔断中时直接走规则，不等待超时）
+        if self.client and getattr(self.client, "circuit_open", False) is not True:
             return self._parse_with_llm(text, context)
 
         # 回退到规则匹配
@@ -290,19 +301,22 @@ class CommandParser:
 只返回 JSON，不要其他内容。"""
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-            )
+            if self.stream:
+                result = self._request_streaming(prompt)
+            else:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.1,
+                )
 
-            result_text = response.choices[0].message.content.strip()
-            # 移除可能的 markdown 代码块标记
-            result_text = result_text.removeprefix("```json").removeprefix("```").strip()
+                result_text = response.choices[0].message.content.strip()
+                # 移除可能的 markdown 代码块标记
+                result_text = result_text.removeprefix("```json").removeprefix("```").strip()
 
-            import json
+                import json
 
-            result = json.loads(result_text)
+                result = json.loads(result_text)
 
             return ParsedCommand(
                 intent=result.get("intent", IntentType.UNKNOWN.value),
@@ -315,6 +329,29 @@ class CommandParser:
             # LLM 调用失败，回退到规则匹配
             return self._parse_with_rules(text, context)
 
+    def _request_streaming(self, prompt: str) -> dict[str, Any]:
+        """流式调用 LLM，增量解码 JSON 结果，拿到全部字段后立即停止读取。
+
+        Args:
+            prompt: 解析提示词
+
+        Returns:
+            LLM 返回的 JSON 对象
+
+        Raises:
+            ValueError: 响应中没有 JSON 对象
+        """
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.1,
+            stream=True,
+        )
+        result = decode_stream(response, until=lambda decoder: _RESULT_FIELDS <= decoder.fields.keys())
+        if not isinstance(result, dict) or not result:
+            raise ValueError(f"LLM 流式响应中没有 JSON 对象: {result}")
+        return result
+
     def _parse_with_rules(self, text: str, context: dict[str, Any]) -> ParsedCommand:
         """使用规则匹配解析命令。
 
@@ -0,0 +1,106 @@
+"""目标窗口几何信息缓存。
+
+截图跟随最近激活的目标窗口时，每次定位都需要窗口的位置和尺寸。查询窗口几何信息
+需要调用系统接口（macOS 上经由 AppleScript，耗时可达数十毫秒），因此缓存一段时间；
+缓存过期后重新查询，窗口移动或调整大小时记录变化。
+"""
+
+import logging
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+Box = tuple[int, int, int, int]
+
+
+def read_window_rect(window: Any) -> Box | None:
+    """读取窗口在屏幕上的位置。
+
+    Args:
+        window: 窗口对象（pygetwindow 窗口或带 hwnd 的包装对象）
+
+    Returns:
+        屏幕坐标 (left, top, right, bottom)；窗口最小化、已关闭或尺寸无效时返回 None
+    """
+    try:
+        if getattr(window, "isMinimized", False):
+            return None
+        if hasattr(window, "left"):
+            left, top = int(window.left), int(window.top)
+            right, bottom = left + int(window.width), top + int(window.height)
+        else:
+            import win32gui
+
+            left, top, right, bottom = win32gui.GetWindowRect(window.hwnd)
+    except Exception as e:
+        logger.debug(f"读取窗口位置失败: {e}")
+        return None
+    if right <= left or bottom <= top:
+        return None
+    return (left, top, right, bottom)
+
+
+class WindowGeometry:
+    """目标窗口几何信息缓存。"""
+
+    def __init__(self, ttl: float = 0.5) -> None:
+        """初始化窗口几何信息缓存。
+
+        Args:
+            ttl: 缓存有效期（秒），过期后重新查询窗口位置
+        """
+        self.ttl = ttl
+        self._window: Any | None = None
+        self._rect: Box | None = None
+        self._checked_at = 0.0
+        self._stats = {"hits": 0, "refreshes": 0, "changes": 0}
+
+    @property
+    def window(self) -> Any | None:
+        """当前跟踪的窗口。"""
+        return self._window
+
+    def track(self, window: Any | None) -> None:
+        """跟踪新的目标窗口（清除缓存）。
+
+        Args:
+            window: 窗口对象（None 表示不再跟踪）
+        """
+        self._window = window
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """使缓存失效，下次获取时重新查询。"""
+        self._rect = None
+        self._checked_at = 0.0
+
+    def rect(self) -> Box | None:
+        """获取目标窗口的屏幕坐标（缓存未过期时直接返回）。
+
+        Returns:
+            屏幕坐标 (left, top, right, bottom)；没有目标窗口或窗口不可用时返回 None
+        """
+        if self._window is None:
+            return None
+        now = time.monotonic()
+        if self._rect is not None and now - self._checked_at < self.ttl:
+            self._stats["hits"] += 1
+            return self._rect
+
+        self._stats["refreshes"] += 1
+        rect = read_window_rect(self._window)
+        if rect is not None and self._rect is not None and rect != self._rect:
+            self._stats["changes"] += 1
+            logger.info(f"目标窗口位置变化: {self._rect} -> {rect}")
+        self._rect = rect
+        self._checked_at = now
+        return rect
+
+    def get_stats(self) -> dict[str, int]:
+        """获取缓存统计。
+
+        Returns:
+            {"hits": 缓存命中次数, "refreshes": 查询次数, "changes": 检测到移动或调整大小的次数}
+        """
+        return dict(self._stats)
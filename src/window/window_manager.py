@@ -5,6 +5,7 @@ import os
 from typing import Any, Callable, Optional
 
 from src.window.exceptions import WindowActivationError, WindowNotFoundError
+from src.window.geometry import WindowGeometry
 
 logger = logging.getLogger(__name__)
 
@@ -12,8 +13,14 @@ logger = logging.getLogger(__name__)
 class WindowManager:
     """跨平台窗口管理器。"""
 
-    def __init__(self) -> None:
-        """初始化窗口管理器。"""
+    def __init__(self, geometry_ttl: float = 0.5) -> None:
+        """初始化窗口管理器。
+
+        Args:
+            geometry_ttl: 目标窗口位置缓存有效期（秒）
+        """
+        # 最近激活的目标窗口（截图跟随该窗口）
+        self.geometry = WindowGeometry(ttl=geometry_ttl)
         self._pygetwindow: Any | None = None
         try:
             import pygetwindow as gw  # type: ignore[import-untyped]
@@ -174,6 +181,7 @@ class WindowManager:
             # 激活窗口
             window.activate()
             logger.info(f"已激活进程窗口: {process_name}")
+            self.set_target_window(window)
             return True
         except Exception as e:
             error_msg = str(e)
@@ -268,6 +276,7 @@ class WindowManager:
                             win32process.AttachThreadInput(current_thread, target_thread, False)
 
                     logger.info(f"使用 Win32 API 强制激活窗口: {title}")
+                    self.set_target_window(window)
                     return True
             except ImportError:
                 # win32gui 未安装，使用标准方法
@@ -276,11 +285,36 @@ class WindowManager:
                 logger.warning(f"Win32 API 激活失败: {e}")
 
             logger.info(f"窗口已激活: {title}")
+            self.set_target_window(window)
             return True
         except Exception as e:
             logger.error(f"激活窗口失败: {e}")
             raise WindowActivationError(f"激活窗口失败: {e}") from e
 
+    def set_target_window(self, window: Any | None) -> None:
+        """设置目标窗口（截图跟随该窗口）。
+
+        Args:
+            window: 窗口对象（None 表示截取整个屏幕）
+        """
+        self.geometry.track(window)
+
+    def get_target_window(self) -> Any | None:
+        """获取最近激活的目标窗口。
+
+        Returns:
+            窗口对象，没有时返回 None
+        """
+        return self.geometry.window
+
+    def get_target_rect(self) -> tuple[int, int, int, int] | None:
+        """获取目标窗口的屏幕坐标（使用缓存，过期后重新查询）。
+
+        Returns:
+            屏幕坐标 (left, top, right, bottom)；没有目标窗口或窗口不可用时返回 None
+        """
+        return self.geometry.rect()
+
     def is_window_minimized(self, title: str) -> bool:
         """检查窗口是否最小化。
 
@@ -3,6 +3,7 @@
 import time
 from typing import Any
 
+from src.infrastructure.deadline import Deadline
 from src.workflow.models import (
     StepResult,
     WorkflowConfig,
@@ -14,13 +15,15 @@ from src.workflow.models import (
 class WorkflowExecutor:
     """工作流执行器。"""
 
-    def __init__(self, ide_controller: Any) -> None:
+    def __init__(self, ide_controller: Any, prefetch_window: int = 4) -> None:
         """初始化执行器。
 
         Args:
             ide_controller: IDE 控制器实例
+            prefetch_window: 一次预取视觉目标的步骤数（小于 2 时不预取）
         """
         self._ide = ide_controller
+        self._prefetch_window = prefetch_window
 
     def execute(self, config: WorkflowConfig, dry_run: bool = False) -> WorkflowResult:
         """执行工作流。
@@ -49,6 +52,7 @@ class WorkflowExecutor:
             "variables": config.variables.copy(),
             "previous_result": None,
         }
+        prefetched_until = -1
 
         for index, step in enumerate(config.steps):
             # 判断是否应该执行该步骤
@@ -68,6 +72,8 @@ class WorkflowExecutor:
             if dry_run:
                 result = self._dry_run_step(step, index)
             else:
+                if index > prefetched_until:
+                    prefetched_until = self._prefetch(config.steps, index)
                 result = self._execute_step(step, index, context)
 
             step_results.append(result)
@@ -122,6 +128,34 @@ class WorkflowExecutor:
             duration=duration,
         )
 
+    def _prefetch(self, steps: list[WorkflowStep], index: int) -> int:
+        """批量预取接下来若干步骤的视觉目标（一次视觉请求）。
+
+        预取结果在使用时按截图变化校验，屏幕已切换时自动丢弃，重新定位。
+
+        Args:
+            steps: 全部步骤
+            index: 当前步骤索引
+
+        Returns:
+            本次预取覆盖到的最后一个步骤索引
+        """
+        last = min(len(steps), index + self._prefetch_window) - 1
+        prefetch = getattr(self._ide, "prefetch_targets", None)
+        if self._prefetch_window < 2 or prefetch is None:
+            return last
+
+        operations = [(step.operation, step.parameters) for step in steps[index : last + 1] if step.operation]
+        if len(operations) < 2:
+            return last
+        try:
+            count = prefetch(operations)
+            if count:
+                print(f"  [预取] 步骤 {index + 1}-{last + 1} 的 {count} 个视觉目标已一次定位")
+        except Exception as e:
+            print(f"  [预取] 预取失败，逐步定位: {e}")
+        return last
+
     def _should_execute_step(self, step: WorkflowStep, index: int, context: dict[str, Any]) -> bool:
         """判断是否应该执行步骤。
 
@@ -174,6 +208,9 @@ class WorkflowExecutor:
     ) -> StepResult:
         """带重试的执行。
 
+        步骤配置了 timeout 时，时间预算覆盖所有重试：每次执行把截止时间传给控制器（定位阶段据此跳过或取消），
+        剩余时间不足以等待重试间隔时不再重试。
+
         Args:
             step: 步骤对象
             index: 步骤索引
@@ -184,6 +221,8 @@ class WorkflowExecutor:
         """
         start_time = time.time()
         last_error = None
+        saved_before = self._negative_saved()
+        deadline = Deadline(step.timeout)
 
         for attempt in range(step.retry_count + 1):
             try:
@@ -200,7 +239,10 @@ class WorkflowExecutor:
 
                 # 执行命令（传递 template 参数，并跳过意图识别）
                 # 工作流中的步骤都是低级操作，不需要意图识别
-                result = self._ide.execute_command(command, template_name=template_name, skip_intent_recognition=True)
+                options: dict[str, Any] = {"template_name": template_name, "skip_intent_recognition": True}
+                if deadline.bounded:
+                    options["deadline"] = deadline
+                result = self._ide.execute_command(command, **options)
 
                 duration = time.time() - start_time
 
@@ -213,12 +255,15 @@ class WorkflowExecutor:
                         error_message=result.error if result.status.value != "success" else None,
                         retry_count=attempt,
                         duration=duration,
+                        saved_seconds=self._negative_saved() - saved_before,
                     )
                 else:
                     last_error = result.error or result.message
 
                     # 如果还有重试机会，等待后重试
                     if attempt < step.retry_count:
+                        if not self._can_retry(step, deadline):
+                            break
                         print(f"    [警告] 执行失败，{step.retry_interval} 秒后重试...")
                         time.sleep(step.retry_interval)
 
@@ -228,20 +273,57 @@ class WorkflowExecutor:
 
                 # 如果还有重试机会，等待后重试
                 if attempt < step.retry_count:
+                    if not self._can_retry(step, deadline):
+                        break
                     print(f"    [警告] 执行异常，{step.retry_interval} 秒后重试...")
                     time.sleep(step.retry_interval)
 
         # 所有尝试都失败
         duration = time.time() - start_time
+        saved = self._negative_saved() - saved_before
+        if saved > 0:
+            print(f"    [快速失败] 屏幕未变化，重试时跳过重复定位，节省 {saved:.1f} 秒")
         return StepResult(
             step_index=index,
             description=step.description,
             success=False,
             error_message=last_error or "执行失败",
-            retry_count=step.retry_count,
+            retry_count=attempt,
             duration=duration,
+            saved_seconds=saved,
         )
 
+    def _can_retry(self, step: WorkflowStep, deadline: Deadline) -> bool:
+        """判断步骤的时间预算是否还够重试一次（等待重试间隔后仍有剩余时间）。
+
+        Args:
+            step: 步骤对象
+            deadline: 步骤截止时间
+
+        Returns:
+            是否重试
+        """
+        remaining = deadline.remaining()
+        if remaining is None or remaining > step.retry_interval:
+            return True
+        print(f"    [超时] 步骤时间预算（{step.timeout} 秒）剩余 {remaining:.1f} 秒，不再重试")
+        return False
+
+    def _negative_saved(self) -> float:
+        """获取定位器因屏幕未变化、直接返回未找到而累计节省的时间（秒）。
+
+        Returns:
+            累计节省的秒数，控制器没有视觉定位器时返回 0
+        """
+        get_stats = getattr(getattr(self._ide, "locator", None), "get_negative_stats", None)
+        if get_stats is None:
+            return 0.0
+        try:
+            saved = get_stats().get("saved_seconds", 0.0)
+        except Exception:
+            return 0.0
+        return float(saved) if isinstance(saved, (int, float)) else 0.0
+
     def _dry_run_step(self, step: WorkflowStep, index: int) -> StepResult:
         """Dry-run 模式下的步骤执行。
 
@@ -13,6 +13,7 @@ class WorkflowStep:
     parameters: dict[str, Any] = field(default_factory=dict)  # 操作参数
     retry_count: int = 0  # 重试次数
     retry_interval: float = 1.0  # 重试间隔（秒）
+    timeout: float | None = None  # 步骤时间预算（秒，包含所有重试），None 表示不限时
     condition: str | None = None  # 执行条件
     continue_on_error: bool = False  # 失败时是否继续
 
@@ -39,6 +40,7 @@ class StepResult:
     error_message: str | None = None  # 错误信息
     retry_count: int = 0  # 实际重试次数
     duration: float = 0.0  # 执行时长
+    saved_seconds: float = 0.0  # 屏幕未变化、直接返回未找到而节省的定位时间
 
 
 @dataclass
@@ -193,6 +193,8 @@ class WorkflowParser:
                 step.retry_count = config["retry_count"]
             if "retry_interval" in config:
                 step.retry_interval = config["retry_interval"]
+            if "timeout" in config:
+                step.timeout = config["timeout"]
             if "continue_on_error" in config:
                 step.continue_on_error = config["continue_on_error"]
             if "condition" in config:
@@ -71,6 +71,9 @@ class WorkflowValidator:
         if step.retry_interval < 0:
             errors.append(f"{prefix}: 重试间隔不能为负数")
 
+        if step.timeout is not None and step.timeout <= 0:
+            errors.append(f"{prefix}: 超时时间必须为正数")
+
         # 验证条件表达式
         if step.condition:
             if not self._is_valid_condition(step.condition):
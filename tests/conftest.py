@@ -1,10 +1,15 @@
 """测试配置和共享 fixtures。"""
 
+import base64
+import json
 import os
 import sys
 import tempfile
+import threading
+import time
+from io import BytesIO
 from pathlib import Path
-from unittest.mock import MagicMock
+from types import SimpleNamespace
 
 import pytest
 from PIL import Image
@@ -13,6 +18,109 @@ from PIL import Image
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 
+class FakeStream:
+    """按块返回内容的假流式响应，记录已读取的块数和是否被关闭。"""
+
+    def __init__(self, content: str, size: int = 3) -> None:
+        self.pieces = [content[i : i + size] for i in range(0, len(content), size)]
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        for piece in self.pieces:
+            self.read += 1
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def request_image(request: dict) -> Image.Image:
+    """取出请求消息中上传的图像。"""
+    for part in request["messages"][0]["content"]:
+        if part.get("type") == "image_url":
+            data = part["image_url"]["url"].split(",", 1)[1]
+            return Image.open(BytesIO(base64.b64decode(data))).convert("RGB")
+    raise ValueError("请求中没有图像")
+
+
+def request_text(request: dict) -> str:
+    """取出请求消息中的文本提示。"""
+    content = request["messages"][0]["content"]
+    if isinstance(content, str):
+        return content
+    return "".join(part["text"] for part in content if part.get("type") == "text")
+
+
+class FakeChatClient:
+    """假 LLM 客户端（chat.completions.create 门面），记录每次请求的参数。
+
+    Args:
+        *contents: 依次返回的内容，用完后重复最后一个；字符串原样返回，其他值按 JSON
+            序列化；可调用时以请求参数调用，返回值同上（抛出的异常传给调用方）
+        delay: 每次请求的耗时（秒），可调用时以请求参数调用；请求的 timeout 小于该耗时时
+            等待 timeout 后抛出 TimeoutError
+        errors: 前几次请求依次抛出的异常
+        chunk_size: stream=True 时每块的字符数
+    """
+
+    def __init__(self, *contents, delay=0.0, errors: list[Exception] = (), chunk_size: int = 3) -> None:
+        self.contents = contents or ("[]",)
+        self.delay = delay
+        self.errors = list(errors)
+        self.chunk_size = chunk_size
+        self.calls: list[dict] = []
+        self.streams: list[FakeStream] = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    @property
+    def timeouts(self) -> list[float | None]:
+        """每次请求的 timeout 参数。"""
+        return [call.get("timeout") for call in self.calls]
+
+    @property
+    def prompts(self) -> list[str]:
+        """每次请求的文本提示。"""
+        return [request_text(call) for call in self.calls]
+
+    @property
+    def sizes(self) -> list[tuple[int, int]]:
+        """每次请求上传的图像尺寸。"""
+        return [request_image(call).size for call in self.calls]
+
+    def create(self, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs)
+            content = self.contents[min(len(self.calls), len(self.contents)) - 1]
+            error = self.errors.pop(0) if self.errors else None
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            if error is not None:
+                raise error
+            if callable(content):
+                content = content(kwargs)
+            if not isinstance(content, str):
+                content = json.dumps(content, ensure_ascii=False)
+            delay = self.delay(kwargs) if callable(self.delay) else self.delay
+            timeout = kwargs.get("timeout")
+            if timeout is not None and timeout < delay:
+                time.sleep(timeout)
+                raise TimeoutError("请求超时")
+            time.sleep(delay)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        if kwargs.get("stream"):
+            stream = FakeStream(content, self.chunk_size)
+            self.streams.append(stream)
+            return stream
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
 @pytest.fixture
 def temp_config_dir():
     """创建临时配置目录。"""
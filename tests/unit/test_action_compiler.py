@@ -0,0 +1,211 @@
+"""操作序列编译器单元测试。"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.automation.actions import ActionType
+from src.automation.backends import VirtualBackend
+from src.automation.compiler import ActionCompiler, parameter_shape
+from src.automation.executor import AutomationExecutor
+from src.config.schema import ActionConfig, OperationConfig
+from src.models.element import UIElement
+
+
+def make_operation(actions: list[ActionConfig], name: str = "test_op") -> OperationConfig:
+    """创建测试用操作配置。"""
+    return OperationConfig(
+        name=name,
+        aliases=[],
+        intent="test",
+        description="测试操作",
+        actions=actions,
+    )
+
+
+@pytest.mark.unit
+class TestActionCompiler:
+    """操作序列编译器测试类。"""
+
+    def test_parameter_shape_ignores_empty_values(self):
+        """测试参数形态只包含有值的参数。"""
+        assert parameter_shape({"b": "x", "a": 1, "c": "", "d": None}) == ("a", "b")
+
+    def test_drop_skipped_conditional(self):
+        """测试删除条件不满足的操作。"""
+        op = make_operation(
+            [
+                ActionConfig(type="click", target="0"),
+                ActionConfig(
+                    type="shortcut",
+                    parameters={
+                        "keys": ["enter"],
+                        "conditional": True,
+                        "conditional_param": "submit_action",
+                    },
+                ),
+            ]
+        )
+        compiler = ActionCompiler()
+
+        program = compiler.compile(op, {"input_text": "hi"})
+        assert [s.action.type for s in program.steps] == [ActionType.CLICK]
+
+        program = compiler.compile(op, {"input_text": "hi", "submit_action": "enter"})
+        assert len(program.steps) == 2
+        # 条件控制字段不再传给执行器
+        assert program.steps[1].action.parameters == {"keys": ["enter"]}
+
+    def test_merge_adjacent_waits(self):
+        """测试合并相邻等待。"""
+        op = make_operation(
+            [
+                ActionConfig(type="wait", parameters={"duration": 0.5}, timeout=1.0),
+                ActionConfig(type="wait", parameters={"duration": 1.0}, timeout=2.0),
+            ]
+        )
+        program = ActionCompiler().compile(op, {})
+
+        assert len(program.steps) == 1
+        assert program.steps[0].action.parameters == {"duration": 1.5}
+        assert program.steps[0].settle_after == pytest.approx(0.6)
+        assert program.source_size == 2
+
+    def test_batch_adjacent_shortcuts(self):
+        """测试合并相邻快捷键为多组合键。"""
+        op = make_operation(
+            [
+                ActionConfig(type="shortcut", parameters={"keys": ["ctrl", "a"]}, timeout=1.0),
+                ActionConfig(type="shortcut", parameters={"keys": "delete"}, timeout=0.5),
+                ActionConfig(type="click", target="0"),
+            ]
+        )
+        program = ActionCompiler().compile(op, {})
+
+        assert len(program.steps) == 2
+        params = program.steps[0].action.parameters
+        assert params["chords"] == [["ctrl", "a"], ["delete"]]
+        assert params["chord_gaps"] == [pytest.approx(0.3)]
+
+    def test_placeholders_not_merged(self):
+        """测试包含占位符的操作不参与合并。"""
+        op = make_operation(
+            [
+                ActionConfig(type="shortcut", parameters={"keys": "{key}"}),
+                ActionConfig(type="shortcut", parameters={"keys": ["enter"]}),
+            ]
+        )
+        program = ActionCompiler().compile(op, {"key": "f5"})
+
+        assert len(program.steps) == 2
+        assert program.steps[0].bind({"key": "f5"}).parameters == {"keys": "f5"}
+
+    def test_bind_placeholders(self):
+        """测试绑定占位符，未知占位符保持原样。"""
+        op = make_operation(
+            [
+                ActionConfig(
+                    type="type",
+                    parameters={"text": "{filename}.py {unknown}", "delay": 0.1},
+                ),
+            ]
+        )
+        program = ActionCompiler().compile(op, {"filename": "main"})
+        action = program.steps[0].bind({"filename": "main"})
+
+        assert action.parameters == {"text": "main.py {unknown}", "delay": 0.1}
+        # 编译结果不被修改，可重复绑定
+        assert program.steps[0].action.parameters["text"] == "{filename}.py {unknown}"
+
+    def test_unknown_type_falls_back_to_shortcut(self):
+        """测试未知操作类型按快捷键处理。"""
+        op = make_operation([ActionConfig(type="hotkey", parameters={"keys": ["f5"]})])
+        program = ActionCompiler().compile(op, {})
+
+        assert program.steps[0].action.type == ActionType.SHORTCUT
+
+    def test_operation_pointer_mode(self):
+        """测试操作级指针模式写入鼠标操作参数。"""
+        op = make_operation(
+            [
+                ActionConfig(type="click", target="0"),
+                ActionConfig(type="drag", parameters={"pointer_mode": "animated"}),
+                ActionConfig(type="shortcut", parameters={"keys": ["enter"]}),
+            ]
+        )
+        op.pointer_mode = "instant"
+        steps = ActionCompiler().compile(op, {}).steps
+
+        assert steps[0].action.parameters == {"pointer_mode": "instant"}
+        assert steps[1].action.parameters == {"pointer_mode": "animated"}
+        assert steps[2].action.parameters == {"keys": ["enter"]}
+
+    def test_cache_by_operation_and_shape(self):
+        """测试按操作名称和参数形态缓存。"""
+        op = make_operation([ActionConfig(type="click", target="0")])
+        compiler = ActionCompiler()
+
+        first = compiler.compile(op, {"filename": "a"})
+        second = compiler.compile(op, {"filename": "b"})
+        third = compiler.compile(op, {"filename": "a", "submit_action": "enter"})
+
+        assert first is second
+        assert third is not first
+        assert (compiler.hits, compiler.misses) == (1, 2)
+
+    def test_recompile_on_config_reload(self):
+        """测试配置热更新后重新编译。"""
+        compiler = ActionCompiler()
+        first = compiler.compile(make_operation([ActionConfig(type="click", target="0")]), {})
+        second = compiler.compile(make_operation([ActionConfig(type="wait")]), {})
+
+        assert second is not first
+        assert second.steps[0].action.type == ActionType.WAIT
+
+
+@pytest.mark.unit
+class TestRunProgram:
+    """执行编译程序测试类。"""
+
+    def test_run_program(self):
+        """测试执行编译后的操作程序。"""
+        op = make_operation(
+            [
+                ActionConfig(type="click", target="0"),
+                ActionConfig(type="shortcut", parameters={"keys": ["ctrl", "a"]}),
+                ActionConfig(type="shortcut", parameters={"keys": ["delete"]}),
+                ActionConfig(type="type", parameters={"text": "{name}", "delay": 0}),
+            ]
+        )
+        backend = VirtualBackend()
+        executor = AutomationExecutor(backend=backend)
+        element = UIElement(
+            element_type="input", description="输入框", bbox=(0, 0, 100, 40), confidence=0.9
+        )
+
+        program = ActionCompiler().compile(op, {"name": "abc"})
+        with patch("src.automation.executor.time.sleep"):
+            result = executor.run_program(program, {"name": "abc"}, {"0": element})
+
+        assert result is True
+        assert [e.kind for e in backend.events] == ["click", "hotkey", "hotkey", "write"]
+        assert backend.events[1].args["keys"] == ["ctrl", "a"]
+        assert backend.events[2].args["keys"] == ["delete"]
+        assert backend.events[3].args["text"] == "abc"
+
+    def test_run_program_stops_on_failure(self):
+        """测试操作失败时停止执行。"""
+        op = make_operation(
+            [
+                ActionConfig(type="click", target="missing"),
+                ActionConfig(type="shortcut", parameters={"keys": ["enter"]}),
+            ]
+        )
+        backend = VirtualBackend()
+        executor = AutomationExecutor(backend=backend)
+
+        with patch("src.automation.executor.time.sleep"):
+            result = executor.run_program(ActionCompiler().compile(op, {}), {}, {})
+
+        assert result is False
+        assert backend.events == []
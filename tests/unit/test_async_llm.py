@@ -0,0 +1,278 @@
+"""异步 LLM 请求路径单元测试。"""
+
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from PIL import Image
+
+from src.intent.recognizer import IntentRecognizer
+from src.llm.async_service import AsyncLLMService, ChatCompletion
+from src.locator.visual_locator import VisualLocator
+from tests.conftest import FakeChatClient
+
+
+def completion_payload(content: str) -> dict:
+    """构建 chat/completions 响应。"""
+    return {
+        "id": "test",
+        "model": "m",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+    }
+
+
+class FakeTransport(httpx.AsyncBaseTransport):
+    """记录请求并延迟返回的假传输层。"""
+
+    def __init__(self, content: str = "ok", delay: float = 0.0, status_code: int = 200) -> None:
+        self.content = content
+        self.delay = delay
+        self.status_code = status_code
+        self.requests: list[httpx.Request] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return httpx.Response(self.status_code, json=completion_payload(self.content))
+
+
+def make_service(transport: FakeTransport, **kwargs) -> AsyncLLMService:
+    """创建使用假传输层的异步服务。"""
+    return AsyncLLMService(
+        api_key="test-key",
+        base_url="http://llm.test/v4/",
+        http_client=httpx.AsyncClient(transport=transport),
+        **kwargs,
+    )
+
+
+INTENTS_YAML = """
+intents:
+  develop-feature:
+    type: single-system
+    description: 需求开发
+    system: ide
+    parameters:
+      requirement_text:
+        type: string
+        description: 需求文本
+        required: true
+"""
+
+
+@pytest.fixture
+def intents_path(tmp_path):
+    """写入测试用意图定义。"""
+    path = tmp_path / "intents.yaml"
+    path.write_text(INTENTS_YAML, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.unit
+class TestAsyncLLMService:
+    """异步 LLM 服务测试类。"""
+
+    def test_chat_completions_request(self):
+        """测试请求地址、鉴权头、请求体和响应解析。"""
+        transport = FakeTransport(content="你好")
+        service = make_service(transport)
+
+        response = asyncio.run(
+            service.chat.completions.create(
+                model="glm-4-flash",
+                messages=[{"role": "user", "content": "hi"}],
+                temperature=0.1,
+            )
+        )
+
+        assert isinstance(response, ChatCompletion)
+        assert response.choices[0].message.content == "你好"
+        request = transport.requests[0]
+        assert str(request.url) == "http://llm.test/v4/chat/completions"
+        assert request.headers["Authorization"] == "Bearer test-key"
+        body = json.loads(request.content)
+        assert body["model"] == "glm-4-flash"
+        assert body["temperature"] == 0.1
+
+    def test_max_in_flight_per_model(self):
+        """测试每个模型的并发限制。"""
+        transport = FakeTransport(delay=0.05)
+        service = make_service(transport, max_in_flight=2)
+
+        async def run():
+            await asyncio.gather(
+                *(service.chat.completions.create(model="m", messages=[]) for _ in range(6))
+            )
+
+        asyncio.run(run())
+
+        assert transport.peak == 2
+        stats = service.get_stats()["m"]
+        assert stats["requests"] == 6
+        assert stats["peak_in_flight"] == 2
+
+    def test_queue_wait_counts_against_timeout(self):
+        """测试排队等待超过超时时间时抛出 TimeoutError。"""
+        transport = FakeTransport(delay=0.3)
+        service = make_service(transport, max_in_flight=1)
+
+        async def run():
+            first = asyncio.create_task(service.chat.completions.create(model="m", messages=[]))
+            await asyncio.sleep(0.05)
+            with pytest.raises(TimeoutError):
+                await service.chat.completions.create(model="m", messages=[], timeout=0.05)
+            await first
+
+        asyncio.run(run())
+
+    def test_http_error_counted(self):
+        """测试 HTTP 错误抛出并计入统计。"""
+        service = make_service(FakeTransport(status_code=500))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(service.chat.completions.create(model="m", messages=[]))
+
+        assert service.get_stats()["m"]["errors"] == 1
+
+    def test_pool_rebuilt_per_event_loop(self):
+        """测试事件循环变化时重建自有连接池和信号量。"""
+        service = AsyncLLMService(api_key="test")
+
+        async def bind():
+            service._bind_loop()
+            return service._client(), service._semaphore("m")
+
+        first_client, first_semaphore = asyncio.run(bind())
+        second_client, second_semaphore = asyncio.run(bind())
+
+        assert first_client is not second_client
+        assert first_semaphore is not second_semaphore
+
+
+@pytest.mark.unit
+class TestRecognizeAsync:
+    """异步意图识别测试类。"""
+
+    def test_recognize_async_with_async_client(self, intents_path):
+        """测试使用异步客户端识别意图。"""
+        content = json.dumps(
+            {"intent_type": "develop-feature", "confidence": 0.9, "parameters": {"requirement_text": "登录"}}
+        )
+        transport = FakeTransport(content=f"```json\n{content}\n```")
+        recognizer = IntentRecognizer(intents_path, async_llm_client=make_service(transport))
+
+        result = asyncio.run(recognizer.recognize_async("开发登录功能"))
+
+        assert result.has_match
+        assert result.intent.type == "develop-feature"
+        assert result.intent.parameters == {"requirement_text": "登录"}
+        assert len(transport.requests) == 1
+
+    def test_recognize_async_unknown_intent(self, intents_path):
+        """测试未知意图类型返回未匹配。"""
+        transport = FakeTransport(content='{"intent_type": "other", "confidence": 0.9}')
+        recognizer = IntentRecognizer(intents_path, async_llm_client=make_service(transport))
+
+        result = asyncio.run(recognizer.recognize_async("你好"))
+
+        assert not result.has_match
+
+    def test_recognize_async_falls_back_to_thread(self, intents_path):
+        """测试未配置异步客户端时在线程中执行同步识别。"""
+        threads = []
+
+        def respond(request):
+            threads.append(threading.current_thread())
+            return {"intent_type": "develop-feature", "confidence": 0.9}
+
+        client = FakeChatClient(respond)
+        recognizer = IntentRecognizer(intents_path, llm_client=client)
+
+        result = asyncio.run(recognizer.recognize_async("开发"))
+
+        assert result.has_match
+        assert threads[0] is not threading.main_thread()
+
+
+@pytest.mark.unit
+class TestLocateAsync:
+    """异步视觉定位测试类。"""
+
+    def test_locate_async_with_async_client(self):
+        """测试使用异步客户端进行视觉定位。"""
+        transport = FakeTransport(
+            content='[{"element_type": "button", "description": "确定", "bbox": [1, 2, 30, 40], "confidence": 0.9}]'
+        )
+        locator = VisualLocator(
+            api_key="test",
+            llm_client=SimpleNamespace(),
+            async_llm_client=make_service(transport),
+        )
+        screenshot = Image.new("RGB", (64, 64))
+
+        elements = asyncio.run(locator.locate_async("找到确定按钮", screenshot=screenshot))
+
+        assert len(elements) == 1
+        assert elements[0].bbox == (1, 2, 30, 40)
+        body = json.loads(transport.requests[0].content)
+        assert body["messages"][0]["content"][0]["type"] == "image_url"
+
+        # 相同截图和提示词命中缓存
+        asyncio.run(locator.locate_async("找到确定按钮", screenshot=screenshot))
+        assert len(transport.requests) == 1
+
+
+@pytest.mark.unit
+class TestAPINonBlocking:
+    """HTTP API 非阻塞测试类。"""
+
+    def test_health_responsive_during_task(self, intents_path):
+        """测试长任务执行期间健康检查和仅识别请求仍然及时响应。"""
+        import src.api.app as api_app
+
+        content = '{"intent_type": "develop-feature", "confidence": 0.9, "parameters": {}}'
+        recognizer = IntentRecognizer(intents_path, async_llm_client=make_service(FakeTransport(content=content)))
+
+        def orchestrate(intent):
+            time.sleep(0.5)
+            return SimpleNamespace(status="completed", step_results=[], get_execution_summary=lambda: "ok")
+
+        orchestrator = SimpleNamespace(show_execution_plan=lambda intent: {}, orchestrate=orchestrate)
+        fake_controller = SimpleNamespace(_intent_recognizer=recognizer, _task_orchestrator=orchestrator)
+
+        async def run():
+            transport = httpx.ASGITransport(app=api_app.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://api.test") as client:
+                task = asyncio.create_task(client.post("/api/intent", json={"message": "开发", "execute": True}))
+                await asyncio.sleep(0.05)
+
+                start = time.perf_counter()
+                health = await client.get("/api/health")
+                recognized = await client.post("/api/intent", json={"message": "开发", "execute": False})
+                elapsed = time.perf_counter() - start
+
+                executed = await task
+            return health, recognized, executed, elapsed
+
+        original = api_app.controller
+        api_app.controller = fake_controller
+        try:
+            health, recognized, executed, elapsed = asyncio.run(run())
+        finally:
+            api_app.controller = original
+
+        assert health.status_code == 200
+        assert recognized.json()["intent_type"] == "develop-feature"
+        assert executed.json()["execution_result"]["status"] == "completed"
+        assert elapsed < 0.3
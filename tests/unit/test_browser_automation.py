@@ -78,10 +78,8 @@ class TestBrowserAutomation:
 
         automation.scroll(direction="down", distance=3)
 
-        assert mock_scroll.call_count == 3
-        for call in mock_scroll.call_args_list:
-            args, kwargs = call
-            assert args[0] == -300  # Negative for down
+        # 合并为一个滚轮事件
+        mock_scroll.assert_called_once_with(-900)  # Negative for down
 
     @patch("src.browser.automation.VisualLocator")
     @patch("src.browser.automation.ScreenshotCapture")
@@ -92,10 +90,7 @@ class TestBrowserAutomation:
 
         automation.scroll(direction="up", distance=2)
 
-        assert mock_scroll.call_count == 2
-        for call in mock_scroll.call_args_list:
-            args, kwargs = call
-            assert args[0] == 300  # Positive for up
+        mock_scroll.assert_called_once_with(600)  # Positive for up
 
     @patch("src.browser.automation.VisualLocator")
     @patch("src.browser.automation.ScreenshotCapture")
@@ -106,10 +101,7 @@ class TestBrowserAutomation:
 
         automation.scroll(direction="left", distance=2)
 
-        assert mock_hscroll.call_count == 2
-        for call in mock_hscroll.call_args_list:
-            args, kwargs = call
-            assert args[0] == 300  # Positive for left
+        mock_hscroll.assert_called_once_with(600)  # Positive for left
 
     @patch("src.browser.automation.VisualLocator")
     @patch("src.browser.automation.ScreenshotCapture")
@@ -0,0 +1,148 @@
+"""LLM 请求录制/回放单元测试。"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.llm.cassette import (
+    Cassette,
+    CassetteMissError,
+    fingerprint,
+    lognormal_latency,
+    normalize_request,
+)
+from src.llm.streaming import decode_stream
+from tests.conftest import FakeChatClient
+
+
+def image_message(data: str) -> list[dict]:
+    """构建包含图像的对话消息。"""
+    return [
+        {
+            "role": "user",
+            "content": [
+                {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{data}"}},
+                {"type": "text", "text": "找到按钮"},
+            ],
+        }
+    ]
+
+
+@pytest.mark.unit
+class TestFingerprint:
+    """请求指纹测试类。"""
+
+    def test_volatile_params_ignored(self):
+        """测试 timeout / stream 不影响指纹，模型和消息影响指纹。"""
+        base = {"model": "m", "messages": [{"role": "user", "content": "你好"}]}
+
+        assert fingerprint(base) == fingerprint({**base, "timeout": 3, "stream": True})
+        assert fingerprint(base) != fingerprint({**base, "model": "other"})
+        assert fingerprint(base) != fingerprint({**base, "temperature": 0.1})
+
+    def test_image_payload_hashed(self):
+        """测试图像数据替换为哈希，不同图像指纹不同。"""
+        normalized = normalize_request({"model": "m", "messages": image_message("AAAA" * 100)})
+
+        url = normalized["messages"][0]["content"][0]["image_url"]["url"]
+        assert url.startswith("sha256:") and len(url) < 40
+        assert fingerprint({"messages": image_message("AAAA")}) != fingerprint({"messages": image_message("BBBB")})
+
+
+@pytest.mark.unit
+class TestCassette:
+    """录制/回放测试类。"""
+
+    def test_record_then_replay(self, tmp_path):
+        """测试录制后离线回放，相同请求按录制顺序返回。"""
+        path = tmp_path / "cassette.json"
+        recorder = Cassette(path, mode="record", client=FakeChatClient("第 1 次", "第 2 次"))
+        request = {"model": "m", "messages": image_message("AAAA")}
+        recorder.chat.completions.create(**request)
+        recorder.chat.completions.create(**request)
+
+        replay = Cassette(path)
+        contents = [replay.chat.completions.create(**request).choices[0].message.content for _ in range(3)]
+
+        assert contents == ["第 1 次", "第 2 次", "第 1 次"]
+        assert replay.get_stats()["hits"] == 3
+        assert json.loads(path.read_text(encoding="utf-8"))["interactions"][0]["request"]["model"] == "m"
+
+    def test_replay_miss(self, tmp_path):
+        """测试回放模式下没有录制的请求报错。"""
+        replay = Cassette(tmp_path / "empty.json")
+
+        with pytest.raises(CassetteMissError):
+            replay.chat.completions.create(model="m", messages=[])
+        assert replay.get_stats()["misses"] == 1
+
+    def test_auto_records_missing(self, tmp_path):
+        """测试 auto 模式有录制时回放，没有时请求并录制。"""
+        client = FakeChatClient()
+        cassette = Cassette(tmp_path / "auto.json", mode="auto", client=client)
+
+        first = cassette.chat.completions.create(model="m", messages=[])
+        second = cassette.chat.completions.create(model="m", messages=[])
+
+        assert first.choices[0].message.content == second.choices[0].message.content
+        assert len(client.calls) == 1
+
+    def test_stream_recorded_fully_and_replayed(self, tmp_path):
+        """测试流式请求提前停止时仍录制完整内容，回放时按块返回。"""
+        path = tmp_path / "stream.json"
+        content = '[{"a": 1}, {"a": 2}, {"a": 3}]'
+        recorder = Cassette(path, mode="record", client=FakeChatClient(content))
+
+        stream = recorder.chat.completions.create(model="m", messages=[], stream=True)
+        assert decode_stream(stream, until=lambda decoder: len(decoder.items) >= 1) == [{"a": 1}]
+
+        replay = Cassette(path, chunk_chars=4)
+        assert decode_stream(replay.chat.completions.create(model="m", messages=[], stream=True)) == [
+            {"a": 1},
+            {"a": 2},
+            {"a": 3},
+        ]
+        # 非流式请求也能回放流式录制
+        assert replay.chat.completions.create(model="m", messages=[]).choices[0].message.content == content
+
+    def test_recorded_latency_injected(self, tmp_path):
+        """测试回放时注入录制的延迟或固定延迟。"""
+        path = tmp_path / "latency.json"
+        Cassette(path, mode="record", client=FakeChatClient(delay=0.1)).chat.completions.create(model="m", messages=[])
+
+        for latency, minimum in (("recorded", 0.09), (50, 0.045), (None, 0.0)):
+            replay = Cassette(path, latency=latency)
+            start = time.perf_counter()
+            replay.chat.completions.create(model="m", messages=[])
+            elapsed = time.perf_counter() - start
+            assert elapsed >= minimum
+            if latency is None:
+                assert elapsed < 0.05
+
+    def test_lognormal_latency_reproducible(self):
+        """测试对数正态延迟分布使用固定种子时可复现。"""
+        first = lognormal_latency(100, seed=3)
+        second = lognormal_latency(100, seed=3)
+
+        samples = [first({}) for _ in range(5)]
+        assert samples == [second({}) for _ in range(5)]
+        assert all(sample > 0 for sample in samples)
+
+    def test_async_replay(self, tmp_path):
+        """测试异步客户端共用录制。"""
+        path = tmp_path / "async.json"
+        Cassette(path, mode="record", client=FakeChatClient("异步")).chat.completions.create(model="m", messages=[])
+        client = Cassette(path).as_async()
+
+        response = asyncio.run(client.chat.completions.create(model="m", messages=[], timeout=5))
+
+        assert response.choices[0].message.content == "异步"
+
+    def test_invalid_mode(self, tmp_path):
+        """测试无效模式和录制模式缺少客户端时报错。"""
+        with pytest.raises(ValueError):
+            Cassette(tmp_path / "x.json", mode="live")
+        with pytest.raises(ValueError):
+            Cassette(tmp_path / "x.json", mode="record")
@@ -0,0 +1,234 @@
+"""时间预算（截止时间）单元测试。"""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from PIL import Image
+
+from src.config.config_manager import OperationConfigModel
+from src.config.schema import OperationConfig
+from src.controller.ide_controller import IDEController
+from src.infrastructure.deadline import Deadline, DeadlineExceededError
+from src.locator.regions import RegionResolver
+from src.locator.visual_locator import VisualLocator
+from src.models.element import LocateResult, UIElement
+from src.models.result import ExecutionStatus
+from src.workflow.executor import WorkflowExecutor
+from src.workflow.models import WorkflowConfig, WorkflowStep
+from src.workflow.validator import WorkflowValidator
+from tests.conftest import FakeChatClient
+
+ITEM = {"element_type": "text", "description": "main.py", "bbox": [10, 10, 60, 30], "confidence": 0.9}
+
+
+@pytest.mark.unit
+class TestDeadline:
+    """截止时间测试类。"""
+
+    def test_unbounded(self):
+        """测试不限时的截止时间放行所有检查。"""
+        deadline = Deadline()
+        assert not deadline.bounded
+        assert deadline.remaining() is None
+        assert deadline.allows(1e9)
+        assert deadline.timeout(cap=5) == 5
+        deadline.check("vision")
+
+    def test_budget(self):
+        """测试剩余时间、预计耗时检查和到期异常。"""
+        deadline = Deadline(0.05)
+        assert 0 < deadline.remaining() <= 0.05
+        assert deadline.allows(0.01)
+        assert not deadline.allows(1.0)
+        assert deadline.timeout(cap=0.01) == 0.01
+
+        time.sleep(0.06)
+        assert deadline.expired
+        assert not deadline.allows(0)
+        with pytest.raises(DeadlineExceededError):
+            deadline.check("vision")
+
+    def test_within_and_coerce(self):
+        """测试子截止时间不晚于父截止时间，coerce 复制到期时刻但不共享阶段记录。"""
+        parent = Deadline(10)
+        assert parent.within(1).remaining() <= 1
+        assert parent.within(100).expires_at == parent.expires_at
+        assert Deadline().within(None).expires_at is None
+
+        parent.truncate("vision")
+        copy = Deadline.coerce(parent)
+        assert copy.expires_at == parent.expires_at
+        assert not copy.truncated
+        assert Deadline.coerce(2.0).bounded
+        assert not Deadline.coerce(None).bounded
+
+
+@pytest.mark.unit
+class TestDeadlineLocate:
+    """限时定位测试类。"""
+
+    def test_vision_cancelled_when_budget_runs_out(self):
+        """测试视觉请求超时取剩余时间，到期取消后返回截断的空结果。"""
+        llm = FakeChatClient([ITEM], delay=0.5)
+        locator = VisualLocator(api_key="test", llm_client=llm)
+
+        start = time.perf_counter()
+        result = locator.locate("找到 main.py", Image.new("RGB", (200, 100)), deadline=0.1)
+
+        assert time.perf_counter() - start < 0.4
+        assert isinstance(result, LocateResult)
+        assert result == []
+        assert result.truncated and result.stages == ["vision"]
+        assert 0 < llm.timeouts[0] <= 0.1
+
+    def test_stage_skipped_by_estimate(self):
+        """测试预计耗时超过剩余时间的 OCR 阶段直接跳过，跳过后估计减半。"""
+        locator = VisualLocator(api_key="test", vision_enabled=False)
+        locator._stage_seconds["ocr_full"] = 5.0
+        locator._locate_with_ocr = Mock(return_value=[])
+
+        result = locator.locate("找到 main.py", Image.new("RGB", (200, 100)), deadline=1.0)
+
+        assert result.truncated
+        locator._locate_with_ocr.assert_not_called()
+        assert locator.get_stage_estimates()["ocr_full"] == pytest.approx(2.5)
+
+    def test_skipped_ocr_estimate_recovers(self):
+        """测试 OCR 阶段被跳过几次后重新执行，按实际耗时更新估计。"""
+        locator = VisualLocator(api_key="test", vision_enabled=False)
+        locator._stage_seconds["ocr_full"] = 5.0
+        locator._locate_with_ocr = Mock(return_value=[])
+
+        runs = []
+        for i in range(5):
+            locator.locate(f"找到 file{i}.py", Image.new("RGB", (200, 100)), deadline=1.0)
+            runs.append(locator._locate_with_ocr.call_count)
+
+        assert runs[0] == 0 and runs[-1] > 0
+        assert locator.get_stage_estimates()["ocr_full"] < 1.0
+
+    def test_slow_vision_estimate_does_not_disable_stage(self):
+        """测试一次很慢的视觉请求之后，限时定位仍然请求视觉 API，估计随实际耗时恢复。"""
+        llm = FakeChatClient([ITEM], delay=0.3)
+        locator = VisualLocator(api_key="test", llm_client=llm)
+        frame = Image.new("RGB", (200, 100))
+        locator.locate("找到 main.py", frame, use_cache=False)
+        assert locator.get_stage_estimates()["vision"] >= 0.3
+
+        llm.delay = 0.01
+        results = [locator.locate("找到 main.py", frame, use_cache=False, deadline=0.2) for _ in range(5)]
+
+        assert len(llm.timeouts) == 6
+        assert all(len(result) == 1 and not result.truncated for result in results)
+        assert locator.get_stage_estimates()["vision"] < 0.2
+
+    def test_unbounded_locate_not_truncated(self):
+        """测试不限时定位不传超时参数，并记录阶段耗时估计。"""
+        llm = FakeChatClient([ITEM], delay=0)
+        locator = VisualLocator(api_key="test", llm_client=llm)
+
+        result = locator.locate("找到 main.py", Image.new("RGB", (200, 100)))
+
+        assert len(result) == 1 and not result.truncated
+        assert llm.timeouts == [None]
+        assert "vision" in locator.get_stage_estimates()
+
+    def test_hybrid_returns_best_so_far(self, monkeypatch):
+        """测试混合定位时 OCR 来不及完成，返回视觉定位结果并标记截断。"""
+        monkeypatch.setattr("src.locator.visual_locator.EASYOCR_AVAILABLE", True)
+        locator = VisualLocator(api_key="test", llm_client=FakeChatClient([ITEM], delay=0))
+        locator._stage_seconds.update({"ocr_region": 10.0, "ocr_full": 10.0})
+        locator._locate_with_ocr_in_region = Mock(return_value=[])
+
+        result = locator.locate("找到 main.py", Image.new("RGB", (400, 200)), target_filter="main.py", deadline=2.0)
+
+        assert [element.description for element in result] == ["main.py"]
+        assert result.stages == ["ocr_region", "ocr_full"]
+        locator._locate_with_ocr_in_region.assert_not_called()
+
+    def test_truncated_miss_not_cached(self):
+        """测试被截断的空结果不写入结果缓存和失败结果缓存。"""
+        llm = FakeChatClient([], delay=0.3)
+        locator = VisualLocator(api_key="test", llm_client=llm)
+        frame = Image.new("RGB", (200, 100))
+
+        assert locator.locate("找到 main.py", frame, deadline=0.05).truncated
+        assert locator.locate("找到 main.py", frame) == []
+
+        assert len(llm.timeouts) == 2
+        assert locator.get_negative_stats()["recorded"] == 1
+
+
+def make_controller() -> IDEController:
+    """构建只包含截图和定位组件的控制器。"""
+    frame = Image.new("RGB", (800, 600))
+    controller = IDEController.__new__(IDEController)
+    controller.screenshot = MagicMock()
+    controller.screenshot.get_monitors.return_value = [{"left": 0, "top": 0, "width": 800, "height": 600}]
+    controller.screenshot.capture_fullscreen.return_value = frame
+    controller.template_matcher = None
+    controller._regions = RegionResolver(None)
+    controller._capture_scope = "screen"
+    controller.locator = MagicMock()
+    controller._action_compiler = MagicMock()
+    controller.executor = MagicMock()
+    controller.executor.run_program.return_value = True
+    return controller
+
+
+def operation(timeout: float | None = None) -> OperationConfig:
+    """构建视觉定位操作。"""
+    return OperationConfig(
+        name="double_click_file", aliases=[], intent="file_operation", description="双击", visual_prompt="找到目标",
+        timeout=timeout,
+    )
+
+
+@pytest.mark.unit
+class TestOperationTimeout:
+    """操作与工作流步骤时间预算测试类。"""
+
+    def test_operation_timeout_bounds_locate(self):
+        """测试操作配置的 timeout 作为定位时间预算，与调用方截止时间取较早者。"""
+        controller = make_controller()
+        controller.locator.locate.return_value = LocateResult([UIElement("tree", "main.py", (1, 1, 5, 5), 0.9)])
+
+        controller._execute_operation(operation(timeout=2.0), {}, deadline=60)
+
+        deadline = controller.locator.locate.call_args.kwargs["deadline"]
+        assert 0 < deadline.remaining() <= 2.0
+
+    def test_truncated_miss_reports_timeout(self):
+        """测试时间不足未找到目标时返回超时状态。"""
+        controller = make_controller()
+        controller.locator.locate.return_value = LocateResult([], truncated=True, stages=["vision"])
+
+        result = controller._execute_operation(operation(timeout=1.0), {})
+
+        assert result.status == ExecutionStatus.TIMEOUT
+
+    def test_operation_timeout_parsed(self):
+        """测试操作配置的 timeout 字段（必须为正数）。"""
+        data = {"name": "op", "aliases": [], "intent": "navigation", "description": "", "actions": []}
+        assert OperationConfigModel(**data, timeout=8).to_operation_config().timeout == 8
+        with pytest.raises(ValueError):
+            OperationConfigModel(**data, timeout=0)
+
+    def test_step_timeout_passed_and_limits_retries(self):
+        """测试步骤时间预算传给控制器，剩余时间不足以等待重试间隔时不再重试。"""
+        controller = MagicMock()
+        controller.execute_command.return_value = SimpleNamespace(status=Mock(value="timeout"), error="定位超时", message="")
+        step = WorkflowStep(description="点击运行", retry_count=3, retry_interval=0.5, timeout=0.3)
+
+        result = WorkflowExecutor(controller).execute(WorkflowConfig(name="测试", steps=[step]))
+
+        assert controller.execute_command.call_count == 1
+        assert isinstance(controller.execute_command.call_args.kwargs["deadline"], Deadline)
+        assert result.step_results[0].retry_count == 0
+
+    def test_step_timeout_validated(self):
+        """测试步骤超时时间必须为正数。"""
+        config = WorkflowConfig(name="测试", steps=[WorkflowStep(description="步骤1", timeout=0)])
+        assert any("超时" in error for error in WorkflowValidator().validate(config))
@@ -0,0 +1,130 @@
+"""列式 UI 元素集合单元测试。"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.locator.ocr_index import OCRIndex
+from src.locator.tiling import merge_elements
+from src.locator.visual_locator import VisualLocator
+from src.models.element import UIElement
+from src.models.element_set import ElementSet
+
+ELEMENTS = [
+    UIElement("tree", "main.py", (10, 10, 60, 30), 0.7),
+    UIElement("button", "运行", (100, 10, 140, 30), 0.9, metadata={"tile": 1}),
+    UIElement("tree", "main.py", (12, 11, 61, 31), 0.8),
+    UIElement("tree", "utils.py", (10, 40, 60, 60), 0.6),
+]
+
+
+@pytest.mark.unit
+class TestElementSet:
+    """列式元素集合测试类。"""
+
+    def test_columns_and_views(self):
+        """测试按列存储（相同描述共用词表项），按下标取回原元素。"""
+        elements = ElementSet.from_elements(ELEMENTS)
+
+        assert len(elements) == 4
+        assert elements.boxes.dtype == np.int32 and elements.boxes.shape == (4, 4)
+        assert elements.descriptions == ["main.py", "运行", "utils.py"]
+        assert elements.description_codes.tolist() == [0, 1, 0, 2]
+        assert elements[1] is ELEMENTS[1]
+        assert elements.to_list() == ELEMENTS
+
+    def test_views_from_columns(self):
+        """测试从列数据构建时按需生成 UIElement 视图。"""
+        elements = ElementSet.from_columns([(0, 0, 10, 10), (5, 5, 9, 7)], [0.5, 0.25], "ocr_text", ["a", "b"])
+
+        assert elements[-1] == UIElement("ocr_text", "b", (5, 5, 9, 7), 0.25)
+        assert elements.centers.tolist() == [[5, 5], [7, 6]]
+        assert elements.areas.tolist() == [100, 8]
+
+    def test_select_and_sort(self):
+        """测试按类型、置信度、区域过滤和按置信度排序，元数据随行移动。"""
+        elements = ElementSet.from_columns(
+            [e.bbox for e in ELEMENTS], [e.confidence for e in ELEMENTS],
+            [e.element_type for e in ELEMENTS], [e.description for e in ELEMENTS],
+            metadata={1: {"tile": 1}},
+        )
+
+        assert [e.description for e in elements.select(element_types=["tree"], min_confidence=0.65)] == [
+            "main.py", "main.py",
+        ]
+        assert [e.description for e in elements.select(region=(0, 0, 90, 35))] == ["main.py", "main.py"]
+        ranked = elements.sort()
+        assert ranked.confidences.tolist() == [0.9, 0.8, 0.7, 0.6]
+        assert ranked[0].metadata == {"tile": 1}
+        assert elements.select(element_types=["menu"]).to_list() == []
+
+    def test_description_scores(self):
+        """测试相同描述只计算一次分数。"""
+        calls = []
+        elements = ElementSet.from_elements(ELEMENTS)
+
+        scores = elements.description_scores(lambda text: calls.append(text) or float(text == "main.py"))
+
+        assert scores.tolist() == [1.0, 0.0, 1.0, 0.0]
+        assert sorted(calls) == ["main.py", "utils.py", "运行"]
+
+    def test_nms_matches_merge(self):
+        """测试非极大值抑制：重叠的同名元素只保留置信度最高的一个。"""
+        kept = ElementSet.from_elements(ELEMENTS).nms(iou_threshold=0.5)
+
+        assert kept.to_list() == [ELEMENTS[1], ELEMENTS[2], ELEMENTS[3]]
+        assert merge_elements(ELEMENTS) == [ELEMENTS[1], ELEMENTS[2], ELEMENTS[3]]
+
+    def test_nms_containment_requires_same_description(self):
+        """测试较小框大部分落在较大框内时，只有描述相同才视为重复。"""
+        outer = UIElement("tree", "main.py", (0, 0, 100, 20), 0.9)
+        part = UIElement("tree", "main.py", (0, 0, 30, 20), 0.8)
+        other = UIElement("tree", "main", (50, 0, 80, 20), 0.7)
+
+        kept = ElementSet.from_elements([part, other, outer]).nms(0.5, containment_threshold=0.8)
+
+        assert kept.to_list() == [outer, other]
+
+    def test_empty(self):
+        """测试空集合。"""
+        elements = ElementSet.from_elements([])
+        assert len(elements) == 0
+        assert elements.nms().to_list() == []
+        assert elements.centers.shape == (0, 2)
+
+    def test_slots(self):
+        """测试 UIElement 不带实例字典。"""
+        assert not hasattr(ELEMENTS[0], "__dict__")
+
+
+@pytest.mark.unit
+class TestVectorizedMatching:
+    """向量化目标匹配测试类。"""
+
+    def test_filter_by_target(self):
+        """测试按匹配度降序返回匹配度 > 0.5 的元素，没有时返回最高分的一个。"""
+        locator = VisualLocator(api_key="test", vision_enabled=False)
+
+        assert locator._filter_by_target(ELEMENTS, "main.py") == [ELEMENTS[0], ELEMENTS[2]]
+        assert locator._filter_by_target(ELEMENTS, "utils") == [ELEMENTS[3]]
+        assert locator._filter_by_target(ELEMENTS, "config.yaml") == [ELEMENTS[0]]
+        assert locator._filter_by_target([], "main.py") == []
+
+    def test_ocr_index_find(self):
+        """测试 OCR 索引按列存储文本块，匹配度相同时按置信度降序。"""
+        quad = lambda x1, y1, x2, y2: [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]  # noqa: E731
+        results = [
+            (quad(0, 0, 50, 10), "main.py", 0.6),
+            (quad(0, 20, 50, 30), "utils.py", 0.9),
+            (quad(0, 40, 80, 50), "test_main.py", 0.8),
+            (quad(0, 60, 80, 70), "noise", 0.05),
+        ]
+        index = OCRIndex(reader=lambda image: results)
+        frame = Image.new("RGB", (100, 100))
+
+        found = index.find(frame, "MAIN")
+
+        assert [e.description for e in found] == ["OCR识别文本: test_main.py", "OCR识别文本: main.py"]
+        assert found[0].bbox == (0, 40, 80, 50)
+        assert len(index.elements(frame)) == 3
+        assert index.ocr_runs == 1
@@ -0,0 +1,134 @@
+"""目标文本模糊匹配单元测试。"""
+
+from unittest.mock import Mock
+
+import pytest
+from PIL import Image
+
+from src.locator.fuzzy import FuzzyMatcher, match_score, tokenize
+from src.locator.ocr_index import OCRIndex
+from src.locator.visual_locator import VisualLocator
+from src.models.element import UIElement
+
+
+def quad(x1: int, y1: int, x2: int, y2: int) -> list[list[int]]:
+    """边界框转换为 OCR 四点格式。"""
+    return [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+
+
+@pytest.mark.unit
+class TestTokenize:
+    """分词测试类。"""
+
+    def test_mixed_text(self):
+        """测试英文按单词、中文按相邻两字切分，全角字符转半角。"""
+        assert tokenize("打开 版本控制 Main_Test.py") == ["打开", "版本", "本控", "控制", "main", "test", "py"]
+        assert tokenize("运") == ["运"]
+        assert tokenize("ｍａｉｎ．ｐｙ") == ["main", "py"]
+
+
+@pytest.mark.unit
+class TestFuzzyMatcher:
+    """模糊匹配器测试类。"""
+
+    def test_exact_and_contains(self):
+        """测试完全相同 1.0，包含目标 0.9，分词部分匹配按比例计分。"""
+        matcher = FuzzyMatcher(["main.py", "test_main.py", "main", "MAIN.PY"])
+
+        assert matcher.scores("main.py").tolist() == pytest.approx([1.0, 0.9, 0.35, 1.0])
+
+    def test_ocr_typo(self):
+        """测试 OCR 识别错误一个字符时仍能匹配，但分数低于精确匹配。"""
+        matcher = FuzzyMatcher(["maln.py", "utils.py", "版本空制"])
+
+        scores = matcher.scores("main.py")
+        assert 0.5 < scores[0] < 0.9
+        assert scores[1] < 0.5
+        assert 0.5 < matcher.scores("版本控制")[2] < 0.9
+
+    def test_typo_inside_longer_text(self):
+        """测试目标与较长文本中的子串相近时匹配（如带路径前缀的文件名）。"""
+        assert match_score("src/maln.py - project", "main.py") > 0.5
+
+    def test_too_many_edits(self):
+        """测试相差过多或目标太短时不做模糊匹配。"""
+        matcher = FuzzyMatcher(["mzln.py", "rnn"])
+
+        assert matcher.scores("main.py")[0] < 0.5
+        assert matcher.scores("run")[1] == 0.0
+
+    def test_empty(self):
+        """测试空词表和空目标。"""
+        assert len(FuzzyMatcher([]).scores("main.py")) == 0
+        assert FuzzyMatcher(["main.py"]).scores("  ").tolist() == [0.0]
+
+    def test_empty_target_matches_all(self):
+        """测试空目标匹配所有文本（与子串匹配相同），保持原顺序。"""
+        matcher = FuzzyMatcher(["main.py", "运行"])
+        assert matcher.rank("").tolist() == [0, 1]
+        assert matcher.rank("main.py").tolist() == [0]
+
+    def test_rank_drops_near_hits_when_exact_exists(self):
+        """测试有精确或包含匹配时不返回相近文本，只有相近文本时按匹配度、置信度排序。"""
+        matcher = FuzzyMatcher(["test_b.py", "rain.py", "main.py", "test_a.py"])
+        assert matcher.scores("test_a.py")[0] > 0.5
+
+        assert matcher.rank("test_a.py").tolist() == [3]
+        assert matcher.rank("main.py", [0.9, 0.9, 0.6, 0.9]).tolist() == [2]
+
+        typos = FuzzyMatcher(["test_b.py", "tesl_a.py", "test_a.py.bak"])
+        assert typos.rank("test_a.py").tolist() == [2]
+        assert FuzzyMatcher(["maln.py", "rnain.py"]).rank("main.py", [0.6, 0.9]).tolist() == [1, 0]
+
+
+@pytest.mark.unit
+class TestFuzzyLocate:
+    """模糊匹配定位测试类。"""
+
+    def test_filter_by_target_tolerates_typo(self):
+        """测试视觉定位结果过滤时，描述中有拼写错误的元素排在不相关元素之前。"""
+        locator = VisualLocator(api_key="test", vision_enabled=False)
+        typo = UIElement("tree", "maln.py", (0, 0, 10, 10), 0.8)
+        other = UIElement("tree", "utils.py", (0, 20, 10, 30), 0.9)
+
+        assert locator._filter_by_target([other, typo], "main.py") == [typo]
+
+    def test_ocr_without_target_returns_all_text(self, monkeypatch):
+        """测试不按目标过滤时 OCR 返回所有文本（视觉识别禁用、熔断时的全图 OCR）。"""
+        monkeypatch.setattr("src.locator.visual_locator.EASYOCR_AVAILABLE", True)
+        results = [(quad(0, 0, 50, 10), "main.py", 0.9), (quad(0, 20, 50, 30), "运行", 0.6)]
+        locator = VisualLocator(api_key="test", vision_enabled=False)
+        locator._ocr_reader = Mock(readtext=Mock(return_value=results))
+
+        assert len(locator._locate_with_ocr(Image.new("RGB", (100, 100)), "")) == 2
+        found = locator.locate("找到所有文本", Image.new("RGB", (100, 100)))
+        assert [e.description for e in found] == ["OCR识别文本: main.py", "OCR识别文本: 运行"]
+
+    def test_ocr_prefers_exact_filename_over_earlier_similar_one(self, monkeypatch):
+        """测试 OCR 定位时阅读顺序在前的相似文件名不会排在目标前面（控制器点击第一个结果）。"""
+        monkeypatch.setattr("src.locator.visual_locator.EASYOCR_AVAILABLE", True)
+        results = [
+            (quad(0, 0, 50, 10), "test_b.py", 0.95),
+            (quad(0, 20, 50, 30), "rain.py", 0.95),
+            (quad(0, 40, 50, 50), "test_a.py", 0.8),
+            (quad(0, 60, 50, 70), "main.py", 0.7),
+        ]
+        locator = VisualLocator(api_key="test", vision_enabled=False)
+        locator._ocr_reader = Mock(readtext=Mock(return_value=results))
+        image = Image.new("RGB", (100, 100))
+
+        for target in ("test_a.py", "main.py"):
+            expected = [f"OCR识别文本: {target}"]
+            assert [e.description for e in locator._locate_with_ocr(image, target)] == expected
+            assert [e.description for e in locator._locate_with_ocr_in_region(image, target)] == expected
+            found = locator._locate_with_ocr_in_region(image, target, (0, 0, 100, 100))
+            assert [e.description for e in found] == expected
+
+    def test_ocr_index_finds_typo(self):
+        """测试 OCR 文本索引容忍识别错误，精确匹配排在前面。"""
+        results = [(quad(0, 0, 50, 10), "maln.py", 0.9), (quad(0, 20, 50, 30), "main.py", 0.6)]
+        index = OCRIndex(reader=lambda image: results)
+
+        found = index.find(Image.new("RGB", (100, 100)), "main.py")
+
+        assert [e.description for e in found] == ["OCR识别文本: main.py", "OCR识别文本: maln.py"]
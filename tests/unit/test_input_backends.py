@@ -0,0 +1,178 @@
+"""输入后端单元测试。"""
+
+import pytest
+
+from src.automation.actions import Action, ActionType
+from src.automation.backends import VirtualBackend, create_input_backend, drag_points
+from src.automation.executor import AutomationExecutor
+from src.models.element import UIElement
+
+
+@pytest.mark.unit
+class TestVirtualBackend:
+    """虚拟后端测试类。"""
+
+    def test_records_events(self):
+        """测试记录输入事件。"""
+        backend = VirtualBackend()
+        backend.click(10, 20)
+        backend.hotkey("ctrl", "s")
+        backend.write("abc")
+
+        assert [e.kind for e in backend.events] == ["click", "hotkey", "write"]
+        assert backend.events[1].args["keys"] == ["ctrl", "s"]
+        assert backend.position() == (10, 20)
+
+    def test_drag_records_start_and_end(self):
+        """测试拖拽事件记录起止坐标。"""
+        backend = VirtualBackend()
+        backend.move_to(5, 5)
+        backend.drag_to(100, 50)
+
+        drag = backend.events[-1]
+        assert drag.args["start"] == (5, 5)
+        assert drag.args["end"] == (100, 50)
+
+    def test_clear(self):
+        """测试清空事件。"""
+        backend = VirtualBackend()
+        backend.press("enter")
+        backend.clear()
+        assert backend.events == []
+
+    def test_simulated_time(self):
+        """测试模拟耗时（动画时长 + 隐式暂停）。"""
+        backend = VirtualBackend(pause=0.1)
+        backend.move_to(10, 10, duration=0.5)
+        backend.click(10, 10)
+        backend.click(20, 20, pause=False)
+
+        assert backend.simulated_time == pytest.approx(0.7)
+
+    def test_drag_points(self):
+        """测试拖拽中间点插值。"""
+        assert drag_points((0, 0), (100, 50), 2) == [(50, 25), (100, 50)]
+        assert drag_points((0, 0), (10, 10), 0) == [(10, 10)]
+
+
+@pytest.mark.unit
+class TestCreateInputBackend:
+    """输入后端工厂测试类。"""
+
+    def test_create_virtual(self):
+        """测试创建虚拟后端。"""
+        assert isinstance(create_input_backend("virtual"), VirtualBackend)
+
+    def test_unknown_backend(self):
+        """测试未知后端名称。"""
+        with pytest.raises(ValueError) as exc_info:
+            create_input_backend("unknown")
+        assert "unknown" in str(exc_info.value)
+
+
+@pytest.mark.unit
+class TestExecutorWithVirtualBackend:
+    """使用虚拟后端的执行器测试类。"""
+
+    @pytest.fixture
+    def backend(self):
+        """创建虚拟后端。"""
+        return VirtualBackend()
+
+    @pytest.fixture
+    def executor(self, backend):
+        """创建使用虚拟后端的执行器。"""
+        return AutomationExecutor(action_delay=0.0, backend=backend)
+
+    def test_actions_dispatch_to_backend(self, executor, backend):
+        """测试操作分发到输入后端。"""
+        elem = UIElement(
+            element_type="button",
+            description="按钮",
+            bbox=(100, 100, 200, 150),
+            confidence=1.0,
+        )
+
+        assert executor.execute(Action(type=ActionType.RIGHT_CLICK, target="0"), elem)
+        assert executor.execute(
+            Action(type=ActionType.SHORTCUT, parameters={"keys": "enter"})
+        )
+        assert executor.execute(Action(type=ActionType.TYPE, parameters={"text": "abc"}))
+
+        assert [e.kind for e in backend.events] == ["click", "hotkey", "write"]
+        assert backend.events[0].args == {"x": 150, "y": 125, "button": "right"}
+
+    def test_dispatch_stats(self, executor):
+        """测试按操作类型统计分发耗时。"""
+        for _ in range(3):
+            executor.execute(Action(type=ActionType.SHORTCUT, parameters={"keys": ["ctrl", "s"]}))
+        executor.execute(Action(type=ActionType.WAIT, parameters={"duration": 0.0}))
+
+        stats = executor.get_dispatch_stats()
+        assert stats["shortcut"]["count"] == 3
+        assert stats["wait"]["count"] == 1
+        assert stats["shortcut"]["max_ms"] >= stats["shortcut"]["mean_ms"] >= 0
+
+        executor.reset_dispatch_stats()
+        assert executor.get_dispatch_stats() == {}
+
+
+@pytest.mark.unit
+class TestPointerMode:
+    """指针模式测试类。"""
+
+    @pytest.fixture
+    def element(self):
+        """创建测试元素。"""
+        return UIElement(
+            element_type="button",
+            description="按钮",
+            bbox=(100, 100, 200, 150),
+            confidence=1.0,
+        )
+
+    def test_invalid_pointer_mode(self):
+        """测试不支持的指针模式。"""
+        with pytest.raises(ValueError):
+            AutomationExecutor(backend=VirtualBackend(), pointer_mode="teleport")
+
+    def test_instant_click_skips_pause(self, element):
+        """测试 instant 模式点击不计入隐式暂停。"""
+        backend = VirtualBackend(pause=0.2)
+        executor = AutomationExecutor(backend=backend)
+
+        executor.execute(Action(type=ActionType.CLICK, target="0"), element)
+        assert backend.simulated_time == pytest.approx(0.2)
+
+        executor.execute(
+            Action(type=ActionType.CLICK, target="0", parameters={"pointer_mode": "instant"}),
+            element,
+        )
+        assert backend.simulated_time == pytest.approx(0.2)
+        assert [e.kind for e in backend.events] == ["click", "click"]
+
+    def test_drag_modes(self, element):
+        """测试拖拽：animated 按时长补间，instant 只发送最少移动事件。"""
+        backend = VirtualBackend()
+        executor = AutomationExecutor(backend=backend, drag_steps=3)
+        params = {"end_x": 400, "end_y": 300}
+
+        executor.execute(Action(type=ActionType.DRAG, parameters=params), element)
+        executor.execute(
+            Action(type=ActionType.DRAG, parameters={**params, "pointer_mode": "instant"}),
+            element,
+        )
+
+        animated, instant = backend.events
+        assert animated.args["start"] == (150, 125)
+        assert (animated.args["steps"], animated.args["duration"]) == (0, 0.5)
+        assert (instant.args["steps"], instant.args["duration"]) == (3, 0.0)
+        assert instant.args["end"] == (400, 300)
+
+    def test_move_to_default_duration(self):
+        """测试 move_to 默认时长随指针模式变化。"""
+        backend = VirtualBackend()
+        AutomationExecutor(backend=backend).move_to(10, 10)
+        AutomationExecutor(backend=backend, pointer_mode="instant").move_to(20, 20)
+
+        assert [e.args["duration"] for e in backend.events] == [0.5, 0.0]
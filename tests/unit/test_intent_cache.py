@@ -0,0 +1,212 @@
+"""意图识别结果缓存单元测试。"""
+
+
+import pytest
+
+from src.intent.cache import IntentCache
+from src.intent.models import Intent, IntentDefinition, IntentParameter
+from src.intent.recognizer import IntentRecognizer
+from tests.conftest import FakeChatClient
+
+INTENTS_YAML = """
+intents:
+  view-requirement:
+    type: single-system
+    description: 需求查看
+    system: browser
+    parameters:
+      url:
+        type: string
+        description: 需求链接
+        required: true
+        pattern: "https?://[^\\\\s，。]+"
+      requirement_id:
+        type: string
+        description: 需求编号
+        required: false
+        pattern: "[A-Z]+-\\\\d+"
+  develop-feature:
+    type: single-system
+    description: 需求开发
+    system: ide
+    parameters:
+      requirement_text:
+        type: string
+        description: 需求文本
+        required: true
+"""
+
+
+@pytest.fixture
+def intents_path(tmp_path):
+    """写入测试用意图定义。"""
+    path = tmp_path / "intents.yaml"
+    path.write_text(INTENTS_YAML, encoding="utf-8")
+    return path
+
+
+def view_result(url: str, requirement_id: str | None = None) -> dict:
+    """构建需求查看意图的 LLM 结果。"""
+    parameters = {"url": url}
+    if requirement_id:
+        parameters["requirement_id"] = requirement_id
+    return {"intent_type": "view-requirement", "confidence": 0.95, "parameters": parameters}
+
+
+@pytest.mark.unit
+class TestIntentCache:
+    """意图缓存测试类。"""
+
+    def make_cache(self, **kwargs) -> IntentCache:
+        """创建带意图定义的缓存。"""
+        cache = IntentCache(**kwargs)
+        cache.set_definitions(
+            {
+                "view-requirement": IntentDefinition(
+                    name="view-requirement",
+                    type="single-system",
+                    description="需求查看",
+                    parameters={
+                        "url": IntentParameter("url", "string", "链接", pattern=r"https?://[^\s，。]+"),
+                    },
+                ),
+                "develop-feature": IntentDefinition(
+                    name="develop-feature",
+                    type="single-system",
+                    description="需求开发",
+                    parameters={"requirement_text": IntentParameter("requirement_text", "string", "需求")},
+                ),
+            }
+        )
+        return cache
+
+    def test_normalize_folds_whitespace_punctuation_case(self):
+        """测试归一化忽略空白、标点、大小写和全角字符。"""
+        cache = self.make_cache()
+
+        assert cache.normalize("  开发 登录功能！") == cache.normalize("开发登录功能")
+        assert cache.normalize("ＡＢＣ，开发") == cache.normalize("abc 开发")
+
+    def test_normalize_templates_parameter_spans(self):
+        """测试 URL 和编号被模板化。"""
+        cache = self.make_cache()
+
+        assert cache.normalize("查看 https://a.com/1 需求") == "查看<url>需求"
+        assert cache.normalize("查看 https://b.com/2，需求") == "查看<url>需求"
+        assert cache.normalize("打开 PROJ-12") == cache.normalize("打开 ABC-3") == "打开<id>"
+
+    def test_hit_reextracts_pattern_parameters(self):
+        """测试命中后用 pattern 从新消息中重新提取参数。"""
+        cache = self.make_cache()
+        intent = Intent("view-requirement", {"url": "https://a.com/1"}, 0.95, "查看 https://a.com/1 需求")
+        assert cache.put(intent)
+
+        hit = cache.get("查看 https://b.com/2。需求")
+
+        assert hit is not None
+        assert hit.parameters == {"url": "https://b.com/2"}
+        assert hit.raw_message == "查看 https://b.com/2。需求"
+
+    def test_free_text_depending_on_template_not_cached(self):
+        """测试自由文本参数包含被模板化片段时不缓存。"""
+        cache = self.make_cache()
+        intent = Intent(
+            "develop-feature",
+            {"requirement_text": "实现 PROJ-1 的登录"},
+            0.95,
+            "开发 实现 PROJ-1 的登录",
+        )
+
+        assert not cache.put(intent)
+        assert cache.get("开发 实现 PROJ-2 的登录") is None
+
+    def test_free_text_value_must_appear_in_new_message(self):
+        """测试键相同但原样出现的参数值不同（大小写、下划线）时不复用缓存结果。"""
+        cache = self.make_cache()
+        for message, value in (("开发 Readme.md", "Readme.md"), ("开发 test_main.py", "test_main.py")):
+            assert cache.put(Intent("develop-feature", {"requirement_text": value}, 0.95, message))
+
+        assert cache.normalize("开发 README.md") == cache.normalize("开发 Readme.md")
+        assert cache.get("开发 README.md") is None
+        assert cache.get("开发 testmain.py") is None
+        # 只有空白、标点不同时仍然命中
+        hit = cache.get("开发：test_main.py！")
+        assert hit is not None and hit.parameters == {"requirement_text": "test_main.py"}
+
+    def test_pattern_mismatch_with_llm_value_not_reextracted(self):
+        """测试 pattern 提取值与 LLM 结果不一致时不缓存该参数。"""
+        cache = self.make_cache()
+        intent = Intent("view-requirement", {"url": "https://a.com"}, 0.95, "查看 https://a.com/1")
+
+        assert not cache.put(intent)
+
+    def test_hit_rate_and_bounded_size(self):
+        """测试命中率统计和容量上限。"""
+        cache = self.make_cache(max_size=2)
+        for text in ("甲", "乙", "丙"):
+            cache.put(Intent("develop-feature", {"requirement_text": text}, 0.9, f"开发{text}"))
+
+        assert cache.get("开发丙") is not None
+        assert cache.get("开发丁") is None
+        stats = cache.get_stats()
+        assert stats["size"] == 2
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_ttl_expiry(self):
+        """测试过期条目不再命中。"""
+        cache = self.make_cache(ttl=0.0)
+        cache.put(Intent("develop-feature", {"requirement_text": "x"}, 0.9, "开发 x"))
+
+        assert cache.get("开发 x") is None
+
+
+@pytest.mark.unit
+class TestRecognizerCache:
+    """识别器缓存集成测试类。"""
+
+    def test_cache_hit_skips_llm(self, intents_path):
+        """测试相同句式的消息命中缓存，不再调用 LLM。"""
+        llm = FakeChatClient(view_result("https://a.com/1", "PROJ-1"))
+        recognizer = IntentRecognizer(str(intents_path), llm_client=llm)
+
+        first = recognizer.recognize("查看需求 PROJ-1 https://a.com/1")
+        second = recognizer.recognize("查看需求PROJ-22，https://b.com/22")
+
+        assert first.has_match and second.has_match
+        assert len(llm.calls) == 1
+        assert second.intent.parameters == {"url": "https://b.com/22", "requirement_id": "PROJ-22"}
+        assert recognizer.get_cache_stats()["hits"] == 1
+
+    def test_unmatched_results_not_cached(self, intents_path):
+        """测试未匹配的结果不缓存。"""
+        llm = FakeChatClient({"intent_type": "unknown", "confidence": 0.0})
+        recognizer = IntentRecognizer(str(intents_path), llm_client=llm)
+
+        recognizer.recognize("你好")
+        recognizer.recognize("你好")
+
+        assert len(llm.calls) == 2
+
+    def test_reload_invalidates_cache(self, intents_path):
+        """测试重新加载意图定义后缓存失效。"""
+        llm = FakeChatClient(view_result("https://a.com/1"))
+        recognizer = IntentRecognizer(str(intents_path), llm_client=llm)
+
+        recognizer.recognize("查看 https://a.com/1")
+        assert recognizer.reload_definitions()
+        recognizer.recognize("查看 https://a.com/1")
+
+        assert len(llm.calls) == 2
+
+    def test_cache_disabled(self, intents_path):
+        """测试 cache_size=0 时禁用缓存。"""
+        llm = FakeChatClient(view_result("https://a.com/1"))
+        recognizer = IntentRecognizer(str(intents_path), llm_client=llm, cache_size=0)
+
+        recognizer.recognize("查看 https://a.com/1")
+        recognizer.recognize("查看 https://a.com/1")
+
+        assert len(llm.calls) == 2
+        assert recognizer.get_cache_stats() is None
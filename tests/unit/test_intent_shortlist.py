@@ -0,0 +1,101 @@
+"""意图识别提示词候选意图筛选单元测试。"""
+
+import pytest
+
+from src.intent.recognizer import IntentRecognizer
+
+INTENTS_YAML = """
+intents:
+  view-requirement:
+    type: single-system
+    description: 需求查看
+    examples:
+      - 查看需求链接
+    parameters:
+      url:
+        type: string
+        description: 需求链接
+        required: true
+        examples:
+          - https://example.com/issue/1
+  run-tests:
+    type: single-system
+    description: 运行测试
+    examples:
+      - 运行单元测试
+  commit-code:
+    type: single-system
+    description: 提交代码
+    examples:
+      - 提交代码到仓库
+  deploy-app:
+    type: single-system
+    description: 部署应用
+    examples:
+      - 部署应用到服务器
+"""
+
+
+@pytest.fixture
+def intents_path(tmp_path):
+    """写入测试用意图定义。"""
+    path = tmp_path / "intents.yaml"
+    path.write_text(INTENTS_YAML, encoding="utf-8")
+    return path
+
+
+def intents_in_prompt(prompt: str) -> list[str]:
+    """提取提示词中列出的意图名称（按出现顺序）。"""
+    names = []
+    for line in prompt.splitlines():
+        head, sep, _ = line.partition(" - ")
+        if sep and head[:1].isdigit():
+            names.append(head.split(". ", 1)[1])
+    return names
+
+
+@pytest.mark.unit
+class TestIntentShortlist:
+    """候选意图筛选测试类。"""
+
+    def test_full_prompt_lists_all_intents(self, intents_path):
+        """测试 shortlist_size=0 时提示词包含全部意图且保持定义顺序。"""
+        recognizer = IntentRecognizer(str(intents_path), shortlist_size=0)
+
+        prompt = recognizer._build_intent_prompt("运行单元测试")
+
+        assert intents_in_prompt(prompt) == ["view-requirement", "run-tests", "commit-code", "deploy-app"]
+        assert "1. view-requirement - 需求查看\n   参数：\n" in prompt
+        assert "     示例: https://example.com/issue/1\n" in prompt
+        assert prompt.endswith("```\n")
+
+    def test_shortlist_limits_and_ranks_candidates(self, intents_path):
+        """测试只包含 top-k 候选意图，最相似的意图排第一。"""
+        recognizer = IntentRecognizer(str(intents_path), shortlist_size=2)
+
+        prompt = recognizer._build_intent_prompt("帮我运行一下单元测试")
+
+        names = intents_in_prompt(prompt)
+        assert len(names) == 2
+        assert names[0] == "run-tests"
+
+    def test_no_similarity_falls_back_to_all(self, intents_path):
+        """测试没有任何相似意图时提示词包含全部意图。"""
+        recognizer = IntentRecognizer(str(intents_path), shortlist_size=2)
+
+        assert len(intents_in_prompt(recognizer._build_intent_prompt("今天天气"))) == 4
+
+    def test_small_catalog_not_shortlisted(self, intents_path):
+        """测试意图数不超过 shortlist_size 时不筛选。"""
+        recognizer = IntentRecognizer(str(intents_path), shortlist_size=4)
+
+        assert recognizer._select_candidates("运行单元测试") == list(recognizer._intent_definitions)
+
+    def test_reload_rerenders_fragments(self, intents_path):
+        """测试重新加载意图定义后提示词片段同步更新。"""
+        recognizer = IntentRecognizer(str(intents_path), shortlist_size=0)
+        intents_path.write_text(INTENTS_YAML.replace("运行测试", "执行测试"), encoding="utf-8")
+
+        assert recognizer.reload_definitions()
+
+        assert "run-tests - 执行测试" in recognizer._build_intent_prompt("执行测试")
@@ -0,0 +1,103 @@
+"""共享 LLM 客户端服务单元测试。"""
+
+import threading
+import time
+
+import pytest
+
+from src.config.schema import APIConfig
+from src.llm.service import LLMService
+from tests.conftest import FakeChatClient
+
+
+@pytest.mark.unit
+class TestLLMService:
+    """LLM 服务测试类。"""
+
+    def test_chat_completions_facade(self):
+        """测试 chat.completions.create 门面并传递超时时间。"""
+        client = FakeChatClient("ok")
+        service = LLMService(api_key="test", timeout=12.0, client=client)
+
+        response = service.chat.completions.create(
+            model="glm-4-flash",
+            messages=[{"role": "user", "content": "hi"}],
+            temperature=0.1,
+        )
+
+        assert response.choices[0].message.content == "ok"
+        call = client.calls[0]
+        assert call["model"] == "glm-4-flash"
+        assert call["temperature"] == 0.1
+        assert 11.0 < call["timeout"] <= 12.0
+
+    def test_per_call_timeout(self):
+        """测试单次调用覆盖超时时间。"""
+        client = FakeChatClient("ok")
+        service = LLMService(api_key="test", timeout=30.0, client=client)
+
+        service.chat.completions.create(model="m", messages=[], timeout=2.0)
+
+        assert client.calls[0]["timeout"] <= 2.0
+
+    def test_max_in_flight_per_model(self):
+        """测试每个模型的并发限制。"""
+        client = FakeChatClient("ok", delay=0.05)
+        service = LLMService(api_key="test", max_in_flight=2, client=client)
+
+        threads = [
+            threading.Thread(
+                target=service.chat.completions.create, kwargs={"model": "m", "messages": []}
+            )
+            for _ in range(6)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert client.peak == 2
+        stats = service.get_stats()["m"]
+        assert stats["requests"] == 6
+        assert stats["peak_in_flight"] == 2
+
+    def test_queue_wait_counts_against_timeout(self):
+        """测试排队等待超过超时时间时抛出 TimeoutError。"""
+        client = FakeChatClient("ok", delay=0.3)
+        service = LLMService(api_key="test", max_in_flight=1, client=client)
+
+        worker = threading.Thread(
+            target=service.chat.completions.create, kwargs={"model": "m", "messages": []}
+        )
+        worker.start()
+        time.sleep(0.05)
+
+        with pytest.raises(TimeoutError):
+            service.chat.completions.create(model="m", messages=[], timeout=0.05)
+        worker.join()
+
+    def test_errors_counted(self):
+        """测试调用失败时统计错误并释放并发槽。"""
+        client = FakeChatClient(errors=[RuntimeError("boom")] * 2)
+        service = LLMService(api_key="test", max_in_flight=1, client=client)
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                service.chat.completions.create(model="m", messages=[])
+
+        assert service.get_stats()["m"]["errors"] == 2
+
+    def test_from_config(self):
+        """测试从 API 配置创建服务。"""
+        config = APIConfig(
+            zhipuai_api_key="test-key",
+            timeout=15,
+            base_url="http://127.0.0.1:9/v4",
+            max_connections=3,
+            max_in_flight=2,
+        )
+        service = LLMService.from_config(config)
+
+        assert service.timeout == 15.0
+        assert service.max_in_flight == 2
+        service.close()
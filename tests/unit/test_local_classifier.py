@@ -0,0 +1,239 @@
+"""本地意图快速分类器单元测试。"""
+
+from pathlib import Path
+
+import pytest
+
+from src.intent.local_classifier import LocalIntentClassifier
+from src.intent.models import IntentDefinition, IntentParameter
+from src.intent.recognizer import IntentRecognizer
+from tests.conftest import FakeChatClient
+
+SHIPPED_INTENTS = Path(__file__).resolve().parents[2] / "config" / "intent_definitions.yaml"
+
+INTENTS_YAML = """
+intents:
+  view-requirement:
+    type: single-system
+    description: 需求查看
+    examples:
+      - 查看需求 https://example.com/issue/1
+      - 打开需求链接
+    parameters:
+      url:
+        type: string
+        description: 需求链接
+        required: true
+        pattern: "https?://[A-Za-z0-9./_-]+"
+  run-tests:
+    type: single-system
+    description: 运行测试
+    examples:
+      - 运行单元测试
+      - 跑一下测试
+    parameters:
+      test_type:
+        type: string
+        description: 测试类型
+        required: false
+        pattern: "unit|integration|e2e"
+  develop-feature:
+    type: single-system
+    description: 需求开发
+    examples:
+      - 开发一个新功能
+    parameters:
+      requirement_text:
+        type: string
+        description: 需求文本
+        required: true
+"""
+
+
+@pytest.fixture
+def intents_path(tmp_path):
+    """写入测试用意图定义。"""
+    path = tmp_path / "intents.yaml"
+    path.write_text(INTENTS_YAML, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def definitions(intents_path):
+    """加载测试用意图定义。"""
+    return IntentRecognizer(intents_path, cache_size=0)._intent_definitions
+
+
+@pytest.mark.unit
+class TestLocalIntentClassifier:
+    """本地分类器测试类。"""
+
+    def test_examples_loaded(self, definitions):
+        """测试加载意图级示例语句。"""
+        assert definitions["run-tests"].examples == ["运行单元测试", "跑一下测试"]
+
+    def test_accepts_close_match_and_extracts_pattern(self, definitions):
+        """测试高相似度消息通过门限，并用 pattern 提取参数。"""
+        classifier = LocalIntentClassifier(threshold=0.6, margin=0.1)
+        classifier.fit(definitions)
+
+        match = classifier.classify("查看需求 https://jira.example.com/browse/PROJ-9")
+
+        assert match.accepted
+        assert match.intent_type == "view-requirement"
+        assert match.parameters == {"url": "https://jira.example.com/browse/PROJ-9"}
+        # 参数值被去掉后再计算相似度
+        assert match.score == pytest.approx(1.0)
+
+    def test_free_text_required_parameter_escalates(self, definitions):
+        """测试必需参数没有 pattern 时总是交给 LLM。"""
+        classifier = LocalIntentClassifier(threshold=0.1, margin=0.0)
+        classifier.fit(definitions)
+
+        match = classifier.classify("开发一个新功能")
+
+        assert match.intent_type == "develop-feature"
+        assert match.missing == ["requirement_text"]
+        assert not match.accepted
+
+    def test_unrelated_message_escalates(self, definitions):
+        """测试无关消息不通过门限。"""
+        classifier = LocalIntentClassifier(threshold=0.6, margin=0.1)
+        classifier.fit(definitions)
+
+        match = classifier.classify("今天天气怎么样")
+
+        assert not match.accepted
+        assert classifier.get_stats()["escalated"] == 1
+
+    def test_margin_gate(self):
+        """测试两个意图得分接近时不通过门限。"""
+        definitions = {
+            name: IntentDefinition(name=name, type="single-system", description="运行测试", examples=["运行测试"])
+            for name in ("a", "b")
+        }
+        classifier = LocalIntentClassifier(threshold=0.5, margin=0.1)
+        classifier.fit(definitions)
+
+        match = classifier.classify("运行测试")
+
+        assert match.score == pytest.approx(1.0)
+        assert match.margin == pytest.approx(0.0)
+        assert not match.accepted
+
+    def test_to_intent_confidence_mapping(self, definitions):
+        """测试通过门限的结果置信度映射到有效区间。"""
+        classifier = LocalIntentClassifier(threshold=0.6, margin=0.1)
+        classifier.fit(definitions)
+
+        match = classifier.classify("跑一下测试")
+        intent = classifier.to_intent(match, "跑一下测试")
+
+        assert match.accepted
+        assert intent.type == "run-tests"
+        assert intent.is_valid()
+        assert 0.85 <= intent.confidence <= 1.0
+
+    def test_pattern_only_intent_parameter_optional(self):
+        """测试可选参数缺失不影响本地作答。"""
+        definitions = {
+            "deploy": IntentDefinition(
+                name="deploy",
+                type="single-system",
+                description="部署应用",
+                examples=["部署应用"],
+                parameters={"branch": IntentParameter("branch", "string", "分支", required=False, pattern=r"\w+/\w+")},
+            )
+        }
+        classifier = LocalIntentClassifier(threshold=0.6, margin=0.1)
+        classifier.fit(definitions)
+
+        match = classifier.classify("部署应用")
+
+        assert match.accepted
+        assert match.parameters == {}
+
+    def test_parameter_without_pattern_escalates(self):
+        """测试可选参数没有 pattern 时交给 LLM（本地作答会丢掉该参数）。"""
+        definitions = {
+            "review": IntentDefinition(
+                name="review",
+                type="single-system",
+                description="代码审查",
+                examples=["帮我做代码审查"],
+                parameters={"scope": IntentParameter("scope", "string", "审查范围", required=False)},
+            )
+        }
+        classifier = LocalIntentClassifier(threshold=0.6, margin=0.1)
+        classifier.fit(definitions)
+
+        match = classifier.classify("帮我做代码审查")
+
+        assert match.intent_type == "review"
+        assert match.score == pytest.approx(1.0)
+        assert match.missing == ["scope"]
+        assert not match.accepted
+
+
+@pytest.mark.unit
+class TestRecognizerLocalStage:
+    """识别器本地快速分类集成测试类。"""
+
+    def test_local_answer_skips_llm(self, intents_path):
+        """测试本地高置信度结果不调用 LLM。"""
+        llm = FakeChatClient({"intent_type": "run-tests", "confidence": 0.9})
+        recognizer = IntentRecognizer(intents_path, llm_client=llm, local_threshold=0.6)
+
+        result = recognizer.recognize("运行单元测试")
+
+        assert result.has_match
+        assert result.intent.type == "run-tests"
+        assert len(llm.calls) == 0
+
+    def test_low_confidence_escalates_to_llm(self, intents_path):
+        """测试本地不确定时交给 LLM。"""
+        llm = FakeChatClient({"intent_type": "develop-feature", "confidence": 0.9, "parameters": {"requirement_text": "x"}})
+        recognizer = IntentRecognizer(intents_path, llm_client=llm, local_threshold=0.6)
+
+        result = recognizer.recognize("开发一个新功能：x")
+
+        assert result.intent.type == "develop-feature"
+        assert len(llm.calls) == 1
+
+    def test_local_answer_without_llm_client(self, intents_path):
+        """测试未配置 LLM 客户端时本地结果仍可用。"""
+        recognizer = IntentRecognizer(intents_path, local_threshold=0.6)
+
+        assert recognizer.recognize("跑一下测试").has_match
+        assert not recognizer.recognize("开发一个新功能").has_match
+
+    def test_disabled_by_default(self, intents_path):
+        """测试默认不启用本地分类。"""
+        llm = FakeChatClient({"intent_type": "run-tests", "confidence": 0.9})
+        recognizer = IntentRecognizer(intents_path, llm_client=llm, cache_size=0)
+
+        recognizer.recognize("运行单元测试")
+
+        assert recognizer.local_classifier is None
+        assert len(llm.calls) == 1
+
+    @pytest.mark.parametrize(
+        "message, intent_type, parameters",
+        [
+            ("跑一下单元测试并生成覆盖率报告", "test_code", {"test_type": "unit", "generate_report": True}),
+            ("执行集成测试", "test_code", {"test_type": "integration"}),
+            ("帮我做代码审查 all", "review_code", {"scope": "all"}),
+        ],
+    )
+    def test_shipped_definitions_keep_llm_parameters(self, message, intent_type, parameters):
+        """测试内置意图的参数没有 pattern 时由 LLM 提取，不被本地结果丢掉。"""
+        llm = FakeChatClient({"intent_type": intent_type, "confidence": 0.95, "parameters": parameters})
+        recognizer = IntentRecognizer(str(SHIPPED_INTENTS), llm_client=llm, local_threshold=0.6, cache_size=0)
+
+        result = recognizer.recognize(message)
+
+        assert len(llm.calls) == 1
+        assert result.intent.type == intent_type
+        assert result.intent.parameters == parameters
+        # 本地相似度仍用于筛选候选意图
+        assert recognizer.local_classifier.classify(message).intent_type == intent_type
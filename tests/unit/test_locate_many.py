@@ -0,0 +1,172 @@
+"""批量定位和工作流预取单元测试。"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image, ImageDraw
+
+from src.locator.visual_locator import VisualLocator
+from src.workflow.executor import WorkflowExecutor
+from src.workflow.models import WorkflowConfig, WorkflowStep
+from tests.conftest import FakeChatClient, request_text
+
+
+def element(name: str, y: int) -> dict:
+    """构建视觉 API 返回的元素。"""
+    return {"element_type": "text_field", "description": name, "bbox": [100, y, 300, y + 20], "confidence": 0.9}
+
+
+def vision_llm(batch_content: str, single_content: str = "[]") -> FakeChatClient:
+    """批量请求返回 batch_content，单目标请求返回 single_content 的假视觉客户端。"""
+    return FakeChatClient(lambda request: batch_content if "分别找到" in request_text(request) else single_content)
+
+
+def make_frame() -> Image.Image:
+    """生成测试截图。"""
+    image = Image.new("RGB", (400, 300), "white")
+    ImageDraw.Draw(image).rectangle((100, 40, 300, 60), outline="black")
+    return image
+
+
+@pytest.mark.unit
+class TestLocateMany:
+    """批量定位测试类。"""
+
+    def test_single_request_for_all_targets(self):
+        """测试多个目标只发送一次视觉请求，结果按目标返回，并与 locate 共用缓存。"""
+        content = json.dumps(
+            {"1": [element("用户名", 40)], "2": [element("密码", 80)], "3": [element("a.py", 120), element("main.py", 140)]},
+            ensure_ascii=False,
+        )
+        llm = vision_llm(content)
+        locator = VisualLocator(api_key="test", llm_client=llm)
+        frame = make_frame()
+
+        results = locator.locate_many(
+            frame, ["找到用户名输入框", "找到密码输入框", ("找到文件 main.py", "main.py")]
+        )
+
+        assert len(llm.prompts) == 1
+        assert [[e.description for e in result] for result in results] == [["用户名"], ["密码"], ["main.py"]]
+        # 同一帧的单独定位命中缓存
+        assert locator.locate("找到密码输入框", screenshot=frame, use_ocr_fallback=False)[0].description == "密码"
+        assert len(llm.prompts) == 1
+
+    def test_missing_target_falls_back(self):
+        """测试某个目标的结果缺失时单独定位该目标。"""
+        llm = vision_llm(json.dumps({"1": [element("用户名", 40)]}), json.dumps([element("密码", 80)]))
+        locator = VisualLocator(api_key="test", llm_client=llm)
+
+        results = locator.locate_many(make_frame(), ["找到用户名输入框", "找到密码输入框"])
+
+        assert [result[0].description for result in results] == ["用户名", "密码"]
+        assert len(llm.prompts) == 2
+        assert "找到密码输入框" in llm.prompts[1]
+
+    def test_unparseable_response_falls_back(self):
+        """测试批量响应无法解析时逐个定位。"""
+        llm = vision_llm("抱歉，我无法识别", json.dumps([element("按钮", 10)]))
+        locator = VisualLocator(api_key="test", llm_client=llm)
+
+        results = locator.locate_many(make_frame(), ["找到确定按钮", "找到取消按钮"])
+
+        assert [len(result) for result in results] == [1, 1]
+        assert len(llm.prompts) == 3
+
+    def test_list_format_and_empty_target(self):
+        """测试按 target/elements 列表返回的格式，空数组表示未找到（不重试）。"""
+        content = json.dumps([{"target": 1, "elements": [element("用户名", 40)]}, {"target": 2, "elements": []}])
+        llm = vision_llm(content)
+        locator = VisualLocator(api_key="test", llm_client=llm)
+
+        results = locator.locate_many(make_frame(), ["找到用户名输入框", "找到验证码输入框"])
+
+        assert [len(result) for result in results] == [1, 0]
+        assert len(llm.prompts) == 1
+
+
+@pytest.mark.unit
+class TestPrefetch:
+    """预取测试类。"""
+
+    def make_locator(self) -> tuple[VisualLocator, FakeChatClient]:
+        content = json.dumps({"1": [element("用户名", 40)], "2": [element("密码", 200)]}, ensure_ascii=False)
+        llm = vision_llm(content, json.dumps([element("重新定位", 10)], ensure_ascii=False))
+        return VisualLocator(api_key="test", llm_client=llm), llm
+
+    def test_prefetched_used_when_screen_unchanged_at_target(self):
+        """测试其他区域变化（如在另一个输入框中输入）时仍使用预取结果。"""
+        locator, llm = self.make_locator()
+        frame = make_frame()
+        assert locator.prefetch(frame, ["找到用户名输入框", "找到密码输入框"]) == 2
+
+        # 在用户名输入框中输入文字，密码输入框区域不变
+        typed = frame.copy()
+        ImageDraw.Draw(typed).rectangle((110, 42, 200, 58), fill="black")
+        found = locator.locate("找到密码输入框", screenshot=typed, use_cache=False, use_ocr_fallback=False)
+
+        assert found[0].description == "密码"
+        assert len(llm.prompts) == 1
+        assert locator.get_prefetch_stats()["hits"] == 1
+
+    def test_prefetched_discarded_when_target_region_changed(self):
+        """测试目标区域发生变化时丢弃预取结果，重新定位。"""
+        locator, llm = self.make_locator()
+        frame = make_frame()
+        locator.prefetch(frame, ["找到用户名输入框", "找到密码输入框"])
+
+        changed = frame.copy()
+        ImageDraw.Draw(changed).rectangle((90, 190, 320, 230), fill="blue")
+        found = locator.locate("找到密码输入框", screenshot=changed, use_cache=False, use_ocr_fallback=False)
+
+        assert found[0].description == "重新定位"
+        assert len(llm.prompts) == 2
+        assert locator.get_prefetch_stats()["stale"] == 1
+
+    def test_prefetched_used_once(self):
+        """测试预取结果只使用一次。"""
+        locator, llm = self.make_locator()
+        frame = make_frame()
+        locator.prefetch(frame, ["找到用户名输入框", "找到密码输入框"])
+
+        locator.locate("找到用户名输入框", screenshot=frame, use_cache=False, use_ocr_fallback=False)
+        locator.locate("找到用户名输入框", screenshot=frame, use_cache=False, use_ocr_fallback=False)
+
+        assert len(llm.prompts) == 2
+
+
+@pytest.mark.unit
+class TestWorkflowPrefetch:
+    """工作流预取测试类。"""
+
+    def test_prefetch_per_window(self):
+        """测试工作流按窗口批量预取后续步骤的视觉目标。"""
+        controller = MagicMock()
+        controller.execute_command.return_value = SimpleNamespace(status=SimpleNamespace(value="success"), error=None)
+        controller.prefetch_targets.return_value = 2
+        steps = [
+            WorkflowStep(description=f"步骤 {i}", operation="open_file", parameters={"filename": f"{i}.py"})
+            for i in range(5)
+        ]
+
+        result = WorkflowExecutor(controller, prefetch_window=3).execute(WorkflowConfig(name="test", steps=steps))
+
+        assert result.success
+        calls = controller.prefetch_targets.call_args_list
+        assert len(calls) == 2
+        assert [params["filename"] for _, params in calls[0].args[0]] == ["0.py", "1.py", "2.py"]
+        assert [params["filename"] for _, params in calls[1].args[0]] == ["3.py", "4.py"]
+
+    def test_prefetch_failure_does_not_fail_workflow(self):
+        """测试预取失败时工作流照常逐步执行。"""
+        controller = MagicMock()
+        controller.execute_command.return_value = SimpleNamespace(status=SimpleNamespace(value="success"), error=None)
+        controller.prefetch_targets.side_effect = RuntimeError("网络错误")
+        steps = [WorkflowStep(description="a", operation="open_file"), WorkflowStep(description="b", operation="save")]
+
+        result = WorkflowExecutor(controller).execute(WorkflowConfig(name="test", steps=steps))
+
+        assert result.success
+        assert controller.execute_command.call_count == 2
@@ -0,0 +1,204 @@
+"""定位失败结果缓存与脏区域检测单元测试。"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from PIL import Image, ImageDraw
+
+from src.locator.frames import DirtyRegionDetector
+from src.locator.negative_cache import NegativeCache
+from src.locator.visual_locator import VisualLocator
+from src.workflow.executor import WorkflowExecutor
+from src.workflow.models import WorkflowConfig, WorkflowStep
+from tests.conftest import FakeChatClient
+
+
+def make_frame() -> Image.Image:
+    """生成 1920x1080 的 IDE 风格截图。"""
+    image = Image.new("RGB", (1920, 1080), (43, 43, 43))
+    draw = ImageDraw.Draw(image)
+    for row in range(20, 1060, 24):
+        draw.text((20, row), f"line {row}: def handler(request): return process(request)", fill=(200, 200, 200))
+    return image
+
+
+def with_caret(frame: Image.Image) -> Image.Image:
+    """在截图中画一个闪烁的文本光标（2x18 像素）。"""
+    image = frame.copy()
+    ImageDraw.Draw(image).rectangle((600, 300, 601, 317), fill=(255, 255, 255))
+    return image
+
+
+def with_dialog(frame: Image.Image) -> Image.Image:
+    """在截图中弹出一个对话框。"""
+    image = frame.copy()
+    ImageDraw.Draw(image).rectangle((400, 200, 880, 480), fill=(240, 240, 240))
+    return image
+
+
+@pytest.mark.unit
+class TestDirtyRegionDetector:
+    """脏区域检测测试类。"""
+
+    def test_unchanged_frame_is_clean(self):
+        """测试相同截图没有脏区域。"""
+        frame = make_frame()
+        assert DirtyRegionDetector(frame).detect(frame.copy()) == []
+
+    def test_dialog_reported_as_region(self):
+        """测试弹出对话框时返回覆盖对话框的脏区域。"""
+        frame = make_frame()
+        regions = DirtyRegionDetector(frame).detect(with_dialog(frame))
+
+        assert len(regions) == 1
+        x1, y1, x2, y2 = regions[0]
+        assert x1 <= 400 and y1 <= 200 and x2 >= 880 and y2 >= 480
+        assert x2 - x1 < 600
+
+    def test_small_changes_ignored(self):
+        """测试光标闪烁等很小的变化不算脏区域，图标大小的变化仍能检测到。"""
+        frame = make_frame()
+        detector = DirtyRegionDetector(frame)
+        assert not detector.changed(with_caret(frame))
+        assert DirtyRegionDetector(frame, min_pixels=1).changed(with_caret(frame))
+
+        icon = frame.copy()
+        ImageDraw.Draw(icon).rectangle((900, 500, 923, 523), fill=(89, 160, 89))
+        assert detector.changed(icon)
+
+    def test_size_change_marks_whole_frame(self):
+        """测试截图尺寸变化时整帧视为脏区域。"""
+        detector = DirtyRegionDetector(make_frame())
+        assert detector.detect(Image.new("RGB", (800, 600))) == [(0, 0, 800, 600)]
+
+
+@pytest.mark.unit
+class TestNegativeCache:
+    """定位失败结果缓存测试类。"""
+
+    def test_hit_until_screen_changes(self):
+        """测试屏幕未变化时命中，变化后失效。"""
+        cache = NegativeCache()
+        frame = make_frame()
+        cache.record("找到运行按钮", frame, cost=2.5)
+
+        assert cache.check("找到运行按钮", frame.copy())
+        assert not cache.check("找到调试按钮", frame)
+        assert not cache.check("找到运行按钮", with_dialog(frame))
+        assert not cache.check("找到运行按钮", frame)
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["invalidated"] == 1
+        assert stats["saved_seconds"] == pytest.approx(2.5)
+
+    def test_small_label_on_large_frame_invalidates(self):
+        """测试大屏幕上新出现一个小文件名（目标出现）时记录失效，光标闪烁也算变化。"""
+        frame = Image.new("RGB", (2560, 1440), (30, 31, 34))
+        label = frame.copy()
+        ImageDraw.Draw(label).text((300, 400), "main.py", fill=(187, 187, 187))
+        # 原先的 160x90 缩略图上检测不到这个变化
+        assert not DirtyRegionDetector(frame).changed(label)
+
+        cache = NegativeCache()
+        cache.record("main.py", frame, cost=1.0)
+        assert not cache.check("main.py", label)
+
+        cache.record("main.py", frame, cost=1.0)
+        assert not cache.check("main.py", with_caret(frame))
+
+    def test_expired_entry(self, monkeypatch):
+        """测试记录过期后重新定位。"""
+        clock = [100.0]
+        monkeypatch.setattr("src.locator.negative_cache.time.monotonic", lambda: clock[0])
+        cache = NegativeCache(ttl=10)
+        frame = make_frame()
+        cache.record("目标", frame, cost=1.0)
+
+        clock[0] += 11
+        assert not cache.check("目标", frame)
+        assert cache.get_stats()["size"] == 0
+
+    def test_scopes_keyed_by_frame_size(self):
+        """测试窗口截图与整屏截图的失败记录互不覆盖。"""
+        cache = NegativeCache()
+        window, screen = make_frame(), Image.new("RGB", (3840, 1080))
+        cache.record("目标", window, cost=1.0)
+        cache.record("目标", screen, cost=1.0)
+
+        assert cache.check("目标", window)
+        assert cache.check("目标", screen)
+
+    def test_disabled(self):
+        """测试有效期为 0 时不记录。"""
+        cache = NegativeCache(ttl=0)
+        cache.record("目标", make_frame(), cost=1.0)
+        assert cache.get_stats()["size"] == 0
+
+
+@pytest.mark.unit
+class TestLocatorNegativeCache:
+    """定位器快速失败测试类。"""
+
+    def test_repeated_miss_skips_vision(self):
+        """测试屏幕未变化时不重复调用视觉 API，屏幕变化后重新定位。"""
+        llm = FakeChatClient()
+        locator = VisualLocator(api_key="test", llm_client=llm)
+        frame = make_frame()
+
+        assert locator.locate("找到运行按钮", frame) == []
+        assert locator.locate("找到运行按钮", frame.copy()) == []
+        assert len(llm.calls) == 1
+
+        assert locator.locate("找到运行按钮", with_dialog(frame)) == []
+        assert len(llm.calls) == 2
+        assert locator.get_negative_stats()["hits"] == 1
+
+    def test_found_or_uncached_not_recorded(self):
+        """测试找到目标或不使用缓存时不记录失败。"""
+        item = {"element_type": "button", "description": "运行", "bbox": [1, 1, 20, 20], "confidence": 0.9}
+        locator = VisualLocator(api_key="test", llm_client=FakeChatClient([item]))
+        locator.locate("找到运行按钮", make_frame())
+
+        empty = FakeChatClient()
+        uncached = VisualLocator(api_key="test", llm_client=empty)
+        uncached.locate("找到运行按钮", make_frame(), use_cache=False)
+        uncached.locate("找到运行按钮", make_frame(), use_cache=False)
+
+        assert locator.get_negative_stats()["recorded"] == 0
+        assert len(empty.calls) == 2
+
+    def test_vision_error_not_recorded(self):
+        """测试视觉 API 出错时不记录为未找到。"""
+        llm = FakeChatClient()
+        llm.chat.completions.create = Mock(side_effect=RuntimeError("网络错误"))
+        locator = VisualLocator(api_key="test", llm_client=llm)
+
+        with pytest.raises(RuntimeError):
+            locator.locate("找到运行按钮", make_frame())
+        assert locator.get_negative_stats()["recorded"] == 0
+
+
+@pytest.mark.unit
+class TestWorkflowSavedSeconds:
+    """工作流步骤节省时间统计测试类。"""
+
+    def test_failed_step_reports_saved_seconds(self):
+        """测试失败步骤的结果中包含节省的定位时间。"""
+        saved = [0.0]
+
+        def execute_command(*args, **kwargs):
+            saved[0] += 1.5
+            return SimpleNamespace(status=Mock(value="error"), error="未找到目标", message="")
+
+        controller = MagicMock()
+        controller.execute_command.side_effect = execute_command
+        controller.locator.get_negative_stats.side_effect = lambda: {"saved_seconds": saved[0]}
+        config = WorkflowConfig(
+            name="测试", steps=[WorkflowStep(description="点击运行", retry_count=2, retry_interval=0)]
+        )
+
+        result = WorkflowExecutor(controller).execute(config)
+
+        assert result.step_results[0].saved_seconds == pytest.approx(4.5)
@@ -0,0 +1,169 @@
+"""操作搜索区域单元测试。"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image
+
+from src.config.config_manager import OperationConfigModel
+from src.config.schema import OperationConfig, RegionConfig
+from src.controller.ide_controller import IDEController
+from src.locator.regions import RegionResolver, anchored_box, fraction_box, to_frame_elements
+from src.models.element import UIElement
+from src.models.result import ExecutionStatus
+
+
+def element(bbox, confidence: float = 0.9) -> UIElement:
+    """构建元素。"""
+    return UIElement(element_type="button", description="目标", bbox=bbox, confidence=confidence)
+
+
+class FakeMatcher:
+    """在截图中查找纯红像素块的假模板匹配器（记录每次匹配的图像尺寸）。"""
+
+    default_confidence = 0.8
+
+    def __init__(self) -> None:
+        self.sizes: list[tuple[int, int]] = []
+
+    def match(self, screenshot, template_name, threshold=None):
+        self.sizes.append(screenshot.size)
+        pixels = screenshot.convert("RGB").load()
+        width, height = screenshot.size
+        hits = [(x, y) for y in range(0, height, 2) for x in range(0, width, 2) if pixels[x, y] == (255, 0, 0)]
+        if not hits:
+            return []
+        xs, ys = [x for x, _ in hits], [y for _, y in hits]
+        return [element((min(xs), min(ys), max(xs) + 2, max(ys) + 2), 0.95)]
+
+
+def operation(region: RegionConfig | None, template: str | None = "run_button.png") -> OperationConfig:
+    """构建操作配置。"""
+    return OperationConfig(
+        name="click_run_button",
+        aliases=[],
+        intent="template_match",
+        description="点击运行按钮",
+        template=template,
+        region=region,
+    )
+
+
+def make_controller(frame: Image.Image, matcher=None) -> IDEController:
+    """构建只包含定位相关组件的控制器。"""
+    controller = IDEController.__new__(IDEController)
+    controller.screenshot = MagicMock()
+    controller.screenshot.get_monitors.return_value = [{"left": 0, "top": 0, "width": frame.width, "height": frame.height}]
+    controller.screenshot.capture_fullscreen.return_value = frame
+    controller.screenshot.capture_region.side_effect = lambda x, y, w, h: frame.crop((x, y, x + w, y + h))
+    controller.template_matcher = matcher
+    controller._regions = RegionResolver(matcher)
+    controller._capture_scope = "screen"
+    controller.locator = MagicMock()
+    controller._action_compiler = MagicMock()
+    controller.executor = MagicMock()
+    controller.executor.run_program.return_value = True
+    return controller
+
+
+@pytest.mark.unit
+class TestRegionBoxes:
+    """区域换算测试类。"""
+
+    def test_fraction_box(self):
+        """测试比例区域换算并裁剪到截图范围内。"""
+        assert fraction_box(RegionConfig(x=0.5, y=0.0, width=0.5, height=0.1), (1920, 1080)) == (960, 0, 1920, 108)
+        assert fraction_box(RegionConfig(x=0.9, y=0.9, width=0.5, height=0.5), (100, 100)) == (90, 90, 100, 100)
+
+    def test_anchored_box(self):
+        """测试锚点区域相对于锚点左上角偏移（可为负）。"""
+        region = RegionConfig(x=0, y=-400, width=1200, height=420, anchor="terminal.png")
+        assert anchored_box(region, (20, 900, 60, 920), (1920, 1080)) == (20, 500, 1220, 920)
+
+    def test_to_frame_elements(self):
+        """测试区域坐标换算为截图坐标。"""
+        assert [e.bbox for e in to_frame_elements([element((1, 2, 3, 4))], (100, 200))] == [(101, 202, 103, 204)]
+
+    def test_region_parsed_from_yaml_model(self):
+        """测试操作配置中的 region 字段。"""
+        model = OperationConfigModel(
+            name="op", aliases=[], intent="navigation", description="", actions=[],
+            region={"anchor": "tab.png", "x": -10, "y": 5, "width": 300, "height": 40},
+        )
+        assert model.to_operation_config().region == RegionConfig(x=-10, y=5, width=300, height=40, anchor="tab.png")
+        assert OperationConfigModel(name="op", aliases=[], intent="i", description="", actions=[]).to_operation_config().region is None
+
+
+@pytest.mark.unit
+class TestRegionResolver:
+    """锚点区域解析测试类。"""
+
+    def test_anchor_cached_and_rechecked_nearby(self):
+        """测试锚点第一次全图匹配，之后只在原位置附近复核。"""
+        frame = Image.new("RGB", (800, 600), "white")
+        frame.paste((255, 0, 0), (600, 500, 620, 510))
+        matcher = FakeMatcher()
+        resolver = RegionResolver(matcher)
+        region = RegionConfig(x=-100, y=-200, width=150, height=210, anchor="anchor.png")
+
+        assert resolver.resolve(region, frame) == (500, 300, 650, 510)
+        assert resolver.resolve(region, frame) == (500, 300, 650, 510)
+
+        assert matcher.sizes[0] == (800, 600)
+        assert max(matcher.sizes[1]) < 100
+        assert resolver.get_stats() == {"anchor_hits": 1, "anchor_searches": 1, "anchor_missing": 0}
+
+    def test_missing_anchor_searches_full_frame(self):
+        """测试未找到锚点时不限定区域。"""
+        resolver = RegionResolver(FakeMatcher())
+        region = RegionConfig(width=100, height=100, anchor="anchor.png")
+
+        assert resolver.resolve(region, Image.new("RGB", (200, 200), "white")) is None
+        assert RegionResolver(None).resolve(region, Image.new("RGB", (200, 200))) is None
+
+
+@pytest.mark.unit
+class TestOperationRegion:
+    """操作按区域定位测试类。"""
+
+    def test_fraction_region_captures_only_region(self):
+        """测试比例区域只截取该区域，结果换算为屏幕坐标。"""
+        frame = Image.new("RGB", (1000, 500), "white")
+        frame.paste((255, 0, 0), (900, 20, 920, 40))
+        matcher = FakeMatcher()
+        controller = make_controller(frame, matcher)
+
+        result = controller._execute_operation(operation(RegionConfig(x=0.5, y=0.0, width=0.5, height=0.2)), {})
+
+        assert result.status == ExecutionStatus.SUCCESS
+        assert matcher.sizes == [(500, 100)]
+        controller.screenshot.capture_fullscreen.assert_not_called()
+        elements = controller.executor.run_program.call_args[0][2]
+        assert elements["0"].bbox == (900, 20, 920, 40)
+
+    def test_region_miss_falls_back_to_full_frame(self):
+        """测试区域内未找到目标时搜索整张截图。"""
+        frame = Image.new("RGB", (1000, 500), "white")
+        frame.paste((255, 0, 0), (100, 400, 120, 420))
+        matcher = FakeMatcher()
+        controller = make_controller(frame, matcher)
+        controller.locator.locate.return_value = []
+
+        result = controller._execute_operation(operation(RegionConfig(x=0.5, y=0.0, width=0.5, height=0.2)), {})
+
+        assert result.status == ExecutionStatus.SUCCESS
+        assert matcher.sizes == [(500, 100), (1000, 500)]
+        assert controller.executor.run_program.call_args[0][2]["0"].bbox == (100, 400, 120, 420)
+
+    def test_vision_locate_gets_region_image(self):
+        """测试视觉定位只上传区域截图。"""
+        frame = Image.new("RGB", (1000, 500), "white")
+        controller = make_controller(frame)
+        controller.locator.locate.return_value = [element((10, 10, 30, 30))]
+        op_config = operation(RegionConfig(x=0.0, y=0.1, width=0.25, height=0.8), template=None)
+        op_config.visual_prompt = "找到项目树"
+
+        controller._execute_operation(op_config, {})
+
+        assert controller.locator.locate.call_args[0][1].size == (250, 400)
+        assert controller.executor.run_program.call_args[0][2]["0"].bbox == (10, 60, 30, 80)
@@ -0,0 +1,299 @@
+"""模型调用限流、退避重试和熔断单元测试。"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from PIL import Image
+
+from src.config.schema import APIConfig
+from src.llm.async_service import AsyncLLMService
+from src.llm.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMResilience,
+    RetryPolicy,
+    TokenBucket,
+)
+from src.llm.service import LLMService
+from src.locator.visual_locator import VisualLocator
+from src.parser.command_parser import CommandParser
+from tests.conftest import FakeChatClient
+
+
+def status_error(status: int, headers: dict[str, str] | None = None) -> httpx.HTTPStatusError:
+    """构建指定状态码的 HTTP 错误。"""
+    request = httpx.Request("POST", "http://llm.test/chat/completions")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status}", request=request, response=response)
+
+
+def make_resilience(max_retries: int = 3, threshold: int = 3, recovery: float = 30.0) -> LLMResilience:
+    """构建退避很短的保护实例（测试用）。"""
+    return LLMResilience(
+        retry_policy=RetryPolicy(max_retries=max_retries, base_delay=0.01, max_delay=0.02),
+        breaker=CircuitBreaker(failure_threshold=threshold, recovery_timeout=recovery),
+    )
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """令牌桶限流测试类。"""
+
+    def test_burst_then_rate_limited(self):
+        """测试突发容量用完后按速率发放令牌。"""
+        bucket = TokenBucket(rate=20, capacity=2)
+
+        start = time.perf_counter()
+        for _ in range(4):
+            assert bucket.acquire()
+        elapsed = time.perf_counter() - start
+
+        # 2 个突发 + 2 个按 20/s 发放
+        assert elapsed >= 0.09
+        assert bucket.get_stats()["waited"] == 2
+
+    def test_reserve_respects_max_wait(self):
+        """测试需要等待超过 max_wait 时不预订令牌。"""
+        bucket = TokenBucket(rate=1, capacity=1)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve(max_wait=0.1) is None
+        assert bucket.get_stats()["waited"] == 0
+
+
+@pytest.mark.unit
+class TestRetryPolicy:
+    """退避重试策略测试类。"""
+
+    def test_retryable_errors(self):
+        """测试 429 / 5xx / 超时可重试，4xx 参数错误不重试。"""
+        assert RetryPolicy.is_retryable(status_error(429))
+        assert RetryPolicy.is_retryable(status_error(503))
+        assert RetryPolicy.is_retryable(httpx.ConnectTimeout("timeout"))
+        assert not RetryPolicy.is_retryable(status_error(400))
+        assert not RetryPolicy.is_retryable(ValueError("bad"))
+
+    def test_backoff_grows_and_is_capped(self):
+        """测试退避上限按次数翻倍且不超过 max_delay。"""
+        policy = RetryPolicy(base_delay=0.5, max_delay=2.0)
+
+        assert all(0 <= policy.delay(0) <= 0.5 for _ in range(20))
+        assert all(0 <= policy.delay(5) <= 2.0 for _ in range(20))
+
+    def test_retry_after_honored(self):
+        """测试遵循 Retry-After 响应头（不超过 max_delay）。"""
+        policy = RetryPolicy(base_delay=0.01, max_delay=5.0)
+
+        assert policy.delay(0, status_error(429, {"Retry-After": "3"})) >= 3.0
+        assert policy.delay(0, status_error(429, {"Retry-After": "60"})) == 5.0
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """熔断器测试类。"""
+
+    def test_open_half_open_closed(self):
+        """测试连续失败后熔断，冷却后放行一个探测请求，成功则恢复。"""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+
+        breaker.record_failure()
+        assert breaker.state == "closed"
+        breaker.record_failure()
+        assert breaker.is_open
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        time.sleep(0.06)
+        assert breaker.state == "half_open"
+        breaker.before_call()
+        # 探测进行中，其他调用仍被拒绝
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+        stats = breaker.get_stats()
+        assert stats["trips"] == 1
+        assert stats["rejected"] == 2
+
+    def test_failed_probe_reopens(self):
+        """测试探测请求失败后重新熔断。"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.is_open
+        assert breaker.get_stats()["trips"] == 2
+
+
+@pytest.mark.unit
+class TestLLMResilience:
+    """LLM 服务调用保护测试类。"""
+
+    def test_retries_then_succeeds(self):
+        """测试 429 / 503 后退避重试成功。"""
+        client = FakeChatClient("ok", errors=[status_error(429), status_error(503)])
+        resilience = make_resilience()
+        service = LLMService(api_key="test", client=client, resilience=resilience)
+
+        response = service.chat.completions.create(model="m", messages=[])
+
+        assert response.choices[0].message.content == "ok"
+        assert len(client.calls) == 3
+        assert resilience.get_stats()["retries"] == 2
+        assert service.get_stats()["m"]["errors"] == 0
+
+    def test_client_error_not_retried(self):
+        """测试 400 不重试，也不计入熔断。"""
+        client = FakeChatClient(errors=[status_error(400)])
+        resilience = make_resilience(threshold=1)
+        service = LLMService(api_key="test", client=client, resilience=resilience)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            service.chat.completions.create(model="m", messages=[])
+
+        assert len(client.calls) == 1
+        assert not service.circuit_open
+
+    def test_open_circuit_fails_fast(self):
+        """测试熔断后调用立即失败，不再请求服务端。"""
+        client = FakeChatClient(errors=[status_error(500)] * 10)
+        service = LLMService(api_key="test", timeout=5, client=client, resilience=make_resilience(max_retries=5))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            service.chat.completions.create(model="m", messages=[])
+        # 达到阈值后停止重试
+        assert len(client.calls) == 3
+        assert service.circuit_open
+
+        start = time.perf_counter()
+        with pytest.raises(CircuitOpenError):
+            service.chat.completions.create(model="m", messages=[])
+        assert time.perf_counter() - start < 0.05
+        assert len(client.calls) == 3
+        assert service.get_resilience_stats()["breaker"]["rejected"] == 1
+
+    def test_rate_limit_wait_counts_toward_timeout(self):
+        """测试截止时间前拿不到限流令牌时超时。"""
+        resilience = LLMResilience(rate_limiter=TokenBucket(rate=1, capacity=1))
+        service = LLMService(api_key="test", timeout=0.1, client=FakeChatClient(), resilience=resilience)
+
+        service.chat.completions.create(model="m", messages=[])
+        with pytest.raises(TimeoutError):
+            service.chat.completions.create(model="m", messages=[])
+
+    def test_async_service_retries_and_shares_breaker(self):
+        """测试异步服务同样重试，并与同步服务共享熔断状态。"""
+        responses = [503, 503, 200]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            status = responses.pop(0)
+            body = {"choices": [{"message": {"content": "ok"}}]} if status == 200 else {}
+            return httpx.Response(status, json=body)
+
+        resilience = make_resilience()
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = AsyncLLMService(api_key="test", http_client=http_client, resilience=resilience)
+
+        async def run():
+            try:
+                return await service.chat.completions.create(model="m", messages=[])
+            finally:
+                await http_client.aclose()
+
+        assert asyncio.run(run()).choices[0].message.content == "ok"
+        assert resilience.get_stats()["retries"] == 2
+
+        resilience.breaker.record_failure()
+        resilience.breaker.record_failure()
+        resilience.breaker.record_failure()
+        sync_service = LLMService(api_key="test", client=FakeChatClient(), resilience=resilience)
+        assert service.circuit_open and sync_service.circuit_open
+
+    def test_from_config(self):
+        """测试根据 API 配置创建。"""
+        config = APIConfig(zhipuai_api_key="test", rate_limit=5, max_retries=1, breaker_failure_threshold=0)
+
+        resilience = LLMResilience.from_config(config)
+
+        assert resilience.rate_limiter.capacity == 5
+        assert resilience.retry_policy.max_retries == 1
+        assert resilience.breaker is None
+
+
+@pytest.mark.unit
+class TestCircuitOpenFallback:
+    """熔断时定位和解析降级测试类。"""
+
+    def open_service(self, client) -> LLMService:
+        resilience = make_resilience(threshold=1)
+        resilience.breaker.record_failure()
+        return LLMService(api_key="test", client=client, resilience=resilience)
+
+    def test_locator_uses_ocr_when_open(self):
+        """测试熔断时视觉定位直接使用 OCR，不调用视觉 API。"""
+        client = FakeChatClient()
+        locator = VisualLocator(api_key="test", llm_client=self.open_service(client))
+        locator._locate_with_ocr = MagicMock(return_value=[])
+
+        locator.locate("找到 main.py", screenshot=Image.new("RGB", (32, 32)), target_filter="main.py")
+
+        assert len(client.calls) == 0
+        locator._locate_with_ocr.assert_called_once()
+        assert locator._locate_with_ocr.call_args.args[1] == "main.py"
+
+    def test_locator_falls_back_when_circuit_trips(self):
+        """测试调用中途熔断时回退到 OCR。"""
+        client = FakeChatClient(errors=[status_error(503)])
+        service = LLMService(api_key="test", client=client, resilience=make_resilience(max_retries=0, threshold=1))
+        locator = VisualLocator(api_key="test", llm_client=service)
+        locator._locate_with_ocr = MagicMock(return_value=[])
+        screenshot = Image.new("RGB", (32, 32))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            locator.locate("找到按钮", screenshot=screenshot, use_ocr_fallback=False)
+        assert locator.locate("找到按钮", screenshot=screenshot, use_ocr_fallback=False) == []
+
+        assert len(client.calls) == 1
+        locator._locate_with_ocr.assert_called_once()
+
+    def test_parser_uses_rules_when_open(self):
+        """测试熔断时命令解析直接使用规则匹配。"""
+        config_manager = MagicMock()
+        config_manager.list_operations.return_value = []
+        client = FakeChatClient()
+        parser = CommandParser(config_manager, api_key="", llm_client=self.open_service(client))
+
+        command = parser.parse("打开文件 main.py")
+
+        assert len(client.calls) == 0
+        assert command.action == "unknown"
+
+    def test_health_reports_breaker(self):
+        """测试健康检查返回熔断状态。"""
+        import src.api.app as api_app
+
+        service = self.open_service(FakeChatClient())
+        fake_controller = SimpleNamespace(_intent_recognizer=None, llm=service)
+
+        async def run():
+            transport = httpx.ASGITransport(app=api_app.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://api.test") as client:
+                return (await client.get("/api/health")).json()
+
+        original = api_app.controller
+        api_app.controller = fake_controller
+        try:
+            health = asyncio.run(run())
+        finally:
+            api_app.controller = original
+
+        assert health["llm"]["breaker"]["state"] == "open"
+        assert health["llm"]["retries"] == 0
@@ -0,0 +1,141 @@
+"""页面滚动引擎单元测试。"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.automation.backends import VirtualBackend
+from src.browser.scroll import ScrollEngine
+from src.locator.frames import frame_diff_ratio, frame_fingerprint
+from src.locator.ocr_index import OCRIndex
+from src.models.element import UIElement
+
+
+class SyntheticPage:
+    """合成长页面：根据虚拟后端记录的滚动事件计算视口位置。"""
+
+    def __init__(self, height: int = 3000, viewport: tuple[int, int] = (320, 240)) -> None:
+        rng = np.random.default_rng(0)
+        pixels = rng.integers(0, 255, size=(height, viewport[0], 3), dtype=np.uint8)
+        self.image = Image.fromarray(pixels)
+        self.viewport = viewport
+        self.backend = VirtualBackend()
+
+    @property
+    def offset(self) -> int:
+        scrolled = -sum(e.args["clicks"] for e in self.backend.events if e.kind == "scroll")
+        return max(0, min(scrolled, self.image.height - self.viewport[1]))
+
+    def capture(self) -> Image.Image:
+        width, height = self.viewport
+        return self.image.crop((0, self.offset, width, self.offset + height))
+
+    def finder_for(self, target_y: int):
+        """创建在目标纵坐标进入视口时返回元素的查找函数。"""
+
+        def finder(frame: Image.Image, text: str) -> list[UIElement]:
+            top = self.offset
+            if top <= target_y < top + self.viewport[1]:
+                y = target_y - top
+                return [UIElement("ocr_text", f"OCR识别文本: {text}", (10, y, 60, y + 10), 0.9)]
+            return []
+
+        return finder
+
+
+@pytest.mark.unit
+class TestFrames:
+    """帧比较工具测试类。"""
+
+    def test_fingerprint(self):
+        """测试相同图像指纹相同。"""
+        a = Image.new("RGB", (50, 50), "white")
+        b = Image.new("RGB", (50, 50), "white")
+        c = Image.new("RGB", (50, 50), "black")
+
+        assert frame_fingerprint(a) == frame_fingerprint(b)
+        assert frame_fingerprint(a) != frame_fingerprint(c)
+
+    def test_diff_ratio(self):
+        """测试帧差异比例。"""
+        page = SyntheticPage()
+        first = page.capture()
+
+        assert frame_diff_ratio(first, first.copy()) == 0.0
+        page.backend.scroll(-300)
+        assert frame_diff_ratio(first, page.capture()) > 0.5
+        assert frame_diff_ratio(first, Image.new("RGB", (10, 10))) == 1.0
+
+
+@pytest.mark.unit
+class TestOCRIndex:
+    """屏幕文本索引测试类。"""
+
+    def test_find_and_cache(self):
+        """测试查找文本并按帧缓存 OCR 结果。"""
+        calls = []
+
+        def reader(image):
+            calls.append(image.shape)
+            return [
+                ([[0, 0], [40, 0], [40, 10], [0, 10]], "Submit", 0.9),
+                ([[0, 20], [40, 20], [40, 30], [0, 30]], "Cancel", 0.8),
+                ([[0, 40], [40, 40], [40, 50], [0, 50]], "submit all", 0.05),
+            ]
+
+        index = OCRIndex(reader=reader)
+        frame = Image.new("RGB", (100, 60), "white")
+
+        elements = index.find(frame, "submit")
+        assert [e.bbox for e in elements] == [(0, 0, 40, 10)]
+        assert index.find(frame, "cancel")[0].description == "OCR识别文本: Cancel"
+        assert index.ocr_runs == 1
+        assert len(calls) == 1
+
+
+@pytest.mark.unit
+class TestScrollEngine:
+    """页面滚动引擎测试类。"""
+
+    def test_scroll_aggregates_events(self):
+        """测试滚动只发送一个聚合事件。"""
+        backend = VirtualBackend()
+        engine = ScrollEngine(backend, capture=lambda: None)
+
+        engine.scroll("down", 5)
+        engine.scroll("right", 1)
+
+        assert [(e.args["clicks"], e.args["horizontal"]) for e in backend.events] == [
+            (-1500, False),
+            (-300, True),
+        ]
+
+    def test_invalid_direction(self):
+        """测试无效的滚动方向。"""
+        engine = ScrollEngine(VirtualBackend(), capture=lambda: None)
+
+        with pytest.raises(ValueError):
+            engine.scroll("diagonal")
+
+    def test_scroll_until_visible(self):
+        """测试滚动直到目标出现。"""
+        page = SyntheticPage()
+        engine = ScrollEngine(
+            page.backend, page.capture, finder=page.finder_for(2500), settle_delay=0
+        )
+
+        element = engine.scroll_until_visible("Footer", step=1)
+
+        assert element is not None
+        assert page.offset <= 2500 < page.offset + page.viewport[1]
+
+    def test_stop_at_page_end(self):
+        """测试到达页面尽头时停止。"""
+        page = SyntheticPage(height=1000)
+        engine = ScrollEngine(
+            page.backend, page.capture, finder=page.finder_for(5000), settle_delay=0
+        )
+
+        assert engine.scroll_until_visible("Missing", step=1, max_steps=50) is None
+        # 1000 像素页面、240 像素视口：3 步到底，第 4 步帧不变
+        assert len(page.backend.events) == 4
@@ -0,0 +1,178 @@
+"""相同请求合并（single-flight）单元测试。"""
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from src.infrastructure.singleflight import AsyncSingleFlight, SingleFlight
+from src.intent.recognizer import IntentRecognizer
+from src.locator.visual_locator import VisualLocator
+from tests.conftest import FakeChatClient
+
+INTENTS_YAML = """
+intents:
+  run-tests:
+    type: single-system
+    description: 运行测试
+"""
+
+
+def run_concurrently(func, count: int) -> list:
+    """在多个线程中同时调用 func。"""
+    barrier = threading.Barrier(count)
+
+    def call(_):
+        barrier.wait()
+        return func()
+
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        return list(pool.map(call, range(count)))
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """线程调用方请求合并测试类。"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """测试相同键的并发调用只执行一次并共享结果。"""
+        flight = SingleFlight()
+        calls = []
+
+        def work():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"value": 42}
+
+        results = run_concurrently(lambda: flight.do("key", work), 5)
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        stats = flight.get_stats()
+        assert stats["executed"] == 1
+        assert stats["deduplicated"] == 4
+        assert stats["in_flight"] == 0
+
+    def test_error_propagates_to_all_waiters(self):
+        """测试执行出错时所有等待者都收到异常。"""
+        flight = SingleFlight()
+
+        def fail():
+            time.sleep(0.2)
+            raise ValueError("失败")
+
+        def call():
+            try:
+                flight.do("key", fail)
+            except ValueError as e:
+                return str(e)
+            return None
+
+        assert run_concurrently(call, 4) == ["失败"] * 4
+        assert flight.get_stats()["executed"] == 1
+
+    def test_different_keys_and_sequential_calls_execute(self):
+        """测试不同键分别执行，请求结束后不缓存结果。"""
+        flight = SingleFlight()
+        calls = []
+
+        flight.do("a", calls.append, "a")
+        flight.do("b", calls.append, "b")
+        flight.do("a", calls.append, "a")
+
+        assert calls == ["a", "b", "a"]
+        assert flight.get_stats()["deduplicated"] == 0
+
+
+@pytest.mark.unit
+class TestAsyncSingleFlight:
+    """asyncio 调用方请求合并测试类。"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """测试相同键的并发协程只执行一次。"""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def work(value):
+            calls.append(value)
+            await asyncio.sleep(0.05)
+            return value * 2
+
+        async def main():
+            return await asyncio.gather(*(flight.do("key", work, 21) for _ in range(5)))
+
+        assert asyncio.run(main()) == [42] * 5
+        assert calls == [21]
+        assert flight.get_stats()["deduplicated"] == 4
+        assert flight.get_stats()["in_flight"] == 0
+
+    def test_error_propagates_to_all_waiters(self):
+        """测试协程出错时所有等待者都收到异常。"""
+        flight = AsyncSingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.05)
+            raise ValueError("失败")
+
+        async def main():
+            return await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(main())
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.get_stats()["executed"] == 1
+
+    def test_cancelled_waiter_does_not_cancel_others(self):
+        """测试某个等待者被取消不影响其他等待者。"""
+        flight = AsyncSingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.1)
+            return "ok"
+
+        async def main():
+            first = asyncio.ensure_future(flight.do("key", work))
+            second = asyncio.ensure_future(flight.do("key", work))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(main()) == "ok"
+
+
+@pytest.mark.unit
+class TestCoalescedCalls:
+    """定位和意图识别请求合并集成测试类。"""
+
+    def test_recognize_coalesced(self, tmp_path):
+        """测试相同消息的并发识别只调用一次 LLM。"""
+        path = tmp_path / "intents.yaml"
+        path.write_text(INTENTS_YAML, encoding="utf-8")
+        llm = FakeChatClient(json.dumps({"intent_type": "run-tests", "confidence": 0.9}), delay=0.2)
+        recognizer = IntentRecognizer(str(path), llm_client=llm, cache_size=0)
+
+        results = run_concurrently(lambda: recognizer.recognize("运行测试"), 4)
+
+        assert all(result.has_match for result in results)
+        assert len(llm.calls) == 1
+        assert recognizer.get_flight_stats()["sync"]["deduplicated"] == 3
+
+    def test_locate_coalesced_per_frame(self):
+        """测试同一帧的相同定位请求只调用一次视觉 API，每个调用方拿到独立列表。"""
+        llm = FakeChatClient('[{"element_type": "button", "description": "确定", "bbox": [1, 2, 3, 4]}]', delay=0.2)
+        locator = VisualLocator(api_key="test", llm_client=llm)
+        frame = Image.new("RGB", (32, 32))
+
+        results = run_concurrently(lambda: locator.locate("找到确定", screenshot=frame, use_cache=False), 3)
+
+        assert len(llm.calls) == 1
+        assert [len(result) for result in results] == [1, 1, 1]
+        assert results[0] is not results[1]
+
+        # 不同帧不合并
+        locator.locate("找到确定", screenshot=Image.new("RGB", (32, 32), "white"), use_cache=False)
+        assert len(llm.calls) == 2
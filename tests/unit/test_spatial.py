@@ -0,0 +1,149 @@
+"""UI 元素空间索引单元测试。"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image
+
+from src.config.schema import OperationConfig
+from src.controller.ide_controller import IDEController
+from src.locator.ocr_index import OCRIndex
+from src.locator.regions import RegionResolver
+from src.locator.spatial import SpatialIndex
+from src.models.element import UIElement
+
+
+def element(name: str, bbox: tuple[int, int, int, int], element_type: str = "text_field") -> UIElement:
+    """构建 UI 元素。"""
+    return UIElement(element_type=element_type, description=name, bbox=bbox, confidence=0.9)
+
+
+# 表单布局：标签 “本地” 下方和右侧各有一个输入框，远处还有一个输入框
+LABEL = (100, 100, 140, 120)
+BELOW = element("下方输入框", (100, 130, 300, 150))
+RIGHT = element("右侧输入框", (150, 100, 350, 120))
+FAR = element("远处输入框", (600, 400, 800, 420))
+BUTTON = element("确定", (100, 160, 160, 180), "button")
+
+
+@pytest.mark.unit
+class TestSpatialIndex:
+    """空间索引测试类。"""
+
+    def test_nearest_in_direction(self):
+        """测试按方向查找最近的元素。"""
+        index = SpatialIndex([BELOW, RIGHT, FAR, BUTTON])
+
+        assert index.nearest(LABEL, "下方") is BELOW
+        assert index.nearest(LABEL, "右侧") is RIGHT
+        assert index.nearest(LABEL, "right") is RIGHT
+        assert index.nearest(LABEL, "上方") is None
+        assert index.nearest(LABEL, "左侧") is None
+
+    def test_nearest_prefers_aligned(self):
+        """测试正下方稍远的元素优先于斜下方较近的元素。"""
+        aligned = element("正下方", (100, 200, 300, 220))
+        diagonal = element("斜下方", (400, 130, 600, 150))
+        assert SpatialIndex([diagonal, aligned]).nearest(LABEL, "下方") is aligned
+
+    def test_nearest_filters(self):
+        """测试按元素类型和最大间隔过滤。"""
+        index = SpatialIndex([BELOW, BUTTON])
+
+        assert index.nearest(LABEL, "下方", element_types=["button"]) is BUTTON
+        assert index.nearest(LABEL, "下方", max_distance=5) is None
+        assert index.nearest(BELOW.bbox, "下方") is BUTTON
+
+    def test_nearest_unknown_direction(self):
+        """测试未知方向抛出 ValueError。"""
+        with pytest.raises(ValueError):
+            SpatialIndex([BELOW]).nearest(LABEL, "斜上方")
+
+    def test_containment(self):
+        """测试包含查询（最内层的元素在前）与范围内查询。"""
+        panel = element("面板", (0, 0, 1000, 1000), "panel")
+        index = SpatialIndex([panel, BELOW, FAR], cell_size=64)
+
+        assert index.containing((150, 140)) == [BELOW, panel]
+        assert index.containing((150, 140, 160, 145)) == [BELOW, panel]
+        assert index.containing((2000, 2000)) == []
+        assert index.within((0, 0, 500, 500)) == [BELOW]
+
+    def test_iou(self):
+        """测试交并比计算与重叠查询。"""
+        index = SpatialIndex([BELOW, FAR])
+
+        scores = index.iou((100, 130, 300, 150))
+        assert scores.tolist() == [1.0, 0.0]
+        overlaps = index.overlapping((200, 130, 400, 150))
+        assert [(e.description, round(score, 3)) for e, score in overlaps] == [("下方输入框", 0.333)]
+        assert index.overlapping((200, 130, 400, 150), min_iou=0.5) == []
+
+    def test_empty_index(self):
+        """测试空索引的查询。"""
+        index = SpatialIndex([])
+        assert len(index) == 0
+        assert index.nearest(LABEL, "下方") is None
+        assert index.containing((1, 1)) == []
+        assert index.overlapping(LABEL) == []
+
+
+def make_controller(words: list) -> IDEController:
+    """构建使用假 OCR 的控制器（words 为 EasyOCR readtext 格式的识别结果）。"""
+    controller = IDEController.__new__(IDEController)
+    controller.template_matcher = MagicMock()
+    controller.template_matcher.default_confidence = 0.8
+    controller.locator = MagicMock()
+    controller._regions = RegionResolver(None)
+    controller._ocr_index = OCRIndex(reader=lambda image: words)
+    return controller
+
+
+def quad(box: tuple[int, int, int, int]) -> list[list[int]]:
+    """边界框转换为 OCR 四点格式。"""
+    x1, y1, x2, y2 = box
+    return [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+
+
+INPUT_OP = OperationConfig(
+    name="input_text", aliases=[], intent="input", description="输入", visual_prompt="找到输入框",
+    template="text_field.png",
+)
+
+
+@pytest.mark.unit
+class TestRelationalTarget:
+    """按位置关系选择目标测试类。"""
+
+    def test_template_matches_resolved_locally(self):
+        """测试模板匹配到多个输入框时，按参考文本和位置提示选出目标，不调用视觉定位。"""
+        controller = make_controller([(quad(LABEL), "本地", 0.95)])
+        controller.template_matcher.match.return_value = [RIGHT, FAR, BELOW]
+        parameters = {"context_text": "本地", "position_hint": "下方", "input_text": "test"}
+
+        elements = controller._locate_elements(INPUT_OP, parameters, Image.new("RGB", (1000, 600)))
+
+        assert elements == [BELOW]
+        controller.locator.locate.assert_not_called()
+
+    def test_without_hint_keeps_candidates(self):
+        """测试没有位置提示或找不到参考文本时保留全部候选元素。"""
+        controller = make_controller([(quad(LABEL), "本地", 0.95)])
+        controller.template_matcher.match.return_value = [RIGHT, BELOW]
+        frame = Image.new("RGB", (1000, 600))
+
+        assert controller._locate_elements(INPUT_OP, {"context_text": "本地"}, frame) == [RIGHT, BELOW]
+        parameters = {"context_text": "远程", "position_hint": "下方"}
+        assert controller._locate_elements(INPUT_OP, parameters, frame) == [RIGHT, BELOW]
+
+    def test_vision_candidates_resolved(self):
+        """测试视觉定位返回多个输入框时同样按位置关系选择。"""
+        controller = make_controller([(quad(LABEL), "本地", 0.95)])
+        controller.template_matcher = None
+        controller.locator.locate.return_value = [BELOW, RIGHT]
+        parameters = {"context_text": "本地", "position_hint": "右侧"}
+        operation = OperationConfig(
+            name="input_text", aliases=[], intent="input", description="输入", visual_prompt="找到输入框"
+        )
+
+        assert controller._locate_elements(operation, parameters, Image.new("RGB", (1000, 600))) == [RIGHT]
@@ -0,0 +1,238 @@
+"""流式响应增量 JSON 解码单元测试。"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image
+
+from src.intent.recognizer import IntentRecognizer
+from src.llm.service import LLMService
+from src.llm.streaming import IncrementalJSONDecoder, decode_stream
+from src.locator.visual_locator import VisualLocator
+from src.parser.command_parser import CommandParser
+from tests.conftest import FakeChatClient, FakeStream
+
+INTENTS_YAML = """
+intents:
+  run-tests:
+    type: single-system
+    description: 运行测试
+    parameters:
+      test_type:
+        type: string
+        description: 测试类型
+        required: false
+"""
+
+
+def feed_chars(text: str) -> tuple[IncrementalJSONDecoder, list]:
+    """逐字符输入文本，返回解码器和全部事件。"""
+    decoder = IncrementalJSONDecoder()
+    events = []
+    for char in text:
+        events.extend(decoder.feed(char))
+    return decoder, events
+
+
+@pytest.mark.unit
+class TestIncrementalJSONDecoder:
+    """增量 JSON 解码器测试类。"""
+
+    def test_array_elements_emitted_when_complete(self):
+        """测试数组元素在右括号到达时立即产出，不等后面的逗号。"""
+        decoder = IncrementalJSONDecoder()
+
+        assert decoder.feed('[{"a": 1}') == [(0, {"a": 1})]
+        assert decoder.feed(', {"a": 2') == []
+        assert decoder.feed("}]") == [(1, {"a": 2})]
+        assert decoder.done
+        assert decoder.close() == [{"a": 1}, {"a": 2}]
+
+    def test_object_fields_emitted_in_order(self):
+        """测试对象根节点按字段产出。"""
+        _, events = feed_chars('{"intent_type": "x", "parameters": {"k": [1, 2]}, "confidence": 0.9}')
+
+        assert events == [("intent_type", "x"), ("parameters", {"k": [1, 2]}), ("confidence", 0.9)]
+
+    def test_fences_and_prose_ignored(self):
+        """测试忽略根节点前后的说明文字和代码块标记。"""
+        decoder, _ = feed_chars('结果如下：\n```json\n[{"a": 1},]\n```\n以上')
+
+        assert decoder.close() == [{"a": 1}]
+
+    def test_unescaped_quotes_in_string(self):
+        """测试字符串中未转义的双引号被视为内容。"""
+        decoder, events = feed_chars('[{"description": "文件 "main.py" 标签", "bbox": [1, 2, 3, 4]}]')
+
+        assert events[0][1]["description"] == '文件 "main.py" 标签'
+        assert decoder.close()[0]["bbox"] == [1, 2, 3, 4]
+
+    def test_escape_split_across_chunks(self):
+        """测试转义序列跨块到达。"""
+        decoder = IncrementalJSONDecoder()
+        assert decoder.feed('{"a": "x\\') == []
+        assert decoder.feed('"y", "b": "\\u4e2') == [("a", 'x"y')]
+        assert decoder.feed('d"}') == [("b", "中")]
+
+    def test_raw_newline_in_string(self):
+        """测试字符串中的原始换行。"""
+        decoder, _ = feed_chars('{"reasoning": "第一行\n第二行"}')
+
+        assert decoder.close() == {"reasoning": "第一行\n第二行"}
+
+    def test_truncated_stream_returns_complete_part(self):
+        """测试截断的响应返回已完整的部分。"""
+        decoder = IncrementalJSONDecoder()
+        decoder.feed('[{"a": 1}, {"a": 2}, {"a"')
+
+        assert decoder.close() == [{"a": 1}, {"a": 2}]
+
+        decoder = IncrementalJSONDecoder()
+        decoder.feed('{"a": 1, "b": "x"')
+        assert decoder.close() == {"a": 1, "b": "x"}
+
+    def test_invalid_element_skipped(self):
+        """测试无法解析的元素被跳过，不影响后续元素。"""
+        decoder, _ = feed_chars("[{bad}, {\"a\": 1}]")
+
+        assert decoder.close() == [{"a": 1}]
+
+    def test_no_json(self):
+        """测试没有 JSON 时返回 None。"""
+        decoder, _ = feed_chars("无法识别")
+
+        assert decoder.close() is None
+
+
+@pytest.mark.unit
+class TestDecodeStream:
+    """流式解码辅助函数测试类。"""
+
+    def test_early_stop_closes_stream(self):
+        """测试满足条件时停止读取并关闭响应。"""
+        stream = FakeStream('[{"a": 1}, {"a": 2}, {"a": 3}]')
+
+        result = decode_stream(stream, until=lambda decoder: len(decoder.items) >= 1)
+
+        assert result == [{"a": 1}]
+        assert stream.closed
+        assert stream.read < len(stream.pieces)
+
+    def test_reads_to_end_without_condition(self):
+        """测试没有停止条件时读取完整响应。"""
+        stream = FakeStream('```json\n{"a": 1}\n```')
+        items = []
+
+        result = decode_stream(stream, on_item=lambda key, value: items.append(key))
+
+        assert result == {"a": 1}
+        assert items == ["a"]
+
+
+@pytest.mark.unit
+class TestLLMServiceStreaming:
+    """LLM 服务流式调用测试类。"""
+
+    def test_slot_held_until_stream_closed(self):
+        """测试流式响应在关闭后才释放并发槽。"""
+        client = FakeChatClient('{"a": 1}')
+        service = LLMService(api_key="test", max_in_flight=1, timeout=0.2, client=client)
+
+        stream = service.chat.completions.create(model="m", messages=[], stream=True)
+        with pytest.raises(TimeoutError):
+            service.chat.completions.create(model="m", messages=[], stream=True)
+
+        assert decode_stream(stream, until=lambda decoder: True) == {"a": 1}
+        assert client.streams[0].closed
+        # 关闭后可以再次调用
+        service.chat.completions.create(model="m", messages=[], stream=True).close()
+        assert service.get_stats()["m"]["requests"] == 2
+
+    def test_slot_released_when_exhausted(self):
+        """测试读取完毕后释放并发槽。"""
+        service = LLMService(api_key="test", max_in_flight=1, timeout=0.2, client=FakeChatClient("[]"))
+
+        assert list(service.chat.completions.create(model="m", messages=[], stream=True))
+        assert list(service.chat.completions.create(model="m", messages=[], stream=True))
+
+
+@pytest.mark.unit
+class TestStreamingConsumers:
+    """流式识别、解析和定位测试类。"""
+
+    def test_recognizer_stops_before_reasoning(self, tmp_path):
+        """测试意图识别拿到必需字段后不再读取 reasoning。"""
+        path = tmp_path / "intents.yaml"
+        path.write_text(INTENTS_YAML, encoding="utf-8")
+        content = json.dumps(
+            {
+                "intent_type": "run-tests",
+                "confidence": 0.95,
+                "parameters": {"test_type": "unit"},
+                "reasoning": "很长的识别理由" * 20,
+            },
+            ensure_ascii=False,
+        )
+        llm = FakeChatClient(content)
+        recognizer = IntentRecognizer(str(path), llm_client=llm, cache_size=0, stream=True)
+
+        result = recognizer.recognize("运行单元测试")
+
+        assert result.has_match
+        assert result.intent.parameters == {"test_type": "unit"}
+        assert llm.calls[0]["stream"] is True
+        stream = llm.streams[0]
+        assert stream.closed
+        assert stream.read < len(stream.pieces) // 2
+
+    def test_parser_stream_falls_back_to_rules(self):
+        """测试流式响应没有 JSON 时回退到规则匹配。"""
+        config_manager = MagicMock()
+        config_manager.list_operations.return_value = []
+        parser = CommandParser(config_manager, api_key="", llm_client=FakeChatClient("抱歉，无法解析"), stream=True)
+
+        command = parser._parse_with_llm("打开 main.py", {})
+
+        assert command.action == "unknown"
+
+    def test_parser_stream_result(self):
+        """测试流式解析命令。"""
+        config_manager = MagicMock()
+        config_manager.list_operations.return_value = []
+        content = '```json\n{"intent": "file", "action": "open_file", "parameters": {}, "confidence": 0.9}\n```'
+        parser = CommandParser(config_manager, api_key="", llm_client=FakeChatClient(content), stream=True)
+
+        command = parser._parse_with_llm("打开 main.py", {})
+
+        assert command.action == "open_file"
+        assert command.confidence == 0.9
+
+    def test_locator_stops_at_target(self):
+        """测试视觉定位找到与目标完全匹配的元素后停止读取。"""
+        elements = [
+            {"element_type": "tree", "description": name, "bbox": [0, i * 20, 50, i * 20 + 10]}
+            for i, name in enumerate(["a.py", "main.py", "b.py", "c.py", "d.py"])
+        ]
+        llm = FakeChatClient(json.dumps(elements))
+        locator = VisualLocator(api_key="test", llm_client=llm, stream=True)
+
+        found = locator.locate(
+            "找到 main.py",
+            screenshot=Image.new("RGB", (64, 64)),
+            target_filter="main.py",
+            use_ocr_fallback=False,
+        )
+
+        assert [element.description for element in found] == ["main.py"]
+        assert llm.streams[0].read < len(llm.streams[0].pieces)
+
+    def test_locator_single_object_response(self):
+        """测试视觉 API 只返回单个对象时仍能解析。"""
+        llm = FakeChatClient('{"element_type": "button", "description": "确定", "bbox": [1, 2, 3, 4]}')
+        locator = VisualLocator(api_key="test", llm_client=llm, stream=True)
+
+        found = locator.locate("找到确定按钮", screenshot=Image.new("RGB", (64, 64)), use_cache=False)
+
+        assert len(found) == 1
+        assert found[0].bbox == (1, 2, 3, 4)
@@ -0,0 +1,72 @@
+"""文本注入器单元测试。"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.automation.backends import VirtualBackend
+from src.automation.text_input import TextInjector
+
+
+@pytest.mark.unit
+class TestTextInjector:
+    """文本注入器测试类。"""
+
+    def test_invalid_mode(self):
+        """测试无效的输入模式。"""
+        with pytest.raises(ValueError):
+            TextInjector(mode="invalid")
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("", False),
+            ("short", False),
+            ("x" * 32, True),
+            ("打开文件", True),
+            ("main.py 中文", True),
+        ],
+    )
+    def test_should_paste_auto(self, text, expected):
+        """测试 auto 模式下的输入方式选择。"""
+        injector = TextInjector(mode="auto", paste_threshold=32)
+        assert injector.should_paste(text) is expected
+
+    def test_should_paste_mode_override(self):
+        """测试按调用覆盖输入模式。"""
+        injector = TextInjector(mode="auto")
+        assert injector.should_paste("hi", mode="paste") is True
+        assert injector.should_paste("中文" * 50, mode="type") is False
+
+    def test_inject_short_ascii_types(self):
+        """测试短 ASCII 文本逐字键入。"""
+        backend = VirtualBackend()
+        injector = TextInjector(backend=backend)
+
+        assert injector.inject("test", interval=0.1) == "type"
+        assert [(e.kind, e.args["text"]) for e in backend.events] == [("write", "test")]
+
+    def test_inject_long_text_pastes_and_restores(self):
+        """测试长文本通过剪贴板粘贴并恢复剪贴板。"""
+        backend = VirtualBackend()
+        injector = TextInjector(paste_threshold=10, restore_delay=0, backend=backend)
+        text = "def main():\n    return 42\n"
+
+        with patch("src.automation.text_input.pyperclip") as mock_clip:
+            mock_clip.paste.return_value = "saved"
+            assert injector.inject(text) == "paste"
+
+            assert [e.kind for e in backend.events] == ["hotkey"]
+            assert backend.events[0].args["keys"] == injector.paste_keys
+            assert [c.args[0] for c in mock_clip.copy.call_args_list] == [text, "saved"]
+
+    def test_inject_falls_back_when_clipboard_fails(self):
+        """测试剪贴板不可用时回退到键入。"""
+        backend = VirtualBackend()
+        injector = TextInjector(mode="paste", backend=backend)
+
+        with patch("src.automation.text_input.pyperclip") as mock_clip:
+            mock_clip.copy.side_effect = RuntimeError("no clipboard")
+            assert injector.inject("hello") == "type"
+
+        assert [e.kind for e in backend.events] == ["write"]
@@ -0,0 +1,172 @@
+"""大尺寸截图分块定位单元测试。"""
+
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from src.locator.tiling import box_overlap, grid_tiles, merge_elements, monitor_tiles, plan_tiles
+from src.locator.visual_locator import VisualLocator
+from src.models.element import UIElement
+from tests.conftest import FakeChatClient, request_image
+
+THREE_MONITORS = [
+    {"left": -1920, "top": 0, "width": 5760, "height": 1080},
+    {"left": -1920, "top": 0, "width": 1920, "height": 1080},
+    {"left": 0, "top": 0, "width": 1920, "height": 1080},
+    {"left": 1920, "top": 0, "width": 1920, "height": 1080},
+]
+
+
+def tile_llm(respond, delay=0.0) -> FakeChatClient:
+    """按上传图像返回内容的假视觉客户端（delay 可以是按图像计算耗时的函数）。"""
+    return FakeChatClient(
+        lambda request: respond(request_image(request)),
+        delay=(lambda request: delay(request_image(request))) if callable(delay) else delay,
+    )
+
+
+def element(name: str, bbox, confidence: float = 0.9) -> UIElement:
+    """构建元素。"""
+    return UIElement(element_type="text", description=name, bbox=bbox, confidence=confidence)
+
+
+@pytest.mark.unit
+class TestTilePlanning:
+    """分块规划测试类。"""
+
+    def test_small_frame_single_tile(self):
+        """测试不超过尺寸上限时只有一块。"""
+        assert plan_tiles((1920, 1080)) == [(0, 0, 1920, 1080)]
+
+    def test_grid_tiles_overlap_and_cover(self):
+        """测试网格切分覆盖整个区域且相邻块重叠。"""
+        tiles = grid_tiles((0, 0, 5000, 1000), (1920, 1200), 64)
+
+        assert tiles[0][0] == 0 and tiles[-1][2] == 5000
+        assert all(right - left == 1920 for left, _, right, _ in tiles)
+        for previous, current in zip(tiles, tiles[1:]):
+            assert previous[2] - current[0] >= 64
+
+    def test_monitor_tiles(self):
+        """测试多显示器虚拟屏幕按显示器分块（坐标相对于虚拟屏幕左上角）。"""
+        assert monitor_tiles(THREE_MONITORS, (5760, 1080)) == [
+            (0, 0, 1920, 1080),
+            (1920, 0, 3840, 1080),
+            (3840, 0, 5760, 1080),
+        ]
+        # 单显示器截图或尺寸不匹配时不按显示器分块
+        assert monitor_tiles(THREE_MONITORS[:2], (1920, 1080)) is None
+        assert monitor_tiles(THREE_MONITORS, (1920, 1080)) is None
+
+
+@pytest.mark.unit
+class TestMergeElements:
+    """去重测试类。"""
+
+    def test_duplicates_merged_keep_highest_confidence(self):
+        """测试重叠块重复识别的元素只保留置信度最高的一个。"""
+        merged = merge_elements(
+            [
+                element("main.py", (100, 100, 200, 120), 0.7),
+                element("main.py", (102, 101, 201, 121), 0.95),
+                # 被块边界截断的部分框
+                element("main.py", (150, 100, 200, 120), 0.6),
+                element("utils.py", (100, 130, 200, 150), 0.8),
+            ]
+        )
+
+        assert [(e.description, e.confidence) for e in merged] == [("main.py", 0.95), ("utils.py", 0.8)]
+
+    def test_box_overlap(self):
+        """测试 IoU 和包含比例。"""
+        assert box_overlap((0, 0, 10, 10), (20, 20, 30, 30)) == (0.0, 0.0)
+        iou, contained = box_overlap((0, 0, 10, 10), (0, 0, 5, 10))
+        assert iou == pytest.approx(0.5)
+        assert contained == pytest.approx(1.0)
+
+
+@pytest.mark.unit
+class TestTiledLocate:
+    """分块定位测试类。"""
+
+    def test_tiles_located_in_global_coordinates(self):
+        """测试各块结果换算为全局坐标，重叠区域的重复元素被合并。"""
+
+        def respond(image):
+            return json.dumps([{"element_type": "text", "description": "目标", "bbox": [10, 20, 60, 40]}])
+
+        llm = tile_llm(respond)
+        locator = VisualLocator(api_key="test", llm_client=llm, tiling=True, tile_size=(1000, 1000), tile_overlap=0)
+
+        found = locator._locate_with_vision(Image.new("RGB", (2000, 800)), "找到目标")
+
+        assert sorted(llm.sizes) == [(1000, 800), (1000, 800)]
+        assert sorted(e.bbox for e in found) == [(10, 20, 60, 40), (1010, 20, 1060, 40)]
+
+    def test_early_stop_on_confident_hit(self):
+        """测试某块找到置信度足够高的目标后不再等待其他块。"""
+
+        def respond(image):
+            # 第一块（纯白）有目标，其余块没有
+            if image.getpixel((0, 0)) == (255, 255, 255):
+                return json.dumps([{"element_type": "tree", "description": "main.py", "bbox": [5, 5, 50, 20], "confidence": 0.95}])
+            return "[]"
+
+        def delay(image):
+            return 0.02 if image.getpixel((0, 0)) == (255, 255, 255) else 0.5
+
+        frame = Image.new("RGB", (3000, 500), "black")
+        frame.paste((255, 255, 255), (0, 0, 1000, 500))
+        llm = tile_llm(respond, delay)
+        locator = VisualLocator(api_key="test", llm_client=llm, tiling=True, tile_size=(1000, 1000), tile_overlap=0)
+
+        start = time.perf_counter()
+        found = locator.locate("找到 main.py", screenshot=frame, target_filter="main.py", use_ocr_fallback=False)
+        elapsed = time.perf_counter() - start
+
+        assert [e.description for e in found] == ["main.py"]
+        assert elapsed < 0.4
+
+    def test_monitor_tiles_from_capture(self):
+        """测试定位虚拟屏幕时按显示器分块。"""
+        llm = tile_llm(lambda image: "[]")
+        capture = SimpleNamespace(get_monitors=lambda: THREE_MONITORS)
+        locator = VisualLocator(api_key="test", llm_client=llm, screenshot_capture=capture, tiling=True)
+
+        locator._locate_with_vision(Image.new("RGB", (5760, 1080)), "找到按钮")
+
+        assert llm.sizes == [(1920, 1080)] * 3
+
+    def test_failed_tile_tolerated(self):
+        """测试部分块失败时返回其他块的结果，全部失败时抛出异常。"""
+        calls = []
+
+        def respond(image):
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("块失败")
+            return json.dumps([{"element_type": "text", "description": "目标", "bbox": [1, 1, 5, 5]}])
+
+        locator = VisualLocator(
+            api_key="test", llm_client=tile_llm(respond), tiling=True, tile_size=(1000, 1000), tile_overlap=0
+        )
+        assert len(locator._locate_with_vision(Image.new("RGB", (2000, 500)), "找到目标")) == 1
+
+        def fail(image):
+            raise RuntimeError("全部失败")
+
+        locator = VisualLocator(api_key="test", llm_client=tile_llm(fail), tiling=True, tile_size=(1000, 1000))
+        with pytest.raises(RuntimeError):
+            locator._locate_with_vision(Image.new("RGB", (2000, 500)), "找到目标")
+
+    def test_tiling_disabled_by_default(self):
+        """测试默认不分块。"""
+        llm = tile_llm(lambda image: "[]")
+        locator = VisualLocator(api_key="test", llm_client=llm)
+
+        locator._locate_with_vision(Image.new("RGB", (5760, 1080)), "找到按钮")
+
+        assert llm.sizes == [(5760, 1080)]
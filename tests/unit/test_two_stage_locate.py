@@ -0,0 +1,126 @@
+"""两阶段（粗定位 + 精确定位）视觉定位单元测试。"""
+
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from src.locator.tiling import expand_box, offset_box, scale_box
+from src.locator.visual_locator import VisualLocator
+from tests.conftest import FakeChatClient, request_image
+
+TARGET = (1503, 811, 1561, 829)
+
+
+def red_box_llm(fail_small: bool = False) -> FakeChatClient:
+    """返回图像中红色矩形边界框的假视觉客户端（fail_small 时小图请求失败）。"""
+
+    def respond(request):
+        image = request_image(request)
+        if fail_small and max(image.size) < 500:
+            raise RuntimeError("精确定位失败")
+        pixels = np.asarray(image).astype(int)
+        red = (pixels[:, :, 0] > 200) & (pixels[:, :, 1] < 80) & (pixels[:, :, 2] < 80)
+        ys, xs = np.nonzero(red)
+        if not len(xs):
+            return []
+        bbox = [int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1]
+        return [{"element_type": "text", "description": "main.py", "bbox": bbox, "confidence": 0.9}]
+
+    return FakeChatClient(respond)
+
+
+def make_frame() -> Image.Image:
+    """生成 1920x1080 截图，目标为红色矩形。"""
+    image = Image.new("RGB", (1920, 1080), (250, 250, 250))
+    ImageDraw.Draw(image).rectangle((TARGET[0], TARGET[1], TARGET[2] - 1, TARGET[3] - 1), fill=(255, 0, 0))
+    return image
+
+
+@pytest.mark.unit
+class TestBoxHelpers:
+    """区域坐标换算测试类。"""
+
+    def test_offset_scale_expand(self):
+        """测试平移、缩放与扩展裁剪。"""
+        assert offset_box((1, 2, 3, 4), 10, 20) == (11, 22, 13, 24)
+        assert scale_box((10, 20, 30, 40), 1.5) == (15, 30, 45, 60)
+        assert expand_box((10, 10, 50, 50), 20, (60, 100)) == (0, 0, 60, 70)
+
+
+@pytest.mark.unit
+class TestTwoStageLocate:
+    """两阶段定位测试类。"""
+
+    def test_coarse_then_native_crop(self):
+        """测试粗定位上传缩小截图，精确定位上传原始分辨率裁剪图，坐标换算回截图坐标。"""
+        llm = red_box_llm()
+        locator = VisualLocator(api_key="test", llm_client=llm, refine=True, coarse_max_side=960, refine_margin=40)
+
+        found = locator.locate("找到 main.py", screenshot=make_frame(), use_ocr_fallback=False)
+
+        assert llm.sizes[0] == (960, 540)
+        # 裁剪图：粗定位区域每边扩展 40 像素（粗定位坐标有缩放误差）
+        assert max(llm.sizes[1]) < 200
+        assert [e.bbox for e in found] == [TARGET]
+
+    def test_small_screenshot_single_request(self):
+        """测试截图不超过粗定位尺寸时只请求一次。"""
+        llm = red_box_llm()
+        locator = VisualLocator(api_key="test", llm_client=llm, refine=True, coarse_max_side=2048)
+
+        found = locator.locate("找到 main.py", screenshot=make_frame(), use_ocr_fallback=False)
+
+        assert llm.sizes == [(1920, 1080)]
+        assert [e.bbox for e in found] == [TARGET]
+
+    def test_refine_failure_keeps_coarse(self):
+        """测试精确定位失败时保留（换算为截图坐标的）粗定位结果。"""
+        llm = red_box_llm(fail_small=True)
+        locator = VisualLocator(api_key="test", llm_client=llm, refine=True, coarse_max_side=960)
+
+        found = locator.locate("找到 main.py", screenshot=make_frame(), use_ocr_fallback=False)
+
+        assert len(llm.sizes) == 2
+        assert len(found) == 1
+        assert all(abs(a - b) <= 2 for a, b in zip(found[0].bbox, TARGET))
+
+    def test_refine_disabled_by_default(self):
+        """测试默认单次定位整张截图。"""
+        llm = red_box_llm()
+        locator = VisualLocator(api_key="test", llm_client=llm)
+
+        locator.locate("找到 main.py", screenshot=make_frame(), use_ocr_fallback=False)
+
+        assert llm.sizes == [(1920, 1080)]
+
+
+@pytest.mark.unit
+class TestEncodeCache:
+    """图像编码缓存测试类。"""
+
+    def test_same_screenshot_encoded_once(self):
+        """测试同一截图重复定位时只编码一次，缩放尺寸不同时分别缓存。"""
+        locator = VisualLocator(api_key="test", llm_client=red_box_llm())
+        frame = make_frame()
+
+        first = locator._encode_image(frame)
+        assert locator._encode_image(frame.copy()) == first
+        locator._encode_image(frame, 960)
+
+        assert locator.get_encode_stats() == {"hits": 1, "misses": 2, "size": 2}
+        locator.clear_cache()
+        assert locator.get_encode_stats()["size"] == 0
+
+    def test_coarse_upload_reused_across_prompts(self):
+        """测试同一截图定位不同目标时粗定位图像只编码一次。"""
+        llm = red_box_llm()
+        locator = VisualLocator(api_key="test", llm_client=llm, refine=True, coarse_max_side=960)
+        frame = make_frame()
+
+        locator.locate("找到 main.py", screenshot=frame, use_ocr_fallback=False)
+        locator.locate("找到 main.py 标签", screenshot=frame, use_ocr_fallback=False)
+
+        # 粗定位图像和裁剪图各编码一次，第二次定位全部命中
+        assert locator.get_encode_stats()["misses"] == 2
+        assert locator.get_encode_stats()["hits"] == 2
@@ -0,0 +1,264 @@
+"""界面地图单元测试。"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image, ImageDraw
+
+from src.config.schema import OperationConfig
+from src.controller.ide_controller import IDEController
+from src.locator.ocr_index import OCRIndex
+from src.locator.regions import RegionResolver
+from src.locator.ui_map import TEMPLATE_TYPE, UIMap, UIMapIndexer
+from src.models.element import UIElement
+from src.models.element_set import ElementSet
+
+# 文件树中的两个文件名（文本位置、识别框）
+LABELS = {"main.py": ((20, 100), (18, 98, 64, 112)), "utils.py": ((20, 140), (18, 138, 70, 152))}
+
+
+def make_frame(labels: dict[str, tuple[int, int]] | None = None, size: tuple[int, int] = (640, 360)) -> Image.Image:
+    """绘制 IDE 截图（labels 为 文本 → 左上角位置）。"""
+    image = Image.new("RGB", size, (43, 43, 43))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, size[0], 20), fill=(60, 63, 65))
+    draw.rectangle((500, 300, 560, 330), fill=(80, 160, 80))
+    for text, position in (labels if labels is not None else {k: v[0] for k, v in LABELS.items()}).items():
+        draw.text(position, text, fill=(200, 200, 200))
+    return image
+
+
+def quad(box: tuple[int, int, int, int]) -> list[list[int]]:
+    """边界框转换为 OCR 四点格式。"""
+    x1, y1, x2, y2 = box
+    return [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+
+
+WORDS = [(quad(box), text, 0.9) for text, (_, box) in LABELS.items()]
+RUN_BUTTON = UIElement("template", "run.png", (500, 300, 560, 330), 0.95)
+
+
+def make_map() -> UIMap:
+    """用默认截图建立地图（两个 OCR 文本、一个模板）。"""
+    ui_map = UIMap()
+    boxes = [box for _, box in LABELS.values()] + [RUN_BUTTON.bbox]
+    types = ["ocr_text", "ocr_text", TEMPLATE_TYPE]
+    ui_map.update(make_frame(), ElementSet.from_columns(boxes, [0.9, 0.9, 0.95], types, [*LABELS, "run.png"]))
+    return ui_map
+
+
+@pytest.mark.unit
+class TestUIMap:
+    """界面地图测试类。"""
+
+    def test_resolve_text_and_template(self):
+        """测试按文本（模糊匹配）和模板名称查找。"""
+        ui_map = make_map()
+
+        found = ui_map.resolve(make_frame(), text="main.py")
+        assert [e.bbox for e in found] == [LABELS["main.py"][1]]
+        assert found[0].description == "OCR识别文本: main.py"
+        assert found[0].metadata == {"source": "ui_map"}
+
+        # OCR 识别错误的目标文本也能命中
+        assert ui_map.resolve(make_frame(), text="maln.py")[0].bbox == LABELS["main.py"][1]
+
+        found = ui_map.resolve(make_frame(), template="run.png")
+        assert [e.bbox for e in found] == [RUN_BUTTON.bbox]
+        assert found[0].description == "run.png"
+
+        # 模板名称不在 OCR 文本中查找，文本不在模板中查找
+        assert ui_map.resolve(make_frame(), text="run.png") == []
+        assert ui_map.get_stats()["hits"] == 3
+
+    def test_verify_rejects_changed_element(self):
+        """测试目标位置的内容变化（换成其他文件名）时校验不通过。"""
+        ui_map = make_map()
+        changed = make_frame({"test.py": (20, 100), "utils.py": (20, 140)})
+
+        assert ui_map.resolve(changed, text="main.py") == []
+        assert ui_map.resolve(changed, text="utils.py") != []
+        assert ui_map.get_stats()["rejected"] == 1
+
+    def test_verify_follows_small_shift(self):
+        """测试元素移动几个像素时校验通过，并返回移动后的位置。"""
+        ui_map = make_map()
+        shifted = make_frame({"main.py": (22, 101), "utils.py": (20, 140)})
+
+        found = ui_map.resolve(shifted, text="main.py")
+
+        assert [e.bbox for e in found] == [(20, 99, 66, 113)]
+
+    def test_layout_mismatch(self):
+        """测试截图尺寸不同（或布局差别很大）时不使用地图。"""
+        ui_map = make_map()
+
+        assert ui_map.resolve(make_frame(size=(800, 600)), text="main.py") == []
+        assert ui_map.resolve(Image.new("RGB", (640, 360), (255, 255, 255)), text="main.py") == []
+        assert ui_map.age(make_frame(size=(800, 600))) is None
+        assert ui_map.get_stats()["misses"] == 2
+
+    def test_update_replaces_same_layout(self):
+        """测试同一布局重新建图时替换之前的结果。"""
+        ui_map = make_map()
+        ui_map.update(make_frame(), ElementSet.from_columns([LABELS["utils.py"][1]], [0.9], "ocr_text", ["utils.py"]))
+
+        assert ui_map.get_stats()["layouts"] == 1
+        assert ui_map.resolve(make_frame(), text="main.py") == []
+        assert ui_map.age(make_frame()) < 1.0
+
+
+def make_indexer(reader, frame: Image.Image | None = None, **kwargs) -> UIMapIndexer:
+    """构建使用假 OCR 和假截图的建图线程（不启动，默认整帧一个条带）。"""
+    frame = frame or make_frame()
+    kwargs.setdefault("band_height", frame.height)
+    kwargs.setdefault("idle_seconds", 0.0)
+    kwargs.setdefault("cpu_budget", 1.0)
+    return UIMapIndexer(UIMap(), lambda: frame, ocr_index=OCRIndex(reader=reader), **kwargs)
+
+
+@pytest.mark.unit
+class TestUIMapIndexer:
+    """空闲建图测试类。"""
+
+    def test_run_once_builds_map(self):
+        """测试一轮建图：OCR 文本和模板都进入地图，之后可以按标签查找。"""
+        matcher = MagicMock()
+        matcher.match.return_value = [RUN_BUTTON]
+        indexer = make_indexer(lambda image: WORDS, template_matcher=matcher, templates=["run.png"])
+
+        assert indexer.run_once() is True
+
+        matcher.match.assert_called_once()
+        assert indexer.ui_map.get_stats()["elements"] == 3
+        assert indexer.ui_map.resolve(make_frame(), text="utils.py")[0].bbox == LABELS["utils.py"][1]
+        assert indexer.ui_map.resolve(make_frame(), template="run.png")[0].bbox == RUN_BUTTON.bbox
+        # 地图仍然新鲜时不重建
+        assert indexer.run_once() is False
+        assert indexer.passes == 1
+
+    def test_bands_offset_and_deduplicated(self):
+        """测试分条带 OCR：条带坐标换算为截图坐标，重叠处识别两次的文本只保留一个。"""
+        # 360 高的截图按 240 高、重叠 32 切成 [0, 240) 和 [208, 360) 两条
+        words = {
+            240: [(quad((18, 98, 64, 112)), "main.py", 0.9), (quad((18, 212, 70, 226)), "utils.py", 0.8)],
+            152: [(quad((18, 4, 70, 18)), "utils.py", 0.9)],
+        }
+        indexer = make_indexer(lambda image: words[image.shape[0]], band_height=240)
+
+        assert indexer.run_once() is True
+
+        stats = indexer.ui_map.get_stats()
+        assert stats["elements"] == 2
+        layout = indexer.ui_map._layouts[0]
+        assert sorted(map(tuple, layout.elements.boxes.tolist())) == [(18, 98, 64, 112), (18, 212, 70, 226)]
+
+    def test_yields_when_command_arrives(self):
+        """测试建图过程中有命令到来时放弃本轮，不更新地图。"""
+        indexer = None
+        calls = []
+
+        def reader(image):
+            # 第一轮 OCR 期间有命令到来
+            if not calls:
+                indexer.pause()
+            calls.append(image)
+            return WORDS
+
+        indexer = make_indexer(reader)
+
+        assert indexer.run_once() is False
+        assert indexer.yielded == 1
+        assert indexer.ui_map.get_stats()["layouts"] == 0
+        assert not indexer.idle
+
+        indexer.resume()
+        assert indexer.idle
+        assert indexer.run_once() is True
+
+    def test_cpu_budget_throttles(self):
+        """测试每步之后按耗时休眠，运行时间占比不超过 cpu_budget。"""
+
+        def reader(image):
+            time.sleep(0.02)
+            return WORDS
+
+        indexer = make_indexer(reader, cpu_budget=0.5)
+        start = time.perf_counter()
+        assert indexer.run_once() is True
+        elapsed = time.perf_counter() - start
+
+        assert indexer.busy_seconds >= 0.02
+        assert indexer.throttled_seconds == pytest.approx(indexer.busy_seconds, rel=0.01)
+        assert indexer.busy_seconds / elapsed <= 0.55
+
+    def test_invalid_budget(self):
+        """测试 cpu_budget 不在 (0, 1] 范围内时报错。"""
+        with pytest.raises(ValueError):
+            make_indexer(lambda image: WORDS, cpu_budget=0)
+        with pytest.raises(ValueError):
+            make_indexer(lambda image: WORDS, cpu_budget=1.5)
+
+    def test_background_thread(self):
+        """测试后台线程在空闲时建图，停止后退出。"""
+        indexer = make_indexer(lambda image: WORDS)
+        indexer.start()
+        try:
+            for _ in range(100):
+                if indexer.passes:
+                    break
+                time.sleep(0.02)
+        finally:
+            indexer.stop()
+
+        assert indexer.passes == 1
+        assert not indexer._thread.is_alive()
+
+
+OPEN_OP = OperationConfig(
+    name="double_click_file", aliases=[], intent="file_operation", description="打开文件",
+    visual_prompt="找到文件 {filename}",
+)
+
+
+@pytest.mark.unit
+class TestControllerUIMap:
+    """控制器使用界面地图测试类。"""
+
+    def make_controller(self) -> IDEController:
+        controller = IDEController.__new__(IDEController)
+        controller.template_matcher = None
+        controller.locator = MagicMock()
+        controller.locator.locate.return_value = []
+        controller._regions = RegionResolver(None)
+        controller._ocr_index = OCRIndex(reader=lambda image: [])
+        controller._ui_map = make_map()
+        return controller
+
+    def test_locate_from_map(self):
+        """测试地图命中时不再调用视觉定位。"""
+        controller = self.make_controller()
+
+        elements = controller._locate_elements(OPEN_OP, {"filename": "main.py"}, make_frame())
+
+        assert [e.bbox for e in elements] == [LABELS["main.py"][1]]
+        controller.locator.locate.assert_not_called()
+
+    def test_falls_back_when_map_misses(self):
+        """测试地图未命中（目标已变化）时照常定位。"""
+        controller = self.make_controller()
+        changed = make_frame({"test.py": (20, 100)})
+
+        controller._locate_elements(OPEN_OP, {"filename": "main.py"}, changed)
+
+        controller.locator.locate.assert_called_once()
+
+    def test_disabled_by_default(self):
+        """测试未启用界面地图时不查找地图。"""
+        controller = self.make_controller()
+        del controller._ui_map
+
+        controller._locate_elements(OPEN_OP, {"filename": "main.py"}, make_frame())
+
+        controller.locator.locate.assert_called_once()
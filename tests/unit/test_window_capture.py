@@ -0,0 +1,149 @@
+"""跟随目标窗口截图单元测试。"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image
+
+from src.config.schema import OperationConfig, RegionConfig
+from src.controller.ide_controller import IDEController
+from src.locator.regions import RegionResolver
+from src.models.element import UIElement
+from src.window.geometry import WindowGeometry, read_window_rect
+
+# 虚拟屏幕左上角在 (-1920, 0)（左侧副屏），主屏 1920x1080
+MONITORS = [
+    {"left": -1920, "top": 0, "width": 3840, "height": 1080},
+    {"left": -1920, "top": 0, "width": 1920, "height": 1080},
+    {"left": 0, "top": 0, "width": 1920, "height": 1080},
+]
+
+
+def fake_window(left=100, top=50, width=800, height=600, minimized=False):
+    """构建 pygetwindow 风格的窗口对象。"""
+    return SimpleNamespace(left=left, top=top, width=width, height=height, isMinimized=minimized, title="PyCharm")
+
+
+def make_controller(frame: Image.Image, window=None) -> IDEController:
+    """构建只包含截图和定位组件的控制器（capture_scope = window）。"""
+    controller = IDEController.__new__(IDEController)
+    controller.screenshot = MagicMock()
+    controller.screenshot.get_monitors.return_value = MONITORS
+    controller.screenshot.capture_fullscreen.return_value = frame
+    # capture_region 使用屏幕坐标，换算为虚拟屏幕截图坐标后裁剪
+    controller.screenshot.capture_region.side_effect = lambda x, y, w, h: frame.crop((x + 1920, y, x + 1920 + w, y + h))
+    controller.template_matcher = None
+    controller._regions = RegionResolver(None)
+    controller._capture_scope = "window"
+    geometry = WindowGeometry()
+    geometry.track(window)
+    controller._window_manager = SimpleNamespace(get_target_rect=geometry.rect)
+    controller.locator = MagicMock()
+    controller._action_compiler = MagicMock()
+    controller.executor = MagicMock()
+    controller.executor.run_program.return_value = True
+    return controller
+
+
+def operation(region: RegionConfig | None = None) -> OperationConfig:
+    """构建视觉定位操作。"""
+    return OperationConfig(
+        name="double_click_file", aliases=[], intent="file_operation", description="双击", visual_prompt="找到目标", region=region
+    )
+
+
+@pytest.mark.unit
+class TestWindowGeometry:
+    """窗口几何信息缓存测试类。"""
+
+    def test_rect_cached_until_ttl(self, monkeypatch):
+        """测试缓存有效期内不重新查询，过期后跟随窗口移动。"""
+        clock = [100.0]
+        monkeypatch.setattr("src.window.geometry.time.monotonic", lambda: clock[0])
+        window = fake_window()
+        geometry = WindowGeometry(ttl=0.5)
+        geometry.track(window)
+
+        assert geometry.rect() == (100, 50, 900, 650)
+        window.left = 300
+        assert geometry.rect() == (100, 50, 900, 650)
+
+        clock[0] += 1.0
+        assert geometry.rect() == (300, 50, 1100, 650)
+        assert geometry.get_stats() == {"hits": 1, "refreshes": 2, "changes": 1}
+
+    def test_unusable_window(self):
+        """测试最小化、尺寸无效或读取失败的窗口返回 None。"""
+        assert read_window_rect(fake_window(minimized=True)) is None
+        assert read_window_rect(fake_window(width=0)) is None
+        assert read_window_rect(SimpleNamespace(isMinimized=False)) is None
+        assert WindowGeometry().rect() is None
+
+    def test_track_invalidates(self):
+        """测试切换目标窗口时清除缓存。"""
+        geometry = WindowGeometry(ttl=60)
+        geometry.track(fake_window())
+        geometry.rect()
+        geometry.track(fake_window(left=0, top=0, width=10, height=10))
+
+        assert geometry.rect() == (0, 0, 10, 10)
+
+
+@pytest.mark.unit
+class TestWindowScopedCapture:
+    """跟随目标窗口截图测试类。"""
+
+    def test_locate_in_window_translated_to_screen(self):
+        """测试只截取目标窗口，定位结果换算为虚拟屏幕截图坐标。"""
+        frame = Image.new("RGB", (3840, 1080))
+        controller = make_controller(frame, fake_window())
+        controller.locator.locate.return_value = [UIElement("tree", "main.py", (10, 20, 50, 40), 0.9)]
+
+        controller._execute_operation(operation(), {})
+
+        assert controller.locator.locate.call_args[0][1].size == (800, 600)
+        controller.screenshot.capture_fullscreen.assert_not_called()
+        # 窗口屏幕坐标 (100, 50) 对应虚拟屏幕截图坐标 (2020, 50)
+        assert controller.executor.run_program.call_args[0][2]["0"].bbox == (2030, 70, 2070, 90)
+
+    def test_region_relative_to_window(self):
+        """测试比例区域相对于目标窗口。"""
+        controller = make_controller(Image.new("RGB", (3840, 1080)), fake_window())
+        controller.locator.locate.return_value = [UIElement("tree", "main.py", (0, 0, 10, 10), 0.9)]
+
+        controller._execute_operation(operation(RegionConfig(x=0.0, y=0.5, width=0.25, height=0.5)), {})
+
+        assert controller.locator.locate.call_args[0][1].size == (200, 300)
+        assert controller.executor.run_program.call_args[0][2]["0"].bbox == (2020, 350, 2030, 360)
+
+    def test_window_miss_falls_back_to_screen(self):
+        """测试窗口内未找到目标时搜索整个屏幕（对话框可能在窗口外）。"""
+        frame = Image.new("RGB", (3840, 1080))
+        controller = make_controller(frame, fake_window())
+        controller.locator.locate.side_effect = [[], [UIElement("dialog", "确定", (5, 5, 15, 15), 0.9)]]
+
+        controller._execute_operation(operation(), {})
+
+        sizes = [call[0][1].size for call in controller.locator.locate.call_args_list]
+        assert sizes == [(800, 600), (3840, 1080)]
+        assert controller.executor.run_program.call_args[0][2]["0"].bbox == (5, 5, 15, 15)
+
+    def test_no_target_window_captures_screen(self):
+        """测试没有激活过目标窗口（或窗口已最小化）时截取整个屏幕。"""
+        frame = Image.new("RGB", (3840, 1080))
+        for window in (None, fake_window(minimized=True)):
+            controller = make_controller(frame, window)
+            controller.locator.locate.return_value = [UIElement("tree", "main.py", (1, 1, 2, 2), 0.9)]
+
+            controller._execute_operation(operation(), {})
+
+            assert controller.locator.locate.call_args[0][1].size == (3840, 1080)
+
+    def test_window_clipped_to_screen(self):
+        """测试部分移出屏幕的窗口裁剪到屏幕范围内。"""
+        controller = make_controller(Image.new("RGB", (3840, 1080)), fake_window(left=1500, top=900, width=800, height=600))
+
+        base, window_box = controller._capture_base_box()
+
+        assert window_box == base == (3420, 900, 3840, 1080)
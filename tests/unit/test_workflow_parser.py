@@ -46,6 +46,7 @@ name: "测试工作流"
    parameters:
      filename: "main.py"
    retry_count: 3
+   timeout: 20
    ```
 """
         parser = WorkflowParser()
@@ -57,6 +58,7 @@ name: "测试工作流"
         assert step.operation == "double_click_file"
         assert step.parameters["filename"] == "main.py"
         assert step.retry_count == 3
+        assert step.timeout == 20
 
     def test_parse_workflow_with_conditions(self):
         """测试解析带条件的工作流。"""